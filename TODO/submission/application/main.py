@@ -4,25 +4,25 @@ from dataclasses import dataclass
 
 # --- Import DataStore ---
 from submission.repositories.in_memory.DataStore import DataStore
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface
 
 # --- Import Domain Models & Enums ---
-from submission.domain.models.OrderItem import OrderItem
+from submission.domain.models.OrderLines import OrderLines
 from submission.domain.models.Customer import Customer
 from submission.domain.models.Product import Product
 from submission.domain.models.Order import Order
 from submission.domain.enums.order_status import OrderStatus
+from submission.domain.values.Money import Money
+from submission.domain.values.PriceQuote import PriceQuote
 
 # --- Import All Strategies ---
-from submission.services.pricing.strategies.bulk_discount import (
-    NoBulkDiscount, 
-    FiveItemsDiscount, 
-    TenItemsDiscount,
-    BulkDiscount
-)
+from submission.services.pricing.strategies.bulk_discount import BulkDiscount
+from submission.services.pricing.strategies.bulk_discount_table import BulkDiscountTable
+from submission.services.pricing.strategies.strategy_registry import BULK_DISCOUNTS
 
 # --- Import All Service Interfaces & Implementations ---
 from submission.services.supplier_service import SupplierService, SupplierInterface
-from submission.services.inventory_service import InventoryService, InventoryInterface
+from submission.services.inventory_service import InventoryService, InventoryInterface, LOW_STOCK_THRESHOLD
 from submission.services.customer_service import CustomerService, CustomerInterface
 from submission.services.notification_service import NotificationService, NotificationInterface
 from submission.services.shipping_service import ShippingService, ShippingServiceInterface
@@ -32,6 +32,8 @@ from submission.services.tax_service import TaxService
 from submission.services.product_service import ProductService, ProductInterface
 from submission.services.reporting_service import ReportingService, ReportingInterface
 from submission.services.pricing.PricingService import PricingService
+from submission.services.pricing.BatchPricingService import BatchPricingService
+from submission.services.pricing.QuoteCache import QuoteCache
 
 @dataclass
 class ServiceContainer:
@@ -39,7 +41,7 @@ class ServiceContainer:
     A simple container to hold and manage the dependencies of all services.
     This uses Dependency Injection to wire up the application.
     """
-    db: DataStore
+    db: DataStoreInterface
     
     # Services are initialized in order of dependency
     supplier: SupplierInterface
@@ -55,15 +57,26 @@ class ServiceContainer:
 
     # Available bulk discount strategies
     bulk_discount_strategies: List[BulkDiscount]
+    # The same strategies, compiled for lookups; configure() swaps in new tiers
+    bulk_discounts: BulkDiscountTable
+
+    # Checkout quotes, kept until a price they depend on changes
+    quotes: QuoteCache
 
     @staticmethod
-    def initialize() -> "ServiceContainer":
-        """Factory method to create and wire all services."""
-        db = DataStore()
+    def initialize(db: Optional[DataStoreInterface] = None) -> "ServiceContainer":
+        """
+        Factory method to create and wire all services.
+        Uses a fresh in-memory DataStore unless another store is given.
+        """
+        if db is None:
+            db = DataStore()
         
         # Initialize individual services
         supplier_service = SupplierService(db)
         inventory_service = InventoryService(db, supplier_service)
+        # Supplier reorders follow the store's low-stock crossings
+        db.add_low_stock_listener(inventory_service.handle_low_stock_event, below=LOW_STOCK_THRESHOLD)
         customer_service = CustomerService(db)
         notification_service = NotificationService() # No dependencies
         shipping_service = ShippingService(db)
@@ -80,7 +93,9 @@ class ServiceContainer:
         reporting_service = ReportingService(db, customer_service)
 
         # Bulk strategies for the pricing service
-        bulk_strategies = [NoBulkDiscount(), FiveItemsDiscount(), TenItemsDiscount()]
+        bulk_strategies = list(BULK_DISCOUNTS.values())
+        bulk_discounts = BulkDiscountTable(bulk_strategies)
+        batch_pricing = BatchPricingService(db, tax_service, shipping_service, bulk_discounts)
 
         return ServiceContainer(
             db=db,
@@ -94,11 +109,13 @@ class ServiceContainer:
             tax=tax_service,
             product=product_service,
             reporting=reporting_service,
-            bulk_discount_strategies=bulk_strategies
+            bulk_discount_strategies=bulk_strategies,
+            bulk_discounts=bulk_discounts,
+            quotes=QuoteCache(db, tax_service, batch_pricing.quote)
         )
 
-def setup_data(db: DataStore):
-    """Populates the in-memory DataStore with sample data."""
+def setup_data(db: DataStoreInterface):
+    """Populates the DataStore with sample data."""
     print("--- 1. Setting up sample data ---")
     
     # Suppliers
@@ -135,6 +152,29 @@ def setup_data(db: DataStore):
     )
     print("--- Data setup complete ---\n")
 
+def quote_order_facade(
+    services: ServiceContainer,
+    customer_id: str,
+    item_requests: List[Dict[str, Any]],
+    shipping_method: str,
+    promo_code: Optional[str] = None
+) -> Optional[PriceQuote]:
+    """
+    What place_order_facade would charge for these items, without
+    placing the order: nothing is reserved, spent or counted. Repeated
+    quotes for the same cart come from services.quotes.
+    """
+    customer = services.db.get_customer(customer_id)
+    if not customer:
+        return None
+    order_items = OrderLines()
+    for item_req in item_requests:
+        product = services.db.get_product(item_req["product_id"])
+        if not product:
+            return None
+        order_items.add(product.product_id, item_req["quantity"], product.price)
+    return services.quotes.quote(order_items, customer, shipping_method, promo_code)
+
 def place_order_facade(
     services: ServiceContainer,
     customer_id: str,
@@ -155,21 +195,22 @@ def place_order_facade(
             return None
         print(f"Customer '{customer.name}' (Tier: {customer.membership_tier.get_name()}) found.")
 
-        # 2. Create OrderItem objects and check product existence
-        order_items: List[OrderItem] = []
-        total_weight: float = 0.0
+        # 2. Create the order lines and check product existence
+        order_items = OrderLines()
+        products: Dict[str, Product] = {}
         for item_req in item_requests:
             product = services.db.get_product(item_req["product_id"])
             if not product:
                 print(f"Order FAILED: Product {item_req['product_id']} not found.")
                 return None
             
-            order_items.append(OrderItem(
+            order_items.add(
                 product_id=product.product_id,
                 quantity=item_req["quantity"],
                 unit_price=product.price
-            ))
-            total_weight += product.weight * item_req["quantity"]
+            )
+            products[product.product_id] = product
+        total_weight: float = order_items.total_weight(lambda product_id: products[product_id].weight)
         
         # 3. Check Stock Availability
         if not services.inventory.check_stock_availability(order_items):
@@ -178,80 +219,99 @@ def place_order_facade(
         print("Stock available for all items.")
 
         # 4. Calculate Pricing
-        price_calc = PricingService(order_items, services.db)
-        
-        # --- Apply all discounts ---
-        (
-            price_calc
-            .apply_bulk_discount(services.bulk_discount_strategies)
-            .apply_membership_discount(customer)
-            .apply_promotion_discount(promo_code)
-            .apply_loyalty_discount(customer) # Note: This spends points
-        )
+        # A quote: loyalty points and the promotion are only spent once
+        # payment succeeds (step 9)
+        discounts = PricingService.quote(order_items, services.db, customer, promo_code, services.bulk_discounts)
         
-        discounted_subtotal = price_calc.get_final_discounted_price()
-        print(f"Subtotal: ${price_calc.subtotal:.2f}")
-        print(f"Discounted Subtotal: ${discounted_subtotal:.2f}")
+        # Amounts from here on are Money, in whole cents
+        discounted_subtotal = discounts.discounted
+        print(f"Subtotal: ${discounts.subtotal}")
+        if discounts.bulk_discount:
+            print(f"Applied bulk discount: ${discounts.bulk_discount}")
+        if discounts.promotion_code:
+            print(f"Promotion {discounts.promotion_code} applied.")
+        if discounts.loyalty_points:
+            print(f"Applied loyalty discount: ${discounts.loyalty_discount}")
+        print(f"Discounted Subtotal: ${discounted_subtotal}")
 
         # 5. Calculate Tax
-        tax = services.tax.calculate_tax(discounted_subtotal, customer)
-        print(f"Tax: ${tax:.2f}")
+        tax = services.tax.calculate_tax_money(discounted_subtotal, customer)
+        print(f"Tax: ${tax}")
 
         # 6. Calculate Shipping
-        shipping_cost = services.shipping.shipping_cost(
+        shipping_cost = Money.from_float(services.shipping.shipping_cost(
             shipping_method, 
             total_weight, 
             customer, 
-            discounted_subtotal
-        )
-        print(f"Shipping ({shipping_method}): ${shipping_cost:.2f}")
+            discounted_subtotal.to_float()
+        ))
+        print(f"Shipping ({shipping_method}): ${shipping_cost}")
 
         # 7. Final Total
         total_price = discounted_subtotal + tax + shipping_cost
-        print(f"TOTAL PRICE: ${total_price:.2f}")
+        print(f"TOTAL PRICE: ${total_price}")
 
         # 8. Validate Payment
-        is_valid, msg = services.payment.validate_payment(payment_info, total_price)
+        is_valid, msg = services.payment.validate_payment(payment_info, total_price.to_float())
         if not is_valid:
             print(f"Order FAILED: Payment validation failed. Reason: {msg}")
-            # Note: In a real app, you might need to refund loyalty points
             return None
         print("Payment successful.")
 
-        # 9. Create Order (in PENDING status)
-        order = services.order.create_order(
-            customer_id=customer_id,
-            order_items=order_items,
-            total_price=total_price,
-            shipping_cost=shipping_cost,
-            payment_method=payment_info.get("type", "unknown")
-        )
-        print(f"Order {order.order_id} created in PENDING status.")
+        # 9. Spend the loyalty points and promotion use the price relies on
+        if not PricingService.commit(services.db, discounts, customer):
+            print("Order FAILED: Loyalty points or promotion changed since pricing; please retry.")
+            return None
 
-        # 10. Post-Order Finalization
-        # - Deduct stock
-        services.inventory.deduct_stock_and_log(order_items, order)
-        print(f"Stock deducted for order {order.order_id}.")
+        # From here on the points and promotion use are spent: give them
+        # back if a later step fails
+        try:
+            # 10. Create Order (in PENDING status)
+            order = services.order.create_order(
+                customer_id=customer_id,
+                order_items=order_items,
+                total_price=total_price.to_float(),
+                shipping_cost=shipping_cost.to_float(),
+                payment_method=payment_info.get("type", "unknown")
+            )
+            print(f"Order {order.order_id} created in PENDING status.")
+
+            # 11. Post-Order Finalization
+            # - Deduct stock (all-or-nothing: a concurrent order may have
+            #   taken the last units since the check in step 3)
+            if not services.inventory.deduct_stock_and_log(order_items, order):
+                services.db.update_order(order, status=OrderStatus.CANCELLED)
+                PricingService.release(services.db, discounts, customer)
+                print(f"Order FAILED: Stock for order {order.order_id} ran out before it could be reserved.")
+                return None
+            print(f"Stock deducted for order {order.order_id}.")
         
-        # - Send confirmation
-        services.notification.send_order_confirmation(customer, order)
+            # - Send confirmation
+            services.notification.send_order_confirmation(customer, order)
         
-        # - Update customer history & loyalty
-        services.customer.finalize_customer_order_updates(customer, order.order_id, price_calc.subtotal)
-        print(f"Customer {customer.customer_id} history and loyalty points updated.")
+            # - Update customer history & loyalty
+            services.customer.finalize_customer_order_updates(customer, order.order_id, discounts.subtotal.to_float())
+            print(f"Customer {customer.customer_id} history and loyalty points updated.")
         
-        # - Check for low stock
-        services.inventory.check_and_notify_low_stock(order_items)
+            # - Low stock: the deduction above already notified the supplier
+            #   of any product it pushed below the threshold
         
-        # - Check for membership upgrade
-        services.customer.check_and_upgrade_membership(customer_id)
+            # - Check for membership upgrade
+            services.customer.check_and_upgrade_membership(customer_id)
 
-        print(f"--- [SUCCESS] Order {order.order_id} Processed ---")
-        return order
+            print(f"--- [SUCCESS] Order {order.order_id} Processed ---")
+            return order
+        except Exception:
+            PricingService.release(services.db, discounts, customer)
+            raise
 
     except Exception as e:
         print(f"--- [ERROR] Order processing failed: {e} ---")
         return None
+    finally:
+        # One wait for every write above; with a write-ahead log, orders
+        # placed by other threads meanwhile share the same disk flush
+        services.db.sync()
 
 
 def main():
@@ -0,0 +1,186 @@
+"""
+Benchmark: repricing carts one PricingService at a time vs in one batch.
+
+Builds a catalog, a pool of customers (every tier, CA/NY/TX/other
+addresses, some with loyalty points) and `--carts` carts of one to six
+lines, each with a shipping method and, for most, a promo code (store
+wide, one category, expired or out of reach). Each cart is priced the
+way checkout does it: PricingService's bulk, membership, promotion and
+loyalty stages, then TaxService and ShippingService. The same carts are
+then priced by BatchPricingService in one call.
+
+Checkout spends loyalty points and counts promo uses; repricing must
+not, so the scalar path runs against the store with those writes
+dropped and every cart sees the same points as in the batch. The scalar
+path is timed on the first `--scalar-sample` carts and every amount of
+those carts is checked against the batch.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_batch_pricing --carts 10000 1000000
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import random
+import sys
+import time
+from typing import AbstractSet, Any, List, Optional, Tuple
+
+from submission.application.main import ServiceContainer
+from submission.domain.models.CartBatch import CartBatch
+from submission.domain.models.Customer import Customer
+from submission.domain.models.OrderLines import OrderLines
+from submission.domain.models.Product import Product
+from submission.domain.values.Money import Money
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.services.pricing.BatchPricingService import BatchPricingService
+from submission.services.pricing.PricingService import PricingService
+
+PRODUCTS = 500
+CATEGORIES = 10
+CUSTOMERS = 1000
+CODES: List[Optional[str]] = [None, "ALL10", "CAT20", "EXPIRED", "BIG5"]
+METHODS: List[str] = ["standard", "express", "overnight"]
+
+# subtotal, bulk, membership, promotion, loyalty, discounted, tax, shipping, total
+Breakdown = Tuple[int, int, int, int, int, int, int, int, int]
+
+
+def build_services(customer_count: int = CUSTOMERS) -> ServiceContainer:
+    rng = random.Random(7)
+    store = DataStore()
+    for i in range(PRODUCTS):
+        store.add_product(f"P{i}", f"Product {i}", rng.randrange(99, 30_000) / 100, 10**9,
+                          f"category-{i % CATEGORIES}", rng.randrange(1, 500) / 100, "S1")
+    tiers = ["gold", "silver", "bronze", "suspended"]
+    addresses = ["1 Main St, CA", "2 Broadway, NY", "3 Elm St, TX", "4 Oak Ave, WA", ""]
+    for i in range(customer_count):
+        store.add_customer(f"C{i}", f"Customer {i}", "c@example.com", tiers[i % 4], "555",
+                           addresses[i % 5], rng.choice([0, 50, 150, 400, 5000]))
+    now = datetime.datetime.now()
+    store.add_promotion("PR1", "ALL10", 10.0, 50.0, now + datetime.timedelta(days=30), "all")
+    store.add_promotion("PR2", "CAT20", 20.0, 0.0, now + datetime.timedelta(days=30), "category-3")
+    store.add_promotion("PR3", "EXPIRED", 50.0, 0.0, now - datetime.timedelta(days=1), "all")
+    store.add_promotion("PR4", "BIG5", 5.0, 1500.0, now + datetime.timedelta(days=30), "all")
+    with contextlib.redirect_stdout(io.StringIO()):
+        return ServiceContainer.initialize(store)
+
+
+Carts = Tuple[List[OrderLines], List[Customer], List[str], List[Optional[str]]]
+
+
+def make_carts(count: int, services: ServiceContainer) -> Carts:
+    """Carts at catalog prices, with a customer, shipping method and promo code each."""
+    rng = random.Random(11)
+    products: List[Product] = [services.db.get_product(f"P{i}") for i in range(PRODUCTS)]  # type: ignore[misc]
+    customers: List[Customer] = list(services.db.customers.values())
+    carts: List[OrderLines] = []
+    for _ in range(count):
+        lines = OrderLines()
+        for _ in range(rng.randrange(1, 7)):
+            product: Product = rng.choice(products)
+            lines.add(product.product_id, rng.randrange(1, 5), product.price)
+        carts.append(lines)
+    return (carts, [rng.choice(customers) for _ in range(count)],
+            [rng.choice(METHODS) for _ in range(count)], [rng.choice(CODES) for _ in range(count)])
+
+
+class QuoteStore:
+    """The store with checkout's writes (points spent, promo uses) dropped."""
+
+    def __init__(self, store: DataStore) -> None:
+        self._store = store
+        self.promotions = store.promotions
+
+    def get_product(self, product_id: str) -> Optional[Product]:
+        return self._store.get_product(product_id)
+
+    def get_product_ids_by_category(self, category: str) -> AbstractSet[str]:
+        return self._store.get_product_ids_by_category(category)
+
+    def update_customer(self, customer: Customer, **changes: Any) -> Customer:
+        return customer
+
+    def update_promotion(self, promotion: Any, **changes: Any) -> Any:
+        return promotion
+
+
+def price_scalar(
+    services: ServiceContainer, quote_store: QuoteStore, lines: OrderLines,
+    customer: Customer, method: str, code: Optional[str]
+) -> Breakdown:
+    """One cart through PricingService, TaxService and ShippingService, as place_order_facade."""
+    pricing = PricingService(lines, quote_store)  # type: ignore[arg-type]
+    (
+        pricing
+        .apply_bulk_discount(services.bulk_discounts, customer)
+        .apply_membership_discount(customer)
+        .apply_promotion_discount(code)
+        .apply_loyalty_discount(customer)
+    )
+    discounted: Money = pricing.get_final_discounted_money()
+    tax: Money = services.tax.calculate_tax_money(discounted, customer)
+
+    def weight_of(product_id: str) -> float:
+        product: Optional[Product] = quote_store.get_product(product_id)
+        assert product is not None
+        return product.weight
+
+    weight: float = lines.total_weight(weight_of)
+    shipping = Money.from_float(services.shipping.shipping_cost(method, weight, customer, discounted.to_float()))
+    return (pricing.subtotal_money.cents, pricing.bulk_discount_money.cents,
+            pricing.membership_discount_money.cents, pricing.promotion_discount_money.cents,
+            pricing.loyalty_discount_money.cents, discounted.cents, tax.cents, shipping.cents,
+            (discounted + tax + shipping).cents)
+
+
+def batch_service(services: ServiceContainer) -> BatchPricingService:
+    return BatchPricingService(services.db, services.tax, services.shipping,  # type: ignore[arg-type]
+                               services.bulk_discounts)
+
+
+def breakdowns(prices: Any) -> List[Breakdown]:
+    return list(zip(
+        prices.subtotal.cents, prices.bulk_discount.cents, prices.membership_discount.cents,
+        prices.promotion_discount.cents, prices.loyalty_discount.cents, prices.discounted.cents,
+        prices.tax.cents, prices.shipping.cents, prices.total.cents
+    ))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--carts", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--scalar-sample", type=int, default=20_000)
+    args = parser.parse_args()
+
+    services = build_services()
+    quote_store = QuoteStore(services.db)  # type: ignore[arg-type]
+    batch_pricing = batch_service(services)
+
+    print(f"{'carts':>10} {'scalar us/cart':>15} {'batch us/cart':>14} {'speedup':>8}")
+    for count in args.carts:
+        carts, cart_customers, methods, codes = make_carts(count, services)
+
+        sample: int = min(count, args.scalar_sample)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            scalar: List[Breakdown] = [
+                price_scalar(services, quote_store, *cart)
+                for cart in zip(carts[:sample], cart_customers, methods, codes)
+            ]
+        scalar_per_cart: float = (time.perf_counter() - start) / sample
+
+        batch = CartBatch(carts)
+        start = time.perf_counter()
+        prices = batch_pricing.price(batch, cart_customers, methods, codes)
+        batch_per_cart: float = (time.perf_counter() - start) / count
+
+        if breakdowns(prices)[:sample] != scalar:
+            sys.exit(f"batch and scalar prices differ for {count:,} carts")
+        print(f"{count:>10,} {scalar_per_cart * 1e6:>15.2f} {batch_per_cart * 1e6:>14.2f} "
+              f"{scalar_per_cart / batch_per_cart:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: picking the bulk discount tier by filter-and-sort vs from a
+compiled BulkDiscountTable.
+
+For schedules of each size in `--tiers`, looks up the best tier for
+`--orders` item counts both ways: the filter, sort and first-element of
+what PricingService.apply_bulk_discount() used to run on every order,
+and a bisect over the table's compiled minimums. Both must pick the
+same rate for every order.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_bulk_discount_table --orders 200000 --tiers 3 12 48
+"""
+import argparse
+import random
+import sys
+import time
+from typing import Callable, List
+
+from submission.services.pricing.strategies.bulk_discount import BulkDiscount
+from submission.services.pricing.strategies.bulk_discount_table import BulkDiscountTable
+
+
+class Tier(BulkDiscount):
+    __slots__ = ()
+
+    def get_discount(self) -> float:
+        return self.discount
+
+    def get_min_quantity(self) -> int:
+        return self.min_quantity
+
+
+def make_tiers(count: int) -> List[BulkDiscount]:
+    """A zero tier and `count - 1` more, every 5 items, in no particular order."""
+    tiers: List[BulkDiscount] = [Tier(5 * i, i / 1000) for i in range(count)]
+    random.Random(3).shuffle(tiers)
+    return tiers
+
+
+def sorted_rate(strategies: List[BulkDiscount], total_items: int) -> float:
+    qualified = [strategy for strategy in strategies if total_items >= strategy.get_min_quantity()]
+    return sorted(qualified, key=lambda d: d.get_min_quantity(), reverse=True)[0].get_discount()
+
+
+def timed(fn: Callable[[int], float], counts: List[int]) -> float:
+    best: float = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for count in counts:
+            fn(count)
+        best = min(best, time.perf_counter() - start)
+    return best / len(counts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--tiers", type=int, nargs="+", default=[3, 12, 48])
+    args = parser.parse_args()
+
+    print(f"{'tiers':>6} {'sorted ns/order':>16} {'table ns/order':>15} {'speedup':>8}")
+    for tier_count in args.tiers:
+        strategies = make_tiers(tier_count)
+        rng = random.Random(9)
+        counts: List[int] = [rng.randrange(1, 5 * tier_count + 10) for _ in range(args.orders)]
+        schedule = BulkDiscountTable(strategies).current().schedule()
+
+        if [sorted_rate(strategies, count) for count in counts] != list(map(schedule.rate, counts)):
+            sys.exit(f"sorted and table rates differ for {tier_count} tiers")
+
+        sorted_time = timed(lambda count: sorted_rate(strategies, count), counts)
+        table_time = timed(schedule.rate, counts)
+        print(f"{tier_count:>6} {sorted_time * 1e9:>16.0f} {table_time * 1e9:>15.0f} "
+              f"{sorted_time / table_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark: catalog and customer loads, per-row add_* vs the bulk APIs.
+
+`--rows` products and as many customers are written to a CSV and an
+NDJSON file, then loaded into a fresh store four ways:
+
+  * per-row: the file is read with csv.DictReader and every row is
+    converted by hand and passed to add_product / add_customer.
+  * bulk csv / bulk ndjson: add_products_bulk / add_customers_bulk fed
+    straight from BulkRows.read_csv / read_ndjson.
+  * bulk rows: the same from rows already in memory (typed values), to
+    show the store's share of the bulk path without file parsing.
+
+Pass `--store sqlite` to load a SqliteDataStore instead; its per-row
+path commits once per row.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_bulk_load --rows 200000
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from submission.repositories.bulk.BulkRows import read_csv, read_ndjson
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface
+from submission.repositories.sqlite.SqliteDataStore import SqliteDataStore
+
+TIERS = ["bronze", "silver", "gold"]
+
+
+def product_rows(count: int) -> List[Dict[str, Any]]:
+    return [
+        {"product_id": f"P{i}", "name": f"Product {i}", "price": round(5 + i % 997 * 0.37, 2),
+         "quantity": i % 500, "category": f"cat{i % 50}", "weight": round(0.1 + i % 40 * 0.25, 2),
+         "supplier_id": f"S{i % 200}"}
+        for i in range(count)
+    ]
+
+
+def customer_rows(count: int) -> List[Dict[str, Any]]:
+    return [
+        {"customer_id": f"C{i}", "name": f"Customer {i}", "email": f"c{i}@example.com",
+         "tier": TIERS[i % 3], "phone": f"555-{i:07d}", "address": f"{i} Main St",
+         "loyalty_points": i % 1000}
+        for i in range(count)
+    ]
+
+
+def write_files(directory: str, table: str, rows: List[Dict[str, Any]]) -> Dict[str, str]:
+    csv_path = os.path.join(directory, f"{table}.csv")
+    with open(csv_path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    ndjson_path = os.path.join(directory, f"{table}.ndjson")
+    with open(ndjson_path, 'w', encoding='utf-8') as handle:
+        handle.writelines(json.dumps(row) + "\n" for row in rows)
+    return {"csv": csv_path, "ndjson": ndjson_path}
+
+
+def load_per_row(store: DataStoreInterface, products_csv: str, customers_csv: str) -> None:
+    with open(products_csv, newline='', encoding='utf-8') as handle:
+        for row in csv.DictReader(handle):
+            store.add_product(row["product_id"], row["name"], float(row["price"]), int(row["quantity"]),
+                              row["category"], float(row["weight"]), row["supplier_id"])
+    with open(customers_csv, newline='', encoding='utf-8') as handle:
+        for row in csv.DictReader(handle):
+            store.add_customer(row["customer_id"], row["name"], row["email"], row["tier"],
+                               row["phone"], row["address"], int(row["loyalty_points"]))
+
+
+def timed(make_store: Callable[[], DataStoreInterface], load: Callable[[DataStoreInterface], None]) -> float:
+    store = make_store()
+    started = time.perf_counter()
+    load(store)
+    elapsed = time.perf_counter() - started
+    if isinstance(store, SqliteDataStore):
+        store.close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000, help="products, and as many customers")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--store", choices=["memory", "sqlite"], default="memory")
+    args = parser.parse_args()
+
+    products, customers = product_rows(args.rows), customer_rows(args.rows)
+    with tempfile.TemporaryDirectory() as directory:
+        product_files = write_files(directory, "products", products)
+        customer_files = write_files(directory, "customers", customers)
+        runs = [0]
+
+        def make_store() -> DataStoreInterface:
+            if args.store == "sqlite":
+                runs[0] += 1
+                return SqliteDataStore(os.path.join(directory, f"bench-{runs[0]}.sqlite"))
+            return DataStore()
+
+        def bulk(products_source: Any, customers_source: Any) -> Callable[[DataStoreInterface], None]:
+            def load(store: DataStoreInterface) -> None:
+                store.add_products_bulk(products_source(), args.batch_size)
+                store.add_customers_bulk(customers_source(), args.batch_size)
+            return load
+
+        cases: Dict[str, Callable[[DataStoreInterface], None]] = {
+            "per-row": lambda store: load_per_row(store, product_files["csv"], customer_files["csv"]),
+            "bulk csv": bulk(lambda: read_csv(product_files["csv"]), lambda: read_csv(customer_files["csv"])),
+            "bulk ndjson": bulk(lambda: read_ndjson(product_files["ndjson"]),
+                                lambda: read_ndjson(customer_files["ndjson"])),
+            "bulk rows": bulk(lambda: products, lambda: customers),
+        }
+
+        total_rows = 2 * args.rows
+        print(f"{args.rows:,} products + {args.rows:,} customers into {args.store}")
+        print(f"{'path':>12} {'seconds':>8} {'rows/s':>10} {'speedup':>8}")
+        baseline = None
+        for name, load in cases.items():
+            elapsed = timed(make_store, load)
+            baseline = baseline or elapsed
+            print(f"{name:>12} {elapsed:8.2f} {total_rows / elapsed:10.0f} {baseline / elapsed:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
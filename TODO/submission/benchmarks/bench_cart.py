@@ -0,0 +1,110 @@
+"""
+Benchmark: repricing a long cart after every change, from scratch vs incrementally.
+
+Fills a cart with `--lines` lines from the batch benchmark's catalog,
+then makes `--changes` random edits (add a product, change a quantity,
+remove a line; now and then a new promo code), repricing after each.
+The from-scratch path is checkout's: PricingService.quote() over every
+line of the cart. The incremental path is Cart.add()/update()/remove()
+and Cart.price(). Every breakdown is checked to be the same.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_cart --lines 10 100 500
+"""
+import argparse
+import random
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from submission.application.main import ServiceContainer
+from submission.benchmarks.bench_batch_pricing import CODES, PRODUCTS, build_services
+from submission.domain.models.OrderLines import OrderLines
+from submission.domain.values.DiscountQuote import DiscountQuote
+from submission.services.pricing.Cart import Cart
+from submission.services.pricing.PricingService import PricingService
+
+# (what, product id, quantity); "code" edits set the product id as the promo code
+Edit = Tuple[str, Optional[str], int]
+
+
+def make_edits(product_ids: List[str], count: int, rng: random.Random) -> List[Edit]:
+    """`count` edits that keep the cart about the size it is, with a new promo code every 50."""
+    edits: List[Edit] = []
+    for i in range(count):
+        if i % 50 == 0:
+            edits.append(("code", rng.choice(CODES), 0))
+        elif i % 3 == 0:
+            edits.append(("update", rng.choice(product_ids), rng.randrange(1, 20)))
+        elif i % 3 == 1:
+            edits.append(("toggle", f"P{rng.randrange(PRODUCTS)}", 2))
+        else:
+            edits.append(("add", rng.choice(product_ids), 1))
+    return edits
+
+
+def apply(cart: Cart, edit: Edit) -> None:
+    what, product_id, quantity = edit
+    if what == "code":
+        cart.promotion_code = product_id
+    elif what == "update" and product_id in cart:
+        cart.update(product_id, quantity)  # type: ignore[arg-type]
+    elif what == "toggle" and product_id in cart:
+        cart.remove(product_id)  # type: ignore[arg-type]
+    else:
+        cart.add(product_id, quantity)  # type: ignore[arg-type]
+
+
+def filled_cart(services: ServiceContainer, product_ids: List[str], quantities: List[int]) -> Cart:
+    cart = Cart(services.db, services.db.get_customer("C0"), services.bulk_discounts, "ALL10")  # type: ignore[arg-type]
+    for product_id, quantity in zip(product_ids, quantities):
+        cart.add(product_id, quantity)
+    return cart
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--changes", type=int, default=2000)
+    args = parser.parse_args()
+
+    services = build_services(customer_count=4)
+    rng = random.Random(5)
+
+    print(f"{'lines':>6} {'rebuild us/change':>18} {'cart us/change':>15} {'speedup':>8}")
+    for line_count in args.lines:
+        product_ids: List[str] = [f"P{i}" for i in rng.sample(range(PRODUCTS), min(line_count, PRODUCTS))]
+        quantities: List[int] = [rng.randrange(1, 20) for _ in product_ids]
+        edits: List[Edit] = make_edits(product_ids, args.changes, rng)
+
+        # The cart after each edit, as checkout would hold it
+        cart: Cart = filled_cart(services, product_ids, quantities)
+        states: List[Tuple[OrderLines, Optional[str]]] = []
+        for edit in edits:
+            apply(cart, edit)
+            states.append((cart.lines(), cart.promotion_code))
+
+        start = time.perf_counter()
+        rebuilt: List[DiscountQuote] = [
+            PricingService.quote(lines, services.db, cart.customer, code, services.bulk_discounts)
+            for lines, code in states
+        ]
+        rebuild_per_change: float = (time.perf_counter() - start) / len(edits)
+
+        cart = filled_cart(services, product_ids, quantities)
+        cart.price()
+        incremental: List[DiscountQuote] = []
+        start = time.perf_counter()
+        for edit in edits:
+            apply(cart, edit)
+            incremental.append(cart.price())
+        cart_per_change: float = (time.perf_counter() - start) / len(edits)
+
+        if rebuilt != incremental:
+            sys.exit(f"incremental and rebuilt prices differ for {line_count:,} lines")
+        print(f"{line_count:>6,} {rebuild_per_change * 1e6:>18.2f} {cart_per_change * 1e6:>15.2f} "
+              f"{rebuild_per_change / cart_per_change:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark: order throughput against thread count on a thread-safe store.
+
+Each run seeds a fresh store (`DataStore(thread_safe=True)`, or a
+SqliteDataStore with `--store sqlite`) with `--products` products of
+limited stock, then places `--orders` orders through place_order_facade
+from a ThreadPoolExecutor of 1, 2, 4, ... threads.
+
+Pure-Python order placement holds the GIL, so threads only overlap
+while an order waits on I/O. `--payment-latency-ms` models that wait by
+sleeping inside payment validation, as a call to a payment gateway
+would. With the default 5 ms, throughput should grow with the thread
+count until the store's CPU work dominates.
+
+After every run the benchmark checks that order ids are unique, that
+no stock went negative, and that the stock taken equals the quantity
+in the successful orders (i.e. nothing was oversold). Service output is
+discarded while timing.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_concurrent_orders --threads 1 2 4 8
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from submission.application.main import ServiceContainer, place_order_facade
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface
+from submission.repositories.sqlite.SqliteDataStore import SqliteDataStore
+from submission.domain.models.Order import Order
+from submission.domain.models.Product import Product
+
+CUSTOMERS = 200
+PAYMENT: Dict[str, Any] = {"type": "credit_card", "card_number": "1234567812345678", "valid": True}
+
+
+def seed(store: DataStoreInterface, products: int, stock: int) -> None:
+    store.add_supplier("S1", "Supplier", "s1@example.com", 0.9)
+    for i in range(products):
+        store.add_product(f"P{i}", f"Product {i}", 10.0 + i, stock, f"cat{i % 10}", 1.0, "S1")
+    for i in range(CUSTOMERS):
+        store.add_customer(f"C{i}", f"Customer {i}", f"c{i}@example.com", "bronze", "", "", 0)
+
+
+def add_payment_latency(services: ServiceContainer, latency_s: float) -> None:
+    validate = services.payment.validate_payment
+
+    def slow_validate(payment_info: Dict[str, Any], total_amount: float) -> Tuple[bool, str]:
+        time.sleep(latency_s)
+        return validate(payment_info, total_amount)
+
+    services.payment.validate_payment = slow_validate  # type: ignore[method-assign]
+
+
+def place(services: ServiceContainer, i: int, products: int) -> Optional[Order]:
+    return place_order_facade(
+        services, f"C{i % CUSTOMERS}",
+        [{"product_id": f"P{i % products}", "quantity": 1 + i % 3}],
+        "standard", dict(PAYMENT, amount=1e9)
+    )
+
+
+def check(store: DataStoreInterface, placed: List[Optional[Order]], products: int, stock: int) -> str:
+    orders = [order for order in placed if order is not None]
+    ids = [order.order_id for order in orders]
+    if len(set(ids)) != len(ids):
+        return "DUPLICATE IDS"
+
+    sold = sum(item.quantity for order in orders for item in order.items)
+    remaining: List[int] = []
+    for i in range(products):
+        product: Optional[Product] = store.get_product(f"P{i}")
+        assert product is not None
+        remaining.append(product.quantity_available)
+    if min(remaining) < 0:
+        return "NEGATIVE STOCK"
+    if products * stock - sum(remaining) != sold:
+        return "OVERSOLD"
+    return "ok"
+
+
+def run(args: argparse.Namespace, threads: int, directory: str) -> Tuple[float, int, str]:
+    store: DataStoreInterface
+    if args.store == "sqlite":
+        store = SqliteDataStore(os.path.join(directory, f"bench-{threads}.sqlite"), readers=threads)
+    else:
+        store = DataStore(thread_safe=True)
+    seed(store, args.products, args.stock)
+    services = ServiceContainer.initialize(store)
+    add_payment_latency(services, args.payment_latency_ms / 1000)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            placed = list(pool.map(lambda i: place(services, i, args.products), range(args.orders)))
+        elapsed = time.perf_counter() - started
+
+    verdict = check(store, placed, args.products, args.stock)
+    if isinstance(store, SqliteDataStore):
+        store.close()
+    return args.orders / elapsed, sum(order is not None for order in placed), verdict
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--products", type=int, default=20)
+    parser.add_argument("--stock", type=int, default=150,
+                        help="units per product; keep it short of demand to exercise sell-outs")
+    parser.add_argument("--payment-latency-ms", type=float, default=5.0)
+    parser.add_argument("--store", choices=["memory", "sqlite"], default="memory")
+    args = parser.parse_args()
+
+    print(f"{'threads':>8} {'orders/s':>10} {'speedup':>8} {'placed':>8} {'check':>8}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as directory:
+        for threads in args.threads:
+            throughput, placed, verdict = run(args, threads, directory)
+            baseline = baseline or throughput
+            print(f"{threads:>8} {throughput:10.0f} {throughput / baseline:7.2f}x {placed:>8} {verdict:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Benchmark: integer product keys and interned strings on a large catalog.
+
+Bulk-loads N products into the in-memory DataStore from rows whose
+category and supplier strings are fresh objects each time, the way a
+CSV reader or a database driver hands them over. The store interns
+them and keeps its category, supplier and stock indexes as sets of
+dense integer keys. The same catalog is then indexed the old way,
+dicts keyed by product id and sets of id strings, with the rows' own
+strings kept per product, and both are measured with tracemalloc. The
+store also keeps an inventory log entry per product, which the old
+layout has no counterpart for, so that log is measured on its own and
+left out. Finally it times the lookups the services make on each layout.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_id_registry --products 1000000
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, TypeVar
+
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.repositories.in_memory.InventoryLog import InventoryLog
+from submission.domain.models.Product import Product
+
+CATEGORIES = 200
+SUPPLIERS = 500
+
+T = TypeVar('T')
+
+
+def product_rows(product_count: int) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(3)
+    for i in range(product_count):
+        yield {"product_id": f"P{i}", "name": f"Product {i}", "price": 10.0,
+               "quantity": rng.randrange(1000), "category": f"category-{i % CATEGORIES}",
+               "weight": 1.0, "supplier_id": f"supplier-{i % SUPPLIERS}"}
+
+
+class StringKeyedCatalog:
+    """The store's catalog indexes before integer keys, for comparison."""
+
+    def __init__(self) -> None:
+        self.products: Dict[str, Product] = {}
+        self.ids_by_category: Dict[str, Set[str]] = {}
+        self.ids_by_supplier: Dict[str, Set[str]] = {}
+        self.ids_by_quantity: Dict[int, Set[str]] = {}
+
+    def load(self, rows: Iterator[Dict[str, Any]]) -> None:
+        for row in rows:
+            product = Product(row["product_id"], row["name"], row["price"], row["quantity"],
+                              row["category"], row["weight"], row["supplier_id"])
+            self.products[product.product_id] = product
+            self.ids_by_category.setdefault(product.category, set()).add(product.product_id)
+            self.ids_by_supplier.setdefault(product.supplier_id, set()).add(product.product_id)
+            self.ids_by_quantity.setdefault(product.quantity_available, set()).add(product.product_id)
+
+    def get_product(self, product_id: str) -> Optional[Product]:
+        return self.products.get(product_id)
+
+    def get_product_ids_by_category(self, category: str) -> Set[str]:
+        return self.ids_by_category.get(category, set())
+
+    def get_products_by_category(self, category: str) -> List[Product]:
+        return [self.products[product_id] for product_id in self.ids_by_category.get(category, ())]
+
+    def get_products_at_or_below(self, quantity: int) -> List[Product]:
+        return [self.products[product_id]
+                for level in sorted(self.ids_by_quantity) if level <= quantity
+                for product_id in self.ids_by_quantity[level]]
+
+
+def measure(build: Callable[[], T]) -> Tuple[T, int, float]:
+    """Builds the catalog under tracemalloc; returns it, its retained bytes and the load time."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    catalog = build()
+    elapsed = time.perf_counter() - start
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return catalog, retained, elapsed
+
+
+def time_call(fn: Callable[[], object], repeat: int) -> float:
+    """Returns the best-of-`repeat` wall time in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    def build_store() -> DataStore:
+        store = DataStore()
+        store.add_products_bulk(product_rows(args.products))
+        return store
+
+    def build_baseline() -> StringKeyedCatalog:
+        catalog = StringKeyedCatalog()
+        catalog.load(product_rows(args.products))
+        return catalog
+
+    def build_log() -> InventoryLog:
+        log = InventoryLog()
+        log.extend([f"P{i}" for i in range(args.products)], [0] * args.products, "initial_stock")
+        return log
+
+    print(f"Loading {args.products:,} products into each layout...")
+    baseline, baseline_bytes, baseline_load = measure(build_baseline)
+    store, store_bytes, store_load = measure(build_store)
+    _log, log_bytes, _log_load = measure(build_log)
+    del _log
+    store_bytes -= log_bytes
+    print(f"{'layout':>14} {'load (s)':>10} {'MiB':>10} {'bytes/product':>15}")
+    for name, retained, load in (("string keys", baseline_bytes, baseline_load),
+                                 ("integer keys", store_bytes, store_load)):
+        print(f"{name:>14} {load:>10.2f} {retained / 2**20:>10.1f} {retained / args.products:>15.0f}")
+    print(f"  (store figures leave out its inventory log, {log_bytes / 2**20:.1f} MiB)")
+
+    rng = random.Random(13)
+    probe_ids = [f"P{rng.randrange(args.products)}" for _ in range(args.lookups)]
+    categories = [f"category-{rng.randrange(CATEGORIES)}" for _ in range(args.lookups)]
+    store_category_ids = store.get_product_ids_by_category("category-7")
+    baseline_category_ids = baseline.get_product_ids_by_category("category-7")
+
+    cases = [
+        ("get_product", args.lookups,
+         lambda: [store.get_product(product_id) for product_id in probe_ids],
+         lambda: [baseline.get_product(product_id) for product_id in probe_ids]),
+        ("id in category", args.lookups,
+         lambda: [product_id in store_category_ids for product_id in probe_ids],
+         lambda: [product_id in baseline_category_ids for product_id in probe_ids]),
+        ("category ids", len(categories) // 100,
+         lambda: [store.get_product_ids_by_category(c) for c in categories[:len(categories) // 100]],
+         lambda: [baseline.get_product_ids_by_category(c) for c in categories[:len(categories) // 100]]),
+        ("category products", 20,
+         lambda: [store.get_products_by_category(c) for c in categories[:20]],
+         lambda: [baseline.get_products_by_category(c) for c in categories[:20]]),
+        ("at or below 5", 1,
+         lambda: store.get_products_at_or_below(5),
+         lambda: baseline.get_products_at_or_below(5)),
+    ]
+    print(f"\n{'lookup':>18} {'calls':>8} {'string (us/call)':>17} {'integer (us/call)':>18}")
+    for name, calls, integer_keyed, string_keyed in cases:
+        string_us = time_call(string_keyed, args.repeat) / calls
+        integer_us = time_call(integer_keyed, args.repeat) / calls
+        print(f"{name:>18} {calls:>8,} {string_us:>17.3f} {integer_us:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: memory of the columnar InventoryLog vs the old list of dicts.
+
+The columnar log is measured at the full `--entries` size. The old
+list-of-dicts layout needs several GB at 10M entries, so it is measured
+on `--dict-sample` entries and scaled linearly (every entry in that
+layout is an independent dict + datetime + string, so the cost per
+entry is constant).
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_inventory_log_memory --entries 10000000
+"""
+import argparse
+import datetime
+import gc
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from submission.repositories.in_memory.InventoryLog import InventoryLog
+
+REASONS = ["order_{}", "order_{}", "order_{}", "cancel_order_{}", "restock"]
+
+
+def reason_for(i: int) -> str:
+    return REASONS[i % len(REASONS)].format(i // 3)
+
+
+def fill_columnar(count: int, products: int) -> InventoryLog:
+    log = InventoryLog()
+    for i in range(count):
+        log.append(f"P{i % products}", -1 - i % 5, reason_for(i))
+    return log
+
+
+def fill_dicts(count: int, products: int) -> List[Dict[str, Any]]:
+    """The pre-change layout of DataStore.inventory_logs."""
+    product_ids = [f"P{i}" for i in range(products)]
+    logs: List[Dict[str, Any]] = []
+    for i in range(count):
+        logs.append({
+            'product_id': product_ids[i % products],
+            'quantity_change': -1 - i % 5,
+            'reason': reason_for(i),
+            'timestamp': datetime.datetime.now()
+        })
+    return logs
+
+
+def traced_bytes(builder: Any, *args: Any) -> int:
+    gc.collect()
+    tracemalloc.start()
+    kept = builder(*args)
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=10_000_000)
+    parser.add_argument("--dict-sample", type=int, default=1_000_000)
+    parser.add_argument("--products", type=int, default=100_000)
+    args = parser.parse_args()
+
+    sample = min(args.dict_sample, args.entries)
+    dict_bytes = traced_bytes(fill_dicts, sample, args.products)
+    dict_per_entry = dict_bytes / sample
+
+    started = time.perf_counter()
+    columnar_bytes = traced_bytes(fill_columnar, args.entries, args.products)
+    elapsed = time.perf_counter() - started
+    columnar_per_entry = columnar_bytes / args.entries
+
+    print(f"entries                  : {args.entries:,}")
+    print(f"list of dicts            : {dict_per_entry:8.1f} B/entry"
+          f"  -> {dict_per_entry * args.entries / 2**20:10,.0f} MiB"
+          f"{' (scaled from ' + format(sample, ',') + ')' if sample < args.entries else ''}")
+    print(f"columnar InventoryLog    : {columnar_per_entry:8.1f} B/entry"
+          f"  -> {columnar_bytes / 2**20:10,.0f} MiB (measured, filled in {elapsed:.1f}s)")
+    print(f"reduction                : {dict_per_entry / columnar_per_entry:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark: append and replay throughput of the on-disk InventoryJournal.
+
+Writes `--records` stock movements spread over `--products` products
+into a fresh journal directory (rotating segments at `--segment-mb`),
+then reopens it and rebuilds every product's stock level by replay.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_journal_replay --records 5000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from submission.repositories.journal.InventoryJournal import InventoryJournal
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=5_000_000)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--segment-mb", type=int, default=64)
+    parser.add_argument("--directory", default=None, help="defaults to a temporary directory")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.directory or os.path.join(tmp, "journal")
+        journal = InventoryJournal(directory, segment_size=args.segment_mb * 1024 * 1024)
+
+        product_ids = [f"P{i}" for i in range(args.products)]
+        now = time.time()
+        started = time.perf_counter()
+        for i in range(args.records):
+            journal.append(product_ids[i % args.products], -1, f"order_{i}", now)
+        journal.flush()
+        append_seconds = time.perf_counter() - started
+        segments = len(journal.segment_paths)
+        journal.close()
+
+        started = time.perf_counter()
+        reopened = InventoryJournal(directory, segment_size=args.segment_mb * 1024 * 1024)
+        stock = reopened.replay()
+        replay_seconds = time.perf_counter() - started
+        reopened.close()
+
+    print(f"records           : {args.records:,} in {segments} segment(s)")
+    print(f"append            : {append_seconds:6.2f}s ({args.records / append_seconds:,.0f} records/s)")
+    print(f"open + replay     : {replay_seconds:6.2f}s ({args.records / replay_seconds:,.0f} records/s)")
+    print(f"products restored : {len(stock):,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: low-stock queries and checks on a large catalog.
+
+Bulk-loads N products with stock spread over 0..999, then times
+`get_low_stock_products` from the stock index against the old scan of
+`DataStore.products` for thresholds that match more and more of the
+catalog. Index lookups should scale with the number of matches, not
+with N. It also times the old per-order check (re-reading every item
+after the deduction) against deductions with the store's low-stock
+listener doing the same job.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_low_stock --products 300000
+"""
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.domain.models.OrderItem import OrderItem
+from submission.domain.models.Product import Product
+from submission.services.inventory_service import InventoryService, LOW_STOCK_THRESHOLD
+from submission.services.supplier_service import SupplierInterface
+
+
+class CountingSupplier(SupplierInterface):
+    """Stands in for SupplierService without printing."""
+
+    def __init__(self) -> None:
+        self.reorders: int = 0
+
+    def notify_supplier_reorder(self, product: Product) -> None:
+        self.reorders += 1
+
+
+def build_store(product_count: int) -> DataStore:
+    rng = random.Random(7)
+    store = DataStore()
+    store.add_products_bulk(
+        {"product_id": f"P{i}", "name": f"Product {i}", "price": 10.0,
+         "quantity": rng.randrange(1000), "category": f"cat{i % 50}",
+         "weight": 1.0, "supplier_id": f"S{i % 20}"}
+        for i in range(product_count)
+    )
+    return store
+
+
+def time_call(fn: Callable[[], object], repeat: int) -> float:
+    """Returns the best-of-`repeat` wall time in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=300_000)
+    parser.add_argument("--orders", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Bulk-loading {args.products:,} products...")
+    store = build_store(args.products)
+    supplier = CountingSupplier()
+    inventory = InventoryService(store, supplier)
+
+    def linear_scan(threshold: int) -> List[Product]:
+        return [p for p in store.products.values() if p.quantity_available <= threshold]
+
+    print(f"\n{'threshold':>10} {'matches':>10} {'index (us)':>12} {'scan (us)':>12}")
+    for threshold in (0, 5, 50, 500):
+        matches = len(inventory.get_low_stock_products(threshold))
+        indexed = time_call(lambda: inventory.get_low_stock_products(threshold), args.repeat)
+        scanned = time_call(lambda: linear_scan(threshold), args.repeat)
+        print(f"{threshold:>10} {matches:>10,} {indexed:>12.1f} {scanned:>12.0f}")
+
+    rng = random.Random(11)
+    baskets = [
+        [OrderItem(f"P{rng.randrange(args.products)}", 1, 10.0) for _ in range(3)]
+        for _ in range(args.orders)
+    ]
+
+    start = time.perf_counter()
+    for basket in baskets:
+        store.deduct_stock(basket, "bench")
+        inventory.check_and_notify_low_stock(basket)
+    polled = time.perf_counter() - start
+    polled_reorders, supplier.reorders = supplier.reorders, 0
+
+    store.add_low_stock_listener(inventory.handle_low_stock_event, below=LOW_STOCK_THRESHOLD)
+    start = time.perf_counter()
+    for basket in baskets:
+        store.deduct_stock(basket, "bench")
+    evented = time.perf_counter() - start
+
+    print(f"\n{args.orders:,} orders of 3 items:")
+    print(f"  deduct + re-read check: {polled / args.orders * 1e6:7.2f} us/order, {polled_reorders:,} reorder alerts")
+    print(f"  deduct + listener:      {evented / args.orders * 1e6:7.2f} us/order, {supplier.reorders:,} reorder alerts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: bytes per domain model instance, with regression budgets.
+
+Builds `--count` instances of each model under tracemalloc and reports
+what each one keeps alive. Field values (ids, names, dates, ...) are
+made before tracing starts, so the figures are the models' own cost:
+the instance, its attribute storage and anything the constructor
+builds (a customer's order history, an order's line columns). Customers get `--history` order ids each, made per
+customer as they would be by placing orders, and orders get two
+items, which are counted with the order.
+
+BUDGETS holds the ceiling for each model. With --check the run fails
+if a model goes over, and test_model_memory runs the same check on a
+smaller count with the test suite.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_model_memory --count 1000000 --check
+"""
+import argparse
+import datetime
+import gc
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from submission.domain.models.Customer import Customer
+from submission.domain.models.Order import Order
+from submission.domain.models.OrderItem import OrderItem
+from submission.domain.models.Product import Product
+from submission.domain.models.Promotion import Promotion
+from submission.domain.models.Shipment import Shipment
+from submission.domain.models.Supplier import Supplier
+from submission.domain.enums.order_status import OrderStatus
+
+# Bytes per instance, measured with CPython 3.11 on 64-bit Linux plus
+# some headroom
+BUDGETS: Dict[str, int] = {
+    'Product': 110,
+    'Customer': 260,
+    'Supplier': 80,
+    'Promotion': 100,
+    'OrderItem': 70,
+    'Order': 560,  # three array headers for the line columns
+    'Shipment': 80,
+}
+
+HISTORY = 5
+
+
+def builders(count: int, history: int) -> Dict[str, Callable[[], List[Any]]]:
+    """One builder per model, each closing over field values made up front."""
+    ids: List[str] = [f"ID{i}" for i in range(count)]
+    numbers: List[int] = list(range(1_000_000, 1_000_000 + count))
+    now = datetime.datetime(2024, 1, 1)
+
+    def customers() -> List[Customer]:
+        built: List[Customer] = []
+        for n, customer_id in zip(numbers, ids):
+            customer = Customer(customer_id, "Name", "a@example.com", "gold", "555", "Street", 10)
+            for order_id in range(n * history, n * history + history):
+                customer.order_history.append(order_id)
+            built.append(customer)
+        return built
+
+    def orders() -> List[Order]:
+        return [
+            Order(n, customer_id, [OrderItem("P1", 1, 9.99), OrderItem("P2", 3, 4.5)],
+                  OrderStatus.PENDING, now, 23.49, 5.0)
+            for n, customer_id in zip(numbers, ids)
+        ]
+
+    return {
+        'Product': lambda: [Product(i, "Name", 9.99, 10, "Elec", 1.0, "S1") for i in ids],
+        'Customer': customers,
+        'Supplier': lambda: [Supplier(i, "Name", "a@example.com", 0.9) for i in ids],
+        'Promotion': lambda: [Promotion(i, "CODE", 10.0, 50.0, now, "all") for i in ids],
+        'OrderItem': lambda: [OrderItem(i, 1, 9.99) for i in ids],
+        'Order': orders,
+        'Shipment': lambda: [Shipment(n, n, i, now) for n, i in zip(numbers, ids)],
+    }
+
+
+def bytes_per_entity(count: int, history: int = HISTORY) -> Dict[str, float]:
+    """Traced bytes per instance of each model, the list holding them left out."""
+    measured: Dict[str, float] = {}
+    for name, build in builders(count, history).items():
+        gc.collect()
+        tracemalloc.start()
+        kept = build()
+        current, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        measured[name] = (current - sys.getsizeof(kept)) / count
+        del kept
+    return measured
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--history", type=int, default=HISTORY)
+    parser.add_argument("--check", action="store_true", help="fail if a model is over its budget")
+    args = parser.parse_args()
+
+    measured = bytes_per_entity(args.count, args.history)
+    print(f"{'model':>10} {'B/instance':>11} {'budget':>7} {'MiB':>10}")
+    over: List[str] = []
+    for name, per_entity in measured.items():
+        flag: str = ""
+        if per_entity > BUDGETS[name]:
+            over.append(name)
+            flag = "  OVER BUDGET"
+        print(f"{name:>10} {per_entity:>11.1f} {BUDGETS[name]:>7} "
+              f"{per_entity * args.count / 2**20:>10,.1f}{flag}")
+    if args.check and over:
+        sys.exit(f"over budget: {', '.join(over)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: float vs Decimal vs Money (integer cents) for pricing sums.
+
+Prices `--orders` orders of three lines each the way checkout does,
+line totals, a 15% discount and 7.25% tax, and then adds every order
+total up for a sales report. Each representation does the same work:
+
+  * float: what pricing used before; nothing is rounded until the end
+  * Decimal: quantized to the cent after the discount and the tax
+  * Money: integer cents, rounded by scale() after the discount and tax
+  * MoneyArray: the same cents as int64 arrays, one column per stage
+
+The report prints the time per order and the final total. The float
+total drifts from the exact ones; Decimal, Money and MoneyArray agree
+to the cent.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_money --orders 1000000
+"""
+import argparse
+import random
+import time
+from decimal import Decimal, ROUND_HALF_EVEN, ROUND_HALF_UP
+from typing import Any, Callable, List, Tuple
+
+from submission.domain.enums.rounding_mode import RoundingMode
+from submission.domain.values.Money import Money, MoneyArray
+
+DISCOUNT = 0.15
+TAX = 0.0725
+LINES = 3
+CENT = Decimal("0.01")
+
+
+def make_orders(count: int) -> Tuple[List[float], List[int]]:
+    """Flat unit prices and quantities, LINES per order."""
+    rng = random.Random(1)
+    prices = [rng.randrange(100, 100_000) / 100 for _ in range(count * LINES)]
+    quantities = [rng.randrange(1, 6) for _ in range(count * LINES)]
+    return prices, quantities
+
+
+def price_floats(prices: List[float], quantities: List[int]) -> float:
+    total = 0.0
+    for start in range(0, len(prices), LINES):
+        subtotal = 0.0
+        for i in range(start, start + LINES):
+            subtotal += prices[i] * quantities[i]
+        discounted = subtotal - subtotal * DISCOUNT
+        total += discounted + discounted * TAX
+    return total
+
+
+def price_decimals(prices: List[float], quantities: List[int]) -> Decimal:
+    discount, tax = Decimal(repr(DISCOUNT)), Decimal(repr(TAX))
+    unit = [Decimal(repr(price)) for price in prices]
+    total = Decimal(0)
+    for start in range(0, len(prices), LINES):
+        subtotal = Decimal(0)
+        for i in range(start, start + LINES):
+            subtotal += unit[i] * quantities[i]
+        discounted = subtotal - (subtotal * discount).quantize(CENT, ROUND_HALF_EVEN)
+        total += discounted + (discounted * tax).quantize(CENT, ROUND_HALF_UP)
+    return total
+
+
+def price_money(prices: List[float], quantities: List[int]) -> Money:
+    unit = [Money.from_float(price) for price in prices]
+    total = Money(0)
+    for start in range(0, len(prices), LINES):
+        subtotal = Money(0)
+        for i in range(start, start + LINES):
+            subtotal += unit[i] * quantities[i]
+        discounted = subtotal - subtotal.scale(DISCOUNT, RoundingMode.HALF_EVEN)
+        total += discounted + discounted.scale(TAX, RoundingMode.HALF_UP)
+    return total
+
+
+def price_money_arrays(prices: List[float], quantities: List[int]) -> Money:
+    lines = MoneyArray.from_floats(prices).times(quantities).cents
+    subtotals = MoneyArray([sum(lines[i:i + LINES]) for i in range(0, len(lines), LINES)])
+    discounted = subtotals - subtotals.scale(DISCOUNT, RoundingMode.HALF_EVEN)
+    return (discounted + discounted.scale(TAX, RoundingMode.HALF_UP)).total()
+
+
+def timed(fn: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    prices, quantities = make_orders(args.orders)
+    print(f"{args.orders:,} orders of {LINES} lines\n")
+    print(f"{'representation':>15} {'us/order':>10} {'total':>22}")
+    for name, fn in (("float", price_floats), ("Decimal", price_decimals),
+                     ("Money", price_money), ("MoneyArray", price_money_arrays)):
+        total, elapsed = timed(fn, prices, quantities)
+        print(f"{name:>15} {elapsed / args.orders * 1e6:>10.2f} {total!s:>22}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: resident order memory and lookup cost with an OrderArchive.
+
+A store is filled with `--orders` orders spread evenly over the last
+two years (one to three items each; 95% delivered or cancelled) for
+`--customers` customers. Memory held by the store is measured with
+tracemalloc, then DataStore.archive_orders() moves the finished orders
+older than `--max-age-days` into compressed segments and it is
+measured again. (The archive pass runs under tracemalloc, so its time
+is several times what it is without.)
+
+Lookups are then timed on the tiered store: get_order on resident
+orders, on archived orders (random ids, mostly cache misses), and
+get_orders_by_customer for random customers, whose history is mostly
+archived.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_order_archive --orders 200000
+"""
+import argparse
+import datetime
+import gc
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List
+
+from submission.repositories.archive.OrderArchive import OrderArchive
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.domain.models.Order import Order
+from submission.domain.models.OrderItem import OrderItem
+from submission.domain.enums.order_status import OrderStatus
+
+STATUSES = [OrderStatus.DELIVERED] * 18 + [OrderStatus.CANCELLED, OrderStatus.PENDING]
+
+
+def fill(store: DataStore, orders: int, customers: int, now: datetime.datetime) -> None:
+    start = now - datetime.timedelta(days=730)
+    step = datetime.timedelta(days=730) / orders
+    for order_id in range(1, orders + 1):
+        items = [OrderItem(f"P{(order_id + n) % 500}", 1 + n, 10.0 + n) for n in range(1 + order_id % 3)]
+        store.add_order(Order(
+            order_id, f"C{order_id % customers}", items, STATUSES[order_id % len(STATUSES)],
+            start + step * order_id, 25.0 + order_id % 100, 4.0
+        ))
+
+
+def traced_mib() -> float:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] / 2**20
+
+
+def per_call_us(calls: int, action: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        action()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--customers", type=int, default=10_000)
+    parser.add_argument("--max-age-days", type=int, default=90)
+    parser.add_argument("--block-size", type=int, default=256)
+    parser.add_argument("--lookups", type=int, default=5_000)
+    args = parser.parse_args()
+
+    now = datetime.datetime(2025, 1, 1)
+    with tempfile.TemporaryDirectory() as directory:
+        archive = OrderArchive(
+            os.path.join(directory, "archive"),
+            max_age=datetime.timedelta(days=args.max_age_days), block_size=args.block_size
+        )
+        tracemalloc.start()
+        baseline = traced_mib()
+        store = DataStore(archive=archive)
+        fill(store, args.orders, args.customers, now)
+        before = traced_mib() - baseline
+
+        started = time.perf_counter()
+        moved = store.archive_orders(now=now)
+        archive_seconds = time.perf_counter() - started
+        after = traced_mib() - baseline
+        tracemalloc.stop()
+
+        on_disk = sum(os.path.getsize(os.path.join(archive.directory, name)) for name in os.listdir(archive.directory))
+        print(f"{args.orders:,} orders, {moved:,} archived in {archive_seconds:.2f}s "
+              f"({on_disk / 2**20:.1f} MiB on disk)")
+        print(f"resident memory: {before:8.1f} MiB -> {after:8.1f} MiB ({before / after:.1f}x less)")
+
+        rng = random.Random(7)
+        resident: List[int] = list(dict(store.orders))
+        archived_ids: List[int] = [order_id for order_id in range(1, args.orders + 1)
+                                   if not store._is_resident(order_id)]
+        print(f"{'lookup':>28} {'us/call':>10}")
+        for label, action in [
+            ("get_order (resident)", lambda: store.get_order(rng.choice(resident))),
+            ("get_order (archived)", lambda: store.get_order(rng.choice(archived_ids))),
+            ("get_orders_by_customer", lambda: store.get_orders_by_customer(f"C{rng.randrange(args.customers)}")),
+        ]:
+            print(f"{label:>28} {per_call_us(args.lookups, action):10.1f}")
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: order lines as OrderItem objects vs as columns (OrderLines).
+
+For orders of each size in `--lines`, builds `--orders` orders both ways
+and compares what the services compute per order: the subtotal in
+cents, the item count and the shipping weight. The object loops are
+the ones pricing and the checkout facade used to run over a list of
+OrderItem; the column versions are OrderLines' reductions. Memory per
+order is measured with tracemalloc on the same orders, product ids left
+out as both layouts share them.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_order_lines --orders 20000 --lines 2 10 100
+"""
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from submission.domain.models.OrderItem import OrderItem
+from submission.domain.models.OrderLines import OrderLines
+from submission.domain.values.Money import Money
+
+PRODUCTS = 1000
+
+
+def make_items(orders: int, lines: int) -> List[List[OrderItem]]:
+    rng = random.Random(5)
+    return [
+        [OrderItem(f"P{rng.randrange(PRODUCTS)}", rng.randrange(1, 6), rng.randrange(100, 100_000) / 100)
+         for _ in range(lines)]
+        for _ in range(orders)
+    ]
+
+
+# --- Per-order work, the old way and the column way ---
+
+def objects_work(items: List[OrderItem], weight_of: Callable[[str], float]) -> Tuple[int, int, float]:
+    cents: int = 0
+    count: int = 0
+    weight: float = 0.0
+    for item in items:
+        cents += Money.from_float(item.unit_price).cents * item.quantity
+        count += item.quantity
+        weight += weight_of(item.product_id) * item.quantity
+    return cents, count, weight
+
+
+def columns_work(lines: OrderLines, weight_of: Callable[[str], float]) -> Tuple[int, int, float]:
+    return lines.subtotal().cents, lines.item_count(), lines.total_weight(weight_of)
+
+
+def timed(fn: Callable[[Any, Callable[[str], float]], Tuple[int, int, float]],
+          orders: List[Any], weight_of: Callable[[str], float]) -> Tuple[List[Tuple[int, int, float]], float]:
+    best: float = float("inf")
+    results: List[Tuple[int, int, float]] = []
+    for _ in range(3):
+        start = time.perf_counter()
+        results = [fn(order, weight_of) for order in orders]
+        best = min(best, time.perf_counter() - start)
+    return results, best
+
+
+def bytes_per_order(build: Callable[[], List[Any]]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (current - sys.getsizeof(kept)) / len(kept)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=20_000)
+    parser.add_argument("--lines", type=int, nargs="+", default=[2, 10, 100])
+    args = parser.parse_args()
+
+    weights: Dict[str, float] = {f"P{i}": 0.1 + i % 50 / 10 for i in range(PRODUCTS)}
+    weight_of = weights.__getitem__
+
+    print(f"{args.orders:,} orders per size\n")
+    print(f"{'lines':>6} {'objects us':>11} {'columns us':>11} {'speedup':>8} "
+          f"{'objects B':>10} {'columns B':>10}")
+    for line_count in args.lines:
+        items = make_items(args.orders, line_count)
+        lines = [OrderLines(order) for order in items]
+        old, old_time = timed(objects_work, items, weight_of)
+        new, new_time = timed(columns_work, lines, weight_of)
+        if old != new:
+            sys.exit(f"results differ for {line_count}-line orders")
+
+        # Memory: the ids are shared by both; an item's price is its own float
+        old_bytes = bytes_per_order(lambda: [
+            [OrderItem(item.product_id, item.quantity, item.unit_price + 0.0) for item in order] for order in items
+        ])
+        new_bytes = bytes_per_order(lambda: [OrderLines(order) for order in items])
+        print(f"{line_count:>6} {old_time / args.orders * 1e6:>11.2f} {new_time / args.orders * 1e6:>11.2f} "
+              f"{old_time / new_time:>7.1f}x {old_bytes:>10.0f} {new_bytes:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: finding the best promotion for a cart by trying every code
+vs with PromotionEngine.
+
+Adds `--promotions` promotions (a tenth store wide, the rest spread over
+the catalog's categories, with assorted minimum purchases and a few
+expired) and builds carts of one to six lines. The scan checks each
+promotion the way apply_promotion_discount() checks a code: expiry,
+minimum purchase, then the category against the cart's product ids.
+The engine looks up the cart's categories. Both must pick a promotion
+with the same discount for every cart.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_promotion_engine --carts 2000 --promotions 100 1000 10000
+"""
+import argparse
+import datetime
+import random
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from submission.domain.models.Promotion import Promotion
+from submission.domain.values.Money import Money
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.services.pricing.PromotionEngine import PromotionEngine
+
+PRODUCTS = 2000
+CATEGORIES = 200
+
+# product ids and amount
+Cart = Tuple[List[str], Money]
+
+
+def build_store(promotions: int) -> DataStore:
+    rng = random.Random(13)
+    store = DataStore()
+    for i in range(PRODUCTS):
+        store.add_product(f"P{i}", f"Product {i}", 10.0, 100, f"category-{i % CATEGORIES}", 1.0, "S1")
+    now = datetime.datetime.now()
+    for i in range(promotions):
+        category = "all" if i % 10 == 0 else f"category-{rng.randrange(CATEGORIES)}"
+        days = rng.choice([-2, 30, 60, 90])
+        store.add_promotion(f"PR{i}", f"CODE{i}", rng.randrange(1, 40) + 0.5 * (i % 2),
+                            rng.choice([0, 50, 100, 250, 1000]), now + datetime.timedelta(days=days), category)
+    return store
+
+
+def make_carts(count: int) -> List[Cart]:
+    rng = random.Random(17)
+    return [([f"P{rng.randrange(PRODUCTS)}" for _ in range(rng.randrange(1, 7))], Money(rng.randrange(1_000, 200_000)))
+            for _ in range(count)]
+
+
+def scan_best(store: DataStore, product_ids: List[str], amount: Money, now: datetime.datetime) -> Optional[float]:
+    best: Optional[float] = None
+    for promo in store.promotions.values():
+        if now >= promo.valid_until or amount < Money.from_float(promo.min_purchase):
+            continue
+        if promo.category != "all":
+            category_ids = store.get_product_ids_by_category(promo.category)
+            if not any(product_id in category_ids for product_id in product_ids):
+                continue
+        if best is None or promo.discount_percent > best:
+            best = promo.discount_percent
+    return best
+
+
+def engine_best(store: DataStore, engine: PromotionEngine, product_ids: List[str], amount: Money,
+                now: datetime.datetime) -> Optional[float]:
+    categories = {store.products[product_id].category for product_id in product_ids}
+    promo: Optional[Promotion] = engine.best(categories, amount, now)
+    return promo.discount_percent if promo else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--carts", type=int, default=2000)
+    parser.add_argument("--promotions", type=int, nargs="+", default=[100, 1000, 10_000])
+    args = parser.parse_args()
+
+    carts = make_carts(args.carts)
+    print(f"{'promotions':>11} {'scan us/cart':>13} {'engine us/cart':>15} {'speedup':>8}")
+    for count in args.promotions:
+        store = build_store(count)
+        now = datetime.datetime.now()
+        engine = PromotionEngine.from_store(store)
+
+        start = time.perf_counter()
+        scanned = [scan_best(store, ids, amount, now) for ids, amount in carts]
+        scan_time = (time.perf_counter() - start) / len(carts)
+
+        start = time.perf_counter()
+        indexed = [engine_best(store, engine, ids, amount, now) for ids, amount in carts]
+        engine_time = (time.perf_counter() - start) / len(carts)
+
+        if scanned != indexed:
+            sys.exit(f"scan and engine disagree with {count:,} promotions")
+        print(f"{count:>11,} {scan_time * 1e6:>13.1f} {engine_time * 1e6:>15.1f} {scan_time / engine_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
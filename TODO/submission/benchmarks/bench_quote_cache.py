@@ -0,0 +1,81 @@
+"""
+Benchmark: checkout reloads quoted from scratch vs through QuoteCache.
+
+Takes the batch pricing benchmark's catalog, customers and promotions
+and `--carts` carts, and requests every cart `--reloads` times in a
+shuffled stream, as shoppers reloading checkout would. Every
+`--update-every` requests a product price changes through
+ProductService, which drops the cached quotes of carts holding that
+product. Each request is answered by pricing the cart from scratch and
+by the container's QuoteCache (capacity `--capacity`); the answers must
+match.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_quote_cache --carts 2000 --reloads 5 --capacity 1000 5000
+"""
+import argparse
+import contextlib
+import io
+import random
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from submission.benchmarks.bench_batch_pricing import PRODUCTS, build_services, make_carts
+from submission.domain.models.Customer import Customer
+from submission.domain.models.OrderLines import OrderLines
+from submission.domain.values.PriceQuote import PriceQuote
+from submission.services.pricing.BatchPricingService import BatchPricingService
+from submission.services.pricing.QuoteCache import QuoteCache
+
+Request = Tuple[OrderLines, Customer, str, Optional[str]]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--carts", type=int, default=2000)
+    parser.add_argument("--reloads", type=int, default=5)
+    parser.add_argument("--update-every", type=int, default=50)
+    parser.add_argument("--capacity", type=int, nargs="+", default=[1000, 5000])
+    args = parser.parse_args()
+
+    print(f"{'capacity':>9} {'uncached us/req':>16} {'cached us/req':>14} {'speedup':>8} "
+          f"{'hit ratio':>10} {'evictions':>10} {'invalidated':>12}")
+    for capacity in args.capacity:
+        services = build_services()
+        carts, customers, methods, codes = make_carts(args.carts, services)
+        requests: List[Request] = list(zip(carts, customers, methods, codes)) * args.reloads
+        rng = random.Random(23)
+        rng.shuffle(requests)
+        price_changes = [(f"P{rng.randrange(PRODUCTS)}", rng.randrange(99, 30_000) / 100)
+                         for _ in range(len(requests) // args.update_every + 1)]
+
+        pricing: BatchPricingService = BatchPricingService(
+            services.db, services.tax, services.shipping, services.bulk_discounts  # type: ignore[arg-type]
+        )
+        cache = QuoteCache(services.db, services.tax, pricing.quote, capacity)
+
+        uncached: List[PriceQuote] = []
+        cached: List[PriceQuote] = []
+        uncached_time = cached_time = 0.0
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i, (lines, customer, method, code) in enumerate(requests):
+                if i % args.update_every == 0:
+                    services.product.update_product_price(*price_changes[i // args.update_every])
+                start = time.perf_counter()
+                uncached.append(pricing.quote(lines, customer, method, code))
+                middle = time.perf_counter()
+                cached.append(cache.quote(lines, customer, method, code))
+                cached_time += time.perf_counter() - middle
+                uncached_time += middle - start
+
+        if cached != uncached:
+            sys.exit(f"cached and uncached quotes differ at capacity {capacity:,}")
+        stats = cache.stats()
+        print(f"{capacity:>9,} {uncached_time / len(requests) * 1e6:>16.1f} "
+              f"{cached_time / len(requests) * 1e6:>14.1f} {uncached_time / cached_time:>7.1f}x "
+              f"{stats.hit_ratio:>10.1%} {stats.evictions:>10,} {stats.invalidations:>12,}")
+
+
+if __name__ == "__main__":
+    main()
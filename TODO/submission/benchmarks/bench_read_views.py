@@ -0,0 +1,143 @@
+"""
+Benchmark: sales reports running alongside order placement.
+
+A thread-safe store (or a SqliteDataStore with `--store sqlite`) is
+seeded with `--history` past orders. One writer thread then places
+orders through place_order_facade for `--seconds`, first on its own and
+then while the main thread runs generate_sales_report in a loop. Each
+report reads through `DataStore.read_view()`, so it takes no lock that
+checkout needs and cannot fail with "dictionary changed size during
+iteration".
+
+Both threads share the GIL, so the writer's throughput drops by about
+the share of CPU the reports use; it must never stall. Each report runs
+inside a view the benchmark opened (a nested view on the same thread is
+the same view), and the orders in the window are recounted through it;
+"check" is ok when every report matched its own view.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_read_views --history 200000 --seconds 5
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from submission.application.main import ServiceContainer, place_order_facade
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface
+from submission.repositories.sqlite.SqliteDataStore import SqliteDataStore
+from submission.domain.models.Customer import Customer
+from submission.domain.models.Order import Order
+from submission.domain.models.OrderItem import OrderItem
+from submission.domain.enums.order_status import OrderStatus
+
+CUSTOMERS = 1000
+PRODUCTS = 50
+PAYMENT: Dict[str, Any] = {"type": "credit_card", "card_number": "1234567812345678", "valid": True}
+
+
+def seed(store: DataStoreInterface, history: int) -> None:
+    store.add_supplier("S1", "Supplier", "s1@example.com", 0.9)
+    for i in range(PRODUCTS):
+        store.add_product(f"P{i}", f"Product {i}", 10.0 + i, 10**9, f"cat{i % 10}", 1.0, "S1")
+    for i in range(CUSTOMERS):
+        store.add_customer(f"C{i}", f"Customer {i}", f"c{i}@example.com", "bronze", "", "", 0)
+
+    start = datetime.datetime.now() - datetime.timedelta(days=365)
+    for order_id in range(1, history + 1):
+        customer_id = f"C{order_id % CUSTOMERS}"
+        item = OrderItem(f"P{order_id % PRODUCTS}", 1, 10.0 + order_id % PRODUCTS)
+        store.add_order(Order(
+            order_id, customer_id, [item], OrderStatus.DELIVERED,
+            start + datetime.timedelta(seconds=order_id * 60), item.unit_price, 4.0
+        ))
+        customer: Optional[Customer] = store.get_customer(customer_id)
+        assert customer is not None
+        store.append_order_history(customer, order_id)
+    store.next_order_id = history + 1
+
+
+def place_orders(services: ServiceContainer, stop: threading.Event, placed: List[int]) -> None:
+    i = 0
+    while not stop.is_set():
+        place_order_facade(
+            services, f"C{i % CUSTOMERS}",
+            [{"product_id": f"P{i % PRODUCTS}", "quantity": 1}],
+            "standard", dict(PAYMENT, amount=1e9)
+        )
+        i += 1
+    placed.append(i)
+
+
+def run_reports(services: ServiceContainer, stop: threading.Event) -> Tuple[int, str]:
+    start = datetime.datetime.now() - datetime.timedelta(days=400)
+    reports, verdict = 0, "ok"
+    while not stop.is_set():
+        end = datetime.datetime.now()
+        with services.db.read_view() as view:
+            report = services.reporting.generate_sales_report(start, end)
+            expected = sum(
+                order.status != OrderStatus.CANCELLED
+                for order in view.get_orders_created_between(start, end)
+            )
+        if report['total_orders'] != expected:
+            verdict = "MISMATCH"
+        reports += 1
+    return reports, verdict
+
+
+def run(args: argparse.Namespace, with_reports: bool, directory: str) -> Tuple[float, int, str]:
+    store: DataStoreInterface
+    if args.store == "sqlite":
+        store = SqliteDataStore(os.path.join(directory, f"bench-{with_reports}.sqlite"))
+    else:
+        store = DataStore(thread_safe=True)
+    seed(store, args.history)
+    services = ServiceContainer.initialize(store)
+
+    stop = threading.Event()
+    placed: List[int] = []
+    reports, verdict = 0, "-"
+    with contextlib.redirect_stdout(io.StringIO()):
+        writer = threading.Thread(target=place_orders, args=(services, stop, placed))
+        started = time.perf_counter()
+        writer.start()
+        timer = threading.Timer(args.seconds, stop.set)
+        timer.start()
+        try:
+            if with_reports:
+                reports, verdict = run_reports(services, stop)
+        finally:
+            stop.set()
+            timer.cancel()
+            writer.join()
+        elapsed = time.perf_counter() - started
+
+    if isinstance(store, SqliteDataStore):
+        store.close()
+    return placed[0] / elapsed, reports, verdict
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--history", type=int, default=200_000, help="orders seeded before timing")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--store", choices=["memory", "sqlite"], default="memory")
+    args = parser.parse_args()
+
+    print(f"{'reports':>8} {'orders/s':>10} {'reports run':>12} {'check':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for with_reports in (False, True):
+            throughput, reports, verdict = run(args, with_reports, directory)
+            label = "on" if with_reports else "off"
+            print(f"{label:>8} {throughput:10.0f} {reports:>12} {verdict:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: one-day sales report over a multi-year order history.
+
+Orders are spread evenly over `--years` of history. The report for the
+last day is generated with the created_at index and compared with the
+old approach of testing every stored order against the window.
+
+Orders are added straight to the store, so customers have no order
+history and the all-time top-customer ranking stays cheap. The timings
+therefore isolate the cost of selecting the report window.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_report_time_index --orders 1000000 --years 3
+"""
+import argparse
+import datetime
+import time
+from typing import Any, Callable, List
+
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.domain.models.Order import Order
+from submission.domain.models.OrderItem import OrderItem
+from submission.domain.enums.order_status import OrderStatus
+from submission.services.customer_service import CustomerService
+from submission.services.reporting_service import ReportingService
+
+
+def build_store(order_count: int, years: int, start: datetime.datetime) -> DataStore:
+    store = DataStore()
+    for i in range(100):
+        store.add_product(f"P{i}", f"Product {i}", 10.0, 1000, f"cat{i % 10}", 1.0, "S1")
+    for i in range(1000):
+        store.add_customer(f"C{i}", f"Customer {i}", f"c{i}@example.com", "bronze", "", "", 0)
+
+    step = datetime.timedelta(days=365 * years) / order_count
+    for order_id in range(1, order_count + 1):
+        items = [OrderItem(f"P{order_id % 100}", 1 + order_id % 3, 10.0)]
+        store.add_order(Order(
+            order_id, f"C{order_id % 1000}", items, OrderStatus.DELIVERED,
+            start + step * order_id, 10.0, 0.0
+        ))
+    return store
+
+
+def scan_window(store: DataStore, start: datetime.datetime, end: datetime.datetime) -> List[Order]:
+    """The pre-index behaviour: test every stored order against the window."""
+    return [o for o in store.orders.values() if start <= o.created_at <= end]
+
+
+def best_of(repeat: int, fn: Callable[..., object], *args: Any) -> float:
+    """Returns the best-of-`repeat` wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    history_start = datetime.datetime(2020, 1, 1)
+    print(f"Building {args.orders:,} orders over {args.years} years...")
+    store = build_store(args.orders, args.years, history_start)
+    reporting = ReportingService(store, CustomerService(store))
+
+    day_end = history_start + datetime.timedelta(days=365 * args.years)
+    day_start = day_end - datetime.timedelta(days=1)
+    in_window = len(store.get_orders_created_between(day_start, day_end))
+    print(f"Orders in the one-day window: {in_window:,}\n")
+
+    indexed = best_of(args.repeat, store.get_orders_created_between, day_start, day_end)
+    scanned = best_of(1, scan_window, store, day_start, day_end)
+    report = best_of(args.repeat, reporting.generate_sales_report, day_start, day_end)
+
+    print(f"select window via index : {indexed:10.3f} ms")
+    print(f"select window via scan  : {scanned:10.3f} ms")
+    print(f"full one-day report     : {report:10.3f} ms (index path)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark: replaying an order history under candidate pricing rules.
+
+Fills a store with `--orders` orders of one to six lines from the batch
+benchmark's catalog, for customers of every tier in every tax region
+(5% cancelled), each charged shipping by one of the three methods
+under today's rules. The history is then replayed with
+RepricingSimulator under a candidate rule set (gold at 18%, a 12% tier
+from 25 items, Texas tax at 6.75% and cheaper express shipping) with
+0 (in this process), 1, 2, ... `--workers` worker processes. For each
+run it reports orders per second, the time a 10M-order history would
+take at that rate, and checks that every run gives the same report.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_repricing --orders 200000 --workers 4
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+from submission.benchmarks.bench_batch_pricing import PRODUCTS, build_services
+from submission.domain.enums.membership_tier import MembershipTierEnum
+from submission.domain.enums.order_status import OrderStatus
+from submission.domain.enums.tax_strategy import TaxRegion
+from submission.domain.models.Customer import Customer
+from submission.domain.models.Order import Order
+from submission.domain.models.OrderLines import OrderLines
+from submission.domain.models.Product import Product
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.services.pricing.RepricingSimulator import RepricingReport, RepricingSimulator, RuleSet
+from submission.services.pricing.strategies.bulk_discount import BulkDiscount
+from submission.services.shipping_strategy import ExpressShipping
+
+HISTORY = 10_000_000
+
+
+class TwelvePercentFrom25(BulkDiscount):
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        super().__init__(25, 0.12)
+
+    def get_discount(self) -> float:
+        return self.discount
+
+    def get_min_quantity(self) -> int:
+        return self.min_quantity
+
+
+class FlatRateExpress(ExpressShipping):
+    def cal_shipping_cost(self, total_weight: float, customer: Customer, subtotal: float) -> float:
+        return 15.0 + total_weight * 0.25
+
+
+def fill(store: DataStore, orders: int) -> None:
+    """`orders` orders, charged the shipping today's rules give (without the discounts, near enough)."""
+    rng = random.Random(13)
+    products: List[Product] = [store.get_product(f"P{i}") for i in range(PRODUCTS)]  # type: ignore[misc]
+    customer_ids: List[str] = list(store.customers)
+    methods = list(RuleSet.current().shipping.items())
+    created = datetime.datetime(2024, 1, 1)
+    for order_id in range(1, orders + 1):
+        lines = OrderLines()
+        weight: float = 0.0
+        for _ in range(rng.randrange(1, 7)):
+            product: Product = rng.choice(products)
+            quantity: int = rng.randrange(1, 8)
+            lines.add(product.product_id, quantity, product.price)
+            weight += product.weight * quantity
+        customer = store.customers[rng.choice(customer_ids)]
+        _, strategy = rng.choice(methods)
+        subtotal: float = lines.subtotal().to_float()
+        store.add_order(Order(
+            order_id, customer.customer_id, lines,
+            OrderStatus.CANCELLED if rng.random() < 0.05 else OrderStatus.DELIVERED,
+            created, subtotal, round(strategy.cal_shipping_cost(weight, customer, subtotal), 2)
+        ))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shard-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    services = build_services(customer_count=2_000)
+    fill(services.db, args.orders)  # type: ignore[arg-type]
+    baseline = RuleSet.current()
+    # Today's tiers (slot 0 is the no-discount placeholder) plus a 12% tier from 25 items
+    bulk_discounts: List[BulkDiscount] = [
+        strategy for strategy in baseline.bulk_discounts.schedule().strategies[1:] if strategy is not None
+    ]
+    bulk_discounts.append(TwelvePercentFrom25())
+    candidate = baseline.with_changes(
+        membership_rates={MembershipTierEnum.GOLD: 0.18},
+        bulk_discounts=bulk_discounts,
+        tax_rates={TaxRegion.TEXAS: 0.0675},
+        shipping={"express": FlatRateExpress()}
+    )
+    simulator = RepricingSimulator(services.db, services.tax, baseline)
+
+    print(f"{'workers':>7} {'seconds':>8} {'orders/s':>10} {'10M orders':>11}")
+    first: Optional[Tuple[int, int, int, int]] = None
+    report: Optional[RepricingReport] = None
+    for workers in range(0, args.workers + 1):
+        with tempfile.TemporaryDirectory() as out_dir:
+            start = time.perf_counter()
+            report = simulator.run(candidate, out_dir, workers=workers, shard_size=args.shard_size)
+            seconds: float = time.perf_counter() - start
+        totals = (report.orders, report.changed, report.baseline.cents, report.candidate.cents)
+        if first is not None and totals != first:
+            sys.exit(f"{workers} workers gave a different report")
+        first = totals
+        rate: float = (report.orders + report.skipped) / seconds
+        print(f"{workers:>7} {seconds:>8.2f} {rate:>10,.0f} {HISTORY / rate / 60:>9.1f} m")
+
+    assert report is not None
+    print(f"\n{report.orders:,} orders replayed ({report.skipped:,} skipped), {report.changed:,} changed")
+    print(f"revenue {report.baseline} -> {report.candidate}: {report.revenue_change} "
+          f"({report.change_ratio * 100:+.2f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: secondary indexes on the in-memory DataStore.
+
+Builds a store with N orders spread over customers with very different
+order counts, then times `get_orders_by_customer` against the old
+full scan of `DataStore.orders`. Index lookups should scale with the
+number of matching orders, not with N.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_secondary_indexes --orders 1000000
+"""
+import argparse
+import datetime
+import time
+from typing import Callable, Dict, List, Tuple
+
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.domain.models.Order import Order
+from submission.domain.enums.order_status import OrderStatus
+
+
+def build_store(order_count: int, product_count: int) -> Tuple[DataStore, Dict[str, int]]:
+    """
+    Fills a DataStore and returns it with {customer_id: order_count}.
+    Customer "C<k>" owns 10**k orders; the remainder goes to a long tail.
+    """
+    store = DataStore()
+    for i in range(product_count):
+        store.add_product(f"P{i}", f"Product {i}", 10.0, 100, f"cat{i % 50}", 1.0, f"S{i % 20}")
+
+    sizes: Dict[str, int] = {}
+    k = 0
+    while 10 ** k <= order_count // 10:
+        sizes[f"C{k}"] = 10 ** k
+        k += 1
+
+    owners: List[str] = []
+    for customer_id, count in sizes.items():
+        owners.extend([customer_id] * count)
+    tail = order_count - len(owners)
+    owners.extend(f"TAIL{i % 100_000}" for i in range(tail))
+
+    now = datetime.datetime.now()
+    for order_id, customer_id in enumerate(owners, start=1):
+        store.add_order(Order(order_id, customer_id, [], OrderStatus.PENDING, now, 10.0, 0.0))
+
+    return store, sizes
+
+
+def time_call(fn: Callable[[], object], repeat: int) -> float:
+    """Returns the best-of-`repeat` wall time in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Building store with {args.orders:,} orders / {args.products:,} products...")
+    start = time.perf_counter()
+    store, sizes = build_store(args.orders, args.products)
+    print(f"  built in {time.perf_counter() - start:.1f}s\n")
+
+    def linear_scan(customer_id: str) -> List[Order]:
+        return [o for o in store.orders.values() if o.customer_id == customer_id]
+
+    print(f"{'customer':>10} {'orders':>10} {'index (us)':>12} {'us/result':>10} {'scan (us)':>12}")
+    for customer_id, count in sizes.items():
+        indexed = time_call(lambda: store.get_orders_by_customer(customer_id), args.repeat)
+        scanned = time_call(lambda: linear_scan(customer_id), 1)
+        print(f"{customer_id:>10} {count:>10,} {indexed:>12.1f} {indexed / count:>10.3f} {scanned:>12.0f}")
+
+    category_lookup = time_call(lambda: store.get_products_by_category("cat7"), args.repeat)
+    supplier_lookup = time_call(lambda: store.get_products_by_supplier("S3"), args.repeat)
+    print(f"\nproducts in one category ({len(store.get_products_by_category('cat7')):,}): {category_lookup:.1f} us")
+    print(f"products for one supplier ({len(store.get_products_by_supplier('S3')):,}): {supplier_lookup:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: shipment lookups and carrier scan updates.
+
+Stores N shipments (one per order) in the in-memory DataStore, with a
+share already delivered, then times the three questions support asks,
+"where is tracking number X", "what shipments does order Y have" and
+"list every in_transit shipment", through the store's indexes against
+a full scan of `DataStore.shipments`. It then applies a carrier scan
+file that moves a tenth of the shipments to a new status in one
+update_shipment_statuses call, and reports the memory per shipment.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_shipment_indexes --shipments 500000
+"""
+import argparse
+import datetime
+import random
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.domain.models.Shipment import Shipment
+from submission.domain.enums.shipment_status import ShipmentStatus
+
+
+def build_store(shipment_count: int) -> DataStore:
+    store = DataStore()
+    now = datetime.datetime.now()
+    rng = random.Random(5)
+    for shipment_id in range(1, shipment_count + 1):
+        status = ShipmentStatus.DELIVERED if rng.random() < 0.8 else ShipmentStatus.IN_TRANSIT
+        store.add_shipment(Shipment(shipment_id, shipment_id, f"TRACK{shipment_id}", now, status))
+    return store
+
+
+def time_call(fn: Callable[[], object], repeat: int) -> float:
+    """Returns the best-of-`repeat` wall time in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--shipments", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Storing {args.shipments:,} shipments...")
+    tracemalloc.start()
+    store = build_store(args.shipments)
+    stored_bytes, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {stored_bytes / args.shipments:.0f} bytes per shipment, indexes included\n")
+
+    target: int = args.shipments // 2
+    shipments = store.shipments.values()
+    cases: List[Tuple[str, Callable[[], object], Callable[[], object]]] = [
+        ("by tracking number",
+         lambda: store.get_shipment_by_tracking_number(f"TRACK{target}"),
+         lambda: [s for s in shipments if s.tracking_number == f"TRACK{target}"]),
+        ("by order id",
+         lambda: store.get_shipments_by_order(target),
+         lambda: [s for s in shipments if s.order_id == target]),
+        ("all in_transit",
+         lambda: store.get_shipments_by_status(ShipmentStatus.IN_TRANSIT),
+         lambda: [s for s in shipments if s.status is ShipmentStatus.IN_TRANSIT]),
+    ]
+    print(f"{'lookup':>20} {'index (us)':>12} {'scan (us)':>12}")
+    for name, indexed, scanned in cases:
+        print(f"{name:>20} {time_call(indexed, args.repeat):>12.1f} {time_call(scanned, 1):>12.0f}")
+
+    rng = random.Random(9)
+    scan_file = [
+        (f"TRACK{rng.randrange(1, args.shipments + 1)}", ShipmentStatus.OUT_FOR_DELIVERY)
+        for _ in range(args.shipments // 10)
+    ]
+    start = time.perf_counter()
+    applied = store.update_shipment_statuses(scan_file)
+    elapsed = time.perf_counter() - start
+    print(f"\ncarrier scan file: {applied:,} rows in {elapsed * 1000:.0f} ms "
+          f"({elapsed / applied * 1e6:.2f} us/row)")
+    print(f"out_for_delivery now: {len(store.get_shipments_by_status(ShipmentStatus.OUT_FOR_DELIVERY)):,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Benchmark: cold start from a binary snapshot vs the legacy JSON path.
+
+A store with `--customers` customers and `--orders` orders (plus their
+items, order histories and inventory log) is saved twice:
+
+  * json: what legacy data_loader does - an indented json.dump of every
+    table - and loaded back by replaying add_product / add_customer /
+    add_order row by row. (The legacy loader drops orders altogether;
+    here they are kept so both paths restore the same data.)
+  * snapshot: DataStore.snapshot() / DataStore.restore().
+
+Each load runs in a fresh interpreter so its peak RSS can be reported
+on its own.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_snapshot --customers 1000000 --orders 5000000
+"""
+import argparse
+import datetime
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.domain.models.Order import Order
+from submission.domain.models.OrderItem import OrderItem
+from submission.domain.enums.order_status import OrderStatus
+
+PRODUCTS = 1000
+TIERS = ["bronze", "silver", "gold"]
+
+
+def build(customers: int, orders: int) -> DataStore:
+    store = DataStore()
+    store.add_supplier("S1", "Supplier", "s1@example.com", 0.9)
+    for i in range(PRODUCTS):
+        store.add_product(f"P{i}", f"Product {i}", 10.0 + i, 1000, f"cat{i % 20}", 1.0, "S1")
+    for i in range(customers):
+        store.add_customer(
+            f"C{i}", f"Customer {i}", f"c{i}@example.com", TIERS[i % 3],
+            f"555-{i:07d}", f"{i} Main St", i % 500
+        )
+
+    start = datetime.datetime(2020, 1, 1)
+    for order_id in range(1, orders + 1):
+        customer = store.customers[f"C{order_id % customers}"]
+        items = [
+            OrderItem(f"P{(order_id + n) % PRODUCTS}", 1 + n, 10.0 + n)
+            for n in range(1 + order_id % 3)
+        ]
+        order = Order(
+            order_id, customer.customer_id, items, OrderStatus.DELIVERED,
+            start + datetime.timedelta(seconds=order_id * 17), 25.0, 4.0
+        )
+        order.payment_method = "credit_card"
+        store.add_order(order)
+        customer.order_history.append(order_id)
+    store.next_order_id = orders + 1
+    return store
+
+
+def fields(record: Any) -> Dict[str, Any]:
+    """What vars() gave for the models before they were slotted."""
+    return {name: getattr(record, name) for name in type(record).__slots__ if name != '__weakref__'}
+
+
+def save_json(store: DataStore, path: str) -> None:
+    data: Dict[str, Any] = {
+        'products': {pid: fields(p) for pid, p in store.products.items()},
+        'customers': {
+            cid: dict(fields(c), tier=c.tier.value,
+                      order_history=c.order_history.tolist())
+            for cid, c in store.customers.items()
+        },
+        'orders': {
+            oid: dict(
+                fields(o), status=o.status.value, created_at=o.created_at.isoformat(),
+                items=[fields(item) for item in o.items]
+            )
+            for oid, o in store.orders.items()
+        },
+    }
+    with open(path, 'w') as handle:
+        json.dump(data, handle, indent=2)
+
+
+def load_json(path: str) -> DataStore:
+    with open(path) as handle:
+        data = json.load(handle)
+    store = DataStore()
+    for p in data['products'].values():
+        store.add_product(p['product_id'], p['name'], p['price'], p['quantity_available'],
+                          p['category'], p['weight'], p['supplier_id'])
+    for c in data['customers'].values():
+        customer = store.add_customer(c['customer_id'], c['name'], c['email'], c['tier'],
+                                      c['phone'], c['address'], c['loyalty_points'])
+        customer.order_history.extend(c['order_history'])
+    for o in data['orders'].values():
+        items: List[OrderItem] = []
+        for i in o['items']:
+            item = OrderItem(i['product_id'], i['quantity'], i['unit_price'])
+            item.discount_applied = i['discount_applied']
+            items.append(item)
+        order = Order(o['order_id'], o['customer_id'], items, OrderStatus(o['status']),
+                      datetime.datetime.fromisoformat(o['created_at']), o['total_price'],
+                      o['shipping_cost'])
+        order.tracking_number = o['tracking_number']
+        order.payment_method = o['payment_method']
+        store.add_order(order)
+    return store
+
+
+def load_in_child(kind: str, path: str) -> List[float]:
+    """Runs one load in a fresh interpreter; returns [seconds, peak MiB]."""
+    output = subprocess.run(
+        [sys.executable, "-m", "submission.benchmarks.bench_snapshot", "--load", kind, path],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return [float(value) for value in output.split()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--customers", type=int, default=1_000_000)
+    parser.add_argument("--orders", type=int, default=5_000_000)
+    parser.add_argument("--skip-json", action="store_true", help="only measure the snapshot")
+    parser.add_argument("--load", nargs=2, metavar=("KIND", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.load:
+        kind, path = args.load
+        started = time.perf_counter()
+        store = DataStore.restore(path) if kind == "snapshot" else load_json(path)
+        elapsed = time.perf_counter() - started
+        assert len(store.orders) > 0
+        peak_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(elapsed, peak_mib)
+        return
+
+    store = build(args.customers, args.orders)
+    print(f"{args.customers:,} customers, {args.orders:,} orders")
+    print(f"{'format':>10} {'save s':>8} {'file MiB':>9} {'load s':>8} {'peak RSS MiB':>13}")
+    with tempfile.TemporaryDirectory() as directory:
+        kinds = ["snapshot"] if args.skip_json else ["snapshot", "json"]
+        for kind in kinds:
+            path = os.path.join(directory, f"store.{kind}")
+            started = time.perf_counter()
+            if kind == "snapshot":
+                store.snapshot(path)
+            else:
+                save_json(store, path)
+            save_s = time.perf_counter() - started
+            size_mib = os.path.getsize(path) / 2**20
+            if kind == kinds[-1]:
+                del store  # give the child the memory
+            load_s, peak_mib = load_in_child(kind, path)
+            print(f"{kind:>10} {save_s:8.1f} {size_mib:9.1f} {load_s:8.1f} {peak_mib:13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark: in-memory DataStore vs SqliteDataStore behind the services.
+
+For each history size, both stores are filled with the same orders
+(spread over `--years`), then measured on:
+
+  * order placement: `--placements` orders through place_order_facade
+    (pricing, stock deduction, history, loyalty, low-stock checks);
+  * report generation: ReportingService for the last day and the last
+    30 days of history.
+
+The SQLite history is loaded inside one transaction. Placement is
+measured twice on SQLite: committing per store call (what the services
+do on their own) and with each order wrapped in `store.transaction()`
+(one commit per order). Service output is discarded while timing.
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_sqlite_store --orders 100000 1000000
+"""
+import argparse
+import contextlib
+import datetime
+import gc
+import io
+import os
+import tempfile
+import time
+from typing import Any, Callable, ContextManager, Dict, List, Optional
+
+from submission.application.main import ServiceContainer, place_order_facade
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface
+from submission.repositories.sqlite.SqliteDataStore import SqliteDataStore
+from submission.domain.models.Order import Order
+from submission.domain.models.OrderItem import OrderItem
+from submission.domain.enums.order_status import OrderStatus
+
+PRODUCTS = 100
+CUSTOMERS = 1000
+PAYMENT: Dict[str, Any] = {"type": "credit_card", "card_number": "1234567812345678", "valid": True}
+
+
+def fill(store: DataStoreInterface, order_count: int, years: int, start: datetime.datetime) -> None:
+    store.add_supplier("S1", "Supplier", "s1@example.com", 0.9)
+    for i in range(PRODUCTS):
+        store.add_product(f"P{i}", f"Product {i}", 10.0 + i, 10_000_000, f"cat{i % 10}", 1.0, "S1")
+    for i in range(CUSTOMERS):
+        store.add_customer(f"C{i}", f"Customer {i}", f"c{i}@example.com", "bronze", "", "", 0)
+
+    step = datetime.timedelta(days=365 * years) / order_count
+    for order_id in range(1, order_count + 1):
+        items = [OrderItem(f"P{order_id % PRODUCTS}", 1 + order_id % 3, 10.0)]
+        store.add_order(Order(
+            order_id, f"C{order_id % CUSTOMERS}", items, OrderStatus.DELIVERED,
+            start + step * order_id, 10.0, 0.0
+        ))
+    store.next_order_id = order_count + 1
+
+
+Group = Optional[Callable[[], ContextManager[Any]]]
+
+
+def place_orders(services: ServiceContainer, count: int, group: Group = None) -> None:
+    for i in range(count):
+        with group() if group else contextlib.nullcontext():
+            place_order_facade(
+                services, f"C{i % CUSTOMERS}",
+                [{"product_id": f"P{i % PRODUCTS}", "quantity": 1 + i % 3}],
+                "standard", dict(PAYMENT, amount=1e9)
+            )
+
+
+def timed(fn: Callable[..., object], *args: Any) -> float:
+    """Wall time of one call in milliseconds, with service output discarded."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        fn(*args)
+        return (time.perf_counter() - started) * 1000
+
+
+def measure(
+    store: DataStoreInterface,
+    placements: int,
+    history_end: datetime.datetime,
+    group: Group = None
+) -> List[float]:
+    services = ServiceContainer.initialize(store)
+    place_ms = timed(place_orders, services, placements, group)
+    day = timed(services.reporting.generate_sales_report,
+                history_end - datetime.timedelta(days=1), history_end)
+    month = timed(services.reporting.generate_sales_report,
+                  history_end - datetime.timedelta(days=30), history_end)
+    return [place_ms * 1000 / placements, day, month]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--placements", type=int, default=2000)
+    args = parser.parse_args()
+
+    history_start = datetime.datetime(2020, 1, 1)
+    history_end = history_start + datetime.timedelta(days=365 * args.years)
+
+    print(f"{'orders':>10} {'store':>8} {'load s':>8} {'place us/order':>15}"
+          f" {'1-day report ms':>16} {'30-day report ms':>17} {'db MiB':>8}")
+    for order_count in args.orders:
+        started = time.perf_counter()
+        memory = DataStore()
+        fill(memory, order_count, args.years, history_start)
+        load_s = time.perf_counter() - started
+        results = measure(memory, args.placements, history_end)
+        print(f"{order_count:>10,} {'memory':>8} {load_s:8.1f} {results[0]:15.1f}"
+              f" {results[1]:16.1f} {results[2]:17.1f} {'-':>8}")
+        del memory
+        gc.collect()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bench.sqlite")
+            started = time.perf_counter()
+            sqlite = SqliteDataStore(path)
+            with sqlite.transaction():
+                fill(sqlite, order_count, args.years, history_start)
+            load_s = time.perf_counter() - started
+            results = measure(sqlite, args.placements, history_end)
+            grouped = measure(sqlite, args.placements, history_end, group=sqlite.transaction)
+            sqlite.close()
+            size_mib = os.path.getsize(path) / 2**20
+            print(f"{order_count:>10,} {'sqlite':>8} {load_s:8.1f} {results[0]:15.1f}"
+                  f" {results[1]:16.1f} {results[2]:17.1f} {size_mib:8.1f}")
+            print(f"{'':>10} {'+tx':>8} {'':>8} {grouped[0]:15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark: durable orders per second against the group-commit window.
+
+`--threads` writer threads place orders through place_order_facade on a
+thread-safe DataStore backed by a WriteAheadLog. Each order returns
+only after DataStore.sync() has seen its records fsynced, so every
+order counted is durable. One row per `--windows` value (milliseconds
+the flusher holds a group open); each row reports orders/s, fsyncs
+and how many orders one fsync covered on average.
+
+The "per order" row is the naive baseline: one thread, `max_batch=1`
+and no window, so nothing is shared and every order pays for its own
+fsync (or more). fsync cost depends heavily on the disk; run it on
+the filesystem you care about (`--dir`).
+
+Run from the TODO/ directory:
+    python -m submission.benchmarks.bench_wal_group_commit --threads 16 --seconds 3
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+from submission.application.main import ServiceContainer, place_order_facade
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.repositories.wal.WriteAheadLog import WriteAheadLog
+
+CUSTOMERS = 1000
+PRODUCTS = 50
+PAYMENT: Dict[str, Any] = {"type": "credit_card", "card_number": "1234567812345678", "valid": True}
+
+
+class CountingFile(io.BufferedWriter):
+    """An append-mode log file that counts its write() calls."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__(io.FileIO(path, 'ab'))
+        self.writes: int = 0
+
+    def write(self, buffer: Any, /) -> int:
+        self.writes += 1
+        return super().write(buffer)
+
+
+class CountingWriteAheadLog(WriteAheadLog):
+    """A WriteAheadLog whose flusher writes (one fsync each) are counted in `file.writes`."""
+
+    def _open(self) -> int:
+        count: int = super()._open()
+        self._file.close()
+        self.file: CountingFile = CountingFile(self.path)
+        self._file = self.file
+        return count
+
+
+def seed(store: DataStore) -> None:
+    store.add_supplier("S1", "Supplier", "s1@example.com", 0.9)
+    store.add_products_bulk(
+        {"product_id": f"P{i}", "name": f"Product {i}", "price": 10.0 + i, "quantity": 10**9,
+         "category": f"cat{i % 10}", "weight": 1.0, "supplier_id": "S1"}
+        for i in range(PRODUCTS)
+    )
+    store.add_customers_bulk(
+        {"customer_id": f"C{i}", "name": f"Customer {i}", "email": f"c{i}@example.com", "tier": "bronze"}
+        for i in range(CUSTOMERS)
+    )
+    store.sync()
+
+
+def place_orders(services: ServiceContainer, first: int, stop: threading.Event, placed: List[int]) -> None:
+    i = first
+    while not stop.is_set():
+        place_order_facade(
+            services, f"C{i % CUSTOMERS}",
+            [{"product_id": f"P{i % PRODUCTS}", "quantity": 1}],
+            "standard", dict(PAYMENT, amount=1e9)
+        )
+        i += 1
+    placed.append(i - first)
+
+
+def run(path: str, threads: int, seconds: float, window_ms: float, max_batch: int) -> Tuple[int, float, int]:
+    wal = CountingWriteAheadLog(path, commit_window_ms=window_ms, max_batch=max_batch)
+    store = DataStore(thread_safe=True, wal=wal)
+    seed(store)
+    services = ServiceContainer.initialize(store)
+
+    stop = threading.Event()
+    placed: List[int] = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        workers = [
+            threading.Thread(target=place_orders, args=(services, n * 10**6, stop, placed))
+            for n in range(threads)
+        ]
+        # Count the flusher's writes during the timed run only
+        writes_before: int = wal.file.writes
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        time.sleep(seconds)
+        stop.set()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+        writes: int = wal.file.writes - writes_before
+    wal.close()
+    return sum(placed), elapsed, writes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 1, 2, 5, 10],
+                        help="commit windows in milliseconds")
+    parser.add_argument("--dir", default=None, help="where to write the logs (default: a temp dir)")
+    args = parser.parse_args()
+
+    cases = [("per order", 1, 0.0, 1)] + [
+        (f"{window:g} ms", args.threads, window, 1024) for window in args.windows
+    ]
+    print(f"{'window':>10} {'threads':>8} {'orders/s':>10} {'fsyncs':>8} {'orders/fsync':>13}")
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        for run_number, (label, threads, window, max_batch) in enumerate(cases):
+            path = os.path.join(directory, f"bench-{run_number}.wal")
+            orders, elapsed, fsyncs = run(path, threads, args.seconds, window, max_batch)
+            print(f"{label:>10} {threads:>8} {orders / elapsed:10.0f} {fsyncs:>8} {orders / max(fsyncs, 1):13.1f}")
+
+
+if __name__ == "__main__":
+    main()
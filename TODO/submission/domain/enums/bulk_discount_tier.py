@@ -0,0 +1,9 @@
+from enum import Enum
+
+class BulkDiscountTier(Enum):
+    """
+    The quantity tiers of the bulk discount.
+    """
+    NONE = "none"
+    FIVE_ITEMS = "five_items"
+    TEN_ITEMS = "ten_items"
@@ -0,0 +1,8 @@
+from enum import Enum
+
+class PaymentMethod(Enum):
+    """
+    The payment types PaymentService accepts (payment_info["type"]).
+    """
+    CREDIT_CARD = "credit_card"
+    PAYPAL = "paypal"
@@ -0,0 +1,14 @@
+from enum import Enum
+
+class RoundingMode(Enum):
+    """
+    How an amount that falls between two cents is rounded.
+    """
+    HALF_UP = "half_up"        # ties away from zero
+    HALF_EVEN = "half_even"    # ties to the even cent (banker's rounding)
+    DOWN = "down"              # toward zero
+    UP = "up"                  # away from zero
+
+    # Members are singletons, so identity hashing is enough; it keeps the
+    # per-amount lookup in Money.scale() off Enum's Python-level __hash__
+    __hash__ = object.__hash__
@@ -0,0 +1,11 @@
+from enum import Enum
+
+class ShipmentStatus(Enum):
+    """
+    Represents the carrier statuses a Shipment moves through.
+    """
+    IN_TRANSIT = "in_transit"
+    OUT_FOR_DELIVERY = "out_for_delivery"
+    DELIVERED = "delivered"
+    EXCEPTION = "exception"
+    RETURNED = "returned"
@@ -0,0 +1,9 @@
+from enum import Enum
+
+class ShippingMethod(Enum):
+    """
+    The shipping methods a customer can pick at checkout.
+    """
+    STANDARD = "standard"
+    EXPRESS = "express"
+    OVERNIGHT = "overnight"
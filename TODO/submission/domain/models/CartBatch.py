@@ -0,0 +1,34 @@
+from array import array
+from typing import Iterable, List
+
+from submission.domain.models.OrderLines import OrderLines
+
+
+class CartBatch:
+    """
+    The lines of many carts as one set of flat columns (each cart's
+    OrderLines columns, one cart after another) and where each cart
+    ends, so a whole batch can be priced column by column.
+    """
+    __slots__ = ('product_ids', 'quantities', 'unit_cents', 'ends')
+
+    def __init__(self, carts: Iterable[OrderLines] = ()) -> None:
+        self.product_ids: List[str] = []
+        self.quantities: "array[int]" = array('q')
+        self.unit_cents: "array[int]" = array('q')
+        self.ends: "array[int]" = array('q')
+        for lines in carts:
+            self.add(lines)
+
+    def add(self, lines: OrderLines) -> None:
+        self.product_ids.extend(lines.product_ids)
+        self.quantities.extend(lines.quantities)
+        self.unit_cents.extend(lines.unit_cents)
+        self.ends.append(len(self.product_ids))
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+    def slices(self) -> List[slice]:
+        """One slice of the line columns per cart."""
+        return list(map(slice, [0, *self.ends[:-1]], self.ends))
@@ -1,45 +1,49 @@
-# Use relative imports to get the strategy and enum
-from submission.services.pricing.strategies.membership_discount import(
-    MembershipTier,
-    BronzeMembership,
-    SilverMembership,
-    GoldMembership,
-    SuspendedMembership
-)
-from typing import List
+# The tier strategies are shared instances, looked up by tier
+from submission.domain.enums.membership_tier import MembershipTierEnum
+from submission.services.pricing.strategies.membership_discount import MembershipTier
+from submission.services.pricing.strategies.strategy_registry import MEMBERSHIP_TIERS
+from array import array
+from typing import Dict
+
+# Tier names as stored ("gold", ...) -> tier
+_TIERS_BY_NAME: Dict[str, MembershipTierEnum] = {tier.value: tier for tier in MembershipTierEnum}
 
 class Customer:
+    __slots__ = (
+        'customer_id', 'name', 'email', 'phone', 'address', 'loyalty_points',
+        'tier', 'order_history', '__weakref__'
+    )
+
     def __init__(
-        self, 
-        customer_id: str, 
-        name: str, 
-        email: str, 
+        self,
+        customer_id: str,
+        name: str,
+        email: str,
         membership_tier_str: str,  # Renamed this parameter for clarity
-        phone: str, 
-        address: str, 
+        phone: str,
+        address: str,
         loyalty_points: int
     ) -> None:
-        
+
         self.customer_id: str = customer_id
         self.name: str = name
         self.email: str = email
         self.phone: str = phone
         self.address: str = address
         self.loyalty_points: int = loyalty_points
-        
-        # This attribute holds the actual strategy *object*
-        self.membership_tier: MembershipTier = self._get_membership_tier_from_string(membership_tier_str)
-        
-        # order_history will hold integers (the order IDs)
-        self.order_history: List[int] = [] 
-
-    def _get_membership_tier_from_string(self, tier_str: str) -> MembershipTier:
-        if tier_str == "bronze":
-            return BronzeMembership()
-        elif tier_str == "silver":
-            return SilverMembership()
-        elif tier_str == "gold":
-            return GoldMembership()
-        else:
-            # Defaults to suspended if the string is unknown (e.g., "standard")
-            return SuspendedMembership()
+
+        # Only the tier is stored; compare it with `is`
+        # Defaults to suspended if the string is unknown (e.g., "standard")
+        self.tier: MembershipTierEnum = _TIERS_BY_NAME.get(membership_tier_str, MembershipTierEnum.SUSPENDED)
+
+        # order_history holds the order IDs as unboxed 64-bit ints
+        self.order_history: "array[int]" = array('q')
+
+    @property
+    def membership_tier(self) -> MembershipTier:
+        """The shared strategy object for the customer's tier."""
+        return MEMBERSHIP_TIERS[self.tier]
+
+    @membership_tier.setter
+    def membership_tier(self, strategy: MembershipTier) -> None:
+        self.tier = strategy.get_tier()
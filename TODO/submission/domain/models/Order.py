@@ -1,14 +1,20 @@
 import datetime
-from typing import List, Optional
+from typing import Iterable, Optional
 from submission.domain.enums.order_status import OrderStatus
 from submission.domain.models.OrderItem import OrderItem
+from submission.domain.models.OrderLines import OrderLines
 
 class Order:
+    __slots__ = (
+        'order_id', 'customer_id', 'items', 'status', 'created_at', 'total_price',
+        'shipping_cost', 'tracking_number', 'payment_method', '__weakref__'
+    )
+
     def __init__(
         self, 
         order_id: int, 
         customer_id: str, 
-        items: List[OrderItem], 
+        items: Iterable[OrderItem], 
         status: OrderStatus,
         created_at: datetime.datetime, 
         total_price: float, 
@@ -16,7 +22,8 @@ class Order:
     ) -> None:
         self.order_id: int = order_id
         self.customer_id: str = customer_id
-        self.items: List[OrderItem] = items
+        # The lines are kept by column; a list of OrderItem is converted
+        self.items: OrderLines = items if isinstance(items, OrderLines) else OrderLines(items)
         self.status: OrderStatus = status
         self.created_at: datetime.datetime = created_at
         self.total_price: float = total_price
@@ -1,7 +1,7 @@
-import datetime
-from typing import List, Optional
-
 class OrderItem:
+    # Tens of millions of these across the order history, so no per-instance __dict__
+    __slots__ = ('product_id', 'quantity', 'unit_price', 'discount_applied')
+
     def __init__(
         self, 
         product_id: str, 
@@ -0,0 +1,192 @@
+from array import array
+from collections.abc import Sequence
+from itertools import compress
+from operator import mul
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Union
+
+from submission.domain.models.OrderItem import OrderItem
+from submission.domain.values.Money import Money
+
+
+def _cents(amount: float) -> int:
+    """Nearest whole cent, as Money.from_float()."""
+    return round(amount * 100)
+
+
+class OrderLineView(OrderItem):
+    """
+    One line of an OrderLines, read from and written to its columns, so
+    `order.items[i].quantity = n` changes the order as it did when the
+    lines were a list of OrderItem. It compares equal to any OrderItem
+    with the same values; OrderItem itself still compares by identity.
+    """
+    __slots__ = ('_lines', '_index')
+
+    def __init__(self, lines: "OrderLines", index: int) -> None:
+        self._lines: OrderLines = lines
+        self._index: int = index
+
+    @property
+    def product_id(self) -> str:
+        return self._lines.product_ids[self._index]
+
+    @product_id.setter
+    def product_id(self, value: str) -> None:
+        self._lines.product_ids[self._index] = value
+
+    @property
+    def quantity(self) -> int:
+        return self._lines._quantities[self._index]
+
+    @quantity.setter
+    def quantity(self, value: int) -> None:
+        self._lines._quantities[self._index] = value
+
+    @property
+    def unit_price(self) -> float:
+        return self._lines._unit_cents[self._index] / 100
+
+    @unit_price.setter
+    def unit_price(self, value: float) -> None:
+        self._lines._unit_cents[self._index] = _cents(value)
+
+    @property
+    def discount_applied(self) -> float:
+        return self._lines._discount_cents[self._index] / 100
+
+    @discount_applied.setter
+    def discount_applied(self, value: float) -> None:
+        self._lines._discount_cents[self._index] = _cents(value)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, OrderItem):
+            return NotImplemented
+        return (self.product_id, self.quantity, self.unit_price, self.discount_applied) == \
+            (other.product_id, other.quantity, other.unit_price, other.discount_applied)
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+class OrderLines(Sequence[OrderItem]):
+    """
+    The lines of an order, stored by column: product ids in a list and
+    the quantities, unit prices and per-line discounts (prices in cents)
+    in three int64 arrays. Adding a line appends to each column.
+    Subtotal, item count and weight are single passes over the columns,
+    with no object per line.
+
+    Indexing and iteration give an OrderLineView per line for code that
+    works line by line; assigning to its fields writes to the columns.
+    """
+    __slots__ = ('product_ids', '_quantities', '_unit_cents', '_discount_cents')
+
+    def __init__(self, items: Iterable[OrderItem] = ()) -> None:
+        items = list(items)
+        self.product_ids: List[str] = [item.product_id for item in items]
+        self._quantities: "array[int]" = array('q', [item.quantity for item in items])
+        self._unit_cents: "array[int]" = array('q', [_cents(item.unit_price) for item in items])
+        self._discount_cents: "array[int]" = array('q', [_cents(item.discount_applied) for item in items])
+
+    @classmethod
+    def from_columns(
+        cls,
+        product_ids: Iterable[str],
+        quantities: Iterable[int],
+        unit_prices: Iterable[float],
+        discounts: Iterable[float]
+    ) -> "OrderLines":
+        """Lines from parallel columns, prices and discounts as floats."""
+        lines = cls()
+        lines.product_ids = list(product_ids)
+        lines._quantities = array('q', quantities)
+        lines._unit_cents = array('q', map(_cents, unit_prices))
+        lines._discount_cents = array('q', map(_cents, discounts))
+        return lines
+
+    # --- Adding and changing lines ---
+
+    def add(self, product_id: str, quantity: int, unit_price: float, discount_applied: float = 0.0) -> None:
+        self._quantities.append(quantity)
+        self._unit_cents.append(_cents(unit_price))
+        self._discount_cents.append(_cents(discount_applied))
+        self.product_ids.append(product_id)
+
+    def append(self, item: OrderItem) -> None:
+        self.add(item.product_id, item.quantity, item.unit_price, item.discount_applied)
+
+    def set_discount(self, index: int, discount_applied: float) -> None:
+        if not -len(self.product_ids) <= index < len(self.product_ids):
+            raise IndexError("order line index out of range")
+        self._discount_cents[index] = _cents(discount_applied)
+
+    # --- Columns (the stored arrays, not copies: read them, don't change them) ---
+
+    @property
+    def quantities(self) -> "array[int]":
+        return self._quantities
+
+    @property
+    def unit_cents(self) -> "array[int]":
+        return self._unit_cents
+
+    @property
+    def discount_cents(self) -> "array[int]":
+        return self._discount_cents
+
+    def line_cents(self) -> "array[int]":
+        """quantity x unit price for every line."""
+        return array('q', map(mul, self._quantities, self._unit_cents))
+
+    # --- Totals ---
+
+    def subtotal(self, included: Optional[Iterable[Any]] = None) -> Money:
+        """
+        Sum of quantity x unit price. With `included`, only the lines
+        whose entry in it is truthy count.
+        """
+        line_totals: Iterable[int] = map(mul, self._quantities, self._unit_cents)
+        if included is not None:
+            line_totals = compress(line_totals, included)
+        return Money(sum(line_totals))
+
+    def discount_total(self) -> Money:
+        return Money(sum(self._discount_cents))
+
+    def item_count(self) -> int:
+        return sum(self._quantities)
+
+    def total_weight(self, weight_of: Callable[[str], float]) -> float:
+        """Sum of weight x quantity, weight_of(product_id) giving the unit weight."""
+        line_weights: Iterable[float] = map(mul, map(weight_of, self.product_ids), self._quantities)
+        return sum(line_weights)
+
+    # --- Sequence of OrderItem ---
+
+    def __len__(self) -> int:
+        return len(self.product_ids)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.product_ids)))]
+        count: int = len(self.product_ids)
+        if not -count <= index < count:
+            raise IndexError("order line index out of range")
+        return OrderLineView(self, index % count)
+
+    def __iter__(self) -> Iterator[OrderItem]:
+        for index in range(len(self.product_ids)):
+            yield OrderLineView(self, index)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, tuple)):
+            # Plain OrderItems compare by identity, so compare the lines' values
+            other = OrderLines(other)
+        if isinstance(other, OrderLines):
+            return (self.product_ids == other.product_ids and self._quantities == other._quantities
+                    and self._unit_cents == other._unit_cents and self._discount_cents == other._discount_cents)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"OrderLines({len(self)} lines)"
@@ -1,4 +1,10 @@
 class Product:
+    # One per catalog entry; __weakref__ lets the SQLite store's identity map hold them
+    __slots__ = (
+        'product_id', 'name', 'price', 'quantity_available', 'category', 'weight',
+        'supplier_id', 'discount_eligible', '__weakref__'
+    )
+
     def __init__(
         self, 
         product_id: str, 
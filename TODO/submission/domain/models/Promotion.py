@@ -1,5 +1,10 @@
 import datetime
 class Promotion:
+    __slots__ = (
+        'promo_id', 'code', 'discount_percent', 'min_purchase', 'valid_until', 'category',
+        'used_count', '__weakref__'
+    )
+
     def __init__(
         self, 
         promo_id: str, 
@@ -0,0 +1,20 @@
+import datetime
+from submission.domain.enums.shipment_status import ShipmentStatus
+
+class Shipment:
+    # Stores hold one per shipped order, so no per-instance __dict__
+    __slots__ = ('shipment_id', 'order_id', 'tracking_number', 'created_at', 'status')
+
+    def __init__(
+        self, 
+        shipment_id: int, 
+        order_id: int, 
+        tracking_number: str, 
+        created_at: datetime.datetime, 
+        status: ShipmentStatus = ShipmentStatus.IN_TRANSIT
+    ) -> None:
+        self.shipment_id: int = shipment_id
+        self.order_id: int = order_id
+        self.tracking_number: str = tracking_number
+        self.created_at: datetime.datetime = created_at
+        self.status: ShipmentStatus = status
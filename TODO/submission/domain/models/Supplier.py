@@ -1,4 +1,6 @@
 class Supplier:
+    __slots__ = ('supplier_id', 'name', 'email', 'reliability_score', '__weakref__')
+
     def __init__(
         self, 
         supplier_id: str, 
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from submission.domain.values.Money import Money
+
+
+@dataclass(frozen=True)
+class DiscountQuote:
+    """
+    The discounts on one order, stage by stage, and what taking them
+    uses up: the promotion applied and the loyalty points spent.
+    """
+    subtotal: Money
+    bulk_discount: Money
+    membership_discount: Money
+    promotion_discount: Money
+    loyalty_discount: Money
+    discounted: Money
+    promotion_code: Optional[str] = None
+    loyalty_points: int = 0
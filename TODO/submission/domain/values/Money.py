@@ -0,0 +1,239 @@
+from array import array
+from decimal import Decimal
+from fractions import Fraction
+from itertools import repeat
+from operator import add, mul, sub
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from submission.domain.enums.rounding_mode import RoundingMode
+
+# A discount or tax rate: 0.15, Decimal("0.0725"), Fraction(1, 3), ...
+Rate = Union[float, int, Decimal, Fraction]
+
+# Rates seen so far -> (numerator, denominator); pricing uses a handful
+_RATIOS: Dict[Rate, Tuple[int, int]] = {}
+
+
+def _rate_ratio(rate: Rate) -> Tuple[int, int]:
+    """
+    A rate as an exact (numerator, denominator). Floats go through their
+    shortest repr, so 0.0725 is 29/400 rather than the binary value
+    just below it.
+    """
+    ratio: Optional[Tuple[int, int]] = _RATIOS.get(rate)
+    if ratio is None:
+        exact = Fraction(repr(rate)) if isinstance(rate, float) else Fraction(rate)
+        ratio = _RATIOS[rate] = (exact.numerator, exact.denominator)
+    return ratio
+
+
+# --- Rounded division ---
+# numerator / denominator (denominator > 0) to an integer, one function
+# per mode. divmod floors, so each adds 1 where flooring is wrong.
+
+def _divide_half_up(numerator: int, denominator: int) -> int:
+    quotient, remainder = divmod(numerator, denominator)
+    twice: int = 2 * remainder
+    return quotient + (twice > denominator or (twice == denominator and numerator > 0))
+
+
+def _divide_half_even(numerator: int, denominator: int) -> int:
+    quotient, remainder = divmod(numerator, denominator)
+    twice: int = 2 * remainder
+    return quotient + (twice > denominator or (twice == denominator and quotient & 1 == 1))
+
+
+def _divide_down(numerator: int, denominator: int) -> int:
+    quotient, remainder = divmod(numerator, denominator)
+    return quotient + (remainder != 0 and numerator < 0)
+
+
+def _divide_up(numerator: int, denominator: int) -> int:
+    quotient, remainder = divmod(numerator, denominator)
+    return quotient + (remainder != 0 and numerator > 0)
+
+
+_DIVIDE: Dict[RoundingMode, Callable[[int, int], int]] = {
+    RoundingMode.HALF_UP: _divide_half_up,
+    RoundingMode.HALF_EVEN: _divide_half_even,
+    RoundingMode.DOWN: _divide_down,
+    RoundingMode.UP: _divide_up,
+}
+
+
+class Money:
+    """
+    An amount of money as a whole number of cents. Adding, subtracting
+    and multiplying by a quantity are exact integer operations, so sums
+    never drift; the only rounding is in scale(), which takes the
+    rounding mode explicitly. The cents are read-only: every operation
+    returns a new Money.
+
+    Amounts stored as floats (catalog prices, order totals) come in
+    through from_float(), which takes the nearest cent, and go back out
+    through to_float().
+    """
+    __slots__ = ('_cents',)
+
+    def __init__(self, cents: int) -> None:
+        self._cents: int = cents
+
+    @property
+    def cents(self) -> int:
+        return self._cents
+
+    @classmethod
+    def from_float(cls, amount: float) -> "Money":
+        return cls(round(amount * 100))
+
+    @classmethod
+    def parse(cls, amount: Union[str, Decimal]) -> "Money":
+        """An exact decimal amount ("19.99"); fractions of a cent round half-even."""
+        return cls(int((Decimal(amount) * 100).to_integral_value()))
+
+    @staticmethod
+    def sum(amounts: Iterable["Money"]) -> "Money":
+        return Money(sum(amount._cents for amount in amounts))
+
+    def to_float(self) -> float:
+        return self._cents / 100
+
+    __float__ = to_float
+
+    def scale(self, rate: Rate, rounding: RoundingMode) -> "Money":
+        """This amount times `rate` (a discount or tax rate), rounded to a cent."""
+        numerator, denominator = _RATIOS.get(rate) or _rate_ratio(rate)
+        return Money(_DIVIDE[rounding](self._cents * numerator, denominator))
+
+    # --- Arithmetic (with Money only; quantities are ints) ---
+
+    def __add__(self, other: "Money") -> "Money":
+        if other.__class__ is not Money:
+            return NotImplemented
+        return Money(self._cents + other._cents)
+
+    def __sub__(self, other: "Money") -> "Money":
+        if other.__class__ is not Money:
+            return NotImplemented
+        return Money(self._cents - other._cents)
+
+    def __mul__(self, quantity: int) -> "Money":
+        if quantity.__class__ is not int:
+            return NotImplemented
+        return Money(self._cents * quantity)
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> "Money":
+        return Money(-self._cents)
+
+    # --- Comparison ---
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not Money:
+            return NotImplemented
+        return self._cents == other._cents
+
+    def __lt__(self, other: "Money") -> bool:
+        return self._cents < other._cents
+
+    def __le__(self, other: "Money") -> bool:
+        return self._cents <= other._cents
+
+    def __gt__(self, other: "Money") -> bool:
+        return self._cents > other._cents
+
+    def __ge__(self, other: "Money") -> bool:
+        return self._cents >= other._cents
+
+    def __hash__(self) -> int:
+        return hash(self._cents)
+
+    def __bool__(self) -> bool:
+        return self._cents != 0
+
+    # --- Copies and display ---
+
+    def __reduce__(self) -> Tuple[type, Tuple[int]]:
+        return Money, (self._cents,)
+
+    def __str__(self) -> str:
+        sign: str = "-" if self._cents < 0 else ""
+        whole, cents = divmod(abs(self._cents), 100)
+        return f"{sign}{whole}.{cents:02d}"
+
+    def __repr__(self) -> str:
+        return f"Money('{self}')"
+
+
+ZERO = Money(0)
+
+
+class MoneyArray:
+    """
+    Many amounts as one int64 array of cents, for totals over whole
+    order histories: total() adds them up exactly in one pass, without
+    a Money object per element.
+    """
+    __slots__ = ('cents',)
+
+    def __init__(self, cents: Iterable[int] = ()) -> None:
+        self.cents: "array[int]" = cents if isinstance(cents, array) and cents.typecode == 'q' else array('q', cents)
+
+    @classmethod
+    def from_floats(cls, amounts: Iterable[float]) -> "MoneyArray":
+        return cls(array('q', [round(amount * 100) for amount in amounts]))
+
+    @classmethod
+    def from_money(cls, amounts: Iterable[Money]) -> "MoneyArray":
+        return cls(array('q', [amount._cents for amount in amounts]))
+
+    def __len__(self) -> int:
+        return len(self.cents)
+
+    def __getitem__(self, index: int) -> Money:
+        return Money(self.cents[index])
+
+    def __iter__(self) -> Iterator[Money]:
+        return map(Money, self.cents)
+
+    def append(self, amount: Money) -> None:
+        self.cents.append(amount._cents)
+
+    def total(self) -> Money:
+        return Money(sum(self.cents))
+
+    def times(self, quantities: Iterable[int]) -> "MoneyArray":
+        """Element-wise amount x quantity (unit prices to line totals)."""
+        return MoneyArray(array('q', map(mul, self.cents, quantities)))
+
+    def scale(self, rate: Rate, rounding: RoundingMode) -> "MoneyArray":
+        """Money.scale() for every element."""
+        numerator, denominator = _rate_ratio(rate)
+        return MoneyArray(array('q', map(
+            _DIVIDE[rounding], map(mul, self.cents, repeat(numerator)), repeat(denominator)
+        )))
+
+    def scale_each(self, rates: Iterable[Rate], rounding: RoundingMode) -> "MoneyArray":
+        """Element i times rates[i], as Money.scale(); rates come from a small set."""
+        rates = list(rates)
+        ratios: Dict[Rate, Tuple[int, int]] = {rate: _rate_ratio(rate) for rate in set(rates)}
+        numerators: Dict[Rate, int] = {rate: ratio[0] for rate, ratio in ratios.items()}
+        denominators: Dict[Rate, int] = {rate: ratio[1] for rate, ratio in ratios.items()}
+        return MoneyArray(array('q', map(
+            _DIVIDE[rounding],
+            map(mul, self.cents, map(numerators.__getitem__, rates)),
+            map(denominators.__getitem__, rates)
+        )))
+
+    def __add__(self, other: "MoneyArray") -> "MoneyArray":
+        return MoneyArray(array('q', map(add, self.cents, other.cents)))
+
+    def __sub__(self, other: "MoneyArray") -> "MoneyArray":
+        return MoneyArray(array('q', map(sub, self.cents, other.cents)))
+
+    def to_floats(self) -> "array[float]":
+        return array('d', [cents / 100 for cents in self.cents])
+
+    def __repr__(self) -> str:
+        return f"MoneyArray({[str(amount) for amount in self]!r})"
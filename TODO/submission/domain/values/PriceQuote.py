@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+
+from submission.domain.values.Money import Money
+
+
+@dataclass(frozen=True)
+class PriceQuote:
+    """What one cart costs, stage by stage, as checkout would charge it."""
+    subtotal: Money
+    bulk_discount: Money
+    membership_discount: Money
+    promotion_discount: Money
+    loyalty_discount: Money
+    discounted: Money
+    tax: Money
+    shipping: Money
+    total: Money
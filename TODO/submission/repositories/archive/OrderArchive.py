@@ -0,0 +1,373 @@
+import bisect
+import datetime
+import json
+import os
+import struct
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from collections.abc import ItemsView, KeysView, ValuesView
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from submission.domain.enums.order_status import OrderStatus
+from submission.domain.models.Order import Order
+from submission.domain.models.OrderLines import OrderLines
+
+# Segment file layout:
+#   magic | block * n | footer | footer offset (uint64) | magic
+# A block is up to `block_size` orders in order id order, zlib-compressed
+# as lines of JSON: first the list of their ids, then one plain list per
+# order (see _pack). A lookup decompresses the block, finds the line by
+# its id and parses only that line. The footer (a compressed JSON
+# object) is the segment's
+# sparse block index: per block its first and last order id, offset,
+# length and oldest and newest created_at (epoch microseconds). It also
+# holds the segment's customer -> order ids map, and the ids whose
+# copies in older segments it replaces.
+MAGIC = b'DSARCH\x00\x01'
+TRAILER = struct.Struct('<Q8s')
+
+# Orders in these statuses are never written again by the services
+TERMINAL_STATUSES = frozenset({OrderStatus.DELIVERED, OrderStatus.CANCELLED})
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+_ANY: Any = object()
+
+# A decompressed block: its order ids, and each order's JSON line
+_Block = Tuple[List[int], List[bytes]]
+_compact_json: Callable[[Any], str] = json.JSONEncoder(separators=(',', ':')).encode
+
+
+def _to_micros(moment: datetime.datetime) -> int:
+    return (moment - _EPOCH) // _MICROSECOND
+
+
+def _pack(order: Order) -> List[Any]:
+    status: Any = order.status.value if isinstance(order.status, OrderStatus) else order.status
+    return [
+        order.order_id, order.customer_id, status, _to_micros(order.created_at),
+        order.total_price, order.shipping_cost, order.tracking_number, order.payment_method,
+        [[item.product_id, item.quantity, item.unit_price, item.discount_applied] for item in order.items]
+    ]
+
+
+def _unpack(fields: List[Any]) -> Order:
+    (order_id, customer_id, status, created_at, total_price, shipping_cost,
+     tracking_number, payment_method, item_rows) = fields
+    items = OrderLines()
+    for product_id, quantity, unit_price, discount_applied in item_rows:
+        items.add(product_id, quantity, unit_price, discount_applied)
+    order = Order(
+        order_id, customer_id, items, OrderStatus(status),
+        _EPOCH + datetime.timedelta(microseconds=created_at), total_price, shipping_cost
+    )
+    order.tracking_number = tracking_number
+    order.payment_method = payment_method
+    return order
+
+
+class _Segment:
+    """One segment file, open for reads, and its sparse block index."""
+
+    def __init__(self, number: int, path: str, blocks: List[List[int]]) -> None:
+        self.number: int = number
+        self.path: str = path
+        self.first_ids: "array[int]" = array('q', [block[0] for block in blocks])
+        self.last_ids: "array[int]" = array('q', [block[1] for block in blocks])
+        self.offsets: "array[int]" = array('q', [block[2] for block in blocks])
+        self.lengths: "array[int]" = array('q', [block[3] for block in blocks])
+        self.oldest: "array[int]" = array('q', [block[4] for block in blocks])
+        self.newest: "array[int]" = array('q', [block[5] for block in blocks])
+        self.handle: BinaryIO = open(path, 'rb')
+
+    def block_for(self, order_id: int) -> int:
+        """The block whose id range covers order_id, or -1."""
+        if not self.first_ids or not self.first_ids[0] <= order_id <= self.last_ids[-1]:
+            return -1
+        block: int = bisect.bisect_right(self.first_ids, order_id) - 1
+        return block if order_id <= self.last_ids[block] else -1
+
+
+class OrderArchive:
+    """
+    Cold tier for orders: immutable, compressed segment files in one
+    directory, written by `DataStore.archive_orders()`.
+
+    Only each segment's sparse block index (one entry per `block_size`
+    orders) and a customer -> order ids map stay in memory. A lookup
+    finds the block by binary search and decompresses it; the last
+    `cache_blocks` blocks read by id are kept, so orders read together
+    (a customer's history) cost one decompression per block. Range scans
+    read the blocks whose created_at span overlaps and bypass the cache.
+
+    An archived order that gets a resident version again (it was updated
+    or re-added) is `mark_resident`: its archived copy no longer counts,
+    and the copy in the segment that archives it next replaces it.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_age: datetime.timedelta = datetime.timedelta(days=90),
+        block_size: int = 256,
+        cache_blocks: int = 64
+    ) -> None:
+        if block_size < 1 or cache_blocks < 1:
+            raise ValueError("block_size and cache_blocks must be at least 1")
+        os.makedirs(directory, exist_ok=True)
+        self.directory: str = directory
+        self.max_age: datetime.timedelta = max_age
+        self.block_size: int = block_size
+        self.cache_blocks: int = cache_blocks
+
+        self._segments: List[_Segment] = []
+        self._order_ids_by_customer: Dict[str, "array[int]"] = {}
+        # Order ids whose valid copy is not simply the one archive copy:
+        # id -> number of the segment holding it, or None while resident
+        self._owner: Dict[int, Optional[int]] = {}
+        # Distinct order ids archived, and how many of those are resident again
+        self._archived: int = 0
+        self._resident: int = 0
+        self._cache: "OrderedDict[Tuple[int, int], _Block]" = OrderedDict()
+        self._lock = threading.RLock()
+
+        for name in sorted(os.listdir(directory)):
+            if name.startswith('segment-') and name.endswith('.dsa'):
+                self._load_segment(os.path.join(directory, name))
+
+    # --- Archiving ---
+
+    def write_segment(self, orders: Iterable[Order]) -> int:
+        """Writes the orders to a new segment file; returns how many it holds."""
+        by_id: List[Order] = sorted(orders, key=_order_id)
+        if not by_id:
+            return 0
+        with self._lock:
+            number: int = self._segments[-1].number + 1 if self._segments else 1
+            replaces: List[int] = [order.order_id for order in by_id if order.order_id in self._owner]
+        path: str = os.path.join(self.directory, f"segment-{number:06d}.dsa")
+
+        blocks: List[List[int]] = []
+        customers: Dict[str, List[int]] = {}
+        partial: str = path + '.partial'
+        with open(partial, 'wb') as handle:
+            handle.write(MAGIC)
+            for start in range(0, len(by_id), self.block_size):
+                chunk: List[Order] = by_id[start:start + self.block_size]
+                rows: List[List[Any]] = [_pack(order) for order in chunk]
+                lines: List[str] = [json.dumps([order.order_id for order in chunk])]
+                lines.extend(map(_compact_json, rows))
+                payload: bytes = zlib.compress("\n".join(lines).encode())
+                created: List[int] = [row[3] for row in rows]
+                blocks.append([
+                    chunk[0].order_id, chunk[-1].order_id, handle.tell(), len(payload),
+                    min(created), max(created)
+                ])
+                handle.write(payload)
+                for order in chunk:
+                    customers.setdefault(order.customer_id, []).append(order.order_id)
+            footer_offset: int = handle.tell()
+            handle.write(zlib.compress(json.dumps(
+                {"blocks": blocks, "customers": customers, "replaces": replaces}
+            ).encode()))
+            handle.write(TRAILER.pack(footer_offset, MAGIC))
+            handle.flush()
+            os.fsync(handle.fileno())
+        # Renamed into place only once complete, as snapshots are
+        os.replace(partial, path)
+
+        with self._lock:
+            self._add_segment(_Segment(number, path, blocks), customers, replaces)
+        return len(by_id)
+
+    def mark_resident(self, order_id: int) -> None:
+        """The store holds a newer version of this order; ignore the archived copy."""
+        with self._lock:
+            if self._owner.get(order_id, _ANY) is not None:
+                self._resident += 1
+            self._owner[order_id] = None
+
+    def order_count(self) -> int:
+        """How many orders have their valid copy in the archive (not resident)."""
+        with self._lock:
+            return self._archived - self._resident
+
+    def order_ids(self) -> List[int]:
+        """The ids of the orders whose valid copy is in the archive, by customer."""
+        found: List[int] = []
+        replaced: Set[int] = set()
+        with self._lock:
+            for order_ids in self._order_ids_by_customer.values():
+                for order_id in order_ids:
+                    owner: Optional[int] = self._owner.get(order_id, _ANY)
+                    if owner is _ANY:
+                        found.append(order_id)
+                    elif owner is not None and order_id not in replaced:
+                        # In more than one segment; count it once
+                        replaced.add(order_id)
+                        found.append(order_id)
+        return found
+
+    # --- Lookups ---
+
+    def get_order(self, order_id: int) -> Optional[Order]:
+        with self._lock:
+            owner: Optional[int] = self._owner.get(order_id, _ANY)
+            if owner is None:
+                return None
+            for segment in reversed(self._segments):
+                if owner is not _ANY and segment.number != owner:
+                    continue
+                block: int = segment.block_for(order_id)
+                if block >= 0:
+                    order_ids, lines = self._read_block(segment, block)
+                    position: int = bisect.bisect_left(order_ids, order_id)
+                    if position < len(order_ids) and order_ids[position] == order_id:
+                        return _unpack(json.loads(lines[position]))
+            return None
+
+    def get_orders_by_customer(self, customer_id: str) -> List[Order]:
+        """The customer's archived orders, by order id."""
+        with self._lock:
+            order_ids: List[int] = sorted(set(self._order_ids_by_customer.get(customer_id, ())))
+            found: List[Optional[Order]] = [self.get_order(order_id) for order_id in order_ids]
+        return [order for order in found if order is not None and order.customer_id == customer_id]
+
+    def get_orders_created_between(
+        self,
+        start_date: datetime.datetime,
+        end_date: datetime.datetime
+    ) -> List[Order]:
+        """Archived orders with start_date <= created_at <= end_date, oldest first."""
+        lo: int = _to_micros(start_date)
+        hi: int = _to_micros(end_date)
+        return self._scan(lo, hi, lambda created: lo <= created <= hi)
+
+    def get_orders_created_after(self, cutoff: datetime.datetime) -> List[Order]:
+        """Archived orders with created_at strictly after cutoff, oldest first."""
+        lo: int = _to_micros(cutoff)
+        return self._scan(lo, None, lambda created: created > lo)
+
+    def close(self) -> None:
+        with self._lock:
+            for segment in self._segments:
+                segment.handle.close()
+            self._cache.clear()
+
+    # --- Internals ---
+
+    def _scan(self, lo: int, hi: Optional[int], created_in_range: Callable[[int], bool]) -> List[Order]:
+        """Orders from the blocks overlapping [lo, hi] whose created_at passes the check."""
+        found: List[Order] = []
+        with self._lock:
+            for segment in self._segments:
+                for block in range(len(segment.first_ids)):
+                    if segment.newest[block] < lo or (hi is not None and segment.oldest[block] > hi):
+                        continue
+                    _order_ids, lines = self._read_block(segment, block, cache=False)
+                    for row in json.loads(b"[" + b",".join(lines) + b"]"):
+                        if created_in_range(row[3]) and self._owner.get(row[0], segment.number) == segment.number:
+                            found.append(_unpack(row))
+        found.sort(key=_created_at)
+        return found
+
+    def _read_block(self, segment: _Segment, block: int, cache: bool = True) -> _Block:
+        """The block's order ids and, in the same order, their unparsed lines."""
+        key: Tuple[int, int] = (segment.number, block)
+        cached: Optional[_Block] = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+        segment.handle.seek(segment.offsets[block])
+        ids_line, *lines = zlib.decompress(segment.handle.read(segment.lengths[block])).split(b"\n")
+        read: _Block = (json.loads(ids_line), lines)
+        if cache:
+            self._cache[key] = read
+            if len(self._cache) > self.cache_blocks:
+                self._cache.popitem(last=False)
+        return read
+
+    def _load_segment(self, path: str) -> None:
+        with open(path, 'rb') as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not an order archive segment: {path}")
+            handle.seek(-TRAILER.size, os.SEEK_END)
+            trailer_offset: int = handle.tell()
+            footer_offset, magic = TRAILER.unpack(handle.read(TRAILER.size))
+            if magic != MAGIC:
+                raise ValueError(f"Order archive segment is incomplete: {path}")
+            handle.seek(footer_offset)
+            footer: Dict[str, Any] = json.loads(zlib.decompress(handle.read(trailer_offset - footer_offset)))
+        number: int = int(os.path.basename(path)[len('segment-'):-len('.dsa')])
+        self._add_segment(_Segment(number, path, footer["blocks"]), footer["customers"], footer["replaces"])
+
+    def _add_segment(self, segment: _Segment, customers: Dict[str, List[int]], replaces: List[int]) -> None:
+        self._segments.append(segment)
+        for customer_id, order_ids in customers.items():
+            known: Optional["array[int]"] = self._order_ids_by_customer.get(customer_id)
+            if known is None:
+                self._order_ids_by_customer[customer_id] = array('q', order_ids)
+            else:
+                known.extend(order_ids)
+            self._archived += len(order_ids)
+        # Replaced ids were archived before (and are counted already)
+        self._archived -= len(replaces)
+        for order_id in replaces:
+            if self._owner.get(order_id, _ANY) is None:
+                self._resident -= 1
+            self._owner[order_id] = segment.number
+
+
+class OrderTable(Dict[int, Order]):
+    """
+    The orders table of a store with an archive: a dict of the resident
+    orders that falls back to the archive on a miss. get(), [], `in`,
+    len(), iteration and keys()/values()/items() see both tiers (reading
+    an archived order's value faults it in); the dict's own methods,
+    e.g. dict.values(table), see the resident orders alone.
+    """
+
+    def __init__(self, archive: OrderArchive) -> None:
+        super().__init__()
+        self.archive: OrderArchive = archive
+
+    def __missing__(self, order_id: int) -> Order:
+        order: Optional[Order] = self.archive.get_order(order_id)
+        if order is None:
+            raise KeyError(order_id)
+        return order
+
+    def get(self, order_id: int, default: Any = None) -> Any:
+        order: Optional[Order] = dict.get(self, order_id)
+        if order is None and isinstance(order_id, int):
+            order = self.archive.get_order(order_id)
+        return default if order is None else order
+
+    def __contains__(self, order_id: object) -> bool:
+        return self.get(order_id) is not None  # type: ignore[arg-type]
+
+    def __len__(self) -> int:
+        return dict.__len__(self) + self.archive.order_count()
+
+    def __iter__(self) -> Iterator[int]:
+        yield from list(dict.__iter__(self))
+        yield from self.archive.order_ids()
+
+    def keys(self) -> KeysView[int]:  # type: ignore[override]
+        return KeysView(self)
+
+    def values(self) -> ValuesView[Order]:  # type: ignore[override]
+        return ValuesView(self)
+
+    def items(self) -> ItemsView[int, Order]:  # type: ignore[override]
+        return ItemsView(self)
+
+
+def _order_id(order: Order) -> int:
+    return order.order_id
+
+
+def _created_at(order: Order) -> datetime.datetime:
+    return order.created_at
@@ -0,0 +1,243 @@
+import csv
+import datetime
+import json
+from contextlib import ExitStack
+from itertools import islice, repeat
+from typing import Any, Callable, Iterable, Iterator, List, Mapping, Optional, Sequence, TextIO, Tuple, Union
+
+from submission.repositories.snapshot.StoreSnapshot import collection_paused
+
+# A row keyed by the parameter names of the matching add_* method, e.g.
+# {'product_id': 'P1', 'name': 'Laptop', 'price': '999.99', ...}.
+# CSV rows hold strings; NDJSON and in-memory rows may hold typed values.
+Row = Mapping[str, Any]
+
+DEFAULT_BATCH_SIZE = 10_000
+
+# Validation stops collecting messages for a batch after this many
+_MAX_ERRORS = 10
+
+_REQUIRED: Any = object()
+
+
+# --- Streaming readers ---
+
+def read_csv(source: Union[str, TextIO]) -> Iterator[Row]:
+    """Yields the rows of a CSV file (path or open file) with a header line."""
+    with ExitStack() as stack:
+        handle: TextIO = (
+            stack.enter_context(open(source, newline='', encoding='utf-8'))
+            if isinstance(source, str) else source
+        )
+        reader = csv.reader(handle)
+        header: Optional[List[str]] = next(reader, None)
+        if header is not None:
+            # What csv.DictReader does, without its per-row Python checks;
+            # a short row simply lacks the trailing fields
+            yield from map(dict, map(zip, repeat(header), reader))
+
+
+def read_ndjson(source: Union[str, TextIO], chunk_lines: int = 1024) -> Iterator[Row]:
+    """
+    Yields one object per non-blank line of a newline-delimited JSON
+    file. Lines are parsed `chunk_lines` at a time as one JSON array,
+    which keeps the parsing in C; a chunk that fails is parsed again
+    line by line to name the bad line.
+    """
+    with ExitStack() as stack:
+        handle: TextIO = (
+            stack.enter_context(open(source, encoding='utf-8'))
+            if isinstance(source, str) else source
+        )
+        first_line: int = 1
+        while True:
+            lines: List[str] = list(islice(handle, chunk_lines))
+            if not lines:
+                return
+            filled: List[str] = [line for line in lines if not line.isspace()]
+            try:
+                rows: List[Any] = json.loads("[" + ",".join(filled) + "]")
+                if len(rows) != len(filled) or set(map(type, rows)) - {dict}:
+                    raise ValueError
+            except ValueError:
+                rows = _parse_lines(lines, first_line)
+            yield from rows
+            first_line += len(lines)
+
+
+def _parse_lines(lines: List[str], first_line: int) -> List[Row]:
+    rows: List[Row] = []
+    for line_number, line in enumerate(lines, start=first_line):
+        if line.isspace():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"line {line_number}: invalid JSON ({error.msg})") from None
+        if not isinstance(row, dict):
+            raise ValueError(f"line {line_number}: expected a JSON object")
+        rows.append(row)
+    return rows
+
+
+# --- Field conversion ---
+# A field converts a whole column at once when every value in it has a
+# type with a known converter (float, int, fromisoformat, or none at
+# all), so the work stays in C. Otherwise, or if that fails, its values
+# are checked one by one, which also names the bad rows.
+
+_Converters = Mapping[type, Optional[Callable[[Any], Any]]]
+
+_TEXT: _Converters = {str: None}
+_NUMBER: _Converters = {str: float, int: float, float: float}
+_INTEGER: _Converters = {str: int, int: int}
+_TIMESTAMP: _Converters = {str: datetime.datetime.fromisoformat, datetime.datetime: None}
+
+
+class Field:
+    """One column of a bulk row: its name, converters, default and limits."""
+
+    def __init__(
+        self,
+        name: str,
+        converters: _Converters,
+        default: Any = _REQUIRED,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None
+    ) -> None:
+        self.name: str = name
+        self.converters: _Converters = converters
+        self.default: Any = default
+        self.minimum: Optional[float] = minimum
+        self.maximum: Optional[float] = maximum
+
+    def column(self, batch: Sequence[Row]) -> List[Any]:
+        """The converted column; raises _RowError at the first bad row."""
+        name: str = self.name
+        try:
+            raw: List[Any] = (
+                [row[name] for row in batch] if self.default is _REQUIRED
+                else [row.get(name, self.default) for row in batch]
+            )
+            converters = {self.converters[kind] for kind in set(map(type, raw))}
+            if len(converters) != 1 or "" in raw:
+                raise TypeError
+            convert: Optional[Callable[[Any], Any]] = converters.pop()
+            values: List[Any] = raw if convert is None else list(map(convert, raw))
+            if values and (
+                (self.minimum is not None and min(values) < self.minimum)
+                or (self.maximum is not None and max(values) > self.maximum)
+            ):
+                raise ValueError
+            return values
+        except (KeyError, TypeError, ValueError):
+            return [self.convert(row) for row in batch]
+
+    def convert(self, row: Row) -> Any:
+        """Converts this field of one row, or raises _RowError."""
+        value: Any = row.get(self.name, self.default)
+        if value is None or value == "" or value is _REQUIRED:
+            if self.default is _REQUIRED:
+                raise _RowError(f"{self.name} is missing")
+            return self.default
+        if type(value) not in self.converters:
+            raise _RowError(f"{self.name}={value!r} has the wrong type")
+        convert: Optional[Callable[[Any], Any]] = self.converters[type(value)]
+        try:
+            converted: Any = value if convert is None else convert(value)
+        except ValueError:
+            raise _RowError(f"{self.name}={value!r} is not valid") from None
+        if self.minimum is not None and converted < self.minimum:
+            raise _RowError(f"{self.name}={value!r} is below {self.minimum:g}")
+        if self.maximum is not None and converted > self.maximum:
+            raise _RowError(f"{self.name}={value!r} is above {self.maximum:g}")
+        return converted
+
+
+class _RowError(ValueError):
+    pass
+
+
+PRODUCT_FIELDS: List[Field] = [
+    Field('product_id', _TEXT),
+    Field('name', _TEXT),
+    Field('price', _NUMBER, minimum=0),
+    Field('quantity', _INTEGER, minimum=0),
+    Field('category', _TEXT),
+    Field('weight', _NUMBER, minimum=0),
+    Field('supplier_id', _TEXT),
+]
+
+CUSTOMER_FIELDS: List[Field] = [
+    Field('customer_id', _TEXT),
+    Field('name', _TEXT),
+    Field('email', _TEXT),
+    Field('tier', _TEXT),
+    Field('phone', _TEXT, default=""),
+    Field('address', _TEXT, default=""),
+    Field('loyalty_points', _INTEGER, default=0, minimum=0),
+]
+
+SUPPLIER_FIELDS: List[Field] = [
+    Field('supplier_id', _TEXT),
+    Field('name', _TEXT),
+    Field('email', _TEXT),
+    Field('reliability', _NUMBER, minimum=0, maximum=1),
+]
+
+PROMOTION_FIELDS: List[Field] = [
+    Field('promo_id', _TEXT),
+    Field('code', _TEXT),
+    Field('discount_percent', _NUMBER, minimum=0, maximum=100),
+    Field('min_purchase', _NUMBER, minimum=0),
+    Field('valid_until', _TIMESTAMP),
+    Field('category', _TEXT),
+]
+
+
+# --- Batching ---
+
+def validated_batches(
+    rows: Iterable[Row],
+    fields: List[Field],
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[List[Tuple[Any, ...]]]:
+    """
+    Reads `rows` in batches of `batch_size` and yields each batch as
+    tuples of converted values in `fields` order (the add_* parameter
+    order). A batch with any bad row raises ValueError naming the rows
+    (numbered from 1) before anything in it is yielded; earlier batches
+    have already been yielded by then.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    iterator: Iterator[Row] = iter(rows)
+    first_row: int = 1
+    while True:
+        # Every object made here is kept, so a collection could find nothing
+        with collection_paused():
+            batch: List[Row] = list(islice(iterator, batch_size))
+            validated: List[Tuple[Any, ...]] = _validate(batch, fields, first_row) if batch else []
+        if not batch:
+            return
+        yield validated
+        first_row += len(batch)
+
+
+def _validate(batch: List[Row], fields: List[Field], first_row: int) -> List[Tuple[Any, ...]]:
+    try:
+        return list(zip(*[field.column(batch) for field in fields]))
+    except _RowError:
+        pass
+
+    # Slow path: go row by row to report every problem in the batch
+    errors: List[str] = []
+    for offset, row in enumerate(batch):
+        for field in fields:
+            try:
+                field.convert(row)
+            except _RowError as error:
+                errors.append(f"row {first_row + offset}: {error}")
+        if len(errors) >= _MAX_ERRORS:
+            break
+    raise ValueError("Invalid rows: " + "; ".join(errors[:_MAX_ERRORS]))
@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+from typing import Any, Callable, FrozenSet, Iterable, List, Optional
+
+# The tables whose writes are reported: the records prices are computed from
+PRICING_TABLES = ('products', 'customers', 'promotions')
+
+
+@dataclass(frozen=True)
+class RecordChange:
+    """
+    A record of `table` written under `key`: added or replaced whole
+    (fields None), or updated in place in `fields`.
+    """
+    table: str
+    key: Any
+    fields: Optional[FrozenSet[str]] = None
+
+
+ChangeListener = Callable[[RecordChange], None]
+
+
+class ChangeListeners:
+    """
+    Listeners for writes to products, customers and promotions. Stores
+    pass every such write to notify() after it is done, outside their
+    locks, on the writing thread; stock moves go to the low-stock
+    listeners instead.
+    """
+
+    def __init__(self) -> None:
+        self._listeners: List[ChangeListener] = []
+
+    def add(self, listener: ChangeListener) -> None:
+        self._listeners.append(listener)
+
+    def __bool__(self) -> bool:
+        return bool(self._listeners)
+
+    def notify(self, table: str, keys: Iterable[Any], fields: Optional[Iterable[str]] = None) -> None:
+        if not self._listeners:
+            return
+        changed: Optional[FrozenSet[str]] = frozenset(fields) if fields is not None else None
+        for key in keys:
+            change = RecordChange(table, key, changed)
+            for listener in self._listeners:
+                listener(change)
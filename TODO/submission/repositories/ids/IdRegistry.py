@@ -0,0 +1,102 @@
+import threading
+from typing import AbstractSet, Any, Dict, Iterable, Iterator, List, Optional, Set, TypeVar
+
+T = TypeVar('T')
+
+
+class IdRegistry:
+    """
+    Dense integer keys for external string ids ("P1", a category name,
+    ...). Keys are handed out from 0 in first-seen order and never
+    reused, so a list indexed by key can stand in for a dict keyed by
+    the id. The registry keeps the first string object it saw for each
+    id and canonical() hands that one out, so records repeating a value
+    share one string instead of holding a copy each.
+
+    Lookups are single dict or list reads; registering new ids takes a
+    lock, so threads can share a registry.
+    """
+
+    def __init__(self, ids: Iterable[str] = ()) -> None:
+        # key -> id; read it directly to map many keys back at once
+        self.ids: List[str] = list(ids)
+        self._keys: Dict[str, int] = {external_id: key for key, external_id in enumerate(self.ids)}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, external_id: object) -> bool:
+        return external_id in self._keys
+
+    def key_of(self, external_id: str) -> Optional[int]:
+        """The id's key, or None if it was never registered."""
+        return self._keys.get(external_id)
+
+    def id_of(self, key: int) -> str:
+        return self.ids[key]
+
+    def intern(self, external_id: str) -> int:
+        """The id's key, registering it first if it is new."""
+        key: Optional[int] = self._keys.get(external_id)
+        if key is None:
+            with self._lock:
+                key = self._keys.get(external_id)
+                if key is None:
+                    key = len(self.ids)
+                    # List first: a reader that finds the key finds the id
+                    self.ids.append(external_id)
+                    self._keys[external_id] = key
+        return key
+
+    def intern_many(self, external_ids: List[str]) -> List[int]:
+        """intern() for a batch: new ids are registered in one step, then every id is looked up in C."""
+        keys: Dict[str, int] = self._keys
+        new_ids: List[str] = list(dict.fromkeys(
+            external_id for external_id in external_ids if external_id not in keys
+        ))
+        if new_ids:
+            with self._lock:
+                new_ids = [external_id for external_id in new_ids if external_id not in keys]
+                first: int = len(self.ids)
+                self.ids.extend(new_ids)
+                keys.update(zip(new_ids, range(first, first + len(new_ids))))
+        return list(map(keys.__getitem__, external_ids))
+
+    def canonical(self, external_id: str) -> str:
+        """The registry's shared string equal to external_id."""
+        return self.ids[self.intern(external_id)]
+
+
+class KeySet(AbstractSet[str]):
+    """
+    Read-only set of ids over a live set of keys. Membership is one
+    dict lookup plus one set lookup, and nothing is copied, so an
+    index can hand out a large set of ids for `in` tests.
+    """
+
+    def __init__(self, registry: IdRegistry, keys: AbstractSet[int]) -> None:
+        self._registry = registry
+        self._keys = keys
+        # Any key: `in` may be asked about a non-string
+        ids_to_keys: Dict[Any, int] = registry._keys
+        self._key_of = ids_to_keys.get
+
+    def __contains__(self, external_id: object) -> bool:
+        key: Optional[int] = self._key_of(external_id)
+        return key is not None and key in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        ids: List[str] = self._registry.ids
+        return (ids[key] for key in self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable[T]) -> Set[T]:
+        # Results of &, |, - ... are plain sets of ids
+        return set(it)
+
+    def __repr__(self) -> str:
+        return f"KeySet({set(self)!r})"
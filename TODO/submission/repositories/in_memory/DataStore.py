@@ -1,5 +1,13 @@
+import bisect
 import datetime
-from typing import Dict, List, Any, Optional
+import threading
+import time
+from contextlib import ExitStack, contextmanager, nullcontext
+from itertools import starmap
+from operator import attrgetter
+from typing import (
+    AbstractSet, Callable, ContextManager, Dict, Iterable, Iterator, List, Any, Optional, Sequence, Set, Tuple
+)
 
 from submission.domain.models.Customer import Customer
 from submission.domain.models.Order import Order
@@ -7,19 +15,130 @@ from submission.domain.models.OrderItem import OrderItem
 from submission.domain.models.Supplier import Supplier
 from submission.domain.models.Promotion import Promotion
 from submission.domain.models.Product import Product
-class DataStore:
-    def __init__(self) -> None:
+from submission.domain.models.Shipment import Shipment
+from submission.domain.enums.shipment_status import ShipmentStatus
+from submission.repositories.bulk.BulkRows import (
+    CUSTOMER_FIELDS,
+    DEFAULT_BATCH_SIZE,
+    PRODUCT_FIELDS,
+    PROMOTION_FIELDS,
+    SUPPLIER_FIELDS,
+    Row,
+    validated_batches
+)
+from submission.repositories.changes.RecordChanges import ChangeListener, ChangeListeners
+from submission.repositories.archive.OrderArchive import TERMINAL_STATUSES, OrderArchive, OrderTable
+from submission.repositories.ids.IdRegistry import IdRegistry, KeySet
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface
+from submission.repositories.in_memory.InventoryLog import InventoryLog
+from submission.repositories.in_memory.ReadView import ABSENT, ReadView, VersionChain, copy_record
+from submission.repositories.journal.InventoryJournal import InventoryJournal
+from submission.repositories.stock.StockLevels import LowStockListener, LowStockListeners, StockLevelIndex, StockMove
+from submission.repositories.snapshot.StoreSnapshot import (
+    SnapshotContents,
+    collection_paused,
+    read_snapshot,
+    write_snapshot
+)
+from submission.repositories.wal.WriteAheadLog import (
+    WriteAheadLog,
+    decode_order,
+    decode_shipment,
+    encode_order,
+    encode_shipment
+)
+class DataStore(DataStoreInterface):
+    def __init__(
+        self, 
+        journal: Optional[InventoryJournal] = None, 
+        thread_safe: bool = False, 
+        lock_stripes: int = 64,
+        wal: Optional[WriteAheadLog] = None,
+        archive: Optional[OrderArchive] = None
+    ) -> None:
+        if journal and wal:
+            raise ValueError("Use either an inventory journal or a write-ahead log, not both")
         self.products: Dict[str, Product] = {}
         self.customers: Dict[str, Customer] = {}
-        self.orders: Dict[int, Order] = {}
+        # With an archive, old finished orders move to its segments (see
+        # archive_orders); self.orders then holds the resident ones and
+        # looks the others up there. The indexes below cover resident
+        # orders only, and lookups through them add the archived matches.
+        self.archive: Optional[OrderArchive] = archive
+        self.orders: Dict[int, Order] = OrderTable(archive) if archive else {}
         self.suppliers: Dict[str, Supplier] = {}
         self.promotions: Dict[str, Promotion] = {}
-        self.shipments: Dict[int, Dict[str, Any]] = {}
-        self.inventory_logs: List[Dict[str, Any]] = []
+        self.shipments: Dict[int, Shipment] = {}
+        self.inventory_logs: InventoryLog = InventoryLog()
+
+        # Dense integer keys (see IdRegistry) for product ids, categories
+        # and supplier ids. The product indexes below hold product keys,
+        # _products_by_key maps a key back to its product with a list
+        # index, and stored records share the registries' strings.
+        self._product_keys: IdRegistry = IdRegistry()
+        self._products_by_key: List[Product] = []
+        self._categories: IdRegistry = IdRegistry()
+        self._supplier_keys: IdRegistry = IdRegistry()
+
+        # Secondary indexes (kept in sync by every write below)
+        self._order_ids_by_customer: Dict[str, List[int]] = {}
+        self._product_keys_by_category: List[Set[int]] = []
+        self._product_keys_by_supplier: List[Set[int]] = []
+        self._stock_levels: StockLevelIndex = StockLevelIndex()
+        self._low_stock: LowStockListeners = LowStockListeners()
+        self._changes: ChangeListeners = ChangeListeners()
+        self._shipment_id_by_tracking_number: Dict[str, int] = {}
+        self._shipment_ids_by_order: Dict[int, List[int]] = {}
+        self._shipment_ids_by_status: Dict[ShipmentStatus, Set[int]] = {}
 
-        # Incrementing IDs and shipment IDs
+        # Orders sorted by created_at as two parallel arrays, searched with bisect
+        self._order_created_at: List[datetime.datetime] = []
+        self._order_ids_by_created_at: List[int] = []
+
+        # Optional on-disk journal. Stock levels replayed from it replace
+        # the quantity passed to add_product for products it already knows.
+        self.journal: Optional[InventoryJournal] = journal
+        self._journaled_stock: Dict[str, int] = journal.replay() if journal else {}
+
+        # Incrementing IDs and shipment IDs (hand them out with allocate_*)
         self.next_order_id: int = 1
         self.next_shipment_id: int = 1
+        self._id_lock = threading.Lock()
+
+        # Thread-safe mode. Stock changes lock the stripe(s) of their
+        # products; index and log writes share one lock. Point lookups
+        # (get_product, get_order, ...) are single dict reads, atomic
+        # under the GIL, and never lock.
+        self.thread_safe: bool = thread_safe
+        self._stock_locks: List[ContextManager[Any]] = (
+            [threading.Lock() for _ in range(lock_stripes)] if thread_safe else [nullcontext()]
+        )
+        self._index_lock: ContextManager[Any] = threading.RLock() if thread_safe else nullcontext()
+        self._log_lock: ContextManager[Any] = threading.Lock() if thread_safe else nullcontext()
+
+        # Read views (see ReadView). While any is open, each record write
+        # takes a new version and first keeps the record's current state
+        # in a per-key chain; with none open, writes skip all of this.
+        # Record writes and view opening share _version_lock, so a view
+        # never opens halfway through a write.
+        self._version: int = 0
+        self._view_versions: List[int] = []
+        self._history: Dict[str, Dict[Any, VersionChain]] = {
+            table: {} for table in
+            ('products', 'customers', 'orders', 'suppliers', 'promotions', 'shipments')
+        }
+        self._version_lock: ContextManager[Any] = threading.Lock() if thread_safe else nullcontext()
+        self._open_view = threading.local()
+
+        # Optional write-ahead log of every mutation. Its records are
+        # replayed first; only then is it attached, so replay is not logged
+        # again. Records are appended inside the locks of the write they
+        # describe, so the log has writes to the same record in order.
+        self.wal: Optional[WriteAheadLog] = None
+        if wal:
+            with collection_paused():
+                self._replay(wal.records())
+            self.wal = wal
     
     def log_inventory_change(
         self, 
@@ -27,12 +146,101 @@ class DataStore:
         quantity_change: int, 
         reason: str
     ) -> None:
-        self.inventory_logs.append({
-            'product_id': product_id,
-            'quantity_change': quantity_change,
-            'reason': reason,
-            'timestamp': datetime.datetime.now()
-        })
+        logged_at: float = time.time()
+        self._log_stock_change(product_id, quantity_change, reason, logged_at)
+        self._write_ahead(("log", product_id, quantity_change, reason, logged_at))
+
+    def _log_stock_change(self, product_id: str, quantity_change: int, reason: str, logged_at: float) -> None:
+        """Records a stock movement that is part of a logged write (not logged on its own)."""
+        with self._log_lock:
+            self.inventory_logs.append(product_id, quantity_change, reason, logged_at)
+            if self.journal:
+                self.journal.append(product_id, quantity_change, reason, logged_at)
+
+    def compact_journal(self) -> None:
+        """Checkpoints current stock levels and drops older journal segments."""
+        if self.journal:
+            self.journal.compact({
+                product_id: product.quantity_available
+                for product_id, product in self.products.items()
+            })
+    
+    # --- Snapshots ---
+
+    def snapshot(self, path: str) -> None:
+        """
+        Writes every table, the inventory log and the id counters to one
+        binary file. Archived orders stay in their archive segments.
+        """
+        write_snapshot(path, SnapshotContents(
+            suppliers=list(self.suppliers.values()),
+            products=list(self.products.values()),
+            customers=list(self.customers.values()),
+            promotions=list(self.promotions.values()),
+            # Resident orders only: archived ones stay in their segments
+            orders=list(dict.values(self.orders)),
+            shipments=list(self.shipments.values()),
+            inventory_log=self.inventory_logs,
+            next_order_id=self.next_order_id,
+            next_shipment_id=self.next_shipment_id
+        ))
+
+    @classmethod
+    def restore(
+        cls, 
+        path: str, 
+        journal: Optional[InventoryJournal] = None, 
+        thread_safe: bool = False, 
+        lock_stripes: int = 64,
+        archive: Optional[OrderArchive] = None
+    ) -> "DataStore":
+        """
+        Builds a store from a snapshot() file, without replaying add_*.
+        As with add_product, a journal's stock levels win over the
+        snapshot's for the products it knows. Pass the archive the store
+        was using to keep its archived orders.
+        """
+        store = cls(journal, thread_safe, lock_stripes, archive=archive)
+        with collection_paused():
+            store._load_snapshot(read_snapshot(path))
+        return store
+
+    def _load_snapshot(self, contents: SnapshotContents) -> None:
+        """Assigns the tables whole and builds each index in one pass."""
+        self.suppliers = {supplier.supplier_id: supplier for supplier in contents.suppliers}
+        self.products = {product.product_id: product for product in contents.products}
+        self.customers = {customer.customer_id: customer for customer in contents.customers}
+        self.promotions = {promo.code: promo for promo in contents.promotions}
+        self.orders.update({order.order_id: order for order in contents.orders})
+        self.shipments = {shipment.shipment_id: shipment for shipment in contents.shipments}
+        self.inventory_logs = contents.inventory_log
+        self.next_order_id = contents.next_order_id
+        self.next_shipment_id = contents.next_shipment_id
+
+        for product in contents.products:
+            restored: Optional[int] = self._journaled_stock.pop(product.product_id, None)
+            if restored is not None:
+                product.quantity_available = restored
+        self._index_products(contents.products)
+        for promo in contents.promotions:
+            promo.category = self._categories.canonical(promo.category)
+        for supplier in contents.suppliers:
+            supplier.supplier_id = self._supplier_keys.canonical(supplier.supplier_id)
+        for shipment in contents.shipments:
+            self._index_shipment(shipment)
+
+        by_customer: Dict[str, List[int]] = self._order_ids_by_customer
+        for order in contents.orders:
+            order_ids: Optional[List[int]] = by_customer.get(order.customer_id)
+            if order_ids is None:
+                by_customer[order.customer_id] = [order.order_id]
+            else:
+                order_ids.append(order.order_id)
+
+        # Orders are mostly stored in time order, so this sort is close to linear
+        by_time: List[Order] = sorted(contents.orders, key=attrgetter('created_at'))
+        self._order_created_at = [order.created_at for order in by_time]
+        self._order_ids_by_created_at = [order.order_id for order in by_time]
     
     def add_product(
         self, 
@@ -44,11 +252,45 @@ class DataStore:
         weight: float, 
         supplier_id: str
     ) -> Product:
+        return self._add_product(product_id, name, price, quantity, category, weight, supplier_id, time.time())
+
+    def _add_product(
+        self,
+        product_id: str,
+        name: str,
+        price: float,
+        quantity: int,
+        category: str,
+        weight: float,
+        supplier_id: str,
+        logged_at: float
+    ) -> Product:
+        """add_product(), with the time its initial stock is logged at (the original time on replay)."""
+        restored: Optional[int] = self._journaled_stock.pop(product_id, None)
         product = Product(
-            product_id, name, price, quantity, category, weight, supplier_id
+            product_id, name, price, quantity if restored is None else restored,
+            category, weight, supplier_id
         )
-        self.products[product_id] = product
-        self.log_inventory_change(product_id, quantity, "initial_stock")
+        stock_before: Optional[int] = None
+        with self._version_lock, self._index_lock:
+            previous: Optional[Product] = self.products.get(product_id)
+            self._before_write('products', product_id, previous, in_place=False)
+            if previous:
+                stock_before = previous.quantity_available
+                self._unindex_product(previous)
+            self.products[product_id] = product
+            self._index_product(product)
+            self._write_ahead((
+                "product", product_id, name, price, product.quantity_available, category, weight, supplier_id,
+                logged_at
+            ))
+        self._low_stock.notify([(product_id, stock_before, product.quantity_available)])
+        self._changes.notify('products', [product_id])
+        if restored is None:
+            self._log_stock_change(product_id, quantity, "initial_stock", logged_at)
+        else:
+            # Already journaled; only record it in this process's log
+            self.inventory_logs.append(product_id, restored, "initial_stock", logged_at)
         return product
     
     def add_customer(
@@ -64,7 +306,11 @@ class DataStore:
         customer = Customer(
             customer_id, name, email, tier, phone, address, loyalty_points
         )
-        self.customers[customer_id] = customer
+        with self._version_lock:
+            self._before_write('customers', customer_id, self.customers.get(customer_id), in_place=False)
+            self.customers[customer_id] = customer
+            self._write_ahead(("customer", customer_id, name, email, tier, phone, address, loyalty_points))
+        self._changes.notify('customers', [customer_id])
         return customer
     
     def add_supplier(
@@ -74,8 +320,11 @@ class DataStore:
         email: str, 
         reliability: float
     ) -> Supplier:
-        supplier = Supplier(supplier_id, name, email, reliability)
-        self.suppliers[supplier_id] = supplier
+        supplier = Supplier(self._supplier_keys.canonical(supplier_id), name, email, reliability)
+        with self._version_lock:
+            self._before_write('suppliers', supplier_id, self.suppliers.get(supplier_id), in_place=False)
+            self.suppliers[supplier_id] = supplier
+            self._write_ahead(("supplier", supplier_id, name, email, reliability))
         return supplier
     
     def add_promotion(
@@ -88,10 +337,518 @@ class DataStore:
         category: str
     ) -> Promotion:
         promo = Promotion(
-            promo_id, code, discount_percent, min_purchase, valid_until, category
+            promo_id, code, discount_percent, min_purchase, valid_until, self._categories.canonical(category)
         )
-        self.promotions[code] = promo
+        with self._version_lock:
+            self._before_write('promotions', code, self.promotions.get(code), in_place=False)
+            self.promotions[code] = promo
+            self._write_ahead(("promotion", promo_id, code, discount_percent, min_purchase, valid_until, category))
+        self._changes.notify('promotions', [code])
         return promo
+
+    def add_order(self, order: Order) -> Order:
+        """Stores an order and registers it in the customer index."""
+        with self._version_lock, self._index_lock:
+            previous: Optional[Order] = self.orders.get(order.order_id)
+            self._before_write('orders', order.order_id, previous, in_place=False)
+            if previous and self.archive and not self._is_resident(order.order_id):
+                self.archive.mark_resident(order.order_id)
+            elif previous:
+                self._unindex_order(previous)
+            self.orders[order.order_id] = order
+            self._order_ids_by_customer.setdefault(order.customer_id, []).append(order.order_id)
+            self._index_order_created_at(order)
+            self._write_ahead(("order", encode_order(order)))
+        return order
+
+    def add_shipment(self, shipment: Shipment) -> Shipment:
+        """Stores a shipment and registers it in the tracking number, order and status indexes."""
+        with self._version_lock, self._index_lock:
+            previous: Optional[Shipment] = self.shipments.get(shipment.shipment_id)
+            self._before_write('shipments', shipment.shipment_id, previous, in_place=False)
+            if previous:
+                self._unindex_shipment(previous)
+            self.shipments[shipment.shipment_id] = shipment
+            self._index_shipment(shipment)
+            self._write_ahead(("shipment", encode_shipment(shipment)))
+        return shipment
+
+    # --- Bulk loads (one lock round, index update and log block per batch) ---
+
+    def add_products_bulk(self, rows: Iterable[Row], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        loaded: int = 0
+        for batch in validated_batches(rows, PRODUCT_FIELDS, batch_size):
+            with collection_paused():
+                self._store_products(batch)
+            loaded += len(batch)
+        return loaded
+
+    def add_customers_bulk(self, rows: Iterable[Row], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        loaded: int = 0
+        for batch in validated_batches(rows, CUSTOMER_FIELDS, batch_size):
+            with collection_paused():
+                self._store_customers(batch)
+            loaded += len(batch)
+        return loaded
+
+    def add_suppliers_bulk(self, rows: Iterable[Row], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        loaded: int = 0
+        for batch in validated_batches(rows, SUPPLIER_FIELDS, batch_size):
+            with collection_paused():
+                self._store_suppliers(batch)
+            loaded += len(batch)
+        return loaded
+
+    def add_promotions_bulk(self, rows: Iterable[Row], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        loaded: int = 0
+        for batch in validated_batches(rows, PROMOTION_FIELDS, batch_size):
+            with collection_paused():
+                self._store_promotions(batch)
+            loaded += len(batch)
+        return loaded
+
+    def _store_customers(self, batch: Sequence[Sequence[Any]]) -> None:
+        customers = {customer.customer_id: customer for customer in starmap(Customer, batch)}
+        with self._version_lock:
+            self._store_batch('customers', self.customers, customers)
+            self._write_ahead(("customers", batch))
+        self._changes.notify('customers', customers)
+
+    def _store_suppliers(self, batch: Sequence[Sequence[Any]]) -> None:
+        suppliers = {supplier.supplier_id: supplier for supplier in starmap(Supplier, batch)}
+        for supplier in suppliers.values():
+            supplier.supplier_id = self._supplier_keys.canonical(supplier.supplier_id)
+        with self._version_lock:
+            self._store_batch('suppliers', self.suppliers, suppliers)
+            self._write_ahead(("suppliers", batch))
+
+    def _store_promotions(self, batch: Sequence[Sequence[Any]]) -> None:
+        promotions = {promo.code: promo for promo in starmap(Promotion, batch)}
+        for promo in promotions.values():
+            promo.category = self._categories.canonical(promo.category)
+        with self._version_lock:
+            self._store_batch('promotions', self.promotions, promotions)
+            self._write_ahead(("promotions", batch))
+        self._changes.notify('promotions', promotions)
+
+    def _store_products(self, batch: Sequence[Sequence[Any]], logged_at: Optional[float] = None) -> None:
+        """Stores a batch of product rows; their initial stock is logged at `logged_at` (default now)."""
+        if logged_at is None:
+            logged_at = time.time()
+        products: List[Product] = list(starmap(Product, batch))
+        # As in add_product, stock replayed from the journal wins and is
+        # only recorded in this process's log
+        restored: List[Product] = []
+        fresh: List[Product] = products
+        if self._journaled_stock:
+            fresh = []
+            for product in products:
+                quantity: Optional[int] = self._journaled_stock.pop(product.product_id, None)
+                if quantity is None:
+                    fresh.append(product)
+                else:
+                    product.quantity_available = quantity
+                    restored.append(product)
+
+        # A later row for the same id wins, as with repeated add_product calls
+        stored: Dict[str, Product] = {product.product_id: product for product in products}
+        stock_before: Dict[str, int] = {}
+        with self._version_lock, self._index_lock:
+            for previous in self._store_batch('products', self.products, stored):
+                stock_before[previous.product_id] = previous.quantity_available
+                self._unindex_product(previous)
+            self._index_products(stored.values())
+            self._write_ahead(("products", batch, logged_at))
+        self._low_stock.notify(
+            (product.product_id, stock_before.get(product.product_id), product.quantity_available)
+            for product in stored.values()
+        )
+        self._changes.notify('products', stored)
+
+        with self._log_lock:
+            if fresh:
+                product_ids: List[str] = [product.product_id for product in fresh]
+                quantities: List[int] = [product.quantity_available for product in fresh]
+                self.inventory_logs.extend(product_ids, quantities, "initial_stock", logged_at)
+                if self.journal:
+                    self.journal.extend(product_ids, quantities, "initial_stock", logged_at)
+            if restored:
+                self.inventory_logs.extend(
+                    [product.product_id for product in restored],
+                    [product.quantity_available for product in restored],
+                    "initial_stock",
+                    logged_at
+                )
+
+    def _store_batch(self, table: str, live: Dict[Any, Any], records: Dict[Any, Any]) -> List[Any]:
+        """
+        Puts a batch of new records in a table with one dict update
+        (call under _version_lock). Returns the records they replace.
+        """
+        replaced: List[Any] = [live[key] for key in records.keys() & live.keys()]
+        if self._view_versions:
+            for key in records:
+                self._before_write(table, key, live.get(key), in_place=False)
+        live.update(records)
+        return replaced
+
+    # --- Updates (objects are changed in place; indexes follow) ---
+
+    def update_product(self, product: Product, **changes: Any) -> Product:
+        stock_change: bool = 'quantity_available' in changes
+        reindex: bool = 'category' in changes or 'supplier_id' in changes or stock_change
+        # A stock write takes the product's stripe lock first, as deduct_stock() does
+        with self._stock_guard([product.product_id]) if stock_change else nullcontext(), \
+                self._version_lock, self._index_lock if reindex else nullcontext():
+            stock_before: int = product.quantity_available
+            self._before_write('products', product.product_id, product)
+            if reindex:
+                self._unindex_product(product)
+            self._apply_changes(product, changes)
+            if reindex:
+                self._index_product(product)
+            self._write_ahead(("update", "products", product.product_id, changes))
+        if stock_change:
+            self._low_stock.notify([(product.product_id, stock_before, product.quantity_available)])
+        self._changes.notify('products', [product.product_id], changes)
+        return product
+
+    def update_customer(self, customer: Customer, **changes: Any) -> Customer:
+        with self._version_lock:
+            self._before_write('customers', customer.customer_id, customer)
+            self._apply_changes(customer, changes)
+            self._write_ahead(("update", "customers", customer.customer_id, changes))
+        self._changes.notify('customers', [customer.customer_id], changes)
+        return customer
+
+    def update_order(self, order: Order, **changes: Any) -> Order:
+        # An archived order becomes resident again before it is changed
+        unarchive: bool = self.archive is not None and not self._is_resident(order.order_id)
+        reindex: bool = unarchive or 'customer_id' in changes or 'created_at' in changes
+        with self._version_lock, self._index_lock if reindex else nullcontext():
+            self._before_write('orders', order.order_id, order)
+            if unarchive:
+                self.archive.mark_resident(order.order_id)  # type: ignore[union-attr]
+                self.orders[order.order_id] = order
+            elif reindex:
+                self._unindex_order(order)
+            self._apply_changes(order, changes)
+            if reindex:
+                self._order_ids_by_customer.setdefault(order.customer_id, []).append(order.order_id)
+                self._index_order_created_at(order)
+            self._write_ahead(("update", "orders", order.order_id, changes))
+        return order
+
+    def update_promotion(self, promotion: Promotion, **changes: Any) -> Promotion:
+        if 'category' in changes:
+            changes['category'] = self._categories.canonical(changes['category'])
+        with self._version_lock:
+            self._before_write('promotions', promotion.code, promotion)
+            self._apply_changes(promotion, changes)
+            self._write_ahead(("update", "promotions", promotion.code, changes))
+        self._changes.notify('promotions', [promotion.code], changes)
+        return promotion
+
+    def update_shipment_statuses(self, updates: Iterable[Tuple[str, ShipmentStatus]]) -> int:
+        """
+        Applies a carrier scan file in one pass: one lock round, each
+        shipment moved between status buckets in place, one log record.
+        """
+        # Read the rows first, so a file being parsed is not read under the locks
+        rows: List[Tuple[str, ShipmentStatus]] = list(updates)
+        applied: List[List[str]] = []
+        with self._version_lock, self._index_lock:
+            by_tracking_number: Dict[str, int] = self._shipment_id_by_tracking_number
+            by_status: Dict[ShipmentStatus, Set[int]] = self._shipment_ids_by_status
+            for tracking_number, status in rows:
+                shipment_id: Optional[int] = by_tracking_number.get(tracking_number)
+                if shipment_id is None:
+                    continue
+                shipment: Shipment = self.shipments[shipment_id]
+                if shipment.status is not status:
+                    self._before_write('shipments', shipment_id, shipment)
+                    self._discard_shipment_status(shipment)
+                    shipment.status = status
+                    by_status.setdefault(status, set()).add(shipment_id)
+                applied.append([tracking_number, status.value])
+            if applied:
+                self._write_ahead(("shipment_statuses", applied))
+        return len(applied)
+
+    def append_order_history(self, customer: Customer, order_id: int) -> None:
+        with self._version_lock:
+            self._before_write('customers', customer.customer_id, customer)
+            customer.order_history.append(order_id)
+            self._write_ahead(("history", customer.customer_id, order_id))
+
+    # --- Atomic counters and stock ---
+
+    def allocate_order_id(self) -> int:
+        with self._id_lock:
+            order_id: int = self.next_order_id
+            self.next_order_id += 1
+        return order_id
+
+    def allocate_shipment_id(self) -> int:
+        with self._id_lock:
+            shipment_id: int = self.next_shipment_id
+            self.next_shipment_id += 1
+        return shipment_id
+
+    def adjust_stock(self, product_id: str, quantity_change: int, reason: str) -> Optional[Product]:
+        """Adds quantity_change to a product's stock and logs it. None if unknown."""
+        with self._stock_guard([product_id]):
+            product: Optional[Product] = self.products.get(product_id)
+            if not product:
+                return None
+            move: StockMove = (product_id, product.quantity_available, product.quantity_available + quantity_change)
+            logged_at: float = time.time()
+            with self._version_lock:
+                self._before_write('products', product_id, product)
+                product.quantity_available += quantity_change
+                self._write_ahead(("stock", [[product_id, quantity_change]], reason, logged_at))
+            self._move_stock([move])
+            self._log_stock_change(product_id, quantity_change, reason, logged_at)
+        self._low_stock.notify([move])
+        return product
+
+    def deduct_stock(self, items: Sequence[OrderItem], reason: str) -> bool:
+        """
+        Takes the stock for every item, or for none of them if a product
+        is unknown or short. The check and the deduction happen under
+        the products' stripe locks, so concurrent orders cannot oversell.
+        """
+        wanted: Dict[str, int] = {}
+        for item in items:
+            wanted[item.product_id] = wanted.get(item.product_id, 0) + item.quantity
+        with self._stock_guard(wanted):
+            for product_id, quantity in wanted.items():
+                product: Optional[Product] = self.products.get(product_id)
+                if not product or product.quantity_available < quantity:
+                    return False
+            moves: List[StockMove] = [
+                (product_id, self.products[product_id].quantity_available,
+                 self.products[product_id].quantity_available - quantity)
+                for product_id, quantity in wanted.items()
+            ]
+            logged_at: float = time.time()
+            with self._version_lock:
+                for product_id in wanted:
+                    self._before_write('products', product_id, self.products[product_id])
+                for item in items:
+                    self.products[item.product_id].quantity_available -= item.quantity
+                self._write_ahead(("stock", [[item.product_id, -item.quantity] for item in items], reason, logged_at))
+            self._move_stock(moves)
+            for item in items:
+                self._log_stock_change(item.product_id, -item.quantity, reason, logged_at)
+        self._low_stock.notify(moves)
+        return True
+
+    def _move_stock(self, moves: List[StockMove]) -> None:
+        """Updates the stock level index; called under the products' stripe locks."""
+        key_of = self._product_keys.key_of
+        with self._index_lock:
+            for product_id, old, new in moves:
+                self._stock_levels.move(key_of(product_id), old, new)  # type: ignore[arg-type]
+
+    def add_low_stock_listener(self, listener: LowStockListener, below: int) -> None:
+        """
+        Calls listener(LowStockEvent) whenever a product's stock drops
+        below `below` or climbs back to it or above, on the thread that
+        made the change, after the change is done.
+        """
+        self._low_stock.add(listener, below)
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """
+        Calls listener(RecordChange) after every write that adds, replaces
+        or updates a product, customer or promotion, on the thread that
+        made it.
+        """
+        self._changes.add(listener)
+
+    def _stock_guard(self, product_ids: Iterable[str]) -> ContextManager[Any]:
+        """Holds the stripe locks of the given products, taken in index order."""
+        if not self.thread_safe:
+            return nullcontext()
+        stripes: int = len(self._stock_locks)
+        guard = ExitStack()
+        for stripe in sorted({hash(product_id) % stripes for product_id in product_ids}):
+            guard.enter_context(self._stock_locks[stripe])
+        return guard
+
+    # --- Write-ahead log ---
+
+    def sync(self) -> None:
+        """Blocks until every write this thread made is in the write-ahead log on disk."""
+        if self.wal:
+            self.wal.wait()
+
+    def _write_ahead(self, record: Tuple[Any, ...]) -> None:
+        if self.wal:
+            self.wal.append(record)
+
+    def _replay(self, records: Iterable[List[Any]]) -> None:
+        """Applies logged writes in log order through the methods that made them."""
+        for operation, *args in records:
+            if operation == "product":
+                self._add_product(*args)
+            elif operation == "customer":
+                self.add_customer(*args)
+            elif operation == "supplier":
+                self.add_supplier(*args)
+            elif operation == "promotion":
+                self.add_promotion(*args)
+            elif operation == "order":
+                order: Order = self.add_order(decode_order(args[0]))
+                self.next_order_id = max(self.next_order_id, order.order_id + 1)
+            elif operation == "shipment":
+                shipment: Shipment = self.add_shipment(decode_shipment(args[0]))
+                self.next_shipment_id = max(self.next_shipment_id, shipment.shipment_id + 1)
+            elif operation == "shipment_statuses":
+                self.update_shipment_statuses(
+                    (tracking_number, ShipmentStatus(status)) for tracking_number, status in args[0]
+                )
+            elif operation == "update":
+                table, key, changes = args
+                getattr(self, f"update_{table[:-1]}")(getattr(self, table)[key], **changes)
+            elif operation == "history":
+                self.append_order_history(self.customers[args[0]], args[1])
+            elif operation == "stock":
+                deltas, reason, logged_at = args
+                for product_id, quantity_change in deltas:
+                    product: Product = self.products[product_id]
+                    self._move_stock([
+                        (product_id, product.quantity_available, product.quantity_available + quantity_change)
+                    ])
+                    product.quantity_available += quantity_change
+                    self._log_stock_change(product_id, quantity_change, reason, logged_at)
+            elif operation == "log":
+                self._log_stock_change(*args)
+            elif operation in ("products", "customers", "suppliers", "promotions"):
+                getattr(self, f"_store_{operation}")(*args)
+            else:
+                raise ValueError(f"Unknown write-ahead log record: {operation!r}")
+
+    # --- Archive tier ---
+
+    def archive_orders(self, now: Optional[datetime.datetime] = None) -> int:
+        """
+        Moves resident orders in a terminal status that were created more
+        than the archive's max_age before `now` to a new archive segment,
+        out of memory and out of the resident indexes. Returns how many
+        moved. Writers wait while the segment is written.
+        """
+        if not self.archive:
+            return 0
+        cutoff: datetime.datetime = (now or datetime.datetime.now()) - self.archive.max_age
+        with self._version_lock, self._index_lock:
+            end: int = bisect.bisect_left(self._order_created_at, cutoff)
+            moving: List[Order] = [
+                order for order in map(self.orders.__getitem__, self._order_ids_by_created_at[:end])
+                if order.status in TERMINAL_STATUSES
+            ]
+            if not moving:
+                return 0
+            self.archive.write_segment(moving)
+
+            moved: Set[int] = set()
+            for order in moving:
+                self._before_write('orders', order.order_id, order, in_place=False)
+                del self.orders[order.order_id]
+                moved.add(order.order_id)
+            # One pass over each index rather than one removal per order
+            kept: List[int] = [
+                position for position, order_id in enumerate(self._order_ids_by_created_at[:end])
+                if order_id not in moved
+            ]
+            self._order_created_at[:end] = [self._order_created_at[position] for position in kept]
+            self._order_ids_by_created_at[:end] = [self._order_ids_by_created_at[position] for position in kept]
+            for customer_id in {order.customer_id for order in moving}:
+                remaining: List[int] = [
+                    order_id for order_id in self._order_ids_by_customer.get(customer_id, [])
+                    if order_id not in moved
+                ]
+                if remaining:
+                    self._order_ids_by_customer[customer_id] = remaining
+                else:
+                    self._order_ids_by_customer.pop(customer_id, None)
+        return len(moving)
+
+    def _is_resident(self, order_id: int) -> bool:
+        return dict.__contains__(self.orders, order_id)
+
+    @staticmethod
+    def _merged(archived: List[Order], resident: List[Order], sort_key: Callable[[Order], Any]) -> List[Order]:
+        """Both tiers' matches in sort_key order; an order caught moving between them counts once."""
+        if not archived:
+            return resident
+        return sorted({order.order_id: order for order in archived + resident}.values(), key=sort_key)
+
+    # --- Read views ---
+
+    @contextmanager
+    def read_view(self) -> Iterator[ReadView]:
+        """
+        Opens a point-in-time view (see ReadView). Opening it is O(1);
+        while it is open, writers keep one before-image per record they
+        change, which is dropped once no open view needs it. A view
+        opened inside another on the same thread is that same view.
+        """
+        current: Optional[ReadView] = getattr(self._open_view, 'view', None)
+        if current is not None:
+            yield current
+            return
+        with self._version_lock:
+            view = ReadView(self, self._version)
+            self._view_versions.append(view.version)
+        self._open_view.view = view
+        try:
+            yield view
+        finally:
+            self._open_view.view = None
+            with self._version_lock:
+                self._view_versions.remove(view.version)
+                self._prune_history()
+
+    def _before_write(self, table: str, key: Any, current: Any, in_place: bool = True) -> None:
+        """
+        Called under _version_lock just before a record is changed in
+        place or replaced. With views open, stamps a new version and
+        keeps the record's current state (ABSENT for a new key) unless
+        a later write already kept one for the newest view.
+        """
+        if not self._view_versions:
+            return
+        self._version += 1
+        chain: VersionChain = self._history[table].setdefault(key, [])
+        if chain and chain[-1][0] > self._view_versions[-1]:
+            return
+        if current is None:
+            before = ABSENT
+        else:
+            before = copy_record(current) if in_place else current
+        chain.append((self._version, before))
+
+    def _prune_history(self) -> None:
+        """Drops before-images that no open view can reach any more."""
+        if not self._view_versions:
+            for chains in self._history.values():
+                chains.clear()
+            return
+        oldest: int = self._view_versions[0]
+        for chains in self._history.values():
+            for key, chain in list(chains.items()):
+                kept: VersionChain = [entry for entry in chain if entry[0] > oldest]
+                if not kept:
+                    del chains[key]
+                elif len(kept) != len(chain):
+                    chains[key] = kept
+
+    @staticmethod
+    def _apply_changes(target: Any, changes: Dict[str, Any]) -> None:
+        for field, value in changes.items():
+            setattr(target, field, value)
     
     def get_product(self, product_id: str) -> Optional[Product]:
         return self.products.get(product_id)
@@ -101,3 +858,195 @@ class DataStore:
     
     def get_supplier(self, supplier_id: str) -> Optional[Supplier]:
         return self.suppliers.get(supplier_id)
+
+    def get_order(self, order_id: int) -> Optional[Order]:
+        return self.orders.get(order_id)
+
+    def get_shipment(self, shipment_id: int) -> Optional[Shipment]:
+        return self.shipments.get(shipment_id)
+
+    # --- Index lookups (cost is proportional to the result size) ---
+
+    def get_orders_by_customer(self, customer_id: str) -> List[Order]:
+        with self._index_lock:
+            order_ids: List[int] = list(self._order_ids_by_customer.get(customer_id, []))
+        resident: List[Order] = [self.orders[order_id] for order_id in order_ids]
+        if not self.archive:
+            return resident
+        return self._merged(self.archive.get_orders_by_customer(customer_id), resident, attrgetter('order_id'))
+
+    def get_orders_created_between(
+        self, 
+        start_date: datetime.datetime, 
+        end_date: datetime.datetime
+    ) -> List[Order]:
+        """Returns orders with start_date <= created_at <= end_date, oldest first."""
+        with self._index_lock:
+            lo: int = bisect.bisect_left(self._order_created_at, start_date)
+            hi: int = bisect.bisect_right(self._order_created_at, end_date)
+            order_ids: List[int] = self._order_ids_by_created_at[lo:hi]
+        resident: List[Order] = [self.orders[order_id] for order_id in order_ids]
+        if not self.archive:
+            return resident
+        return self._merged(
+            self.archive.get_orders_created_between(start_date, end_date), resident, attrgetter('created_at')
+        )
+
+    def get_orders_created_after(self, cutoff: datetime.datetime) -> List[Order]:
+        """Returns orders with created_at strictly after cutoff, oldest first."""
+        with self._index_lock:
+            lo: int = bisect.bisect_right(self._order_created_at, cutoff)
+            order_ids: List[int] = self._order_ids_by_created_at[lo:]
+        resident: List[Order] = [self.orders[order_id] for order_id in order_ids]
+        if not self.archive:
+            return resident
+        return self._merged(self.archive.get_orders_created_after(cutoff), resident, attrgetter('created_at'))
+
+    def get_product_ids_by_category(self, category: str) -> AbstractSet[str]:
+        """Returns the ids of all products in a category (a live, read-only set)."""
+        return KeySet(self._product_keys, self._keys_in(self._product_keys_by_category, self._categories, category))
+
+    def get_products_by_category(self, category: str) -> List[Product]:
+        with self._index_lock:
+            keys: List[int] = list(self._keys_in(self._product_keys_by_category, self._categories, category))
+        products: List[Product] = self._products_by_key
+        return [products[key] for key in keys]
+
+    def get_products_by_supplier(self, supplier_id: str) -> List[Product]:
+        with self._index_lock:
+            keys: List[int] = list(self._keys_in(self._product_keys_by_supplier, self._supplier_keys, supplier_id))
+        products: List[Product] = self._products_by_key
+        return [products[key] for key in keys]
+
+    def get_products_at_or_below(self, quantity: int) -> List[Product]:
+        """Products with quantity_available <= quantity, lowest stock first."""
+        with self._index_lock:
+            keys: List[int] = self._stock_levels.at_or_below(quantity)
+        products: List[Product] = self._products_by_key
+        return [products[key] for key in keys]
+
+    def get_shipment_by_tracking_number(self, tracking_number: str) -> Optional[Shipment]:
+        shipment_id: Optional[int] = self._shipment_id_by_tracking_number.get(tracking_number)
+        return None if shipment_id is None else self.shipments.get(shipment_id)
+
+    def get_shipments_by_order(self, order_id: int) -> List[Shipment]:
+        with self._index_lock:
+            shipment_ids: List[int] = list(self._shipment_ids_by_order.get(order_id, ()))
+        return [self.shipments[shipment_id] for shipment_id in shipment_ids]
+
+    def get_shipments_by_status(self, status: ShipmentStatus) -> List[Shipment]:
+        with self._index_lock:
+            shipment_ids: List[int] = list(self._shipment_ids_by_status.get(status, ()))
+        return [self.shipments[shipment_id] for shipment_id in shipment_ids]
+
+    # --- Index maintenance ---
+
+    def _register_product(self, product: Product) -> Tuple[int, int, int]:
+        """
+        Gives a product (and its category and supplier id) their keys,
+        points its fields at the registries' shared strings and makes
+        it the product for its key. Returns (product key, category key,
+        supplier key).
+        """
+        key: int = self._product_keys.intern(product.product_id)
+        category_key: int = self._categories.intern(product.category)
+        supplier_key: int = self._supplier_keys.intern(product.supplier_id)
+        product.product_id = self._product_keys.ids[key]
+        product.category = self._categories.ids[category_key]
+        product.supplier_id = self._supplier_keys.ids[supplier_key]
+
+        if key == len(self._products_by_key):
+            self._products_by_key.append(product)
+        else:
+            self._products_by_key[key] = product
+        # Categories and suppliers also get keys from promotions and the
+        # suppliers table, so their index lists may need to catch up
+        while len(self._product_keys_by_category) <= category_key:
+            self._product_keys_by_category.append(set())
+        while len(self._product_keys_by_supplier) <= supplier_key:
+            self._product_keys_by_supplier.append(set())
+        return key, category_key, supplier_key
+
+    def _index_product(self, product: Product) -> None:
+        key, category_key, supplier_key = self._register_product(product)
+        self._product_keys_by_category[category_key].add(key)
+        self._product_keys_by_supplier[supplier_key].add(key)
+        self._stock_levels.add(key, product.quantity_available)
+
+    def _index_products(self, products: Iterable[Product]) -> None:
+        """_index_product for a batch: groups the keys, then one set update per category and supplier."""
+        by_category: Dict[int, List[int]] = {}
+        by_supplier: Dict[int, List[int]] = {}
+        stock: List[Tuple[int, int]] = []
+        for product in products:
+            key, category_key, supplier_key = self._register_product(product)
+            by_category.setdefault(category_key, []).append(key)
+            by_supplier.setdefault(supplier_key, []).append(key)
+            stock.append((key, product.quantity_available))
+        for category_key, keys in by_category.items():
+            self._product_keys_by_category[category_key].update(keys)
+        for supplier_key, keys in by_supplier.items():
+            self._product_keys_by_supplier[supplier_key].update(keys)
+        self._stock_levels.add_many(stock)
+
+    def _unindex_product(self, product: Product) -> None:
+        key: int = self._product_keys.intern(product.product_id)
+        self._keys_in(self._product_keys_by_category, self._categories, product.category).discard(key)
+        self._keys_in(self._product_keys_by_supplier, self._supplier_keys, product.supplier_id).discard(key)
+        self._stock_levels.remove(key, product.quantity_available)
+
+    @staticmethod
+    def _keys_in(index: List[Set[int]], registry: IdRegistry, external_id: str) -> Set[int]:
+        """The live set of product keys filed under external_id (a spare empty set if none)."""
+        key: Optional[int] = registry.key_of(external_id)
+        return index[key] if key is not None and key < len(index) else set()
+
+    def _index_order_created_at(self, order: Order) -> None:
+        # Orders normally arrive in time order, so this is usually an append
+        if not self._order_created_at or self._order_created_at[-1] <= order.created_at:
+            self._order_created_at.append(order.created_at)
+            self._order_ids_by_created_at.append(order.order_id)
+            return
+        position: int = bisect.bisect_right(self._order_created_at, order.created_at)
+        self._order_created_at.insert(position, order.created_at)
+        self._order_ids_by_created_at.insert(position, order.order_id)
+
+    def _unindex_order(self, order: Order) -> None:
+        order_ids: List[int] = self._order_ids_by_customer.get(order.customer_id, [])
+        if order.order_id in order_ids:
+            order_ids.remove(order.order_id)
+        if not order_ids:
+            self._order_ids_by_customer.pop(order.customer_id, None)
+
+        # Only entries sharing the same created_at need to be checked
+        position: int = bisect.bisect_left(self._order_created_at, order.created_at)
+        while (
+            position < len(self._order_created_at)
+            and self._order_created_at[position] == order.created_at
+        ):
+            if self._order_ids_by_created_at[position] == order.order_id:
+                del self._order_created_at[position]
+                del self._order_ids_by_created_at[position]
+                break
+            position += 1
+
+    def _index_shipment(self, shipment: Shipment) -> None:
+        self._shipment_id_by_tracking_number[shipment.tracking_number] = shipment.shipment_id
+        self._shipment_ids_by_order.setdefault(shipment.order_id, []).append(shipment.shipment_id)
+        self._shipment_ids_by_status.setdefault(shipment.status, set()).add(shipment.shipment_id)
+
+    def _unindex_shipment(self, shipment: Shipment) -> None:
+        if self._shipment_id_by_tracking_number.get(shipment.tracking_number) == shipment.shipment_id:
+            del self._shipment_id_by_tracking_number[shipment.tracking_number]
+        shipment_ids: List[int] = self._shipment_ids_by_order.get(shipment.order_id, [])
+        if shipment.shipment_id in shipment_ids:
+            shipment_ids.remove(shipment.shipment_id)
+        if not shipment_ids:
+            self._shipment_ids_by_order.pop(shipment.order_id, None)
+        self._discard_shipment_status(shipment)
+
+    def _discard_shipment_status(self, shipment: Shipment) -> None:
+        status_ids: Set[int] = self._shipment_ids_by_status.get(shipment.status, set())
+        status_ids.discard(shipment.shipment_id)
+        if not status_ids:
+            self._shipment_ids_by_status.pop(shipment.status, None)
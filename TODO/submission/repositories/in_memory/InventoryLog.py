@@ -0,0 +1,230 @@
+import bisect
+import datetime
+import time
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from submission.repositories.ids.IdRegistry import IdRegistry
+
+# Reason codes. Free-form reasons that do not fit a known pattern are
+# stored once in a side table and referenced by REASON_OTHER.
+REASON_INITIAL_STOCK = 0
+REASON_RESTOCK = 1
+REASON_ORDER = 2
+REASON_CANCEL_ORDER = 3
+REASON_OTHER = 4
+
+_PREFIXED_REASONS: List[Tuple[str, int]] = [
+    ("cancel_order_", REASON_CANCEL_ORDER),  # must be tested before "order_"
+    ("order_", REASON_ORDER),
+]
+_FIXED_REASONS: Dict[str, int] = {
+    "initial_stock": REASON_INITIAL_STOCK,
+    "restock": REASON_RESTOCK,
+}
+_FIXED_REASON_NAMES: Dict[int, str] = {code: name for name, code in _FIXED_REASONS.items()}
+_PREFIX_BY_CODE: Dict[int, str] = {code: prefix for prefix, code in _PREFIXED_REASONS}
+
+LogEntry = Dict[str, Any]
+
+
+def split_reason(reason: str) -> Optional[Tuple[int, int]]:
+    """
+    Encodes a known reason as (code, reference id), e.g. "order_12" ->
+    (REASON_ORDER, 12). Returns None for free-form reasons.
+    """
+    fixed: Optional[int] = _FIXED_REASONS.get(reason)
+    if fixed is not None:
+        return fixed, 0
+    for prefix, code in _PREFIXED_REASONS:
+        if reason.startswith(prefix):
+            reference: str = reason[len(prefix):]
+            # Only canonical integers round-trip ("007" would not)
+            if reference.isdigit() and str(int(reference)) == reference:
+                return code, int(reference)
+            return None
+    return None
+
+
+def join_reason(code: int, reference_id: int) -> str:
+    """Inverse of split_reason for every code except REASON_OTHER."""
+    prefix: Optional[str] = _PREFIX_BY_CODE.get(code)
+    if prefix is not None:
+        return f"{prefix}{reference_id}"
+    return _FIXED_REASON_NAMES[code]
+
+
+class InventoryLog:
+    """
+    Column-oriented, append-only log of stock movements.
+
+    Each entry is spread over five typed arrays (product surrogate key,
+    quantity delta, epoch timestamp, reason code, reference id) plus a
+    per-product row index, so an entry costs ~33 bytes instead of a
+    dict, a datetime and a string.
+    Iterating or indexing still yields the old dict shape:
+    {'product_id', 'quantity_change', 'reason', 'timestamp'}.
+    """
+
+    def __init__(self) -> None:
+        self._product_keys: "array[int]" = array('I')
+        self._quantity_changes: "array[int]" = array('q')
+        self._timestamps: "array[float]" = array('d')
+        self._reason_codes: "array[int]" = array('B')
+        self._reference_ids: "array[int]" = array('q')
+
+        # Surrogate keys for product ids, and free-form reason strings
+        self._product_ids: IdRegistry = IdRegistry()
+        self._other_reasons: IdRegistry = IdRegistry()
+
+        # Row numbers per product key, in append (= time) order
+        self._rows_by_product: Dict[int, "array[int]"] = {}
+
+    def append(
+        self,
+        product_id: str,
+        quantity_change: int,
+        reason: str,
+        timestamp: Optional[float] = None
+    ) -> None:
+        product_key: int = self._product_ids.intern(product_id)
+        reason_code, reference_id = self._encode_reason(reason)
+
+        self._rows_by_product.setdefault(product_key, array('I')).append(len(self._timestamps))
+        self._product_keys.append(product_key)
+        self._quantity_changes.append(quantity_change)
+        self._timestamps.append(time.time() if timestamp is None else timestamp)
+        self._reason_codes.append(reason_code)
+        self._reference_ids.append(reference_id)
+
+    def extend(
+        self,
+        product_ids: List[str],
+        quantity_changes: List[int],
+        reason: str,
+        timestamp: Optional[float] = None
+    ) -> None:
+        """Appends one entry per product, all with the same reason and time, column by column."""
+        count: int = len(product_ids)
+        if not count:
+            return
+        product_keys: List[int] = self._product_ids.intern_many(product_ids)
+        reason_code, reference_id = self._encode_reason(reason)
+
+        first_row: int = len(self._timestamps)
+        rows_by_product: Dict[int, "array[int]"] = self._rows_by_product
+        for row, product_key in enumerate(product_keys, start=first_row):
+            rows = rows_by_product.get(product_key)
+            if rows is None:
+                rows = rows_by_product[product_key] = array('I')
+            rows.append(row)
+        self._product_keys.extend(product_keys)
+        self._quantity_changes.extend(quantity_changes)
+        self._timestamps.extend(array('d', [time.time() if timestamp is None else timestamp]) * count)
+        self._reason_codes.extend(array('B', [reason_code]) * count)
+        self._reference_ids.extend(array('q', [reference_id]) * count)
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def __getitem__(self, row: int) -> LogEntry:
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("inventory log index out of range")
+        return self._entry(row)
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        for row in range(len(self)):
+            yield self._entry(row)
+
+    def query(
+        self,
+        product_id: str,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None
+    ) -> Iterator[LogEntry]:
+        """
+        Yields one product's entries with start <= timestamp <= end.
+        Only that product's rows are visited, and the time bounds are
+        found by binary search over them.
+        """
+        product_key: Optional[int] = self._product_ids.key_of(product_id)
+        if product_key is None:
+            return
+        rows: "array[int]" = self._rows_by_product[product_key]
+        timestamps: "array[float]" = self._timestamps
+
+        lo: int = 0 if start is None else bisect.bisect_left(
+            rows, start.timestamp(), key=timestamps.__getitem__
+        )
+        hi: int = len(rows) if end is None else bisect.bisect_right(
+            rows, end.timestamp(), key=timestamps.__getitem__
+        )
+        for position in range(lo, hi):
+            yield self._entry(rows[position])
+
+    def net_change(self, product_id: str) -> int:
+        """Sum of all quantity changes logged for a product."""
+        product_key: Optional[int] = self._product_ids.key_of(product_id)
+        if product_key is None:
+            return 0
+        changes: "array[int]" = self._quantity_changes
+        return sum(changes[row] for row in self._rows_by_product[product_key])
+
+    # --- Bulk export / import (used by store snapshots) ---
+
+    def columns(self) -> Tuple[List[str], List[str], List["array[Any]"]]:
+        """
+        Returns the product id table, the free-form reason table and the
+        five row columns (product key, quantity change, timestamp,
+        reason code, reference id). The arrays are the live ones.
+        """
+        return self._product_ids.ids, self._other_reasons.ids, [
+            self._product_keys, self._quantity_changes, self._timestamps,
+            self._reason_codes, self._reference_ids
+        ]
+
+    @classmethod
+    def from_columns(
+        cls,
+        product_ids: List[str],
+        other_reasons: List[str],
+        columns: List["array[Any]"]
+    ) -> "InventoryLog":
+        """Inverse of columns(); takes ownership of the arrays."""
+        log = cls()
+        (log._product_keys, log._quantity_changes, log._timestamps,
+         log._reason_codes, log._reference_ids) = columns
+        log._product_ids = IdRegistry(product_ids)
+        log._other_reasons = IdRegistry(other_reasons)
+
+        rows_by_product: Dict[int, "array[int]"] = {}
+        for row, product_key in enumerate(log._product_keys):
+            rows = rows_by_product.get(product_key)
+            if rows is None:
+                rows = rows_by_product[product_key] = array('I')
+            rows.append(row)
+        log._rows_by_product = rows_by_product
+        return log
+
+    # --- Encoding helpers ---
+
+    def _encode_reason(self, reason: str) -> Tuple[int, int]:
+        known: Optional[Tuple[int, int]] = split_reason(reason)
+        if known is not None:
+            return known
+        return REASON_OTHER, self._other_reasons.intern(reason)
+
+    def _decode_reason(self, code: int, reference_id: int) -> str:
+        if code == REASON_OTHER:
+            return self._other_reasons.id_of(reference_id)
+        return join_reason(code, reference_id)
+
+    def _entry(self, row: int) -> LogEntry:
+        return {
+            'product_id': self._product_ids.id_of(self._product_keys[row]),
+            'quantity_change': self._quantity_changes[row],
+            'reason': self._decode_reason(self._reason_codes[row], self._reference_ids[row]),
+            'timestamp': datetime.datetime.fromtimestamp(self._timestamps[row])
+        }
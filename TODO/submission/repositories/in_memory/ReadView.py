@@ -0,0 +1,327 @@
+import bisect
+import datetime
+from typing import TYPE_CHECKING, AbstractSet, Any, Callable, Dict, Iterator, List, Mapping, Optional, Set, Tuple
+
+from submission.domain.models.Customer import Customer
+from submission.domain.models.Order import Order
+from submission.domain.models.Product import Product
+from submission.domain.models.Promotion import Promotion
+from submission.domain.models.Shipment import Shipment
+from submission.domain.enums.shipment_status import ShipmentStatus
+from submission.domain.models.Supplier import Supplier
+from submission.repositories.interfaces.DataStoreInterface import DataStoreReaderInterface
+
+if TYPE_CHECKING:
+    from submission.repositories.in_memory.DataStore import DataStore
+
+# Before-image of a key that did not exist yet
+ABSENT: Any = object()
+
+# (version of the write, state of the record just before it)
+VersionChain = List[Tuple[int, Any]]
+
+
+def _record_fields(model: type) -> Tuple[str, ...]:
+    """A model's data slots (every slot but __weakref__), looked up once per type."""
+    fields: Optional[Tuple[str, ...]] = _FIELDS.get(model)
+    if fields is None:
+        slots: Tuple[str, ...] = getattr(model, '__slots__')
+        fields = _FIELDS[model] = tuple(name for name in slots if name != '__weakref__')
+    return fields
+
+
+_FIELDS: Dict[type, Tuple[str, ...]] = {}
+
+
+def copy_record(record: Any) -> Any:
+    """
+    Shallow copy of a stored record, slot by slot, plus a copy of the
+    one container that is appended to in place (a customer's order
+    history).
+    """
+    copied = object.__new__(type(record))
+    for name in _record_fields(type(record)):
+        setattr(copied, name, getattr(record, name))
+    if isinstance(record, Customer):
+        copied.order_history = record.order_history[:]
+    return copied
+
+
+class _VersionedTable(Mapping[Any, Any]):
+    """One table of a ReadView: the live dict, resolved as of the view's version."""
+
+    def __init__(self, view: "ReadView", live: Dict[Any, Any], chains: Dict[Any, VersionChain]) -> None:
+        self._view = view
+        self._live = live
+        self._chains = chains
+
+    def __getitem__(self, key: Any) -> Any:
+        record = self._view.resolve(self._live, self._chains, key)
+        if record is None:
+            raise KeyError(key)
+        return record
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        record = self._view.resolve(self._live, self._chains, key)
+        return default if record is None else record
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key) is not None
+
+    def __iter__(self) -> Iterator[Any]:
+        for key, _record in self._records():
+            yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._records())
+
+    def keys(self) -> List[Any]:  # type: ignore[override]
+        return [key for key, _record in self._records()]
+
+    def values(self) -> List[Any]:  # type: ignore[override]
+        return [record for _key, record in self._records()]
+
+    def items(self) -> List[Tuple[Any, Any]]:  # type: ignore[override]
+        return list(self._records())
+
+    def _records(self) -> Iterator[Tuple[Any, Any]]:
+        # list() copies the keys in one step, so writers may keep inserting
+        resolve, live, chains = self._view.resolve, self._live, self._chains
+        for key in list(live):
+            record = resolve(live, chains, key)
+            if record is not None:
+                yield key, record
+
+
+class ReadView(DataStoreReaderInterface):
+    """
+    A point-in-time, read-only view of an in-memory DataStore.
+
+    While a view is open the store keeps, per written record, a chain of
+    (version, before-image) pairs. A view at version v resolves a key to
+    the before-image of the first write after v, or else to the live
+    record. Records are handed out as copies taken before that check,
+    so a write racing the read is either fully visible or not at all.
+    Get one with `DataStore.read_view()`.
+    """
+
+    def __init__(self, store: "DataStore", version: int) -> None:
+        self._store = store
+        self.version: int = version
+        history = store._history
+        self.products: Mapping[str, Product] = _VersionedTable(self, store.products, history['products'])
+        self.customers: Mapping[str, Customer] = _VersionedTable(self, store.customers, history['customers'])
+        self.orders: Mapping[int, Order] = _VersionedTable(self, store.orders, history['orders'])
+        self.suppliers: Mapping[str, Supplier] = _VersionedTable(self, store.suppliers, history['suppliers'])
+        self.promotions: Mapping[str, Promotion] = _VersionedTable(self, store.promotions, history['promotions'])
+        self.shipments: Mapping[int, Shipment] = _VersionedTable(self, store.shipments, history['shipments'])
+
+    def resolve(self, live: Dict[Any, Any], chains: Dict[Any, VersionChain], key: Any) -> Any:
+        """The record for `key` as of this view's version, or None."""
+        # Copy first, check the chain second: a writer appends to the
+        # chain before it changes the record, so a copy that may have
+        # caught a later write is always caught here.
+        record = live.get(key)
+        if record is not None:
+            record = copy_record(record)
+        chain: Optional[VersionChain] = chains.get(key)
+        if chain:
+            for version, before in chain:
+                if version > self.version:
+                    return None if before is ABSENT else before
+        return record
+
+    # --- Point lookups ---
+
+    def get_product(self, product_id: str) -> Optional[Product]:
+        return self.products.get(product_id)
+
+    def get_customer(self, customer_id: str) -> Optional[Customer]:
+        return self.customers.get(customer_id)
+
+    def get_supplier(self, supplier_id: str) -> Optional[Supplier]:
+        return self.suppliers.get(supplier_id)
+
+    def get_order(self, order_id: int) -> Optional[Order]:
+        return self.orders.get(order_id)
+
+    def get_shipment(self, shipment_id: int) -> Optional[Shipment]:
+        return self.shipments.get(shipment_id)
+
+    # --- Index lookups ---
+    # The live indexes give the candidates; records changed since the
+    # view opened are added from the history and every match is checked
+    # against the record as of the view.
+
+    def get_orders_by_customer(self, customer_id: str) -> List[Order]:
+        store = self._store
+        with store._index_lock:
+            order_ids: List[int] = list(store._order_ids_by_customer.get(customer_id, []))
+        return self._matching_orders(
+            order_ids, store.archive.get_orders_by_customer(customer_id) if store.archive else [],
+            lambda order: order.customer_id == customer_id,
+            sort_key=_order_id
+        )
+
+    def get_orders_created_between(
+        self,
+        start_date: datetime.datetime,
+        end_date: datetime.datetime
+    ) -> List[Order]:
+        """Returns orders with start_date <= created_at <= end_date, oldest first."""
+        store = self._store
+        with store._index_lock:
+            lo: int = bisect.bisect_left(store._order_created_at, start_date)
+            hi: int = bisect.bisect_right(store._order_created_at, end_date)
+            order_ids: List[int] = store._order_ids_by_created_at[lo:hi]
+        return self._matching_orders(
+            order_ids, store.archive.get_orders_created_between(start_date, end_date) if store.archive else [],
+            lambda order: start_date <= order.created_at <= end_date,
+            sort_key=_created_at
+        )
+
+    def get_orders_created_after(self, cutoff: datetime.datetime) -> List[Order]:
+        """Returns orders with created_at strictly after cutoff, oldest first."""
+        store = self._store
+        with store._index_lock:
+            lo: int = bisect.bisect_right(store._order_created_at, cutoff)
+            order_ids: List[int] = store._order_ids_by_created_at[lo:]
+        return self._matching_orders(
+            order_ids, store.archive.get_orders_created_after(cutoff) if store.archive else [],
+            lambda order: order.created_at > cutoff,
+            sort_key=_created_at
+        )
+
+    def get_product_ids_by_category(self, category: str) -> AbstractSet[str]:
+        return {product.product_id for product in self.get_products_by_category(category)}
+
+    def get_products_by_category(self, category: str) -> List[Product]:
+        store = self._store
+        with store._index_lock:
+            keys: List[int] = list(store._keys_in(store._product_keys_by_category, store._categories, category))
+        product_ids: List[str] = list(map(store._product_keys.ids.__getitem__, keys))
+        return self._matching(
+            store.products, store._history['products'], product_ids,
+            lambda product: product.category == category
+        )
+
+    def get_products_by_supplier(self, supplier_id: str) -> List[Product]:
+        store = self._store
+        with store._index_lock:
+            keys: List[int] = list(store._keys_in(store._product_keys_by_supplier, store._supplier_keys, supplier_id))
+        product_ids: List[str] = list(map(store._product_keys.ids.__getitem__, keys))
+        return self._matching(
+            store.products, store._history['products'], product_ids,
+            lambda product: product.supplier_id == supplier_id
+        )
+
+    def get_products_at_or_below(self, quantity: int) -> List[Product]:
+        """Products with quantity_available <= quantity, lowest stock first."""
+        store = self._store
+        with store._index_lock:
+            keys: List[int] = store._stock_levels.at_or_below(quantity)
+        product_ids: List[str] = list(map(store._product_keys.ids.__getitem__, keys))
+        return self._matching(
+            store.products, store._history['products'], product_ids,
+            lambda product: product.quantity_available <= quantity,
+            sort_key=_quantity_available
+        )
+
+    def get_shipment_by_tracking_number(self, tracking_number: str) -> Optional[Shipment]:
+        store = self._store
+        shipment_id: Optional[int] = store._shipment_id_by_tracking_number.get(tracking_number)
+        found: List[Shipment] = self._matching(
+            store.shipments, store._history['shipments'], [] if shipment_id is None else [shipment_id],
+            lambda shipment: shipment.tracking_number == tracking_number
+        )
+        return found[0] if found else None
+
+    def get_shipments_by_order(self, order_id: int) -> List[Shipment]:
+        store = self._store
+        with store._index_lock:
+            shipment_ids: List[int] = list(store._shipment_ids_by_order.get(order_id, ()))
+        return self._matching(
+            store.shipments, store._history['shipments'], shipment_ids,
+            lambda shipment: shipment.order_id == order_id
+        )
+
+    def get_shipments_by_status(self, status: ShipmentStatus) -> List[Shipment]:
+        store = self._store
+        with store._index_lock:
+            shipment_ids: List[int] = list(store._shipment_ids_by_status.get(status, ()))
+        return self._matching(
+            store.shipments, store._history['shipments'], shipment_ids,
+            lambda shipment: shipment.status is status
+        )
+
+    def _matching_orders(
+        self,
+        order_ids: List[int],
+        archived: List[Order],
+        predicate: Callable[[Order], bool],
+        sort_key: Callable[[Order], Any]
+    ) -> List[Order]:
+        """
+        _matching over resident candidates plus the archive's matches.
+        An archived copy never changes, so it is used as is unless the
+        order is resident again or was written since the view opened.
+        """
+        store = self._store
+        chains: Dict[Any, VersionChain] = store._history['orders']
+        unchanged: List[Order] = []
+        for order in archived:
+            if order.order_id in chains or store._is_resident(order.order_id):
+                order_ids.append(order.order_id)
+            else:
+                unchanged.append(copy_record(order))
+        found: List[Order] = self._matching(
+            store.orders, chains, list(dict.fromkeys(order_ids)), predicate, sort_key
+        )
+        if unchanged:
+            found.extend(unchanged)
+            found.sort(key=sort_key)
+        return found
+
+    def _matching(
+        self,
+        live: Dict[Any, Any],
+        chains: Dict[Any, VersionChain],
+        candidates: List[Any],
+        predicate: Callable[[Any], bool],
+        sort_key: Optional[Callable[[Any], Any]] = None
+    ) -> List[Any]:
+        resolve = self.resolve
+        found: List[Any] = []
+        for key in candidates:
+            record = resolve(live, chains, key)
+            if record is not None and predicate(record):
+                found.append(record)
+
+        # Records written since the view opened may have left the index
+        # entry the view would have used; look at those directly.
+        changed: List[Any] = list(chains)
+        if changed:
+            seen: Set[Any] = set(candidates)
+            extra: List[Any] = []
+            for key in changed:
+                if key not in seen:
+                    record = resolve(live, chains, key)
+                    if record is not None and predicate(record):
+                        extra.append(record)
+            if extra:
+                found.extend(extra)
+                if sort_key is not None:
+                    found.sort(key=sort_key)
+        return found
+
+
+def _created_at(order: Order) -> datetime.datetime:
+    return order.created_at
+
+
+def _order_id(order: Order) -> int:
+    return order.order_id
+
+
+def _quantity_available(product: Product) -> int:
+    return product.quantity_available
@@ -0,0 +1,283 @@
+from abc import ABC, abstractmethod
+import datetime
+from typing import AbstractSet, Any, ContextManager, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from submission.domain.models.Customer import Customer
+from submission.domain.models.Order import Order
+from submission.domain.models.OrderItem import OrderItem
+from submission.domain.models.Supplier import Supplier
+from submission.domain.models.Promotion import Promotion
+from submission.domain.models.Product import Product
+from submission.domain.models.Shipment import Shipment
+from submission.domain.enums.shipment_status import ShipmentStatus
+from submission.repositories.bulk.BulkRows import DEFAULT_BATCH_SIZE, Row
+from submission.repositories.changes.RecordChanges import ChangeListener
+from submission.repositories.stock.StockLevels import LowStockListener
+
+
+class DataStoreReaderInterface(ABC):
+    """
+    The read half of the storage contract: dict-like tables (for reads
+    only), point lookups and index queries. Both a store and its read
+    views provide it.
+    """
+
+    products: Mapping[str, Product]
+    customers: Mapping[str, Customer]
+    orders: Mapping[int, Order]
+    suppliers: Mapping[str, Supplier]
+    promotions: Mapping[str, Promotion]
+    shipments: Mapping[int, Shipment]
+
+    @abstractmethod
+    def get_product(self, product_id: str) -> Optional[Product]:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def get_customer(self, customer_id: str) -> Optional[Customer]:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def get_supplier(self, supplier_id: str) -> Optional[Supplier]:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def get_order(self, order_id: int) -> Optional[Order]:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def get_shipment(self, shipment_id: int) -> Optional[Shipment]:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def get_orders_by_customer(self, customer_id: str) -> List[Order]:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def get_orders_created_between(
+        self,
+        start_date: datetime.datetime,
+        end_date: datetime.datetime
+    ) -> List[Order]:
+        """Returns orders with start_date <= created_at <= end_date, oldest first."""
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def get_orders_created_after(self, cutoff: datetime.datetime) -> List[Order]:
+        """Returns orders with created_at strictly after cutoff, oldest first."""
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def get_product_ids_by_category(self, category: str) -> AbstractSet[str]:
+        """Read-only; may be a live view of the store's index."""
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def get_products_by_category(self, category: str) -> List[Product]:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def get_products_by_supplier(self, supplier_id: str) -> List[Product]:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def get_products_at_or_below(self, quantity: int) -> List[Product]:
+        """Products with quantity_available <= quantity, lowest stock first."""
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def get_shipment_by_tracking_number(self, tracking_number: str) -> Optional[Shipment]:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def get_shipments_by_order(self, order_id: int) -> List[Shipment]:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def get_shipments_by_status(self, status: ShipmentStatus) -> List[Shipment]:
+        pass  # pragma: no cover
+
+
+class DataStoreInterface(DataStoreReaderInterface):
+    """
+    The storage contract the services are written against.
+
+    Services read through the getters and index lookups, and change a
+    stored object only through the update_* / add_* methods, so a
+    backend can persist (or otherwise track) every write.
+    """
+
+    next_order_id: int
+    next_shipment_id: int
+
+    # --- Writes ---
+
+    @abstractmethod
+    def add_product(
+        self,
+        product_id: str,
+        name: str,
+        price: float,
+        quantity: int,
+        category: str,
+        weight: float,
+        supplier_id: str
+    ) -> Product:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def add_customer(
+        self,
+        customer_id: str,
+        name: str,
+        email: str,
+        tier: str,
+        phone: str,
+        address: str,
+        loyalty_points: int = 0
+    ) -> Customer:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def add_supplier(self, supplier_id: str, name: str, email: str, reliability: float) -> Supplier:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def add_promotion(
+        self,
+        promo_id: str,
+        code: str,
+        discount_percent: float,
+        min_purchase: float,
+        valid_until: datetime.datetime,
+        category: str
+    ) -> Promotion:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def add_order(self, order: Order) -> Order:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def add_shipment(self, shipment: Shipment) -> Shipment:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def update_product(self, product: Product, **changes: Any) -> Product:
+        """Sets the given fields on a stored product, e.g. price=9.99."""
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def update_customer(self, customer: Customer, **changes: Any) -> Customer:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def update_order(self, order: Order, **changes: Any) -> Order:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def update_promotion(self, promotion: Promotion, **changes: Any) -> Promotion:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def update_shipment_statuses(self, updates: Iterable[Tuple[str, ShipmentStatus]]) -> int:
+        """
+        Sets the status of each shipment named by tracking number, e.g.
+        the rows of a carrier scan file, in one write. Unknown tracking
+        numbers are skipped; a later row for the same one wins. Returns
+        how many rows were applied.
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def append_order_history(self, customer: Customer, order_id: int) -> None:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def log_inventory_change(self, product_id: str, quantity_change: int, reason: str) -> None:
+        pass  # pragma: no cover
+
+    # --- Bulk loads ---
+    # Rows are mappings keyed by the matching add_* parameter names, from
+    # any iterable or a streaming BulkRows.read_csv / read_ndjson reader.
+    # Each batch of `batch_size` rows is validated as a whole and then
+    # stored in one step; a bad row raises ValueError naming it, with the
+    # earlier batches already stored and nothing of its own batch.
+    # Each returns the number of rows stored.
+
+    @abstractmethod
+    def add_products_bulk(self, rows: Iterable[Row], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """As add_product per row, with the initial_stock log entries written per batch."""
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def add_customers_bulk(self, rows: Iterable[Row], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def add_suppliers_bulk(self, rows: Iterable[Row], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def add_promotions_bulk(self, rows: Iterable[Row], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        pass  # pragma: no cover
+
+    # --- Atomic operations (safe to call from several threads) ---
+
+    @abstractmethod
+    def allocate_order_id(self) -> int:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def allocate_shipment_id(self) -> int:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def adjust_stock(self, product_id: str, quantity_change: int, reason: str) -> Optional[Product]:
+        """Adds quantity_change to a product's stock and logs it. None if unknown."""
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def deduct_stock(self, items: Sequence[OrderItem], reason: str) -> bool:
+        """Takes the stock for every item, or for none if any product is short."""
+        pass  # pragma: no cover
+
+    # --- Stock events ---
+
+    @abstractmethod
+    def add_low_stock_listener(self, listener: LowStockListener, below: int) -> None:
+        """
+        Calls listener(LowStockEvent) whenever a write takes a product's
+        stock below `below`, or from below it back to `below` or more.
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """
+        Calls listener(RecordChange) after every write that adds, replaces
+        or updates a product, customer or promotion.
+        """
+        pass  # pragma: no cover
+
+    # --- Durability ---
+
+    @abstractmethod
+    def sync(self) -> None:
+        """
+        Blocks until every write made by the calling thread is durable.
+        Services call it once at the end of an operation, so a store that
+        groups commits can cover several writers with one disk flush.
+        """
+        pass  # pragma: no cover
+
+    # --- Read views ---
+
+    @abstractmethod
+    def read_view(self) -> ContextManager[DataStoreReaderInterface]:
+        """
+        Opens a point-in-time, read-only view for long scans such as
+        reports. Writes made after it opens are not visible through it,
+        and holding it open never blocks writers.
+        """
+        pass  # pragma: no cover
@@ -0,0 +1,326 @@
+import mmap
+import os
+import struct
+import time
+from typing import BinaryIO, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from submission.repositories.in_memory.InventoryLog import (
+    REASON_OTHER,
+    join_reason,
+    split_reason
+)
+
+# Written by compact(): the record holds an absolute quantity, not a delta
+REASON_CHECKPOINT = 255
+
+# Fixed-width record, 32 bytes, little-endian:
+#   product key (uint32) | reason code (uint8) | 3 pad | delta (int64)
+#   | epoch timestamp (float64) | reference id (int64)
+# The first 8 bytes read as one int64 are `key | code << 32`, which lets
+# replay() walk the mapped file as an int64 view without unpacking.
+RECORD = struct.Struct('<IB3xqdq')
+RECORD_SIZE = RECORD.size
+_WORDS_PER_RECORD = RECORD_SIZE // 8
+
+# Segment header, padded to one record so records stay 8-byte aligned:
+#   magic | version | flags | record size | record count
+HEADER = struct.Struct('<8sHHIQ')
+HEADER_SIZE = RECORD_SIZE
+_MAGIC = b'INVJRNL\x00'
+_VERSION = 1
+_FLAG_CHECKPOINT = 1
+_COUNT_OFFSET = 16
+
+JournalRecord = Tuple[str, int, str, float]
+
+
+class _KeyFile:
+    """Append-only string table on disk; a value's key is its line number."""
+
+    def __init__(self, path: str) -> None:
+        self.values: List[str] = []
+        self.keys: Dict[str, int] = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8', newline='\n') as handle:
+                for line in handle:
+                    self._remember(line[:-1])
+        self._handle = open(path, 'a', encoding='utf-8', newline='\n')
+
+    def key_for(self, value: str) -> int:
+        key: Optional[int] = self.keys.get(value)
+        if key is None:
+            if '\n' in value:
+                raise ValueError(f"Journal keys cannot contain newlines: {value!r}")
+            self._handle.write(value + '\n')
+            self._handle.flush()
+            key = self._remember(value)
+        return key
+
+    def _remember(self, value: str) -> int:
+        key = len(self.values)
+        self.values.append(value)
+        self.keys[value] = key
+        return key
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+class InventoryJournal:
+    """
+    Append-only, memory-mapped journal of inventory changes.
+
+    Records are fixed-width and written straight into a pre-sized,
+    memory-mapped segment file. A segment that reaches `segment_size`
+    is closed and a new one started. Product ids and free-form reasons
+    are kept in small side files so every record stays 32 bytes.
+    """
+
+    def __init__(self, directory: str, segment_size: int = 64 * 1024 * 1024) -> None:
+        if segment_size < HEADER_SIZE + RECORD_SIZE:
+            raise ValueError("segment_size is too small to hold a record")
+        self.directory: str = directory
+        self.segment_size: int = segment_size
+        self._capacity: int = (segment_size - HEADER_SIZE) // RECORD_SIZE
+        os.makedirs(directory, exist_ok=True)
+
+        self._products = _KeyFile(os.path.join(directory, 'products.keys'))
+        self._reasons = _KeyFile(os.path.join(directory, 'reasons.keys'))
+
+        self._file: Optional[BinaryIO] = None
+        self._map: Optional[mmap.mmap] = None
+        self._count: int = 0
+        self._segment_number: int = 0
+
+        segments: List[int] = self._segment_numbers()
+        if segments:
+            self._open_segment(segments[-1])
+        else:
+            self._create_segment(1, flags=0)
+
+    # --- Writing ---
+
+    def append(
+        self,
+        product_id: str,
+        quantity_change: int,
+        reason: str,
+        timestamp: Optional[float] = None
+    ) -> None:
+        known: Optional[Tuple[int, int]] = split_reason(reason)
+        code, reference_id = known if known is not None else (
+            REASON_OTHER, self._reasons.key_for(reason)
+        )
+        self._write(
+            self._products.key_for(product_id), code, quantity_change,
+            time.time() if timestamp is None else timestamp, reference_id
+        )
+
+    def extend(
+        self,
+        product_ids: List[str],
+        quantity_changes: List[int],
+        reason: str,
+        timestamp: Optional[float] = None
+    ) -> None:
+        """
+        Appends one record per product, all with the same reason and
+        time. The segment's record count is written once per segment,
+        so a crash midway leaves whole records only.
+        """
+        known: Optional[Tuple[int, int]] = split_reason(reason)
+        code, reference_id = known if known is not None else (
+            REASON_OTHER, self._reasons.key_for(reason)
+        )
+        now: float = time.time() if timestamp is None else timestamp
+        key_for = self._products.key_for
+        pack_into = RECORD.pack_into
+        for product_id, quantity_change in zip(product_ids, quantity_changes):
+            if self._count >= self._capacity:
+                self._store_count()
+                self._rotate(flags=0)
+            assert self._map is not None
+            pack_into(
+                self._map, HEADER_SIZE + self._count * RECORD_SIZE,
+                key_for(product_id), code, quantity_change, now, reference_id
+            )
+            self._count += 1
+        self._store_count()
+
+    def compact(self, stock: Mapping[str, int]) -> None:
+        """
+        Replaces the journal with one checkpoint segment holding the
+        given absolute stock levels. The checkpoint is written to a
+        temporary file and renamed into place only once every record
+        is on disk, so a crash before the rename leaves the old
+        segments as they were, and one after it a whole checkpoint.
+        Older segments are removed last.
+        """
+        number: int = self._segment_number + 1
+        size: int = max(self.segment_size, HEADER_SIZE + len(stock) * RECORD_SIZE)
+        temp_path: str = os.path.join(self.directory, 'checkpoint.tmp')
+        now: float = time.time()
+        key_for = self._products.key_for
+        with open(temp_path, 'w+b') as handle:
+            handle.truncate(size)
+            with mmap.mmap(handle.fileno(), size) as mapped:
+                count: int = 0
+                for product_id, quantity in stock.items():
+                    RECORD.pack_into(
+                        mapped, HEADER_SIZE + count * RECORD_SIZE,
+                        key_for(product_id), REASON_CHECKPOINT, quantity, now, 0
+                    )
+                    count += 1
+                HEADER.pack_into(mapped, 0, _MAGIC, _VERSION, _FLAG_CHECKPOINT, RECORD_SIZE, count)
+                mapped.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, self._segment_path(number))
+        self._close_segment()
+        self._open_segment(number)
+        for older in self._segment_numbers():
+            if older < number:
+                os.remove(self._segment_path(older))
+
+    def flush(self) -> None:
+        """Forces mapped pages to disk (msync)."""
+        if self._map is not None:
+            self._map.flush()
+
+    def close(self) -> None:
+        self._close_segment()
+        self._products.close()
+        self._reasons.close()
+
+    # --- Reading ---
+
+    def scan(self) -> Iterator[memoryview]:
+        """
+        Yields, per segment from the newest checkpoint on, a zero-copy
+        view of its records. A view is only valid until the next one
+        is requested.
+        """
+        for number in self._replay_segments():
+            if number == self._segment_number and self._map is not None:
+                with memoryview(self._map)[HEADER_SIZE:HEADER_SIZE + self._count * RECORD_SIZE] as view:
+                    yield view
+                continue
+            with open(self._segment_path(number), 'rb') as handle:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    count: int = HEADER.unpack_from(mapped)[4]
+                    with memoryview(mapped)[HEADER_SIZE:HEADER_SIZE + count * RECORD_SIZE] as view:
+                        yield view
+
+    def records(self) -> Iterator[JournalRecord]:
+        """Yields decoded (product_id, quantity_change, reason, timestamp) tuples."""
+        products: List[str] = self._products.values
+        for view in self.scan():
+            for key, code, delta, timestamp, reference_id in RECORD.iter_unpack(view):
+                if code == REASON_OTHER:
+                    reason = self._reasons.values[reference_id]
+                elif code == REASON_CHECKPOINT:
+                    reason = "checkpoint"
+                else:
+                    reason = join_reason(code, reference_id)
+                yield products[key], delta, reason, timestamp
+
+    def replay(self) -> Dict[str, int]:
+        """
+        Returns the current stock level of every journaled product.
+        Replay starts from the newest checkpoint, whose records hold
+        absolute levels, so every record can simply be summed.
+        """
+        totals: Dict[int, int] = {}
+        get = totals.get
+        for view in self.scan():
+            with view.cast('q') as words:
+                heads, deltas = words[0::_WORDS_PER_RECORD], words[1::_WORDS_PER_RECORD]
+                for head, delta in zip(heads, deltas):
+                    key = head & 0xFFFFFFFF
+                    totals[key] = get(key, 0) + delta
+                heads.release()
+                deltas.release()
+        products: List[str] = self._products.values
+        return {products[key]: quantity for key, quantity in totals.items()}
+
+    @property
+    def segment_paths(self) -> List[str]:
+        return [self._segment_path(number) for number in self._segment_numbers()]
+
+    # --- Segment management ---
+
+    def _write(self, key: int, code: int, delta: int, timestamp: float, reference_id: int) -> None:
+        if self._count >= self._capacity:
+            self._rotate(flags=0)
+        assert self._map is not None
+        RECORD.pack_into(
+            self._map, HEADER_SIZE + self._count * RECORD_SIZE,
+            key, code, delta, timestamp, reference_id
+        )
+        self._count += 1
+        self._store_count()
+
+    def _store_count(self) -> None:
+        assert self._map is not None
+        struct.pack_into('<Q', self._map, _COUNT_OFFSET, self._count)
+
+    def _rotate(self, flags: int) -> None:
+        next_number: int = self._segment_number + 1
+        self._close_segment()
+        self._create_segment(next_number, flags)
+
+    def _close_segment(self) -> None:
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _create_segment(self, number: int, flags: int) -> None:
+        handle = open(self._segment_path(number), 'w+b')
+        handle.truncate(self.segment_size)
+        mapped = mmap.mmap(handle.fileno(), self.segment_size)
+        HEADER.pack_into(mapped, 0, _MAGIC, _VERSION, flags, RECORD_SIZE, 0)
+        self._file, self._map = handle, mapped
+        self._segment_number, self._count = number, 0
+        self._capacity = (self.segment_size - HEADER_SIZE) // RECORD_SIZE
+
+    def _open_segment(self, number: int) -> None:
+        handle = open(self._segment_path(number), 'r+b')
+        mapped = mmap.mmap(handle.fileno(), 0)
+        magic, version, _flags, record_size, count = HEADER.unpack_from(mapped)
+        if magic != _MAGIC or version != _VERSION or record_size != RECORD_SIZE:
+            mapped.close()
+            handle.close()
+            raise ValueError(f"Not a version {_VERSION} inventory journal segment: {handle.name}")
+        self._file, self._map = handle, mapped
+        self._segment_number, self._count = number, count
+        self._capacity = (len(mapped) - HEADER_SIZE) // RECORD_SIZE
+
+    def _replay_segments(self) -> List[int]:
+        numbers: List[int] = self._segment_numbers()
+        for position in range(len(numbers) - 1, -1, -1):
+            if self._segment_flags(numbers[position]) & _FLAG_CHECKPOINT:
+                return numbers[position:]
+        return numbers
+
+    def _segment_flags(self, number: int) -> int:
+        header: Tuple[int, ...]
+        if number == self._segment_number and self._map is not None:
+            header = HEADER.unpack_from(self._map)
+        else:
+            with open(self._segment_path(number), 'rb') as handle:
+                header = HEADER.unpack(handle.read(HEADER.size))
+        flags: int = header[2]
+        return flags
+
+    def _segment_numbers(self) -> List[int]:
+        numbers: List[int] = []
+        for name in os.listdir(self.directory):
+            if name.startswith('segment-') and name.endswith('.journal'):
+                numbers.append(int(name[len('segment-'):-len('.journal')]))
+        return sorted(numbers)
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, f'segment-{number:06d}.journal')
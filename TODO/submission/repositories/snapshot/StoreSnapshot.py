@@ -0,0 +1,358 @@
+import datetime
+import gc
+import operator
+import os
+import struct
+import sys
+from array import array
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import accumulate, chain, compress, repeat
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from submission.domain.enums.order_status import OrderStatus
+from submission.domain.enums.shipment_status import ShipmentStatus
+from submission.domain.models.Customer import Customer
+from submission.domain.models.Order import Order
+from submission.domain.models.OrderLines import OrderLines
+from submission.domain.models.Product import Product
+from submission.domain.models.Promotion import Promotion
+from submission.domain.models.Shipment import Shipment
+from submission.domain.models.Supplier import Supplier
+from submission.repositories.in_memory.InventoryLog import InventoryLog
+
+# File layout:
+#   header | block * block count
+# Header (little-endian): magic | version | array byte order | block count
+# Block: array typecode | payload length | payload (a raw array)
+# Each block is one column of one table, in the order write_snapshot
+# emits them. String columns hold indexes into a single string table,
+# the last block, stored as NUL-separated UTF-8 ('s').
+HEADER = struct.Struct('<8sHBxI')
+BLOCK = struct.Struct('<c7xQ')
+VERSION = 1
+_MAGIC = b'DSSNAP\x00\x00'
+_STRING_TABLE = 's'
+_NO_STRING = -1  # optional string columns
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+_STATUS_BY_VALUE: Dict[str, OrderStatus] = {status.value: status for status in OrderStatus}
+_SHIPMENT_STATUS_BY_VALUE: Dict[str, ShipmentStatus] = {status.value: status for status in ShipmentStatus}
+
+
+@dataclass
+class SnapshotContents:
+    """Everything a snapshot holds, as plain lists of model objects."""
+    suppliers: List[Supplier] = field(default_factory=list)
+    products: List[Product] = field(default_factory=list)
+    customers: List[Customer] = field(default_factory=list)
+    promotions: List[Promotion] = field(default_factory=list)
+    orders: List[Order] = field(default_factory=list)
+    shipments: List[Shipment] = field(default_factory=list)
+    inventory_log: InventoryLog = field(default_factory=InventoryLog)
+    next_order_id: int = 1
+    next_shipment_id: int = 1
+
+
+def _to_micros(moment: datetime.datetime) -> int:
+    return (moment - _EPOCH) // _MICROSECOND
+
+
+def _status_value(status: Any) -> str:
+    return status.value if isinstance(status, OrderStatus) else status
+
+
+class _ColumnWriter:
+    """Collects columns as arrays and interns every string once."""
+
+    def __init__(self) -> None:
+        self.columns: List["array[Any]"] = []
+        self._string_keys: Dict[str, int] = {}
+
+    def column(self, typecode: str, values: Iterable[Any]) -> None:
+        self.columns.append(array(typecode, values))
+
+    def strings(self, values: Iterable[str]) -> None:
+        keys = self._string_keys
+        self.column('I', [keys.setdefault(value, len(keys)) for value in values])
+
+    def optional_strings(self, values: Iterable[Optional[str]]) -> None:
+        keys = self._string_keys
+        self.column('q', [
+            _NO_STRING if value is None else keys.setdefault(value, len(keys))
+            for value in values
+        ])
+
+    def datetimes(self, values: Iterable[datetime.datetime]) -> None:
+        self.column('q', map(_to_micros, values))
+
+    def write(self, path: str) -> None:
+        table: List[str] = list(self._string_keys)
+        for value in table:
+            if '\0' in value:
+                raise ValueError(f"Snapshot strings cannot contain NUL: {value!r}")
+        encoded: bytes = '\0'.join(table).encode('utf-8')
+
+        # Written next to the target and renamed, so a crash never leaves
+        # a half-written snapshot at `path`
+        partial: str = path + '.partial'
+        with open(partial, 'wb') as handle:
+            handle.write(HEADER.pack(
+                _MAGIC, VERSION, sys.byteorder == 'big', len(self.columns) + 1
+            ))
+            for values in self.columns:
+                handle.write(BLOCK.pack(values.typecode.encode(), len(values) * values.itemsize))
+                values.tofile(handle)
+            handle.write(BLOCK.pack(_STRING_TABLE.encode(), len(encoded)))
+            handle.write(encoded)
+        os.replace(partial, path)
+
+
+class _ColumnReader:
+    """Hands back the columns of a snapshot file in the order they were written."""
+
+    def __init__(self, data: bytes) -> None:
+        if len(data) < HEADER.size:
+            raise ValueError("Not a DataStore snapshot (file too short)")
+        magic: bytes
+        version: int
+        big_endian: int
+        count: int
+        magic, version, big_endian, count = HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a DataStore snapshot")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version} (expected {VERSION})")
+        self._swap: bool = bool(big_endian) != (sys.byteorder == 'big')
+
+        blocks: List[Tuple[str, memoryview]] = []
+        view = memoryview(data)
+        offset: int = HEADER.size
+        code: bytes
+        length: int
+        for _ in range(count):
+            if offset + BLOCK.size > len(data):
+                raise ValueError("Snapshot is truncated")
+            code, length = BLOCK.unpack_from(data, offset)
+            offset += BLOCK.size
+            if offset + length > len(data):
+                raise ValueError("Snapshot is truncated")
+            blocks.append((code.decode(), view[offset:offset + length]))
+            offset += length
+
+        typecode, encoded = blocks.pop()
+        if typecode != _STRING_TABLE:
+            raise ValueError("Snapshot has no string table")
+        # The trailing None is what _NO_STRING (-1) resolves to
+        self._strings: List[Optional[str]] = [*str(encoded, 'utf-8').split('\0'), None]
+        self._blocks: Iterator[Tuple[str, memoryview]] = iter(blocks)
+
+    def column(self, typecode: str) -> "array[Any]":
+        found, payload = next(self._blocks, (None, None))
+        if found != typecode:
+            raise ValueError(f"Snapshot is corrupt: expected a '{typecode}' column, found {found!r}")
+        assert payload is not None
+        values: "array[Any]" = array(typecode)
+        values.frombytes(payload)
+        if self._swap:
+            values.byteswap()
+        return values
+
+    def strings(self) -> List[Any]:
+        return list(map(self._strings.__getitem__, self.column('I')))
+
+    def optional_strings(self) -> List[Any]:
+        return list(map(self._strings.__getitem__, self.column('q')))
+
+    def datetimes(self) -> List[datetime.datetime]:
+        micros: "array[int]" = self.column('q')
+        # timedelta(days, seconds, microseconds), built without a Python-level call
+        offsets = map(datetime.timedelta, repeat(0, len(micros)), repeat(0), micros)
+        return list(map(_EPOCH.__add__, offsets))
+
+
+@contextmanager
+def collection_paused() -> Iterator[None]:
+    """
+    Turns the cyclic garbage collector off for a bulk load. Millions of
+    new objects would otherwise set off repeated full collections, and
+    none of them can be garbage yet.
+    """
+    collecting: bool = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if collecting:
+            gc.enable()
+
+
+def _slices(counts: "array[int]") -> List[slice]:
+    """Turns per-row lengths of a flattened column into one slice per row."""
+    ends: List[int] = list(accumulate(counts))
+    return list(map(slice, [0, *ends[:-1]], ends))
+
+
+def write_snapshot(path: str, contents: SnapshotContents) -> None:
+    """Writes `contents` to `path` as one columnar binary file."""
+    out = _ColumnWriter()
+    out.column('q', [contents.next_order_id, contents.next_shipment_id])
+
+    suppliers = contents.suppliers
+    out.strings(s.supplier_id for s in suppliers)
+    out.strings(s.name for s in suppliers)
+    out.strings(s.email for s in suppliers)
+    out.column('d', (s.reliability_score for s in suppliers))
+
+    products = contents.products
+    out.strings(p.product_id for p in products)
+    out.strings(p.name for p in products)
+    out.column('d', (p.price for p in products))
+    out.column('q', (p.quantity_available for p in products))
+    out.strings(p.category for p in products)
+    out.column('d', (p.weight for p in products))
+    out.strings(p.supplier_id for p in products)
+    out.column('B', (p.discount_eligible for p in products))
+
+    customers = contents.customers
+    out.strings(c.customer_id for c in customers)
+    out.strings(c.name for c in customers)
+    out.strings(c.email for c in customers)
+    out.strings(c.tier.value for c in customers)
+    out.strings(c.phone for c in customers)
+    out.strings(c.address for c in customers)
+    out.column('q', (c.loyalty_points for c in customers))
+    out.column('I', (len(c.order_history) for c in customers))
+    out.column('q', (order_id for c in customers for order_id in c.order_history))
+
+    promotions = contents.promotions
+    out.strings(p.promo_id for p in promotions)
+    out.strings(p.code for p in promotions)
+    out.column('d', (p.discount_percent for p in promotions))
+    out.column('d', (p.min_purchase for p in promotions))
+    out.datetimes(p.valid_until for p in promotions)
+    out.strings(p.category for p in promotions)
+    out.column('q', (p.used_count for p in promotions))
+
+    orders = contents.orders
+    out.column('q', (o.order_id for o in orders))
+    out.strings(o.customer_id for o in orders)
+    out.strings(_status_value(o.status) for o in orders)
+    out.datetimes(o.created_at for o in orders)
+    out.column('d', (o.total_price for o in orders))
+    out.column('d', (o.shipping_cost for o in orders))
+    out.optional_strings(o.tracking_number for o in orders)
+    out.optional_strings(o.payment_method for o in orders)
+    lines: List[OrderLines] = [o.items for o in orders]
+    out.column('I', map(len, lines))
+    out.strings(chain.from_iterable(order_lines.product_ids for order_lines in lines))
+    out.column('q', chain.from_iterable(order_lines.quantities for order_lines in lines))
+    out.column('d', (cents / 100 for order_lines in lines for cents in order_lines.unit_cents))
+    out.column('d', (cents / 100 for order_lines in lines for cents in order_lines.discount_cents))
+
+    shipments = contents.shipments
+    out.column('q', (s.shipment_id for s in shipments))
+    out.column('q', (s.order_id for s in shipments))
+    out.strings(s.tracking_number for s in shipments)
+    out.datetimes(s.created_at for s in shipments)
+    out.strings(s.status.value for s in shipments)
+
+    product_ids, other_reasons, log_columns = contents.inventory_log.columns()
+    out.strings(product_ids)
+    out.strings(other_reasons)
+    out.columns.extend(log_columns)
+
+    out.write(path)
+
+
+def read_snapshot(path: str) -> SnapshotContents:
+    """
+    Reads a file written by write_snapshot. Model objects are built
+    column-wise (one map() over the constructor per table), and only
+    fields that differ from the constructor defaults are patched after.
+    """
+    with open(path, 'rb') as handle:
+        source = _ColumnReader(handle.read())
+    with collection_paused():
+        return _build_contents(source)
+
+
+def _build_contents(source: _ColumnReader) -> SnapshotContents:
+    contents = SnapshotContents()
+    contents.next_order_id, contents.next_shipment_id = source.column('q')
+
+    contents.suppliers = list(map(
+        Supplier, source.strings(), source.strings(), source.strings(), source.column('d')
+    ))
+
+    products: List[Product] = list(map(
+        Product, source.strings(), source.strings(), source.column('d'), source.column('q'),
+        source.strings(), source.column('d'), source.strings()
+    ))
+    for product in compress(products, map(operator.not_, source.column('B'))):
+        product.discount_eligible = False
+    contents.products = products
+
+    customers: List[Customer] = list(map(
+        Customer, source.strings(), source.strings(), source.strings(), source.strings(),
+        source.strings(), source.strings(), source.column('q')
+    ))
+    history_counts: "array[int]" = source.column('I')
+    history: "array[int]" = source.column('q')
+    for customer, rows in compress(zip(customers, _slices(history_counts)), history_counts):
+        customer.order_history = history[rows]
+    contents.customers = customers
+
+    promotions: List[Promotion] = list(map(
+        Promotion, source.strings(), source.strings(), source.column('d'), source.column('d'),
+        source.datetimes(), source.strings()
+    ))
+    used_counts: "array[int]" = source.column('q')
+    for promotion, used in compress(zip(promotions, used_counts), used_counts):
+        promotion.used_count = used
+    contents.promotions = promotions
+
+    order_ids: "array[int]" = source.column('q')
+    customer_ids: List[str] = source.strings()
+    status_values: List[str] = source.strings()
+    statuses = map(_STATUS_BY_VALUE.get, status_values, status_values)
+    created_at: List[datetime.datetime] = source.datetimes()
+    totals: "array[float]" = source.column('d')
+    shipping_costs: "array[float]" = source.column('d')
+    tracking_numbers: List[Optional[str]] = source.optional_strings()
+    payment_methods: List[Optional[str]] = source.optional_strings()
+    line_slices: List[slice] = _slices(source.column('I'))
+
+    product_ids: List[str] = source.strings()
+    quantities: "array[int]" = source.column('q')
+    unit_prices: "array[float]" = source.column('d')
+    discounts: "array[float]" = source.column('d')
+    lines: List[OrderLines] = [
+        OrderLines.from_columns(product_ids[s], quantities[s], unit_prices[s], discounts[s])
+        for s in line_slices
+    ]
+
+    orders: List[Order] = list(map(
+        Order, order_ids, customer_ids, lines, statuses,
+        created_at, totals, shipping_costs
+    ))
+    for order, tracking in zip(orders, tracking_numbers):
+        if tracking is not None:
+            order.tracking_number = tracking
+    for order, payment in zip(orders, payment_methods):
+        if payment is not None:
+            order.payment_method = payment
+    contents.orders = orders
+
+    contents.shipments = list(map(
+        Shipment, source.column('q'), source.column('q'), source.strings(),
+        source.datetimes(), map(_SHIPMENT_STATUS_BY_VALUE.__getitem__, source.strings())
+    ))
+
+    contents.inventory_log = InventoryLog.from_columns(
+        source.strings(), source.strings(),
+        [source.column('I'), source.column('q'), source.column('d'),
+         source.column('B'), source.column('q')]
+    )
+    return contents
@@ -0,0 +1,1137 @@
+import datetime
+import os
+import queue
+import sqlite3
+import threading
+import time
+import urllib.parse
+import weakref
+from contextlib import contextmanager
+from functools import partial
+from itertools import starmap
+from typing import (
+    AbstractSet, Any, Callable, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Sequence, Set, Tuple
+)
+
+from submission.domain.enums.order_status import OrderStatus
+from submission.domain.enums.shipment_status import ShipmentStatus
+from submission.domain.models.Customer import Customer
+from submission.domain.models.Order import Order
+from submission.domain.models.OrderItem import OrderItem
+from submission.domain.models.OrderLines import OrderLines
+from submission.domain.models.Supplier import Supplier
+from submission.domain.models.Promotion import Promotion
+from submission.domain.models.Product import Product
+from submission.domain.models.Shipment import Shipment
+from submission.repositories.bulk.BulkRows import (
+    CUSTOMER_FIELDS,
+    DEFAULT_BATCH_SIZE,
+    PRODUCT_FIELDS,
+    PROMOTION_FIELDS,
+    SUPPLIER_FIELDS,
+    Row,
+    validated_batches
+)
+from submission.repositories.ids.IdRegistry import IdRegistry
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface
+from submission.repositories.changes.RecordChanges import ChangeListener, ChangeListeners
+from submission.repositories.stock.StockLevels import LowStockListener, LowStockListeners, StockMove
+
+# Datetimes are stored as integer microseconds since this (naive) epoch,
+# which keeps range queries on an integer index.
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS suppliers (
+    supplier_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    reliability_score REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS products (
+    product_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    price REAL NOT NULL,
+    quantity_available INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    weight REAL NOT NULL,
+    supplier_id TEXT NOT NULL,
+    discount_eligible INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS products_by_category ON products (category);
+CREATE INDEX IF NOT EXISTS products_by_supplier ON products (supplier_id);
+CREATE INDEX IF NOT EXISTS products_by_stock ON products (quantity_available);
+CREATE TABLE IF NOT EXISTS customers (
+    customer_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    membership_tier TEXT NOT NULL,
+    phone TEXT,
+    address TEXT,
+    loyalty_points INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS customer_order_history (
+    customer_id TEXT NOT NULL,
+    order_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS order_history_by_customer ON customer_order_history (customer_id);
+CREATE TABLE IF NOT EXISTS promotions (
+    code TEXT PRIMARY KEY,
+    promo_id TEXT NOT NULL,
+    discount_percent REAL NOT NULL,
+    min_purchase REAL NOT NULL,
+    valid_until INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    used_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS orders (
+    order_id INTEGER PRIMARY KEY,
+    customer_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    total_price REAL NOT NULL,
+    shipping_cost REAL NOT NULL,
+    tracking_number TEXT,
+    payment_method TEXT
+);
+CREATE INDEX IF NOT EXISTS orders_by_customer ON orders (customer_id, order_id);
+CREATE INDEX IF NOT EXISTS orders_by_created_at ON orders (created_at, order_id);
+CREATE TABLE IF NOT EXISTS order_items (
+    order_id INTEGER NOT NULL,
+    line_no INTEGER NOT NULL,
+    product_id TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    unit_price REAL NOT NULL,
+    discount_applied REAL NOT NULL,
+    PRIMARY KEY (order_id, line_no)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS shipments (
+    shipment_id INTEGER PRIMARY KEY,
+    order_id INTEGER NOT NULL,
+    tracking_number TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS shipments_by_tracking_number ON shipments (tracking_number);
+CREATE INDEX IF NOT EXISTS shipments_by_order ON shipments (order_id);
+CREATE INDEX IF NOT EXISTS shipments_by_status ON shipments (status);
+CREATE TABLE IF NOT EXISTS inventory_logs (
+    log_id INTEGER PRIMARY KEY,
+    product_id TEXT NOT NULL,
+    quantity_change INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS inventory_logs_by_product ON inventory_logs (product_id, timestamp);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# Statement texts are constants so each connection's statement cache
+# hands back the already-prepared statement on every call.
+_PRODUCT_COLUMNS = "product_id, name, price, quantity_available, category, weight, supplier_id, discount_eligible"
+_CUSTOMER_COLUMNS = "customer_id, name, email, membership_tier, phone, address, loyalty_points"
+_SUPPLIER_COLUMNS = "supplier_id, name, email, reliability_score"
+_PROMOTION_COLUMNS = "promo_id, code, discount_percent, min_purchase, valid_until, category, used_count"
+_ORDER_COLUMNS = (
+    "order_id, customer_id, status, created_at, total_price, shipping_cost, tracking_number, payment_method"
+)
+_SHIPMENT_COLUMNS = "shipment_id, order_id, tracking_number, created_at, status"
+
+_INSERT_PRODUCT = f"INSERT OR REPLACE INTO products ({_PRODUCT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+_INSERT_CUSTOMER = f"INSERT OR REPLACE INTO customers ({_CUSTOMER_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)"
+_INSERT_SUPPLIER = f"INSERT OR REPLACE INTO suppliers ({_SUPPLIER_COLUMNS}) VALUES (?, ?, ?, ?)"
+_INSERT_PROMOTION = f"INSERT OR REPLACE INTO promotions ({_PROMOTION_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)"
+_INSERT_ORDER = f"INSERT OR REPLACE INTO orders ({_ORDER_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+_INSERT_ORDER_ITEM = (
+    "INSERT INTO order_items (order_id, line_no, product_id, quantity, unit_price, discount_applied) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_INSERT_SHIPMENT = f"INSERT OR REPLACE INTO shipments ({_SHIPMENT_COLUMNS}) VALUES (?, ?, ?, ?, ?)"
+_SET_SHIPMENT_STATUS = "UPDATE shipments SET status = ? WHERE tracking_number = ?"
+_INSERT_HISTORY = "INSERT INTO customer_order_history (customer_id, order_id) VALUES (?, ?)"
+_INSERT_LOG = (
+    "INSERT INTO inventory_logs (product_id, quantity_change, reason, timestamp) VALUES (?, ?, ?, ?)"
+)
+_SET_COUNTER = "INSERT OR REPLACE INTO counters (name, value) VALUES (?, ?)"
+_ADJUST_STOCK = "UPDATE products SET quantity_available = quantity_available + ? WHERE product_id = ?"
+_GET_STOCK = "SELECT quantity_available FROM products WHERE product_id = ?"
+
+_ITEM_COLUMNS = "order_id, product_id, quantity, unit_price, discount_applied"
+
+
+def _to_micros(moment: datetime.datetime) -> int:
+    return (moment - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(micros: int) -> datetime.datetime:
+    return _EPOCH + datetime.timedelta(microseconds=micros)
+
+
+def _encode_status(status: Any) -> str:
+    return status.value if isinstance(status, OrderStatus) else status
+
+
+def _scalar(connection: sqlite3.Connection, sql: str, params: Sequence[Any] = ()) -> int:
+    """The single integer an aggregate or point query returns."""
+    row: Optional[Tuple[Any, ...]] = connection.execute(sql, params).fetchone()
+    if row is None:
+        raise LookupError(f"no row for {sql!r}")
+    value: int = row[0]
+    return value
+
+
+# Fields update_* may change, with their encoder for the column value
+_Encoder = Callable[[Any], Any]
+_PRODUCT_FIELDS: Dict[str, Optional[_Encoder]] = {
+    'name': None, 'price': None, 'quantity_available': None, 'category': None,
+    'weight': None, 'supplier_id': None, 'discount_eligible': int,
+}
+_CUSTOMER_FIELDS: Dict[str, Optional[_Encoder]] = {
+    'name': None, 'email': None, 'phone': None, 'address': None, 'loyalty_points': None,
+    'membership_tier': lambda tier: tier.get_name(),
+}
+_ORDER_FIELDS: Dict[str, Optional[_Encoder]] = {
+    'customer_id': None, 'total_price': None, 'shipping_cost': None,
+    'tracking_number': None, 'payment_method': None,
+    'status': _encode_status,
+    'created_at': _to_micros,
+}
+_PROMOTION_FIELDS: Dict[str, Optional[_Encoder]] = {
+    'promo_id': None, 'discount_percent': None, 'min_purchase': None,
+    'category': None, 'used_count': None,
+    'valid_until': _to_micros,
+}
+
+
+class _TableView(Mapping[Any, Any]):
+    """
+    Read-only, dict-like view of one table, so code written against the
+    in-memory store's dicts (`store.customers.values()`, ...) keeps working.
+    """
+
+    def __init__(
+        self,
+        get_one: Callable[[Any], Any],
+        load_all: Callable[[], List[Any]],
+        key_of: Callable[[Any], Any],
+        connection_for_read: Callable[[], Any],
+        table: str,
+        key_column: str
+    ) -> None:
+        self._get_one = get_one
+        self._load_all = load_all
+        self._key_of = key_of
+        self._reader = connection_for_read
+        self._keys_sql: str = f"SELECT {key_column} FROM {table} ORDER BY rowid"
+        self._count_sql: str = f"SELECT COUNT(*) FROM {table}"
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self._get_one(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return self._get_one(key) is not None
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        with self._reader() as connection:
+            return _scalar(connection, self._count_sql)
+
+    def keys(self) -> List[Any]:  # type: ignore[override]
+        with self._reader() as connection:
+            return [row[0] for row in connection.execute(self._keys_sql)]
+
+    def values(self) -> List[Any]:  # type: ignore[override]
+        # One query for the whole table instead of one per key
+        return self._load_all()
+
+    def items(self) -> List[Tuple[Any, Any]]:  # type: ignore[override]
+        return [(self._key_of(value), value) for value in self._load_all()]
+
+
+class _InventoryLogView:
+    """The inventory_logs table, with the same surface as InventoryLog."""
+
+    def __init__(self, store: "SqliteDataStore") -> None:
+        self._store = store
+
+    def __len__(self) -> int:
+        with self._store._reader(flush_logs=True) as connection:
+            return _scalar(connection, "SELECT COUNT(*) FROM inventory_logs")
+
+    def __getitem__(self, row: int) -> Dict[str, Any]:
+        if row < 0:
+            row += len(self)
+        with self._store._reader(flush_logs=True) as connection:
+            found = connection.execute(
+                "SELECT product_id, quantity_change, reason, timestamp FROM inventory_logs "
+                "ORDER BY log_id LIMIT 1 OFFSET ?", (row,)
+            ).fetchone() if row >= 0 else None
+        if found is None:
+            raise IndexError("inventory log index out of range")
+        return self._entry(found)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with self._store._reader(flush_logs=True) as connection:
+            rows = connection.execute(
+                "SELECT product_id, quantity_change, reason, timestamp FROM inventory_logs ORDER BY log_id"
+            ).fetchall()
+        return (self._entry(row) for row in rows)
+
+    def query(
+        self,
+        product_id: str,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yields one product's entries with start <= timestamp <= end."""
+        low: float = float('-inf') if start is None else start.timestamp()
+        high: float = float('inf') if end is None else end.timestamp()
+        with self._store._reader(flush_logs=True) as connection:
+            rows = connection.execute(
+                "SELECT product_id, quantity_change, reason, timestamp FROM inventory_logs "
+                "WHERE product_id = ? AND timestamp BETWEEN ? AND ? ORDER BY timestamp, log_id",
+                (product_id, low, high)
+            ).fetchall()
+        return (self._entry(row) for row in rows)
+
+    def net_change(self, product_id: str) -> int:
+        with self._store._reader(flush_logs=True) as connection:
+            return _scalar(
+                connection,
+                "SELECT COALESCE(SUM(quantity_change), 0) FROM inventory_logs WHERE product_id = ?",
+                (product_id,)
+            )
+
+    @staticmethod
+    def _entry(row: Sequence[Any]) -> Dict[str, Any]:
+        return {
+            'product_id': row[0],
+            'quantity_change': row[1],
+            'reason': row[2],
+            'timestamp': datetime.datetime.fromtimestamp(row[3])
+        }
+
+
+class SqliteDataStore(DataStoreInterface):
+    """
+    DataStore kept in a SQLite database file instead of the Python heap.
+
+    Rows are turned into the usual domain objects on read. A weak
+    identity map hands out the same object for a row while anyone still
+    holds it, so a service that changes a product sees its own write.
+    Writes go through a single connection behind a lock and are
+    committed per call (or once per `transaction()` block); reads come
+    from a small pool of read-only connections, which WAL mode lets run
+    next to the writer. Inventory log rows are buffered and inserted
+    with executemany, together with the next write or every
+    `log_batch_size` rows.
+    """
+
+    def __init__(self, path: str, readers: int = 4, log_batch_size: int = 1000) -> None:
+        if readers < 1:
+            raise ValueError("readers must be at least 1")
+        self.path: str = os.path.abspath(path)
+        self.log_batch_size: int = log_batch_size
+
+        self._writer: sqlite3.Connection = self._connect(self.path)
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute("PRAGMA synchronous=NORMAL")
+        self._writer.executescript(SCHEMA)
+        self._write_lock = threading.RLock()
+        self._transaction_owner: Optional[int] = None
+        self._transaction_depth: int = 0
+        self._pending_logs: List[Tuple[str, int, str, float]] = []
+        self._low_stock: LowStockListeners = LowStockListeners()
+        self._changes: ChangeListeners = ChangeListeners()
+
+        self._reader_pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._reader_limit: int = readers
+        self._readers_opened: int = 0
+        self._readers_lock = threading.Lock()
+
+        # Identity maps. A row read while a write was in flight is handed
+        # out but not remembered (see _remember), so the maps never hold
+        # an object older than the database.
+        self._products: MutableMapping[str, Product] = weakref.WeakValueDictionary()
+        self._customers: MutableMapping[str, Customer] = weakref.WeakValueDictionary()
+        self._suppliers: MutableMapping[str, Supplier] = weakref.WeakValueDictionary()
+        self._promotions: MutableMapping[str, Promotion] = weakref.WeakValueDictionary()
+        self._orders: MutableMapping[int, Order] = weakref.WeakValueDictionary()
+        self._identity_lock = threading.Lock()
+        self._generation: int = 0
+
+        # Each row read is a fresh set of strings; products and
+        # promotions built from rows share one object per category and
+        # supplier id instead
+        self._categories: IdRegistry = IdRegistry()
+        self._supplier_ids: IdRegistry = IdRegistry()
+
+        # read_view() pins a reader (inside a read transaction) to a thread
+        self._pinned = threading.local()
+
+        self.products: Mapping[str, Product] = self._view(
+            self.get_product, self._load_products, lambda p: p.product_id, "products", "product_id")
+        self.customers: Mapping[str, Customer] = self._view(
+            self.get_customer, self._load_customers, lambda c: c.customer_id, "customers", "customer_id")
+        self.suppliers: Mapping[str, Supplier] = self._view(
+            self.get_supplier, self._load_suppliers, lambda s: s.supplier_id, "suppliers", "supplier_id")
+        self.promotions: Mapping[str, Promotion] = self._view(
+            self.get_promotion, self._load_promotions, lambda p: p.code, "promotions", "code")
+        self.orders: Mapping[int, Order] = self._view(
+            self.get_order, self._load_all_orders, lambda o: o.order_id, "orders", "order_id")
+        self.shipments: Mapping[int, Shipment] = self._view(
+            self.get_shipment, self._load_shipments, lambda s: s.shipment_id, "shipments", "shipment_id")
+        self.inventory_logs: _InventoryLogView = _InventoryLogView(self)
+
+        self._next_order_id: int = self._read_counter('next_order_id')
+        self._next_shipment_id: int = self._read_counter('next_shipment_id')
+
+    # --- Connections ---
+
+    @staticmethod
+    def _connect(target: str, uri: bool = False) -> sqlite3.Connection:
+        return sqlite3.connect(
+            target, uri=uri, isolation_level=None, check_same_thread=False, cached_statements=256
+        )
+
+    @contextmanager
+    def _reader(self, flush_logs: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        Lends a pooled read-only connection. Inside a transaction the
+        owning thread reads from the writer, so it sees its own changes.
+        """
+        if flush_logs and self._pending_logs:
+            with self._write():
+                pass
+        pinned: Optional[sqlite3.Connection] = getattr(self._pinned, 'connection', None)
+        if pinned is not None:
+            yield pinned
+            return
+        if self._transaction_owner == threading.get_ident():
+            yield self._writer
+            return
+        try:
+            connection = self._reader_pool.get_nowait()
+        except queue.Empty:
+            connection = self._open_reader()
+        try:
+            yield connection
+        finally:
+            self._reader_pool.put(connection)
+
+    def _open_reader(self) -> sqlite3.Connection:
+        with self._readers_lock:
+            if self._readers_opened >= self._reader_limit:
+                opened = None
+            else:
+                self._readers_opened += 1
+                opened = self._connect(
+                    f"file:{urllib.parse.quote(self.path)}?mode=ro", uri=True
+                )
+        # Pool exhausted: wait for a connection to come back
+        return opened if opened is not None else self._reader_pool.get()
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        with self._write_lock:
+            outermost: bool = self._transaction_depth == 0
+            if outermost:
+                self._writer.execute("BEGIN")
+                self._transaction_owner = threading.get_ident()
+            self._transaction_depth += 1
+            try:
+                yield self._writer
+                if outermost:
+                    self._flush_logs()
+            except BaseException:
+                self._transaction_depth -= 1
+                if outermost:
+                    self._transaction_owner = None
+                    self._writer.execute("ROLLBACK")
+                    self._forget_all()
+                raise
+            self._transaction_depth -= 1
+            if outermost:
+                self._writer.execute("COMMIT")
+                self._transaction_owner = None
+                with self._identity_lock:
+                    self._generation += 1
+
+    @contextmanager
+    def transaction(self) -> Iterator["SqliteDataStore"]:
+        """Groups several writes into one commit (and one rollback on error)."""
+        with self._write():
+            yield self
+
+    @contextmanager
+    def read_view(self) -> Iterator["SqliteDataStore"]:
+        """
+        Runs the calling thread's reads inside one read transaction on a
+        pooled reader. WAL mode gives that transaction a fixed snapshot
+        of the database while writers keep committing. Inside the view,
+        objects are built from the snapshot rather than taken from the
+        identity maps, which track the latest state.
+        """
+        if self._in_view() or self._transaction_owner == threading.get_ident():
+            # Nested view, or this thread's own transaction: nothing else
+            # can write under it
+            yield self
+            return
+        with self._reader(flush_logs=True) as connection:
+            connection.execute("BEGIN")
+            try:
+                # The snapshot is taken by the first read, not by BEGIN
+                connection.execute("SELECT 1 FROM counters LIMIT 1").fetchall()
+                self._pinned.connection = connection
+                yield self
+            finally:
+                self._pinned.connection = None
+                connection.execute("COMMIT")
+
+    def _in_view(self) -> bool:
+        return getattr(self._pinned, 'connection', None) is not None
+
+    def sync(self) -> None:
+        """Nothing to wait for: every write is committed before it returns."""
+
+    def flush(self) -> None:
+        """Writes any buffered inventory log rows."""
+        with self._write():
+            pass
+
+    def close(self) -> None:
+        self.flush()
+        self._writer.close()
+        while True:
+            try:
+                self._reader_pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    # --- Writes ---
+
+    def log_inventory_change(
+        self,
+        product_id: str,
+        quantity_change: int,
+        reason: str
+    ) -> None:
+        with self._write_lock:
+            self._pending_logs.append((product_id, quantity_change, reason, time.time()))
+            if len(self._pending_logs) >= self.log_batch_size:
+                self.flush()
+
+    def add_product(
+        self,
+        product_id: str,
+        name: str,
+        price: float,
+        quantity: int,
+        category: str,
+        weight: float,
+        supplier_id: str
+    ) -> Product:
+        product = Product(product_id, name, price, quantity, category, weight, supplier_id)
+        with self._write() as connection:
+            # A replaced product's stock moves from its old level
+            found = connection.execute(_GET_STOCK, (product_id,)).fetchone()
+            connection.execute(_INSERT_PRODUCT, self._product_row(product))
+            self.log_inventory_change(product_id, quantity, "initial_stock")
+            self._products[product_id] = product
+        self._low_stock.notify([(product_id, None if found is None else found[0], quantity)])
+        self._changes.notify('products', [product_id])
+        return product
+
+    def add_customer(
+        self,
+        customer_id: str,
+        name: str,
+        email: str,
+        tier: str,
+        phone: str,
+        address: str,
+        loyalty_points: int = 0
+    ) -> Customer:
+        customer = Customer(customer_id, name, email, tier, phone, address, loyalty_points)
+        with self._write() as connection:
+            connection.execute("DELETE FROM customer_order_history WHERE customer_id = ?", (customer_id,))
+            connection.execute(_INSERT_CUSTOMER, (
+                customer_id, name, email, customer.tier.value,
+                phone, address, loyalty_points
+            ))
+            self._customers[customer_id] = customer
+        self._changes.notify('customers', [customer_id])
+        return customer
+
+    def add_supplier(
+        self,
+        supplier_id: str,
+        name: str,
+        email: str,
+        reliability: float
+    ) -> Supplier:
+        supplier = Supplier(supplier_id, name, email, reliability)
+        with self._write() as connection:
+            connection.execute(_INSERT_SUPPLIER, (supplier_id, name, email, reliability))
+            self._suppliers[supplier_id] = supplier
+        return supplier
+
+    def add_promotion(
+        self,
+        promo_id: str,
+        code: str,
+        discount_percent: float,
+        min_purchase: float,
+        valid_until: datetime.datetime,
+        category: str
+    ) -> Promotion:
+        promo = Promotion(promo_id, code, discount_percent, min_purchase, valid_until, category)
+        with self._write() as connection:
+            connection.execute(_INSERT_PROMOTION, (
+                promo_id, code, discount_percent, min_purchase,
+                _to_micros(valid_until), category, promo.used_count
+            ))
+            self._promotions[code] = promo
+        self._changes.notify('promotions', [code])
+        return promo
+
+    def add_order(self, order: Order) -> Order:
+        """Stores an order and its items (one executemany for the items)."""
+        with self._write() as connection:
+            connection.execute("DELETE FROM order_items WHERE order_id = ?", (order.order_id,))
+            connection.execute(_INSERT_ORDER, (
+                order.order_id, order.customer_id, _encode_status(order.status),
+                _to_micros(order.created_at), order.total_price, order.shipping_cost,
+                order.tracking_number, order.payment_method
+            ))
+            connection.executemany(_INSERT_ORDER_ITEM, [
+                (order.order_id, line_no, item.product_id, item.quantity,
+                 item.unit_price, item.discount_applied)
+                for line_no, item in enumerate(order.items)
+            ])
+            self._orders[order.order_id] = order
+        return order
+
+    def add_shipment(self, shipment: Shipment) -> Shipment:
+        with self._write() as connection:
+            connection.execute(_INSERT_SHIPMENT, (
+                shipment.shipment_id, shipment.order_id, shipment.tracking_number,
+                _to_micros(shipment.created_at), shipment.status.value
+            ))
+        return shipment
+
+    # --- Bulk loads (one transaction and executemany per batch) ---
+
+    def add_products_bulk(self, rows: Iterable[Row], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        loaded: int = 0
+        for batch in validated_batches(rows, PRODUCT_FIELDS, batch_size):
+            now: float = time.time()
+            stock_before: Dict[str, int] = {}
+            with self._write() as connection:
+                if self._low_stock:
+                    for row in batch:
+                        found = connection.execute(_GET_STOCK, (row[0],)).fetchone()
+                        if found is not None:
+                            stock_before[row[0]] = found[0]
+                # Bulk-loaded products are discount eligible, as new Product objects are
+                connection.executemany(_INSERT_PRODUCT, [(*row, 1) for row in batch])
+                self._pending_logs.extend((row[0], row[3], "initial_stock", now) for row in batch)
+                self._forget(self._products, [row[0] for row in batch])
+            self._low_stock.notify((row[0], stock_before.get(row[0]), row[3]) for row in batch)
+            self._changes.notify('products', [row[0] for row in batch])
+            loaded += len(batch)
+        return loaded
+
+    def add_customers_bulk(self, rows: Iterable[Row], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        loaded: int = 0
+        for batch in validated_batches(rows, CUSTOMER_FIELDS, batch_size):
+            customers: List[Customer] = list(starmap(Customer, batch))
+            with self._write() as connection:
+                connection.executemany(
+                    "DELETE FROM customer_order_history WHERE customer_id = ?",
+                    [(customer.customer_id,) for customer in customers]
+                )
+                connection.executemany(_INSERT_CUSTOMER, [
+                    (customer.customer_id, customer.name, customer.email,
+                     customer.tier.value, customer.phone, customer.address,
+                     customer.loyalty_points)
+                    for customer in customers
+                ])
+                self._forget(self._customers, [customer.customer_id for customer in customers])
+            self._changes.notify('customers', [customer.customer_id for customer in customers])
+            loaded += len(batch)
+        return loaded
+
+    def add_suppliers_bulk(self, rows: Iterable[Row], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        loaded: int = 0
+        for batch in validated_batches(rows, SUPPLIER_FIELDS, batch_size):
+            with self._write() as connection:
+                connection.executemany(_INSERT_SUPPLIER, batch)
+                self._forget(self._suppliers, [row[0] for row in batch])
+            loaded += len(batch)
+        return loaded
+
+    def add_promotions_bulk(self, rows: Iterable[Row], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        loaded: int = 0
+        for batch in validated_batches(rows, PROMOTION_FIELDS, batch_size):
+            with self._write() as connection:
+                connection.executemany(_INSERT_PROMOTION, [
+                    (promo_id, code, discount_percent, min_purchase, _to_micros(valid_until), category, 0)
+                    for promo_id, code, discount_percent, min_purchase, valid_until, category in batch
+                ])
+                self._forget(self._promotions, [row[1] for row in batch])
+            self._changes.notify('promotions', [row[1] for row in batch])
+            loaded += len(batch)
+        return loaded
+
+    def update_product(self, product: Product, **changes: Any) -> Product:
+        stock_before: int = product.quantity_available
+        self._update("products", "product_id", _PRODUCT_FIELDS, self._products, product.product_id, product, changes)
+        if 'quantity_available' in changes:
+            self._low_stock.notify([(product.product_id, stock_before, product.quantity_available)])
+        self._changes.notify('products', [product.product_id], changes)
+        return product
+
+    def update_customer(self, customer: Customer, **changes: Any) -> Customer:
+        self._update(
+            "customers", "customer_id", _CUSTOMER_FIELDS, self._customers, customer.customer_id, customer, changes
+        )
+        self._changes.notify('customers', [customer.customer_id], changes)
+        return customer
+
+    def update_order(self, order: Order, **changes: Any) -> Order:
+        self._update("orders", "order_id", _ORDER_FIELDS, self._orders, order.order_id, order, changes)
+        return order
+
+    def update_promotion(self, promotion: Promotion, **changes: Any) -> Promotion:
+        self._update("promotions", "code", _PROMOTION_FIELDS, self._promotions, promotion.code, promotion, changes)
+        self._changes.notify('promotions', [promotion.code], changes)
+        return promotion
+
+    def update_shipment_statuses(self, updates: Iterable[Tuple[str, ShipmentStatus]]) -> int:
+        """One executemany over the tracking number index, in one transaction."""
+        rows: List[Tuple[str, str]] = [(status.value, tracking_number) for tracking_number, status in updates]
+        with self._write() as connection:
+            cursor = connection.executemany(_SET_SHIPMENT_STATUS, rows)
+            # rowcount sums over the batch; it only equals the row count
+            # while tracking numbers are unique
+            applied: int = cursor.rowcount
+        return applied
+
+    def append_order_history(self, customer: Customer, order_id: int) -> None:
+        with self._write() as connection:
+            connection.execute(_INSERT_HISTORY, (customer.customer_id, order_id))
+            customer.order_history.append(order_id)
+
+    # --- Atomic counters and stock (serialised by the writer lock) ---
+
+    def allocate_order_id(self) -> int:
+        with self._write() as connection:
+            order_id: int = self._next_order_id
+            connection.execute(_SET_COUNTER, ('next_order_id', order_id + 1))
+            self._next_order_id = order_id + 1
+        return order_id
+
+    def allocate_shipment_id(self) -> int:
+        with self._write() as connection:
+            shipment_id: int = self._next_shipment_id
+            connection.execute(_SET_COUNTER, ('next_shipment_id', shipment_id + 1))
+            self._next_shipment_id = shipment_id + 1
+        return shipment_id
+
+    def adjust_stock(self, product_id: str, quantity_change: int, reason: str) -> Optional[Product]:
+        """Adds quantity_change to a product's stock and logs it. None if unknown."""
+        with self._write() as connection:
+            if not connection.execute(_ADJUST_STOCK, (quantity_change, product_id)).rowcount:
+                return None
+            self.log_inventory_change(product_id, quantity_change, reason)
+            stock: int = _scalar(connection, _GET_STOCK, (product_id,))
+            product: Optional[Product] = self._products.get(product_id)
+            if product is not None:
+                product.quantity_available += quantity_change
+        self._low_stock.notify([(product_id, stock - quantity_change, stock)])
+        return product if product is not None else self.get_product(product_id)
+
+    def deduct_stock(self, items: Sequence[OrderItem], reason: str) -> bool:
+        """
+        Takes the stock for every item, or for none of them if a product
+        is unknown or short. Check and update run under the writer lock.
+        """
+        wanted: Dict[str, int] = {}
+        for item in items:
+            wanted[item.product_id] = wanted.get(item.product_id, 0) + item.quantity
+        moves: List[StockMove] = []
+        with self._write() as connection:
+            for product_id, quantity in wanted.items():
+                found = connection.execute(_GET_STOCK, (product_id,)).fetchone()
+                if found is None or found[0] < quantity:
+                    return False
+                moves.append((product_id, found[0], found[0] - quantity))
+            connection.executemany(_ADJUST_STOCK, [
+                (-quantity, product_id) for product_id, quantity in wanted.items()
+            ])
+            for item in items:
+                self.log_inventory_change(item.product_id, -item.quantity, reason)
+            for product_id, quantity in wanted.items():
+                product: Optional[Product] = self._products.get(product_id)
+                if product is not None:
+                    product.quantity_available -= quantity
+        self._low_stock.notify(moves)
+        return True
+
+    def add_low_stock_listener(self, listener: LowStockListener, below: int) -> None:
+        self._low_stock.add(listener, below)
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        self._changes.add(listener)
+
+    @property
+    def next_order_id(self) -> int:
+        return self._next_order_id
+
+    @next_order_id.setter
+    def next_order_id(self, value: int) -> None:
+        with self._write() as connection:
+            connection.execute(_SET_COUNTER, ('next_order_id', value))
+            self._next_order_id = value
+
+    @property
+    def next_shipment_id(self) -> int:
+        return self._next_shipment_id
+
+    @next_shipment_id.setter
+    def next_shipment_id(self, value: int) -> None:
+        with self._write() as connection:
+            connection.execute(_SET_COUNTER, ('next_shipment_id', value))
+            self._next_shipment_id = value
+
+    # --- Reads ---
+
+    def get_product(self, product_id: str) -> Optional[Product]:
+        cached: Optional[Product] = self._products.get(product_id)
+        if cached is not None and not self._in_view():
+            return cached
+        found = self._load_products("WHERE product_id = ?", (product_id,))
+        return found[0] if found else None
+
+    def get_customer(self, customer_id: str) -> Optional[Customer]:
+        cached: Optional[Customer] = self._customers.get(customer_id)
+        if cached is not None and not self._in_view():
+            return cached
+        found = self._load_customers("WHERE customer_id = ?", (customer_id,))
+        return found[0] if found else None
+
+    def get_supplier(self, supplier_id: str) -> Optional[Supplier]:
+        cached: Optional[Supplier] = self._suppliers.get(supplier_id)
+        if cached is not None and not self._in_view():
+            return cached
+        found = self._load_suppliers("WHERE supplier_id = ?", (supplier_id,))
+        return found[0] if found else None
+
+    def get_promotion(self, code: str) -> Optional[Promotion]:
+        cached: Optional[Promotion] = self._promotions.get(code)
+        if cached is not None and not self._in_view():
+            return cached
+        found = self._load_promotions("WHERE code = ?", (code,))
+        return found[0] if found else None
+
+    def get_order(self, order_id: int) -> Optional[Order]:
+        cached: Optional[Order] = self._orders.get(order_id)
+        if cached is not None and not self._in_view():
+            return cached
+        found = self._load_orders("WHERE order_id = ?", (order_id,))
+        return found[0] if found else None
+
+    def get_shipment(self, shipment_id: int) -> Optional[Shipment]:
+        found = self._load_shipments("WHERE shipment_id = ?", (shipment_id,))
+        return found[0] if found else None
+
+    # --- Index lookups (served by SQLite indexes) ---
+
+    def get_orders_by_customer(self, customer_id: str) -> List[Order]:
+        return self._load_orders("WHERE customer_id = ?", (customer_id,))
+
+    def get_orders_created_between(
+        self,
+        start_date: datetime.datetime,
+        end_date: datetime.datetime
+    ) -> List[Order]:
+        """Returns orders with start_date <= created_at <= end_date, oldest first."""
+        return self._load_orders(
+            "WHERE created_at BETWEEN ? AND ?",
+            (_to_micros(start_date), _to_micros(end_date)),
+            order_by="created_at, order_id"
+        )
+
+    def get_orders_created_after(self, cutoff: datetime.datetime) -> List[Order]:
+        """Returns orders with created_at strictly after cutoff, oldest first."""
+        return self._load_orders(
+            "WHERE created_at > ?", (_to_micros(cutoff),), order_by="created_at, order_id"
+        )
+
+    def get_product_ids_by_category(self, category: str) -> AbstractSet[str]:
+        with self._reader() as connection:
+            return {row[0] for row in connection.execute(
+                "SELECT product_id FROM products WHERE category = ?", (category,)
+            )}
+
+    def get_products_by_category(self, category: str) -> List[Product]:
+        return self._load_products("WHERE category = ?", (category,))
+
+    def get_products_by_supplier(self, supplier_id: str) -> List[Product]:
+        return self._load_products("WHERE supplier_id = ?", (supplier_id,))
+
+    def get_products_at_or_below(self, quantity: int) -> List[Product]:
+        """Products with quantity_available <= quantity, lowest stock first."""
+        return self._load_products(
+            "WHERE quantity_available <= ? ORDER BY quantity_available, product_id", (quantity,)
+        )
+
+    def get_shipment_by_tracking_number(self, tracking_number: str) -> Optional[Shipment]:
+        found = self._load_shipments("WHERE tracking_number = ? ORDER BY shipment_id DESC LIMIT 1", (tracking_number,))
+        return found[0] if found else None
+
+    def get_shipments_by_order(self, order_id: int) -> List[Shipment]:
+        return self._load_shipments("WHERE order_id = ? ORDER BY shipment_id", (order_id,))
+
+    def get_shipments_by_status(self, status: ShipmentStatus) -> List[Shipment]:
+        return self._load_shipments("WHERE status = ?", (status.value,))
+
+    # --- Row mapping ---
+
+    def _load_products(self, where: str = "", params: Sequence[Any] = ()) -> List[Product]:
+        generation, rows = self._select(f"SELECT {_PRODUCT_COLUMNS} FROM products {where}", params)
+        return [
+            self._remember(self._products, row[0], generation, partial(self._product_from_row, row))
+            for row in rows
+        ]
+
+    def _load_customers(self, where: str = "", params: Sequence[Any] = ()) -> List[Customer]:
+        generation, rows = self._select(f"SELECT {_CUSTOMER_COLUMNS} FROM customers {where}", params)
+        return [
+            self._remember(self._customers, row[0], generation, partial(self._customer_from_row, row))
+            for row in rows
+        ]
+
+    def _load_suppliers(self, where: str = "", params: Sequence[Any] = ()) -> List[Supplier]:
+        generation, rows = self._select(f"SELECT {_SUPPLIER_COLUMNS} FROM suppliers {where}", params)
+        return [
+            self._remember(self._suppliers, row[0], generation, partial(Supplier, *row))
+            for row in rows
+        ]
+
+    def _load_promotions(self, where: str = "", params: Sequence[Any] = ()) -> List[Promotion]:
+        generation, rows = self._select(f"SELECT {_PROMOTION_COLUMNS} FROM promotions {where}", params)
+        return [
+            self._remember(self._promotions, row[1], generation, partial(self._promotion_from_row, row))
+            for row in rows
+        ]
+
+    def _load_all_orders(self) -> List[Order]:
+        return self._load_orders()
+
+    def _load_orders(
+        self,
+        where: str = "",
+        params: Sequence[Any] = (),
+        order_by: str = "order_id"
+    ) -> List[Order]:
+        """
+        Loads the orders matching `where`, plus the items of those not
+        already in the identity map with a single second query.
+        """
+        with self._identity_lock:
+            generation: int = self._generation
+        with self._reader() as connection:
+            rows = connection.execute(
+                f"SELECT {_ORDER_COLUMNS} FROM orders {where} ORDER BY {order_by}", params
+            ).fetchall()
+            in_view: bool = self._in_view()
+            missing: Set[int] = {row[0] for row in rows if in_view or row[0] not in self._orders}
+            items: Dict[int, OrderLines] = {}
+            if missing:
+                item_rows = connection.execute(
+                    f"SELECT {_ITEM_COLUMNS} FROM order_items WHERE order_id IN "
+                    f"(SELECT order_id FROM orders {where}) ORDER BY order_id, line_no",
+                    params
+                ) if len(missing) > 1 else connection.execute(
+                    f"SELECT {_ITEM_COLUMNS} FROM order_items WHERE order_id = ? ORDER BY line_no",
+                    (next(iter(missing)),)
+                )
+                for order_id, product_id, quantity, unit_price, discount_applied in item_rows:
+                    if order_id in missing:
+                        lines: Optional[OrderLines] = items.get(order_id)
+                        if lines is None:
+                            lines = items[order_id] = OrderLines()
+                        lines.add(product_id, quantity, unit_price, discount_applied)
+        return [
+            self._remember(
+                self._orders, row[0], generation,
+                partial(self._order_from_row, row, items.get(row[0]) or OrderLines())
+            )
+            for row in rows
+        ]
+
+    def _load_shipments(self, where: str = "", params: Sequence[Any] = ()) -> List[Shipment]:
+        _generation, rows = self._select(f"SELECT {_SHIPMENT_COLUMNS} FROM shipments {where}", params)
+        return [
+            Shipment(shipment_id, order_id, tracking_number, _from_micros(created_at), ShipmentStatus(status))
+            for shipment_id, order_id, tracking_number, created_at, status in rows
+        ]
+
+    @staticmethod
+    def _product_row(product: Product) -> Tuple[Any, ...]:
+        return (
+            product.product_id, product.name, product.price, product.quantity_available,
+            product.category, product.weight, product.supplier_id, int(product.discount_eligible)
+        )
+
+    def _product_from_row(self, row: Sequence[Any]) -> Product:
+        product_id, name, price, quantity, category, weight, supplier_id, discount_eligible = row
+        product = Product(
+            product_id, name, price, quantity, self._categories.canonical(category),
+            weight, self._supplier_ids.canonical(supplier_id)
+        )
+        product.discount_eligible = bool(discount_eligible)
+        return product
+
+    def _customer_from_row(self, row: Sequence[Any]) -> Customer:
+        customer = Customer(*row)
+        with self._reader() as connection:
+            customer.order_history.extend(found[0] for found in connection.execute(
+                "SELECT order_id FROM customer_order_history WHERE customer_id = ? ORDER BY rowid",
+                (customer.customer_id,)
+            ))
+        return customer
+
+    def _promotion_from_row(self, row: Sequence[Any]) -> Promotion:
+        promo_id, code, discount_percent, min_purchase, valid_until, category, used_count = row
+        promo = Promotion(
+            promo_id, code, discount_percent, min_purchase, _from_micros(valid_until),
+            self._categories.canonical(category)
+        )
+        promo.used_count = used_count
+        return promo
+
+    @staticmethod
+    def _order_from_row(row: Sequence[Any], items: OrderLines) -> Order:
+        (order_id, customer_id, status, created_at, total_price,
+         shipping_cost, tracking_number, payment_method) = row
+        order = Order(
+            order_id, customer_id, items, OrderStatus(status),
+            _from_micros(created_at), total_price, shipping_cost
+        )
+        order.tracking_number = tracking_number
+        order.payment_method = payment_method
+        return order
+
+    # --- Helpers ---
+
+    def _view(
+        self,
+        get_one: Callable[[Any], Any],
+        load_all: Callable[[], List[Any]],
+        key_of: Callable[[Any], Any],
+        table: str,
+        key_column: str
+    ) -> _TableView:
+        return _TableView(get_one, load_all, key_of, self._reader, table, key_column)
+
+    def _select(self, sql: str, params: Sequence[Any]) -> Tuple[int, List[Tuple[Any, ...]]]:
+        with self._identity_lock:
+            generation: int = self._generation
+        with self._reader() as connection:
+            return generation, connection.execute(sql, params).fetchall()
+
+    def _remember(
+        self,
+        identity_map: MutableMapping[Any, Any],
+        key: Any,
+        generation: int,
+        build: Callable[[], Any]
+    ) -> Any:
+        """
+        Returns the mapped object for `key`, building it from the row
+        otherwise. Objects built from a read that raced a commit, or
+        inside a read view, are returned but not mapped.
+        """
+        if self._in_view():
+            return build()
+        with self._identity_lock:
+            existing = identity_map.get(key)
+        if existing is not None:
+            return existing
+        built = build()
+        with self._identity_lock:
+            existing = identity_map.get(key)
+            if existing is not None:
+                return existing
+            if generation == self._generation:
+                identity_map[key] = built
+        return built
+
+    def _update(
+        self,
+        table: str,
+        key_column: str,
+        fields: Dict[str, Optional[_Encoder]],
+        identity_map: MutableMapping[Any, Any],
+        key: Any,
+        target: Any,
+        changes: Dict[str, Any]
+    ) -> None:
+        unknown: List[str] = [field for field in changes if field not in fields]
+        if unknown:
+            raise ValueError(f"Cannot update {table} field(s): {', '.join(unknown)}")
+        if not changes:
+            return
+        columns: List[str] = list(changes)
+        values: List[Any] = []
+        for column in columns:
+            encode: Optional[_Encoder] = fields[column]
+            values.append(encode(changes[column]) if encode else changes[column])
+        with self._write() as connection:
+            connection.execute(
+                f"UPDATE {table} SET {', '.join(f'{column} = ?' for column in columns)} "
+                f"WHERE {key_column} = ?",
+                (*values, key)
+            )
+            for column in columns:
+                setattr(target, column, changes[column])
+            with self._identity_lock:
+                if identity_map.get(key) is not target:
+                    # The caller holds a copy the map does not; drop the mapped one
+                    identity_map.pop(key, None)
+
+    def _flush_logs(self) -> None:
+        if self._pending_logs:
+            self._writer.executemany(_INSERT_LOG, self._pending_logs)
+            self._pending_logs.clear()
+
+    def _read_counter(self, name: str) -> int:
+        with self._reader() as connection:
+            found = connection.execute("SELECT value FROM counters WHERE name = ?", (name,)).fetchone()
+        return found[0] if found else 1
+
+    def _forget(self, identity_map: MutableMapping[Any, Any], keys: List[Any]) -> None:
+        """Drops mapped objects for rows that were just replaced wholesale."""
+        with self._identity_lock:
+            for key in keys:
+                identity_map.pop(key, None)
+
+    def _forget_all(self) -> None:
+        """After a rollback, cached objects may hold undone changes."""
+        with self._identity_lock:
+            for identity_map in (self._products, self._customers, self._suppliers,
+                                 self._promotions, self._orders):
+                identity_map.clear()
+            self._generation += 1
@@ -0,0 +1,105 @@
+import bisect
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# (product id, quantity before, quantity after). A product that
+# add_product or a bulk load replaces moves from the replaced
+# product's level; a new one has None before: loading the catalog
+# crosses no bound, so it emits no event.
+StockMove = Tuple[str, Optional[int], int]
+
+
+@dataclass(frozen=True)
+class LowStockEvent:
+    """A product's stock crossed a listener's bound: `entered` the low band, or left it."""
+    product_id: str
+    quantity_available: int
+    entered: bool
+
+
+LowStockListener = Callable[[LowStockEvent], None]
+
+
+class StockLevelIndex:
+    """
+    Product keys bucketed by quantity_available, plus the sorted list of
+    quantities that have a bucket. "At or below n" bisects that list and
+    walks the buckets below it, so it costs O(log n + k) for k results;
+    a stock change moves one key between two buckets.
+    Not thread-safe on its own; the store guards it with its index lock.
+    """
+
+    def __init__(self) -> None:
+        self._keys_by_quantity: Dict[int, Set[int]] = {}
+        self._quantities: List[int] = []
+
+    def add(self, key: int, quantity: int) -> None:
+        bucket: Optional[Set[int]] = self._keys_by_quantity.get(quantity)
+        if bucket is None:
+            self._keys_by_quantity[quantity] = {key}
+            bisect.insort(self._quantities, quantity)
+        else:
+            bucket.add(key)
+
+    def add_many(self, entries: Iterable[Tuple[int, int]]) -> None:
+        """add() for a batch, with one sort of the quantity list."""
+        created: bool = False
+        for key, quantity in entries:
+            bucket: Optional[Set[int]] = self._keys_by_quantity.get(quantity)
+            if bucket is None:
+                self._keys_by_quantity[quantity] = {key}
+                created = True
+            else:
+                bucket.add(key)
+        if created:
+            self._quantities = sorted(self._keys_by_quantity)
+
+    def remove(self, key: int, quantity: int) -> None:
+        bucket: Optional[Set[int]] = self._keys_by_quantity.get(quantity)
+        if bucket is None:
+            return
+        bucket.discard(key)
+        if not bucket:
+            del self._keys_by_quantity[quantity]
+            del self._quantities[bisect.bisect_left(self._quantities, quantity)]
+
+    def move(self, key: int, old: int, new: int) -> None:
+        if old != new:
+            self.remove(key, old)
+            self.add(key, new)
+
+    def at_or_below(self, quantity: int) -> List[int]:
+        """Keys of products with quantity_available <= quantity, lowest stock first."""
+        found: List[int] = []
+        for level in self._quantities[:bisect.bisect_right(self._quantities, quantity)]:
+            found.extend(self._keys_by_quantity[level])
+        return found
+
+
+class LowStockListeners:
+    """
+    Listeners for products crossing a low-stock bound, each with its own
+    bound: a product is in a listener's low band while its stock is
+    below `below`. Stores pass every stock move to notify() after the
+    write, outside their locks, on the writing thread.
+    """
+
+    def __init__(self) -> None:
+        self._listeners: List[Tuple[int, LowStockListener]] = []
+
+    def add(self, listener: LowStockListener, below: int) -> None:
+        self._listeners.append((below, listener))
+
+    def __bool__(self) -> bool:
+        return bool(self._listeners)
+
+    def notify(self, moves: Iterable[StockMove]) -> None:
+        if not self._listeners:
+            return
+        for product_id, old, new in moves:
+            if old is None:
+                continue
+            for below, listener in self._listeners:
+                was_low: bool = old < below
+                if was_low != (new < below):
+                    listener(LowStockEvent(product_id, new, entered=not was_low))
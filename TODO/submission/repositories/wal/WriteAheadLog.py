@@ -0,0 +1,245 @@
+import datetime
+import json
+import os
+import struct
+import threading
+import zlib
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence
+
+from submission.domain.enums.order_status import OrderStatus
+from submission.domain.enums.shipment_status import ShipmentStatus
+from submission.domain.models.Order import Order
+from submission.domain.models.OrderLines import OrderLines
+from submission.domain.models.Shipment import Shipment
+from submission.domain.enums.membership_tier import MembershipTierEnum
+from submission.services.pricing.strategies.membership_discount import MembershipTier
+from submission.services.pricing.strategies.strategy_registry import MEMBERSHIP_TIERS
+
+# File layout: magic, then one frame per record:
+#   payload length (uint32) | CRC-32 of the payload (uint32) | payload
+# The payload is a JSON array, [operation, arg, ...]. A frame cut short
+# by a crash fails its length or CRC check and ends the log there.
+MAGIC = b'DSWAL\x00\x00\x01'
+FRAME = struct.Struct('<II')
+
+# --- Record values ---
+# JSON plus three tagged types: {"$dt": iso}, {"$status": value} and
+# {"$tier": name}. Everything else a store writes is already plain data.
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime.datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, OrderStatus):
+        return {"$status": value.value}
+    if isinstance(value, MembershipTier):
+        return {"$tier": value.get_name()}
+    raise TypeError(f"Cannot log a {type(value).__name__}")
+
+
+def _decode_value(tagged: Dict[str, Any]) -> Any:
+    if len(tagged) == 1:
+        if "$dt" in tagged:
+            return datetime.datetime.fromisoformat(tagged["$dt"])
+        if "$status" in tagged:
+            return OrderStatus(tagged["$status"])
+        if "$tier" in tagged:
+            return MEMBERSHIP_TIERS[MembershipTierEnum(tagged["$tier"])]
+    return tagged
+
+
+def encode_order(order: Order) -> List[Any]:
+    return [
+        order.order_id, order.customer_id, order.status, order.created_at,
+        order.total_price, order.shipping_cost, order.tracking_number, order.payment_method,
+        [[item.product_id, item.quantity, item.unit_price, item.discount_applied] for item in order.items]
+    ]
+
+
+def decode_order(fields: List[Any]) -> Order:
+    (order_id, customer_id, status, created_at, total_price, shipping_cost,
+     tracking_number, payment_method, item_rows) = fields
+    items = OrderLines()
+    for product_id, quantity, unit_price, discount_applied in item_rows:
+        items.add(product_id, quantity, unit_price, discount_applied)
+    order = Order(order_id, customer_id, items, status, created_at, total_price, shipping_cost)
+    order.tracking_number = tracking_number
+    order.payment_method = payment_method
+    return order
+
+
+def encode_shipment(shipment: Shipment) -> List[Any]:
+    return [
+        shipment.shipment_id, shipment.order_id, shipment.tracking_number,
+        shipment.created_at, shipment.status.value
+    ]
+
+
+def decode_shipment(fields: List[Any]) -> Shipment:
+    shipment_id, order_id, tracking_number, created_at, status = fields
+    return Shipment(shipment_id, order_id, tracking_number, created_at, ShipmentStatus(status))
+
+
+class WriteAheadLog:
+    """
+    Append-only log of logical store mutations with group commit.
+
+    append() only encodes a record and queues it, so it is cheap enough
+    to call under a store's locks (which keeps the log in the order the
+    writes were applied). A background thread writes whatever is queued
+    and fsyncs it once: the first record of a group waits at most
+    `commit_window_ms` for others to join, or less once `max_batch`
+    records are queued. wait() blocks until a record is durable, so one
+    fsync covers every writer that arrived within the window.
+
+    A window of 0 still groups the writers that queue up while the
+    previous fsync runs. `fsync=False` skips the fsync (the data still
+    reaches the OS, so it survives a process crash but not a power cut).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        commit_window_ms: float = 2.0,
+        max_batch: int = 1024,
+        fsync: bool = True
+    ) -> None:
+        if commit_window_ms < 0 or max_batch < 1:
+            raise ValueError("commit_window_ms must be >= 0 and max_batch >= 1")
+        self.path: str = path
+        self.commit_window: float = commit_window_ms / 1000
+        self.max_batch: int = max_batch
+        self.fsync: bool = fsync
+
+        # Records already on disk count towards the sequence numbers
+        self._durable_lsn: int = self._open()
+        self._next_lsn: int = self._durable_lsn
+        self._pending: List[bytes] = []
+        self._error: Optional[BaseException] = None
+        self._closing: bool = False
+        self._local = threading.local()
+
+        self._lock = threading.Lock()
+        self._work = threading.Condition(self._lock)
+        self._durable = threading.Condition(self._lock)
+        self._flusher = threading.Thread(target=self._flush_loop, name="wal-flusher", daemon=True)
+        self._flusher.start()
+
+    # --- Writing ---
+
+    def append(self, record: Sequence[Any]) -> int:
+        """Queues one record; returns its sequence number (LSN)."""
+        payload: bytes = json.dumps(record, default=_encode_value, separators=(',', ':')).encode()
+        frame: bytes = FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            if self._closing:
+                raise ValueError("write-ahead log is closed")
+            self._pending.append(frame)
+            self._next_lsn += 1
+            lsn: int = self._next_lsn
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+                self._work.notify()
+        self._local.last_lsn = lsn
+        return lsn
+
+    def wait(self, lsn: Optional[int] = None) -> None:
+        """
+        Blocks until record `lsn` (by default the calling thread's last
+        one) is on disk. Raises the flusher's error if writing failed.
+        """
+        target: int = getattr(self._local, 'last_lsn', 0) if lsn is None else lsn
+        with self._lock:
+            while self._durable_lsn < target and self._error is None:
+                self._durable.wait()
+            if self._error is not None and self._durable_lsn < target:
+                raise OSError("write-ahead log could not be written") from self._error
+
+    @property
+    def durable_lsn(self) -> int:
+        return self._durable_lsn
+
+    def close(self) -> None:
+        """Writes everything queued, stops the flusher and closes the file."""
+        with self._lock:
+            if self._closing:
+                return
+            self._closing = True
+            self._work.notify()
+        self._flusher.join()
+        self._file.close()
+
+    # --- Reading ---
+
+    def records(self) -> Iterator[List[Any]]:
+        """Yields every durable record from the start of the log, oldest first."""
+        with open(self.path, 'rb') as handle:
+            handle.seek(len(MAGIC))
+            for payload in _frames(handle):
+                yield json.loads(payload, object_hook=_decode_value)
+
+    # --- Internals ---
+
+    def _open(self) -> int:
+        """Opens (or creates) the file, cuts off a torn tail and returns the record count."""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            with open(self.path, 'wb') as handle:
+                handle.write(MAGIC)
+                handle.flush()
+                os.fsync(handle.fileno())
+        count: int = 0
+        with open(self.path, 'r+b') as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a write-ahead log: {self.path}")
+            for _ in _frames(handle):
+                count += 1
+            end: int = handle.tell()
+            if end != os.path.getsize(self.path):
+                handle.truncate(end)
+        self._file: BinaryIO = open(self.path, 'ab')
+        return count
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._lock:
+                while not self._pending and not self._closing:
+                    self._work.wait()
+                if not self._pending:
+                    return
+                # Hold the group open for the window, unless it fills up first
+                if self.commit_window and not self._closing:
+                    self._work.wait_for(
+                        lambda: len(self._pending) >= self.max_batch or self._closing,
+                        timeout=self.commit_window
+                    )
+                batch, self._pending = self._pending, []
+                last_lsn: int = self._next_lsn
+
+            try:
+                self._file.write(b''.join(batch))
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+            except BaseException as error:  # surfaced to every waiter
+                with self._lock:
+                    self._error = error
+                    self._durable.notify_all()
+                return
+
+            with self._lock:
+                self._durable_lsn = last_lsn
+                self._durable.notify_all()
+
+
+def _frames(handle: BinaryIO) -> Iterator[bytes]:
+    """Yields payloads up to the end of the file or the first torn frame."""
+    while True:
+        start: int = handle.tell()
+        header: bytes = handle.read(FRAME.size)
+        if len(header) < FRAME.size:
+            handle.seek(start)
+            return
+        length, checksum = FRAME.unpack(header)
+        payload: bytes = handle.read(length)
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            handle.seek(start)
+            return
+        yield payload
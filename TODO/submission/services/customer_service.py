@@ -1,17 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Iterable
+from typing import Dict, List, Optional, Iterable, Set
 import datetime
 
 # --- Import Dependencies ---
-from submission.repositories.in_memory.DataStore import DataStore
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface, DataStoreReaderInterface
 from submission.domain.models.Customer import Customer
 from submission.domain.models.Order import Order
-from submission.services.pricing.strategies.membership_discount import (
-    MembershipTier,
-    BronzeMembership,
-    SilverMembership,
-    GoldMembership
-)
+from submission.domain.enums.order_status import OrderStatus
+from submission.domain.values.Money import Money
+from submission.domain.enums.membership_tier import MembershipTierEnum
+from submission.services.pricing.PricingService import PricingService
+from submission.services.pricing.strategies.membership_discount import MembershipTier
+from submission.services.pricing.strategies.strategy_registry import MEMBERSHIP_TIERS
 
 # --- Interface ---
 class CustomerInterface(ABC):
@@ -32,9 +32,15 @@ class CustomerInterface(ABC):
         pass  # pragma: no cover
 
     @abstractmethod
-    def get_customer_lifetime_value(self, customer_id: str) -> float:
+    def get_customer_lifetime_value(
+        self, 
+        customer_id: str, 
+        store: Optional[DataStoreReaderInterface] = None
+    ) -> float:
         """
         Calculates the total value of a customer's non-cancelled orders.
+        Reads from `store` (e.g. a read view) instead of the service's
+        own data store when one is given.
         """
         pass  # pragma: no cover
 
@@ -55,16 +61,16 @@ class CustomerInterface(ABC):
 
 # --- Concrete Class ---
 class CustomerService(CustomerInterface):
-    def __init__(self, data_store: DataStore) -> None:
-        self.data_store: DataStore = data_store
+    def __init__(self, data_store: DataStoreInterface) -> None:
+        self.data_store: DataStoreInterface = data_store
 
     def finalize_customer_order_updates(self, customer: Customer, order_id: int, subtotal: float) -> None:
         """
         Updates customer history and awards loyalty points.
         Note: This method name was updated from 'customer_order_updates' to match.
         """
-        customer.order_history.append(order_id)
-        customer.loyalty_points += int(subtotal)
+        self.data_store.append_order_history(customer, order_id)
+        PricingService.award_points(self.data_store, customer, int(subtotal))
 
     def refund_loyalty_points_for_order(self, customer: Customer, order: Order) -> None:
         """
@@ -73,22 +79,29 @@ class CustomerService(CustomerInterface):
         """
         print(f"Processing loyalty point refund for {customer.name} for order {order.order_id}.")
 
-    def get_customer_lifetime_value(self, customer_id: str) -> float:
+    def get_customer_lifetime_value(
+        self, 
+        customer_id: str, 
+        store: Optional[DataStoreReaderInterface] = None
+    ) -> float:
         """
         Calculates the total value of a customer's non-cancelled orders.
         """
-        customer: Optional[Customer] = self.data_store.get_customer(customer_id)
+        source: DataStoreReaderInterface = self.data_store if store is None else store
+        customer: Optional[Customer] = source.get_customer(customer_id)
         if not customer:
             return 0.0
 
-        total_value: float = 0.0
+        # Summed in whole cents
+        total_cents: int = 0
         for order_id in customer.order_history:
-            order: Optional[Order] = self.data_store.orders.get(order_id)
+            order: Optional[Order] = source.orders.get(order_id)
             
-            if order and order.status != 'cancelled':
-                total_value += order.total_price
+            # Statuses may be OrderStatus or (in older records) its plain value
+            if order and order.status not in (OrderStatus.CANCELLED, OrderStatus.CANCELLED.value):
+                total_cents += Money.from_float(order.total_price).cents
 
-        return total_value
+        return Money(total_cents).to_float()
     
     def check_and_upgrade_membership(self, customer_id: str) -> bool:
         """
@@ -99,10 +112,10 @@ class CustomerService(CustomerInterface):
         if not customer:
             return False
 
-        current_tier_name: str = customer.membership_tier.get_name()
+        current_tier: MembershipTierEnum = customer.tier
 
         # Your logic: If suspended, do nothing.
-        if current_tier_name == 'suspended':
+        if current_tier is MembershipTierEnum.SUSPENDED:
             return False
 
         lifetime_value: float = self.get_customer_lifetime_value(customer_id)
@@ -110,18 +123,18 @@ class CustomerService(CustomerInterface):
 
         # Logic fixed: Check from highest to lowest
         # and only upgrade from a lower tier.
-        if lifetime_value >= 1000 and current_tier_name != 'gold':
-            new_tier_object = GoldMembership()
+        if lifetime_value >= 1000 and current_tier is not MembershipTierEnum.GOLD:
+            new_tier_object = MEMBERSHIP_TIERS[MembershipTierEnum.GOLD]
             print(f"Customer {customer.name} upgraded to Gold!")
-        elif lifetime_value >= 500 and current_tier_name == 'bronze':
-            new_tier_object = SilverMembership()
+        elif lifetime_value >= 500 and current_tier is MembershipTierEnum.BRONZE:
+            new_tier_object = MEMBERSHIP_TIERS[MembershipTierEnum.SILVER]
             print(f"Customer {customer.name} upgraded to Silver!")
         
         # (The 'standard' to 'bronze' rule is removed as 
         # 'bronze' is the new base tier)
 
         if new_tier_object:
-            customer.membership_tier = new_tier_object
+            self.data_store.update_customer(customer, membership_tier=new_tier_object)
             return True
 
         return False
@@ -129,28 +142,39 @@ class CustomerService(CustomerInterface):
     def get_customers_for_segment(self, segment: str) -> List[Customer]:
         """
         Gets a list of customers based on a marketing segment.
+        Membership is decided on one read view, so the scan never sees
+        a half-applied order; the live customers are returned.
         """
-        targeted_customers: List[Customer] = []
-        all_customers: Iterable[Customer] = self.data_store.customers.values()
+        targeted_ids: List[str] = []
 
-        if segment == 'all':
-            return list(all_customers)
+        with self.data_store.read_view() as view:
+            all_customers: Iterable[Customer] = view.customers.values()
 
-        for customer in all_customers:
-            if segment == 'gold' and customer.membership_tier.get_name() == 'gold':
-                targeted_customers.append(customer)
-            
-            elif segment == 'inactive':
-                has_recent_order: bool = False
+            # Orders of the last 90 days by customer, read from the
+            # created_at index instead of walking every order history.
+            # Only those in the customer's order history count, as before:
+            # an order that failed at checkout never made it there.
+            recent_orders: Dict[str, Set[int]] = {}
+            if segment == 'inactive':
                 cutoff: datetime.datetime = datetime.datetime.now() - datetime.timedelta(days=90)
+                for order in view.get_orders_created_after(cutoff):
+                    recent_orders.setdefault(order.customer_id, set()).add(order.order_id)
+
+            for customer in all_customers:
+                if segment == 'all':
+                    targeted_ids.append(customer.customer_id)
+
+                elif segment == 'gold' and customer.tier is MembershipTierEnum.GOLD:
+                    targeted_ids.append(customer.customer_id)
                 
-                for order_id in customer.order_history:
-                    order: Optional[Order] = self.data_store.orders.get(order_id)
-                    if order and order.created_at > cutoff:
-                        has_recent_order = True
-                        break
-                
-                if not has_recent_order:
-                    targeted_customers.append(customer)
-        
+                elif segment == 'inactive':
+                    recent: Optional[Set[int]] = recent_orders.get(customer.customer_id)
+                    if recent is None or recent.isdisjoint(customer.order_history):
+                        targeted_ids.append(customer.customer_id)
+
+        targeted_customers: List[Customer] = []
+        for customer_id in targeted_ids:
+            live: Optional[Customer] = self.data_store.get_customer(customer_id)
+            if live:
+                targeted_customers.append(live)
         return targeted_customers
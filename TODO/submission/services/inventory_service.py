@@ -1,29 +1,44 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterable, List, Optional, Sequence
 
 # --- Import Dependencies ---
 # (We assume these files exist in their respective locations)
-from submission.repositories.in_memory.DataStore import DataStore
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface
+from submission.repositories.stock.StockLevels import LowStockEvent
 from submission.services.supplier_service import SupplierInterface
 from submission.domain.models.Order import Order
 from submission.domain.models.OrderItem import OrderItem
 from submission.domain.models.Product import Product
 
+# Products below this many units are reordered from their supplier
+LOW_STOCK_THRESHOLD: int = 5
 
 class InventoryInterface(ABC):
     
     @abstractmethod
-    def deduct_stock_and_log(self, order_items: List[OrderItem], order: Order) -> None:
+    def deduct_stock_and_log(self, order_items: Sequence[OrderItem], order: Order) -> bool:
+        """
+        Deducts stock for all items, or for none if any is short.
+        Returns whether the stock was taken.
+        """
         pass  # pragma: no cover
 
     @abstractmethod
-    def check_and_notify_low_stock(self, order_items: List[OrderItem]) -> None:
+    def check_and_notify_low_stock(self, order_items: Iterable[OrderItem]) -> None:
         """
         Checks items for low stock and triggers supplier
         notifications if the threshold is met.
         """
         pass  # pragma: no cover
 
+    @abstractmethod
+    def handle_low_stock_event(self, event: LowStockEvent) -> None:
+        """
+        Store listener: notifies the supplier when a product's
+        stock falls into the low band.
+        """
+        pass  # pragma: no cover
+
     @abstractmethod
     def restore_stock(self, order: Order) -> None:
         pass  # pragma: no cover
@@ -37,45 +52,44 @@ class InventoryInterface(ABC):
         pass  # pragma: no cover
 
     @abstractmethod
-    def check_stock_availability(self, order_items: List[OrderItem]) -> bool:
+    def check_stock_availability(self, order_items: Iterable[OrderItem]) -> bool:
         pass  # pragma: no cover
 
 class InventoryService(InventoryInterface):
-    def __init__(self, data_store: DataStore, supplier_service: SupplierInterface) -> None:
-        self.data_store: DataStore = data_store
+    def __init__(self, data_store: DataStoreInterface, supplier_service: SupplierInterface) -> None:
+        self.data_store: DataStoreInterface = data_store
         self.supplier_service: SupplierInterface = supplier_service
 
-    def deduct_stock_and_log(self, order_items: List[OrderItem], order: Order) -> None:
-        for item in order_items:
-            product: Optional[Product] = self.data_store.get_product(item.product_id)
-            if product:
-                product.quantity_available -= item.quantity
-                self.data_store.log_inventory_change(
-                    item.product_id, 
-                    -item.quantity, 
-                    f"order_{order.order_id}"
-                )
+    def deduct_stock_and_log(self, order_items: Sequence[OrderItem], order: Order) -> bool:
+        # Check and deduction are one atomic store operation, so two
+        # orders racing for the last units cannot both succeed
+        return self.data_store.deduct_stock(order_items, f"order_{order.order_id}")
                 
-    def check_and_notify_low_stock(self, order_items: List[OrderItem]) -> None:
+    def check_and_notify_low_stock(self, order_items: Iterable[OrderItem]) -> None:
         for item in order_items:
             product: Optional[Product] = self.data_store.get_product(item.product_id)
             
             # Low stock threshold
-            if product and product.quantity_available < 5:
+            if product and product.quantity_available < LOW_STOCK_THRESHOLD:
                 self.supplier_service.notify_supplier_reorder(product)
 
+    def handle_low_stock_event(self, event: LowStockEvent) -> None:
+        # Only the crossing into the band triggers a reorder, not every
+        # sale made while the product stays low
+        if not event.entered:
+            return
+        product: Optional[Product] = self.data_store.get_product(event.product_id)
+        if product:
+            self.supplier_service.notify_supplier_reorder(product)
 
     def restore_stock(self, order: Order) -> None:
-        for item in order.items:
-            product: Optional[Product] = self.data_store.get_product(item.product_id)
-            if product:
-                product.quantity_available += item.quantity
-
-                self.data_store.log_inventory_change(
-                    item.product_id, 
-                    item.quantity, 
-                    f"cancel_order_{order.order_id}"
-                )
+        lines = order.items
+        for product_id, quantity in zip(lines.product_ids, lines.quantities):
+            self.data_store.adjust_stock(
+                product_id, 
+                quantity, 
+                f"cancel_order_{order.order_id}"
+            )
 
     def restock_product(self, product_id: str, quantity: int, supplier_id: Optional[str] = None) -> bool:
         product: Optional[Product] = self.data_store.get_product(product_id)
@@ -87,25 +101,22 @@ class InventoryService(InventoryInterface):
             print("Supplier mismatch")
             return False
 
-        product.quantity_available += quantity
-        self.data_store.log_inventory_change(
+        restocked: Optional[Product] = self.data_store.adjust_stock(
             product_id, 
             quantity, 
             "restock"
         )
-        print(f"Restocked {product.name} by {quantity}. New stock: {product.quantity_available}")
+        if not restocked:
+            print("Product not found")
+            return False
+        print(f"Restocked {restocked.name} by {quantity}. New stock: {restocked.quantity_available}")
         return True
     
     def get_low_stock_products(self, threshold: int = 10) -> List[Product]:
-        
-        low_stock: List[Product] = []
-        for product in self.data_store.products.values():
-            if product.quantity_available <= threshold:
-                low_stock.append(product)
-
-        return low_stock
+        # Served from the store's stock index, lowest stock first
+        return self.data_store.get_products_at_or_below(threshold)
     
-    def check_stock_availability(self, order_items: List[OrderItem]) -> bool:
+    def check_stock_availability(self, order_items: Iterable[OrderItem]) -> bool:
         """
         Checks if all items in an order are in stock.
         """
@@ -1,10 +1,10 @@
 from abc import ABC, abstractmethod
 import datetime
 import random
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 # --- Import Dependencies ---
-from submission.repositories.in_memory.DataStore import DataStore
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface
 from submission.domain.models.Order import Order
 from submission.domain.models.OrderItem import OrderItem
 from submission.domain.models.Customer import Customer
@@ -22,7 +22,7 @@ class OrderInterface(ABC):
     def create_order(
         self, 
         customer_id: str, 
-        order_items: List[OrderItem], 
+        order_items: Iterable[OrderItem], 
         total_price: float, 
         shipping_cost: float, 
         payment_method: str
@@ -58,14 +58,14 @@ class OrderInterface(ABC):
 class OrderService(OrderInterface):
     def __init__(
         self, 
-        data_store: DataStore, 
+        data_store: DataStoreInterface, 
         notification_service: NotificationInterface, 
         shipping_service: ShippingServiceInterface,  # <-- Use Interface
         inventory_service: InventoryInterface, 
         customer_service: CustomerInterface  # <-- Use Interface
     ) -> None:
         
-        self.data_store: DataStore = data_store
+        self.data_store: DataStoreInterface = data_store
         self.notification_service: NotificationInterface = notification_service
         self.shipping_service: ShippingServiceInterface = shipping_service
         self.inventory_service: InventoryInterface = inventory_service
@@ -74,14 +74,13 @@ class OrderService(OrderInterface):
     def create_order(
         self, 
         customer_id: str, 
-        order_items: List[OrderItem], 
+        order_items: Iterable[OrderItem], 
         total_price: float, 
         shipping_cost: float, 
         payment_method: str
     ) -> Order:
         
-        order_id: int = self.data_store.next_order_id
-        self.data_store.next_order_id += 1
+        order_id: int = self.data_store.allocate_order_id()
 
         order = Order(
             order_id=order_id,
@@ -93,7 +92,7 @@ class OrderService(OrderInterface):
             shipping_cost=shipping_cost
         )
         order.payment_method = payment_method
-        self.data_store.orders[order_id] = order
+        self.data_store.add_order(order)
 
         return order
 
@@ -108,7 +107,7 @@ class OrderService(OrderInterface):
         if not order:
             return None
             
-        order.status = new_status
+        self.data_store.update_order(order, status=new_status)
 
         customer: Optional[Customer] = self.data_store.get_customer(order.customer_id)
         
@@ -118,10 +117,12 @@ class OrderService(OrderInterface):
         if new_status == OrderStatus.SHIPPED and not order.tracking_number: # <-- Use Enum
             try: 
                 tracking_number: str = self.shipping_service.create_shipment_for_order(order)
-                order.tracking_number = tracking_number
+                self.data_store.update_order(order, tracking_number=tracking_number)
             except Exception as e:
                 print(f"Warning: Failed to create shipment for order {order_id}: {e}")
+                self.data_store.sync()
                 return None
+        self.data_store.sync()
         return order
     
     def apply_additional_discount(
@@ -139,8 +140,9 @@ class OrderService(OrderInterface):
             print("Can only apply discount to pending orders")
             return None
 
-        order.total_price = order.total_price * (1 - discount_percent / 100)
+        self.data_store.update_order(order, total_price=order.total_price * (1 - discount_percent / 100))
         print(f"Applied {discount_percent}% discount to order {order_id}. New total: ${order.total_price:.2f}. Reason: {reason}")
+        self.data_store.sync()
         return order
     
     def cancel_order(self, order_id: int, reason: str) -> bool:
@@ -157,20 +159,16 @@ class OrderService(OrderInterface):
         
         self.inventory_service.restore_stock(order)
 
-        order.status = OrderStatus.CANCELLED # <-- Use Enum
+        self.data_store.update_order(order, status=OrderStatus.CANCELLED) # <-- Use Enum
 
         customer: Optional[Customer] = self.data_store.get_customer(order.customer_id)
         if customer:
             self.notification_service.send_cancellation_notice(customer, order, reason)
             self.customer_service.refund_loyalty_points_for_order(customer, order)
 
+        self.data_store.sync()
         return True
     
     def get_customer_orders(self, customer_id: str) -> List[Order]:
-        customer_orders: List[Order] = [] # <-- Fixed typo
-
-        for order in self.data_store.orders.values():
-            if order.customer_id == customer_id:
-                customer_orders.append(order)
-
-        return customer_orders
+        # Served from the customer -> order ids index, not a scan of all orders
+        return self.data_store.get_orders_by_customer(customer_id)
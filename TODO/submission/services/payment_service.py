@@ -2,12 +2,10 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, Tuple, Optional
 
 # Import the strategies
-from .pricing.strategies.payment_strategy import (
-    PaymentStrategy, 
-    CreditCardStrategy, 
-    PayPalStrategy, 
-    UnknownPaymentStrategy
-)
+from submission.domain.enums.payment_method import PaymentMethod
+from submission.domain.values.Money import Money
+from .pricing.strategies.payment_strategy import PaymentStrategy
+from .pricing.strategies.strategy_registry import PAYMENT_STRATEGIES, UNKNOWN_PAYMENT
 
 class PaymentServiceInterface(ABC):
     """
@@ -31,10 +29,9 @@ class PaymentService(PaymentServiceInterface):
     """
     def __init__(self) -> None:
         self.strategies: Dict[str, PaymentStrategy] = {
-            "credit_card": CreditCardStrategy(),
-            "paypal": PayPalStrategy()
+            method.value: PAYMENT_STRATEGIES[method] for method in PaymentMethod
         }
-        self._default_strategy: PaymentStrategy = UnknownPaymentStrategy()
+        self._default_strategy: PaymentStrategy = UNKNOWN_PAYMENT
 
     def validate_payment(
         self, 
@@ -45,8 +42,9 @@ class PaymentService(PaymentServiceInterface):
         if not payment_info.get("valid"):
             return False, "Payment failed - invalid payment info"
 
-        payment_amount: float = payment_info.get("amount", 0.0)
-        rounded_total: float = round(total_amount, 2)
+        # Compared in whole cents
+        payment_amount: Money = Money.from_float(payment_info.get("amount", 0.0))
+        rounded_total: Money = Money.from_float(total_amount)
 
         if payment_amount < rounded_total:
             return False, "Insufficient payment amount"
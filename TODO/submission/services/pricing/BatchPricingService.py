@@ -0,0 +1,302 @@
+import datetime
+from array import array
+from dataclasses import dataclass
+from itertools import repeat
+from operator import attrgetter, ge, mul, truediv
+from typing import AbstractSet, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface
+from submission.domain.models.CartBatch import CartBatch
+from submission.domain.models.Customer import Customer
+from submission.domain.models.OrderLines import OrderLines
+from submission.domain.models.Product import Product
+from submission.domain.models.Promotion import Promotion
+from submission.domain.enums.membership_tier import MembershipTierEnum
+from submission.domain.enums.rounding_mode import RoundingMode
+from submission.domain.values.Money import Money, MoneyArray
+from submission.domain.values.PriceQuote import PriceQuote
+from submission.services.pricing.PricingService import DISCOUNT_ROUNDING
+from submission.services.pricing.strategies.bulk_discount import BulkDiscount
+from submission.services.pricing.strategies.bulk_discount_table import BulkDiscountTable, CompiledBulkDiscounts
+from submission.services.pricing.strategies.strategy_registry import MEMBERSHIP_TIERS
+from submission.services.shipping_service import ShippingService
+from submission.services.shipping_strategy import ShippingStrategy
+from submission.services.tax_service import TAX_ROUNDING, TaxService
+
+# A promotion's terms: minimum purchase in cents, rate, and the product
+# ids it applies to (None for "all")
+PromotionTerms = Tuple[int, float, Optional[AbstractSet[str]]]
+
+
+def bulk_discount_column(
+    table: CompiledBulkDiscounts,
+    slices: List[slice],
+    line_categories: List[Optional[str]],
+    quantities: "array[int]",
+    line_cents: "array[int]",
+    item_counts: List[int],
+    tiers: List[MembershipTierEnum],
+    discounted: MoneyArray
+) -> MoneyArray:
+    """
+    The bulk discount of each cart of a batch under `table`: cart i is
+    lines slices[i], has item_counts[i] items, a customer of tiers[i]
+    and costs discounted[i] so far.
+    """
+    schedules = {tier: table.schedule(None, tier) for tier in set(tiers)}
+    rates: List[float] = [schedules[tier].rate(count) for tier, count in zip(tiers, item_counts)]
+    bulk_discount: MoneyArray = discounted.scale_each(rates, DISCOUNT_ROUNDING)
+    if table.categories:
+        # Carts with lines under a category schedule are discounted group by group
+        for i, (cart, tier) in enumerate(zip(slices, tiers)):
+            grouped: Optional[Money] = table.grouped_discount(
+                line_categories[cart], quantities[cart], line_cents[cart], tier, DISCOUNT_ROUNDING
+            )
+            if grouped is not None:
+                bulk_discount.cents[i] = grouped.cents
+    return bulk_discount
+
+
+@dataclass
+class BatchPrices:
+    """The price breakdown of every cart in a batch; element i of each column is cart i."""
+    subtotal: MoneyArray
+    bulk_discount: MoneyArray
+    membership_discount: MoneyArray
+    promotion_discount: MoneyArray
+    loyalty_discount: MoneyArray
+    discounted: MoneyArray
+    tax: MoneyArray
+    shipping: MoneyArray
+    total: MoneyArray
+
+    def __len__(self) -> int:
+        return len(self.total)
+
+    def quote(self, index: int) -> PriceQuote:
+        """The breakdown of cart `index`."""
+        return PriceQuote(
+            subtotal=self.subtotal[index],
+            bulk_discount=self.bulk_discount[index],
+            membership_discount=self.membership_discount[index],
+            promotion_discount=self.promotion_discount[index],
+            loyalty_discount=self.loyalty_discount[index],
+            discounted=self.discounted[index],
+            tax=self.tax[index],
+            shipping=self.shipping[index],
+            total=self.total[index]
+        )
+
+
+class BatchPricingService:
+    """
+    Prices many carts at once, with checkout's rules in checkout's order:
+    bulk, membership, promotion and loyalty discounts, then tax and
+    shipping. Each stage is one pass over an int64 column of cents for
+    the whole batch instead of a PricingService per cart, and the
+    amounts are the ones PricingService, TaxService and ShippingService
+    give cart by cart, to the cent.
+
+    It only quotes: no loyalty points are spent, no promotion use is
+    counted and nothing is printed, so a whole set of carts can be
+    repriced whenever a price or a promotion changes.
+    """
+
+    def __init__(
+        self,
+        data_store: DataStoreInterface,
+        tax_service: TaxService,
+        shipping_service: ShippingService,
+        bulk_discounts: Union[BulkDiscountTable, Iterable[BulkDiscount]]
+    ) -> None:
+        self.data_store: DataStoreInterface = data_store
+        self.tax_service: TaxService = tax_service
+        self.shipping_strategies: Dict[str, ShippingStrategy] = shipping_service.strategies
+
+        # A table is shared, so a configure() on it reaches the next batch
+        self.bulk_discounts: BulkDiscountTable = bulk_discounts if isinstance(bulk_discounts, BulkDiscountTable) \
+            else BulkDiscountTable(bulk_discounts)
+
+        self._membership_rates: Dict[MembershipTierEnum, float] = {
+            tier: strategy.get_discount() for tier, strategy in MEMBERSHIP_TIERS.items()
+        }
+
+    def price(
+        self,
+        carts: Union[CartBatch, Iterable[OrderLines]],
+        customers: Sequence[Customer],
+        shipping_methods: Sequence[str],
+        promo_codes: Optional[Sequence[Optional[str]]] = None,
+        now: Optional[datetime.datetime] = None
+    ) -> BatchPrices:
+        """
+        Prices cart i for customers[i], shipped by shipping_methods[i],
+        with promo_codes[i] if given. Raises ValueError if the lengths
+        differ or a shipping method is unknown.
+        """
+        batch: CartBatch = carts if isinstance(carts, CartBatch) else CartBatch(carts)
+        count: int = len(batch)
+        if len(customers) != count or len(shipping_methods) != count or \
+                (promo_codes is not None and len(promo_codes) != count):
+            raise ValueError("Need one customer, shipping method and promo code per cart")
+        slices: List[slice] = batch.slices()
+
+        # --- Lines ---
+        # Every distinct product is looked up once; lines for unknown
+        # products don't count, as in PricingService
+        products: Dict[str, Optional[Product]] = {
+            product_id: self.data_store.get_product(product_id) for product_id in set(batch.product_ids)
+        }
+        line_products: List[Optional[Product]] = list(map(products.__getitem__, batch.product_ids))
+        line_cents = array('q', map(mul, map(mul, batch.quantities, batch.unit_cents), map(bool, line_products)))
+        line_weights = array('d', map(
+            mul, [product.weight if product else 0.0 for product in line_products], batch.quantities
+        ))
+
+        subtotal = MoneyArray(array('q', map(sum, map(line_cents.__getitem__, slices))))
+        item_counts: List[int] = list(map(sum, map(batch.quantities.__getitem__, slices)))
+        weights: List[float] = list(map(sum, map(line_weights.__getitem__, slices)))
+
+        # --- Discounts ---
+        discounted: MoneyArray = subtotal
+
+        tiers: List[MembershipTierEnum] = list(map(attrgetter('tier'), customers))
+        bulk_discount: MoneyArray = self._bulk_discount(
+            slices, line_products, batch.quantities, line_cents, item_counts, tiers, discounted
+        )
+        discounted = discounted - bulk_discount
+
+        membership_rates = map(self._membership_rates.__getitem__, tiers)
+        membership_discount: MoneyArray = discounted.scale_each(membership_rates, DISCOUNT_ROUNDING)
+        discounted = discounted - membership_discount
+
+        if promo_codes is None:
+            promotion_discount = MoneyArray(array('q', [0]) * count)
+        else:
+            promotion_rates: List[float] = self._promotion_rates(
+                batch, slices, discounted, promo_codes, now or datetime.datetime.now()
+            )
+            promotion_discount = discounted.scale_each(promotion_rates, DISCOUNT_ROUNDING)
+        discounted = discounted - promotion_discount
+
+        # Up to 10% of the price, one point per cent, from 100 points up
+        points = array('q', map(attrgetter('loyalty_points'), customers))
+        caps = discounted.scale(0.1, RoundingMode.DOWN).cents
+        loyalty_discount = MoneyArray(array('q', map(mul, map(min, caps, points), map(ge, points, repeat(100)))))
+        discounted = discounted - loyalty_discount
+
+        # --- Tax and shipping ---
+        addresses: List[Optional[str]] = list(map(attrgetter('address'), customers))
+        tax_rates: Dict[Optional[str], float] = {
+            address: self.tax_service.rate_for_address(address) for address in set(addresses)
+        }
+        tax: MoneyArray = discounted.scale_each(map(tax_rates.__getitem__, addresses), TAX_ROUNDING)
+
+        shipping: MoneyArray = self._shipping(shipping_methods, weights, customers, discounted)
+
+        return BatchPrices(
+            subtotal=subtotal,
+            bulk_discount=bulk_discount,
+            membership_discount=membership_discount,
+            promotion_discount=promotion_discount,
+            loyalty_discount=loyalty_discount,
+            discounted=discounted,
+            tax=tax,
+            shipping=shipping,
+            total=discounted + tax + shipping
+        )
+
+    def quote(
+        self,
+        lines: OrderLines,
+        customer: Customer,
+        shipping_method: str,
+        promo_code: Optional[str] = None,
+        now: Optional[datetime.datetime] = None
+    ) -> PriceQuote:
+        """price() for one cart."""
+        return self.price([lines], [customer], [shipping_method], [promo_code], now).quote(0)
+
+    def _bulk_discount(
+        self,
+        slices: List[slice],
+        line_products: List[Optional[Product]],
+        quantities: "array[int]",
+        line_cents: "array[int]",
+        item_counts: List[int],
+        tiers: List[MembershipTierEnum],
+        discounted: MoneyArray
+    ) -> MoneyArray:
+        """The bulk discount of each cart, as apply_bulk_discount() with the cart's customer."""
+        line_categories: List[Optional[str]] = [product.category if product else None for product in line_products]
+        return bulk_discount_column(
+            self.bulk_discounts.current(), slices, line_categories, quantities, line_cents, item_counts, tiers,
+            discounted
+        )
+
+    def _promotion_terms(self, code: Optional[str], now: datetime.datetime) -> Optional[PromotionTerms]:
+        """The terms of promo `code`, or None if there is no such live promotion."""
+        if not code:
+            return None
+        promo: Optional[Promotion] = self.data_store.promotions.get(code)
+        if not promo or now >= promo.valid_until:
+            return None
+        category_ids: Optional[AbstractSet[str]] = None
+        if promo.category != "all":
+            category_ids = self.data_store.get_product_ids_by_category(promo.category)
+        return Money.from_float(promo.min_purchase).cents, promo.discount_percent / 100, category_ids
+
+    def _promotion_rates(
+        self,
+        batch: CartBatch,
+        slices: List[slice],
+        discounted: MoneyArray,
+        promo_codes: Sequence[Optional[str]],
+        now: datetime.datetime
+    ) -> List[float]:
+        """The promotion rate of each cart (0 where its code does not apply), as apply_promotion_discount()."""
+        terms: Dict[Optional[str], Optional[PromotionTerms]] = {
+            code: self._promotion_terms(code, now) for code in set(promo_codes)
+        }
+        rates: List[float] = []
+        for code, cents, cart in zip(promo_codes, discounted.cents, slices):
+            promo_terms: Optional[PromotionTerms] = terms[code]
+            if promo_terms is None or cents < promo_terms[0]:
+                rates.append(0.0)
+                continue
+            min_cents, rate, category_ids = promo_terms
+            applicable: bool = category_ids is None or any(
+                product_id in category_ids for product_id in batch.product_ids[cart]
+            )
+            rates.append(rate if applicable else 0.0)
+        return rates
+
+    def _shipping(
+        self,
+        shipping_methods: Sequence[str],
+        weights: List[float],
+        customers: Sequence[Customer],
+        discounted: MoneyArray
+    ) -> MoneyArray:
+        """Shipping per cart, one batch call per method, in cents as Money.from_float()."""
+        subtotals: List[float] = list(map(truediv, discounted.cents, repeat(100)))
+        methods: Set[str] = set(shipping_methods)
+        strategies: Dict[str, ShippingStrategy] = {}
+        for method in methods:
+            strategy: Optional[ShippingStrategy] = self.shipping_strategies.get(method)
+            if not strategy:
+                raise ValueError(f"Invalid shipping method: {method}")
+            strategies[method] = strategy
+
+        costs: List[float]
+        if len(methods) == 1:
+            costs = strategies[shipping_methods[0]].cal_shipping_costs(weights, customers, subtotals)
+        else:
+            costs = [0.0] * len(weights)
+            for method, strategy in strategies.items():
+                carts: List[int] = [i for i, cart_method in enumerate(shipping_methods) if cart_method == method]
+                for i, cost in zip(carts, strategy.cal_shipping_costs(
+                    [weights[i] for i in carts], [customers[i] for i in carts], [subtotals[i] for i in carts]
+                )):
+                    costs[i] = cost
+        return MoneyArray(array('q', map(round, map(mul, costs, repeat(100)))))
@@ -0,0 +1,270 @@
+import datetime
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface
+from submission.domain.models.Customer import Customer
+from submission.domain.models.OrderLines import OrderLines
+from submission.domain.models.Product import Product
+from submission.domain.models.Promotion import Promotion
+from submission.domain.enums.rounding_mode import RoundingMode
+from submission.domain.values.DiscountQuote import DiscountQuote
+from submission.domain.values.Money import Money, ZERO
+from submission.services.pricing.PricingService import DISCOUNT_ROUNDING
+from submission.services.pricing.strategies.bulk_discount import BulkDiscount
+from submission.services.pricing.strategies.bulk_discount_table import BulkDiscountTable, CompiledBulkDiscounts
+
+# Weights are summed as whole millionths of a unit, so taking a line
+# out leaves exactly the total it had before the line went in
+_WEIGHT_SCALE = 1_000_000
+
+# A promotion's terms for this cart: code, minimum purchase in cents, and
+# rate; None if the code is not a live promotion the cart qualifies for
+CartPromotion = Optional[Tuple[str, int, float]]
+
+STAGES = ('bulk', 'membership', 'promotion', 'loyalty')
+
+
+class _Line:
+    """A cart line and what it adds to the running totals, per unit."""
+    __slots__ = ('quantity', 'unit_cents', 'category', 'weight_units')
+
+    def __init__(self, quantity: int, unit_cents: int, category: str, weight_units: int) -> None:
+        self.quantity: int = quantity
+        self.unit_cents: int = unit_cents
+        self.category: str = category
+        self.weight_units: int = weight_units
+
+
+class Cart:
+    """
+    A cart that is priced again after every change, for carts of
+    hundreds of lines edited one line at a time.
+
+    It keeps the subtotal, item count, weight and the quantity and cents
+    of each product category as running totals, so adding, changing or
+    removing a line costs O(1) however long the cart is. price() gives
+    the same breakdown as PricingService.quote() on lines(), and reruns
+    only the discount stages whose inputs changed since the last call:
+    a new promo code reprices the promotion and loyalty stages, new
+    loyalty points only the loyalty stage, and so on.
+
+    A line is keyed by product and takes its unit price (unless one is
+    given), category and weight from the catalog when it is added; a
+    later catalog change does not reach lines already in the cart.
+    Like a quote, price() writes nothing to the store.
+    """
+
+    def __init__(
+        self,
+        data_store: DataStoreInterface,
+        customer: Customer,
+        bulk_discounts: Union[BulkDiscountTable, Sequence[BulkDiscount]] = (),
+        promotion_code: Optional[str] = None
+    ) -> None:
+        self.data_store: DataStoreInterface = data_store
+        self.customer: Customer = customer
+        self.promotion_code: Optional[str] = promotion_code
+        self.bulk_discounts: BulkDiscountTable = BulkDiscountTable.of(bulk_discounts)
+
+        self._lines: Dict[str, _Line] = {}
+        self._subtotal_cents: int = 0
+        self._item_count: int = 0
+        self._weight_units: int = 0
+        # category -> [quantity, cents]
+        self._by_category: Dict[str, List[int]] = {}
+        # Bumped by every line change; the bulk stage's input
+        self._version: int = 0
+
+        # stage -> (its inputs, its result) when it last ran
+        self._memo: Dict[str, Tuple[Hashable, Any]] = {}
+        self.stage_runs: Dict[str, int] = dict.fromkeys(STAGES, 0)
+
+    # --- Changing lines ---
+
+    def add(self, product_id: str, quantity: int = 1, unit_price: Optional[float] = None) -> None:
+        """
+        Adds `quantity` of a product, as a new line or onto its line.
+        With `unit_price`, the whole line takes that price. Raises
+        ValueError for an unknown product or a quantity below 1.
+        """
+        if quantity < 1:
+            raise ValueError("quantity must be at least 1")
+        line: Optional[_Line] = self._lines.get(product_id)
+        if line is None:
+            product: Optional[Product] = self.data_store.get_product(product_id)
+            if product is None:
+                raise ValueError(f"Unknown product: {product_id}")
+            line = self._lines[product_id] = _Line(
+                0, Money.from_float(product.price if unit_price is None else unit_price).cents,
+                product.category, round(product.weight * _WEIGHT_SCALE)
+            )
+        elif unit_price is not None:
+            quantity += line.quantity
+            self._count(line, -line.quantity)
+            line.unit_cents = Money.from_float(unit_price).cents
+        self._count(line, quantity)
+
+    def update(self, product_id: str, quantity: int) -> None:
+        """Sets the quantity of a product's line; 0 removes it. Raises KeyError if it has none."""
+        if quantity < 0:
+            raise ValueError("quantity must not be negative")
+        if quantity == 0:
+            self.remove(product_id)
+            return
+        line: _Line = self._lines[product_id]
+        self._count(line, quantity - line.quantity)
+
+    def remove(self, product_id: str) -> None:
+        """Removes a product's line. Raises KeyError if it has none."""
+        line: _Line = self._lines.pop(product_id)
+        self._count(line, -line.quantity)
+
+    def _count(self, line: _Line, quantity: int) -> None:
+        """Adds `quantity` (maybe negative) to `line` and every running total."""
+        line.quantity += quantity
+        cents: int = quantity * line.unit_cents
+        self._subtotal_cents += cents
+        self._item_count += quantity
+        self._weight_units += quantity * line.weight_units
+        totals: Optional[List[int]] = self._by_category.get(line.category)
+        if totals is None:
+            totals = self._by_category[line.category] = [0, 0]
+        totals[0] += quantity
+        totals[1] += cents
+        if not totals[0]:
+            del self._by_category[line.category]
+        self._version += 1
+
+    # --- Running totals ---
+
+    @property
+    def subtotal(self) -> Money:
+        return Money(self._subtotal_cents)
+
+    @property
+    def item_count(self) -> int:
+        return self._item_count
+
+    @property
+    def weight(self) -> float:
+        return self._weight_units / _WEIGHT_SCALE
+
+    def category_total(self, category: str) -> Tuple[int, Money]:
+        """The quantity and cost of the cart's products in `category`."""
+        quantity, cents = self._by_category.get(category, (0, 0))
+        return quantity, Money(cents)
+
+    def quantity(self, product_id: str) -> int:
+        line: Optional[_Line] = self._lines.get(product_id)
+        return line.quantity if line is not None else 0
+
+    def lines(self) -> OrderLines:
+        """The cart as order lines, in the order they were first added."""
+        lines = OrderLines()
+        for product_id, line in self._lines.items():
+            lines.add(product_id, line.quantity, line.unit_cents / 100)
+        return lines
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def __contains__(self, product_id: object) -> bool:
+        return product_id in self._lines
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._lines)
+
+    # --- Pricing ---
+
+    def price(self, now: Optional[datetime.datetime] = None) -> DiscountQuote:
+        """The discounts on the cart as it stands, as PricingService.quote() with its settings."""
+        now = now or datetime.datetime.now()
+        customer: Customer = self.customer
+        discounted: int = self._subtotal_cents
+
+        compiled: CompiledBulkDiscounts = self.bulk_discounts.current()
+        bulk: Money = self._stage(
+            'bulk', (compiled, customer.tier, self._version), lambda: self._bulk_discount(compiled, customer)
+        )
+        discounted -= bulk.cents
+
+        rate: float = customer.membership_tier.get_discount()
+        membership: Money = self._stage(
+            'membership', (discounted, rate), lambda: Money(discounted).scale(rate, DISCOUNT_ROUNDING)
+        )
+        discounted -= membership.cents
+
+        promotion: CartPromotion = self._promotion(now)
+        promotion_discount: Money
+        promotion_code: Optional[str]
+        promotion_discount, promotion_code = self._stage(
+            'promotion', (discounted, promotion), lambda: self._promotion_discount(discounted, promotion)
+        )
+        discounted -= promotion_discount.cents
+
+        points: int = customer.loyalty_points
+        loyalty: Money = self._stage(
+            'loyalty', (discounted, points), lambda: self._loyalty_discount(discounted, points)
+        )
+        discounted -= loyalty.cents
+
+        return DiscountQuote(
+            subtotal=Money(self._subtotal_cents),
+            bulk_discount=bulk,
+            membership_discount=membership,
+            promotion_discount=promotion_discount,
+            loyalty_discount=loyalty,
+            discounted=Money(discounted),
+            promotion_code=promotion_code,
+            loyalty_points=loyalty.cents
+        )
+
+    def _stage(self, stage: str, inputs: Hashable, run: Callable[[], Any]) -> Any:
+        """The result of `stage`: the last one if `inputs` are unchanged, else run()'s."""
+        memo: Optional[Tuple[Hashable, Any]] = self._memo.get(stage)
+        if memo is not None and memo[0] == inputs:
+            return memo[1]
+        result: Any = run()
+        self._memo[stage] = (inputs, result)
+        self.stage_runs[stage] += 1
+        return result
+
+    def _bulk_discount(self, compiled: CompiledBulkDiscounts, customer: Customer) -> Money:
+        """As PricingService.apply_bulk_discount(), from the category totals instead of the lines."""
+        if compiled.categories:
+            grouped: Optional[Money] = compiled.grouped_discount(
+                self._by_category.keys(),
+                [quantity for quantity, _ in self._by_category.values()],
+                [cents for _, cents in self._by_category.values()],
+                customer.tier,
+                DISCOUNT_ROUNDING
+            )
+            if grouped is not None:
+                return grouped
+        rate: float = compiled.schedule(None, customer.tier).rate(self._item_count)
+        return Money(self._subtotal_cents).scale(rate, DISCOUNT_ROUNDING)
+
+    def _promotion(self, now: datetime.datetime) -> CartPromotion:
+        """The terms of the cart's promo code, if it is live and covers something in the cart."""
+        if not self.promotion_code:
+            return None
+        promo: Optional[Promotion] = self.data_store.promotions.get(self.promotion_code)
+        if not promo or now >= promo.valid_until:
+            return None
+        if promo.category != "all" and promo.category not in self._by_category:
+            return None
+        return promo.code, Money.from_float(promo.min_purchase).cents, promo.discount_percent / 100
+
+    @staticmethod
+    def _promotion_discount(discounted: int, promotion: CartPromotion) -> Tuple[Money, Optional[str]]:
+        if promotion is None or discounted < promotion[1]:
+            return ZERO, None
+        code, _, rate = promotion
+        return Money(discounted).scale(rate, DISCOUNT_ROUNDING), code
+
+    @staticmethod
+    def _loyalty_discount(discounted: int, points: int) -> Money:
+        """Up to 10% of the price, one point per cent, from 100 points up."""
+        if points < 100:
+            return ZERO
+        return min(Money(discounted).scale(0.1, RoundingMode.DOWN), Money(points))
@@ -1,44 +1,190 @@
 import datetime
-from typing import List, Optional
+import threading
+from operator import mul
+from typing import AbstractSet, Any, Iterable, Optional, Sequence, Set, Union, overload
 
-from submission.repositories.in_memory.DataStore import DataStore
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface
 from submission.domain.models.  OrderItem import OrderItem
+from submission.domain.models.OrderLines import OrderLines
 from submission.domain.models.Customer import Customer
-from submission.domain.models.Product import Product
 from submission.domain.models.Promotion import Promotion
+from submission.domain.enums.rounding_mode import RoundingMode
+from submission.domain.values.DiscountQuote import DiscountQuote
+from submission.domain.values.Money import Money, ZERO
+from submission.services.pricing.PromotionEngine import PromotionEngine
 from submission.services.pricing.strategies.bulk_discount import BulkDiscount
+from submission.services.pricing.strategies.bulk_discount_table import BulkDiscountTable, CompiledBulkDiscounts
+
+# Percentage discounts are rounded to the nearest cent, ties to even
+DISCOUNT_ROUNDING = RoundingMode.HALF_EVEN
+
+# Held while loyalty points and promotion uses are checked and spent
+_USAGE_LOCK = threading.Lock()
+
+
+class _AsFloat:
+    """A float view of the Money attribute `name`, for callers that work in floats."""
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+
+    @overload
+    def __get__(self, instance: None, owner: Any) -> "_AsFloat": ...
+
+    @overload
+    def __get__(self, instance: object, owner: Any) -> float: ...
+
+    def __get__(self, instance: Optional[object], owner: Any) -> Union["_AsFloat", float]:
+        if instance is None:
+            return self
+        amount: Money = getattr(instance, self.name)
+        return amount.to_float()
+
+    def __set__(self, instance: object, value: float) -> None:
+        setattr(instance, self.name, Money.from_float(value))
 
 
 class PricingService:
-    def __init__(self, order_items: List[OrderItem], data_store: DataStore) -> None:
-        self.order_items: List[OrderItem] = order_items
-        self.data_store: DataStore = data_store
+    """
+    Takes an order's discounts off its subtotal, one stage at a time.
+
+    By default the loyalty and promotion stages spend what they use as
+    they go (points off the customer, a use on the promotion). With
+    quote_only=True no stage writes or prints: the service only works
+    out the breakdown, so any number of quotes can run side by side,
+    and commit() spends the points and the promotion use later, once
+    the order goes through.
+    """
+
+    # Amounts are Money (whole cents); these are the same amounts as floats
+    subtotal = _AsFloat('subtotal_money')
+    discounted_price = _AsFloat('discounted_money')
+    promotion_discount_amount = _AsFloat('promotion_discount_money')
+    bulk_discount_amount = _AsFloat('bulk_discount_money')
+    membership_discount_amount = _AsFloat('membership_discount_money')
+    loyalty_discount_amount = _AsFloat('loyalty_discount_money')
 
-        self.subtotal: float = self._calculate_subtotal(order_items, data_store)
-        self.discounted_price: float = self.subtotal
+    def __init__(
+        self, order_items: Iterable[OrderItem], data_store: DataStoreInterface, quote_only: bool = False
+    ) -> None:
+        self.order_items: OrderLines = order_items if isinstance(order_items, OrderLines) else OrderLines(order_items)
+        self.data_store: DataStoreInterface = data_store
+
+        self.subtotal_money: Money = self._calculate_subtotal(self.order_items, data_store)
+        self.discounted_money: Money = self.subtotal_money
         
         # Track applied discount amounts
-        self.promotion_discount_amount: float = 0.0
-        self.bulk_discount_amount: float = 0.0
-        self.membership_discount_amount: float = 0.0
-        self.loyalty_discount_amount: float = 0.0
+        self.promotion_discount_money: Money = ZERO
+        self.bulk_discount_money: Money = ZERO
+        self.membership_discount_money: Money = ZERO
+        self.loyalty_discount_money: Money = ZERO
+
+        # What the discounts use up (spent at once unless quote_only)
+        self.quote_only: bool = quote_only
+        self.applied_promotion_code: Optional[str] = None
+        self.loyalty_points_spent: int = 0
+
+    @classmethod
+    def quote(
+        cls,
+        order_items: Iterable[OrderItem],
+        data_store: DataStoreInterface,
+        customer: Customer,
+        promotion_code: Optional[str] = None,
+        bulk_discounts: Union[BulkDiscountTable, Sequence[BulkDiscount]] = ()
+    ) -> DiscountQuote:
+        """Every discount stage, in checkout's order, with no writes and no output."""
+        return (
+            cls(order_items, data_store, quote_only=True)
+            .apply_bulk_discount(bulk_discounts, customer)
+            .apply_membership_discount(customer)
+            .apply_promotion_discount(promotion_code)
+            .apply_loyalty_discount(customer)
+            .to_quote()
+        )
+
+    def to_quote(self) -> DiscountQuote:
+        """The discounts applied so far."""
+        return DiscountQuote(
+            subtotal=self.subtotal_money,
+            bulk_discount=self.bulk_discount_money,
+            membership_discount=self.membership_discount_money,
+            promotion_discount=self.promotion_discount_money,
+            loyalty_discount=self.loyalty_discount_money,
+            discounted=self.discounted_money,
+            promotion_code=self.applied_promotion_code,
+            loyalty_points=self.loyalty_points_spent
+        )
+
+    @staticmethod
+    def commit(
+        data_store: DataStoreInterface,
+        quote: DiscountQuote,
+        customer: Customer,
+        now: Optional[datetime.datetime] = None
+    ) -> bool:
+        """
+        Spends what `quote` uses: the customer's loyalty points and one use
+        of its promotion, both or neither. Returns False, changing nothing,
+        if the customer no longer has the points or the promotion is gone
+        or expired since the quote.
+        """
+        now = now or datetime.datetime.now()
+        with _USAGE_LOCK:
+            promo: Optional[Promotion] = None
+            if quote.promotion_code:
+                promo = data_store.promotions.get(quote.promotion_code)
+                if promo is None or now >= promo.valid_until:
+                    return False
+            if customer.loyalty_points < quote.loyalty_points:
+                return False
+            if promo is not None:
+                data_store.update_promotion(promo, used_count=promo.used_count + 1)
+            if quote.loyalty_points:
+                data_store.update_customer(customer, loyalty_points=customer.loyalty_points - quote.loyalty_points)
+        return True
+
+    @staticmethod
+    def release(data_store: DataStoreInterface, quote: DiscountQuote, customer: Customer) -> None:
+        """Gives back what commit() spent for `quote` (the order did not go through)."""
+        with _USAGE_LOCK:
+            promo: Optional[Promotion] = data_store.promotions.get(quote.promotion_code) \
+                if quote.promotion_code else None
+            if promo is not None and promo.used_count > 0:
+                data_store.update_promotion(promo, used_count=promo.used_count - 1)
+            if quote.loyalty_points:
+                data_store.update_customer(customer, loyalty_points=customer.loyalty_points + quote.loyalty_points)
+
+    @staticmethod
+    def award_points(data_store: DataStoreInterface, customer: Customer, points: int) -> None:
+        """
+        Adds points the customer earned. Under the same lock as commit()
+        and release(), so concurrent checkouts do not lose each other's
+        point changes.
+        """
+        with _USAGE_LOCK:
+            data_store.update_customer(customer, loyalty_points=customer.loyalty_points + points)
+
+    def _say(self, message: str) -> None:
+        if not self.quote_only:
+            print(message)
     
-    def _calculate_subtotal(self, order_items: List[OrderItem], data_store: DataStore) -> float:
-        """Private helper to calculate base subtotal."""
-        subtotal: float = 0.0
-        for item in order_items:
-            product: Optional[Product] = data_store.get_product(item.product_id)
-            if product:
-                subtotal += item.quantity * item.unit_price
-        return subtotal
+    def _calculate_subtotal(self, order_lines: OrderLines, data_store: DataStoreInterface) -> Money:
+        """Private helper to calculate base subtotal (lines for unknown products don't count)."""
+        return order_lines.subtotal(map(data_store.get_product, order_lines.product_ids))
+
+    def _take_discount(self, rate: float) -> Money:
+        """Takes `rate` off the running price; returns the amount taken."""
+        amount: Money = self.discounted_money.scale(rate, DISCOUNT_ROUNDING)
+        self.discounted_money -= amount
+        return amount
     
     def apply_membership_discount(self, customer: Customer) -> "PricingService":
         """Applies membership discount. Returns self for chaining."""
         discount_rate: float = customer.membership_tier.get_discount()
 
         if discount_rate > 0:
-            self.membership_discount_amount = self.discounted_price * discount_rate
-            self.discounted_price -= self.membership_discount_amount
+            self.membership_discount_money = self._take_discount(discount_rate)
         
         return self
     
@@ -53,78 +199,113 @@ class PricingService:
             return self
         
         if datetime.datetime.now() >= promo.valid_until:
-            print("Promotion has expired.")
+            self._say("Promotion has expired.")
             return self
         
-        if self.discounted_price < promo.min_purchase:
-            print("Promotion is not applicable.")
+        if self.discounted_money < Money.from_float(promo.min_purchase):
+            self._say("Promotion is not applicable.")
             return self
         
         applicable: bool = False
         if promo.category == "all":
             applicable = True
         else:
-            for item in self.order_items:
-                product: Optional[Product] = self.data_store.get_product(item.product_id)
-                if product and product.category == promo.category:
-                    applicable = True
-                    break
+            category_ids: AbstractSet[str] = self.data_store.get_product_ids_by_category(promo.category)
+            applicable = any(product_id in category_ids for product_id in self.order_items.product_ids)
         
         if applicable:
-            promo_discount_rate: float = promo.discount_percent / 100
-            self.promotion_discount_amount = self.discounted_price * promo_discount_rate
-            self.discounted_price -= self.promotion_discount_amount
-            promo.used_count += 1
-            print(f"Promotion {promo.code} applied.")
+            self._apply_promotion(promo)
         else:
-            print("Promotion is not applicable.")
+            self._say("Promotion is not applicable.")
         
         return self
+
+    def apply_best_promotion(
+        self, engine: PromotionEngine, now: Optional[datetime.datetime] = None
+    ) -> "PricingService":
+        """Applies the best live promotion the order qualifies for, without a code. Returns self for chaining."""
+        categories: Set[str] = {
+            product.category for product in map(self.data_store.get_product, set(self.order_items.product_ids))
+            if product
+        }
+        promo: Optional[Promotion] = engine.best(categories, self.discounted_money, now)
+        if promo:
+            self._apply_promotion(promo)
+        return self
+
+    def _apply_promotion(self, promo: Promotion) -> None:
+        self.promotion_discount_money = self._take_discount(promo.discount_percent / 100)
+        self.applied_promotion_code = promo.code
+        if not self.quote_only:
+            self.data_store.update_promotion(promo, used_count=promo.used_count + 1)
+        self._say(f"Promotion {promo.code} applied.")
     
-    def apply_bulk_discount(self, available_discounts: List[BulkDiscount]) -> "PricingService":
-        """Applies the best matching bulk discount. Returns self for chaining."""
-        total_items: int = sum(item.quantity for item in self.order_items)
-        
-        qualified_discounts: List[BulkDiscount] = [
-            strategy for strategy in available_discounts 
-            if total_items >= strategy.get_min_quantity()
-        ]
-
-        # Assumes 'NoBulkDiscount' is always in the list, so qualified_discounts is never empty
-        best_discount_strategy: BulkDiscount = sorted(
-            qualified_discounts, 
-            key=lambda d: d.get_min_quantity(), 
-            reverse=True
-        )[0]
-
-        bulk_discount_rate: float = best_discount_strategy.get_discount()
+    def apply_bulk_discount(
+        self,
+        available_discounts: Union[BulkDiscountTable, Sequence[BulkDiscount]],
+        customer: Optional[Customer] = None
+    ) -> "PricingService":
+        """
+        Applies the best matching bulk discount, from `customer`'s schedule
+        if there is one for their tier. Returns self for chaining.
+        """
+        compiled: CompiledBulkDiscounts = BulkDiscountTable.of(available_discounts).current()
+        tier = customer.tier if customer is not None else None
+
+        if compiled.categories:
+            lines: OrderLines = self.order_items
+            products = list(map(self.data_store.get_product, lines.product_ids))
+            grouped: Optional[Money] = compiled.grouped_discount(
+                [product.category if product else None for product in products],
+                lines.quantities,
+                map(mul, lines.line_cents(), map(bool, products)),
+                tier,
+                DISCOUNT_ROUNDING
+            )
+            if grouped is not None:
+                self.bulk_discount_money = grouped
+                self.discounted_money -= grouped
+                if grouped:
+                    self._say(f"Applied bulk discount: ${grouped}")
+                return self
+
+        bulk_discount_rate: float = compiled.schedule(None, tier).rate(self.order_items.item_count())
         
         if bulk_discount_rate > 0:
-            self.bulk_discount_amount = self.discounted_price * bulk_discount_rate 
-            self.discounted_price -= self.bulk_discount_amount
-            print(f"Applied bulk discount: {bulk_discount_rate*100}%")
+            self.bulk_discount_money = self._take_discount(bulk_discount_rate)
+            self._say(f"Applied bulk discount: {bulk_discount_rate*100}%")
             
         return self
 
     def apply_loyalty_discount(self, customer: Customer) -> "PricingService":
         """Applies loyalty discount. Returns self for chaining."""
         if customer.loyalty_points >= 100:
-            max_discount_from_price: float = self.discounted_price * 0.1
-            max_discount_from_points: float = customer.loyalty_points * 0.01
+            # Up to 10% of the price, and one point buys one cent
+            max_discount_from_price: Money = self.discounted_money.scale(0.1, RoundingMode.DOWN)
+            max_discount_from_points: Money = Money(customer.loyalty_points)
 
-            loyalty_discount: float = min(max_discount_from_price, max_discount_from_points)
+            loyalty_discount: Money = min(max_discount_from_price, max_discount_from_points)
 
-            self.loyalty_discount_amount = loyalty_discount
-            self.discounted_price -= self.loyalty_discount_amount
-            
-            customer.loyalty_points -= int(loyalty_discount * 100)
+            self.loyalty_discount_money = loyalty_discount
+            self.discounted_money -= loyalty_discount
+            self.loyalty_points_spent = loyalty_discount.cents
+
+            if not self.quote_only:
+                with _USAGE_LOCK:
+                    self.data_store.update_customer(
+                        customer, loyalty_points=customer.loyalty_points - loyalty_discount.cents
+                    )
             
-            print(f"Applied loyalty discount: ${loyalty_discount:.2f}")
+            self._say(f"Applied loyalty discount: ${loyalty_discount}")
         else:
-            print("Not enough loyalty points to apply discount.")
+            self._say("Not enough loyalty points to apply discount.")
         
         return self
 
     def get_final_discounted_price(self) -> float:
         """Returns the final price after all discounts."""
         return self.discounted_price
+
+    def get_final_discounted_money(self) -> Money:
+        """get_final_discounted_price() as Money."""
+        return self.discounted_money
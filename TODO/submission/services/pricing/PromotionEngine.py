@@ -0,0 +1,192 @@
+import datetime
+import heapq
+import threading
+from bisect import bisect_right
+from itertools import count
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from submission.repositories.changes.RecordChanges import RecordChange
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface
+from submission.domain.models.Promotion import Promotion
+from submission.domain.values.Money import Money
+
+# The category of promotions that apply to any cart
+ALL_CATEGORIES = "all"
+
+
+class _CategoryIndex:
+    """
+    The live promotions of one category by minimum purchase. Compiled on
+    the first lookup after a change: minimums ascending, and best[i] the
+    highest discount among the first i, so the best promotion a cart of
+    some amount reaches is one bisect.
+    """
+    __slots__ = ('promotions', 'minimums', 'best')
+
+    def __init__(self) -> None:
+        self.promotions: Dict[str, Promotion] = {}
+        self.minimums: Optional[List[int]] = None
+        self.best: List[Optional[Promotion]] = []
+
+    def changed(self) -> None:
+        self.minimums = None
+
+    def best_for(self, cents: int) -> Optional[Promotion]:
+        if self.minimums is None:
+            self._compile()
+        return self.best[bisect_right(self.minimums, cents)]  # type: ignore[arg-type]
+
+    def _compile(self) -> None:
+        ordered: List[Tuple[int, str, Promotion]] = sorted(
+            (Money.from_float(promo.min_purchase).cents, code, promo) for code, promo in self.promotions.items()
+        )
+        best: List[Optional[Promotion]] = [None]
+        for _, _, promo in ordered:
+            leader: Optional[Promotion] = best[-1]
+            best.append(promo if leader is None or promo.discount_percent > leader.discount_percent else leader)
+        self.best = best
+        self.minimums = [minimum for minimum, _, _ in ordered]
+
+
+class PromotionEngine:
+    """
+    Picks the best promotion for a cart among all live ones, without a
+    code. Promotions are indexed by category and minimum purchase, and
+    an expiry heap drops each one as its valid_until passes, so a lookup
+    costs one bisect per distinct category in the cart (plus the "all"
+    category) however many promotions are running.
+
+    "Best" is the highest discount_percent among the promotions the cart
+    qualifies for as apply_promotion_discount() checks them: not expired,
+    the amount at least min_purchase, and the category "all" or one of
+    the cart's. The engine holds the promotions it was given; add() and
+    remove() keep it in step with the store, and a promotion whose terms
+    change is add()ed again. An engine built by from_store() does this
+    itself, from the store's change notifications. A valid_until changed
+    in place is honoured either way: best() checks it before returning
+    a promotion, and the expiry heap reschedules an entry that comes up
+    early.
+    """
+
+    def __init__(self, promotions: Iterable[Promotion] = ()) -> None:
+        self._by_code: Dict[str, Promotion] = {}
+        # The category each code was indexed under, in case it changes
+        self._category_of: Dict[str, str] = {}
+        self._by_category: Dict[str, _CategoryIndex] = {}
+        # (valid_until, sequence, promotion); only the entry whose
+        # sequence is the code's current one counts, older ones are
+        # skipped when they come up
+        self._expiry: List[Tuple[datetime.datetime, int, Promotion]] = []
+        self._entry_of: Dict[str, int] = {}
+        self._sequence = count()
+        self._lock = threading.Lock()
+        for promo in promotions:
+            self.add(promo)
+
+    @classmethod
+    def from_store(cls, data_store: DataStoreInterface) -> "PromotionEngine":
+        """An engine over the store's promotions, following their changes."""
+        engine = cls(data_store.promotions.values())
+
+        def on_change(change: RecordChange) -> None:
+            if change.table != 'promotions' or change.fields == {'used_count'}:
+                return
+            promo: Optional[Promotion] = data_store.promotions.get(change.key)
+            if promo is None:
+                engine.remove(change.key)
+            else:
+                engine.add(promo)
+
+        data_store.add_change_listener(on_change)
+        return engine
+
+    def __len__(self) -> int:
+        return len(self._by_code)
+
+    def __contains__(self, code: object) -> bool:
+        return code in self._by_code
+
+    def add(self, promotion: Promotion) -> None:
+        """Adds `promotion`, replacing any promotion with the same code."""
+        with self._lock:
+            self._remove(promotion.code)
+            self._by_code[promotion.code] = promotion
+            self._category_of[promotion.code] = promotion.category
+            index: Optional[_CategoryIndex] = self._by_category.get(promotion.category)
+            if index is None:
+                index = self._by_category[promotion.category] = _CategoryIndex()
+            index.promotions[promotion.code] = promotion
+            index.changed()
+            self._schedule(promotion)
+
+    def remove(self, code: str) -> Optional[Promotion]:
+        with self._lock:
+            return self._remove(code)
+
+    def expire(self, now: Optional[datetime.datetime] = None) -> List[Promotion]:
+        """Drops the promotions expired at `now`; returns them."""
+        with self._lock:
+            return self._expire(now or datetime.datetime.now())
+
+    def best(
+        self,
+        categories: Iterable[str],
+        amount: Money,
+        now: Optional[datetime.datetime] = None
+    ) -> Optional[Promotion]:
+        """The best promotion for a cart of `amount` with products in `categories`, or None."""
+        now = now or datetime.datetime.now()
+        with self._lock:
+            self._expire(now)
+            best: Optional[Promotion] = None
+            for category in (ALL_CATEGORIES, *set(categories)):
+                candidate: Optional[Promotion] = self._best_live(category, amount.cents, now)
+                if candidate is not None and (best is None or candidate.discount_percent > best.discount_percent):
+                    best = candidate
+            return best
+
+    # --- Private helpers (called with the lock held) ---
+
+    def _best_live(self, category: str, cents: int, now: datetime.datetime) -> Optional[Promotion]:
+        """The category's best promotion for `cents`, dropping any whose valid_until was brought forward."""
+        while True:
+            index: Optional[_CategoryIndex] = self._by_category.get(category)
+            if index is None:
+                return None
+            candidate: Optional[Promotion] = index.best_for(cents)
+            if candidate is None or now < candidate.valid_until:
+                return candidate
+            self._remove(candidate.code)
+
+    def _schedule(self, promo: Promotion) -> None:
+        sequence: int = next(self._sequence)
+        self._entry_of[promo.code] = sequence
+        heapq.heappush(self._expiry, (promo.valid_until, sequence, promo))
+
+    def _remove(self, code: str) -> Optional[Promotion]:
+        promo: Optional[Promotion] = self._by_code.pop(code, None)
+        if promo is not None:
+            del self._entry_of[code]
+            category: str = self._category_of.pop(code)
+            index: _CategoryIndex = self._by_category[category]
+            del index.promotions[code]
+            if index.promotions:
+                index.changed()
+            else:
+                del self._by_category[category]
+        return promo
+
+    def _expire(self, now: datetime.datetime) -> List[Promotion]:
+        expired: List[Promotion] = []
+        expiry = self._expiry
+        while expiry and expiry[0][0] <= now:
+            _, sequence, promo = heapq.heappop(expiry)
+            if self._entry_of.get(promo.code) != sequence:
+                continue
+            if promo.valid_until <= now:
+                self._remove(promo.code)
+                expired.append(promo)
+            else:
+                # valid_until was pushed back in place: wait for the new date
+                self._schedule(promo)
+        return expired
@@ -0,0 +1,235 @@
+import datetime
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, MutableMapping, Optional, Set, Tuple
+
+from submission.repositories.changes.RecordChanges import RecordChange
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface
+from submission.domain.models.Customer import Customer
+from submission.domain.models.OrderLines import OrderLines
+from submission.domain.models.Promotion import Promotion
+from submission.domain.enums.membership_tier import MembershipTierEnum
+from submission.domain.enums.tax_strategy import TaxRegion
+from submission.domain.values.PriceQuote import PriceQuote
+from submission.services.tax_service import TaxService
+
+# A cart with its lines sorted and lines for the same product at the
+# same price merged: (product id, unit cents, quantity) each
+CartKey = Tuple[Tuple[str, int, int], ...]
+QuoteKey = Tuple[CartKey, str, MembershipTierEnum, TaxRegion, Optional[str], str]
+
+# Prices the cart for the customer: (lines, customer, shipping method, promo code, now)
+QuoteFunction = Callable[[OrderLines, Customer, str, Optional[str], Optional[datetime.datetime]], PriceQuote]
+
+# Fields whose changes no quote depends on
+_UNPRICED_FIELDS: Dict[str, FrozenSet[str]] = {
+    'products': frozenset({'quantity_available', 'name', 'supplier_id'}),
+    'customers': frozenset({'name', 'email', 'phone', 'order_history'}),
+    'promotions': frozenset({'used_count'}),
+}
+
+
+@dataclass(frozen=True)
+class QuoteCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _Entry:
+    __slots__ = ('quote', 'product_ids', 'customer_id', 'promo_code', 'expires_at')
+
+    def __init__(
+        self,
+        quote: PriceQuote,
+        product_ids: FrozenSet[str],
+        customer_id: str,
+        promo_code: Optional[str],
+        expires_at: Optional[datetime.datetime]
+    ) -> None:
+        self.quote: PriceQuote = quote
+        self.product_ids: FrozenSet[str] = product_ids
+        self.customer_id: str = customer_id
+        self.promo_code: Optional[str] = promo_code
+        self.expires_at: Optional[datetime.datetime] = expires_at
+
+
+class QuoteCache:
+    """
+    The last `capacity` price quotes, least recently used evicted first,
+    so a checkout reloaded with the same cart is not priced again.
+
+    A quote is keyed by the canonical cart (the same lines in any order
+    are the same cart), the customer, their tier, the tax region of their
+    address, the promo code and the shipping method. It is dropped as
+    soon as something it was computed from changes: the store reports
+    every write to a product in the cart (a price change through
+    ProductService.update_product_price, say), to the customer (tier,
+    loyalty points, address) and to a promotion with the quote's code
+    (including one added with it). A quote that used a promotion also
+    lapses when the promotion expires. Writes no price depends on, such
+    as stock levels or a promotion's use count, drop nothing.
+    """
+
+    def __init__(
+        self,
+        data_store: DataStoreInterface,
+        tax_service: TaxService,
+        compute: QuoteFunction,
+        capacity: int = 10_000
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.data_store: DataStoreInterface = data_store
+        self.tax_service: TaxService = tax_service
+        self.compute: QuoteFunction = compute
+        self.capacity: int = capacity
+
+        self._entries: "OrderedDict[QuoteKey, _Entry]" = OrderedDict()
+        # What each quote was computed from -> the keys of those quotes
+        self._by_product: Dict[str, Set[QuoteKey]] = {}
+        self._by_customer: Dict[str, Set[QuoteKey]] = {}
+        self._by_promo_code: Dict[Optional[str], Set[QuoteKey]] = {}
+        self._lock = threading.Lock()
+
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+        self._invalidations: int = 0
+        # Bumped by every relevant write, cached or not (see quote())
+        self._changes: int = 0
+
+        data_store.add_change_listener(self._on_change)
+
+    @staticmethod
+    def cart_key(lines: OrderLines) -> CartKey:
+        if len(set(lines.product_ids)) == len(lines):
+            return tuple(sorted(zip(lines.product_ids, lines.unit_cents, lines.quantities)))
+        merged: Dict[Tuple[str, int], int] = {}
+        for product_id, quantity, unit_cents in zip(lines.product_ids, lines.quantities, lines.unit_cents):
+            merged[product_id, unit_cents] = merged.get((product_id, unit_cents), 0) + quantity
+        return tuple(sorted((product_id, cents, quantity) for (product_id, cents), quantity in merged.items()))
+
+    def quote(
+        self,
+        lines: OrderLines,
+        customer: Customer,
+        shipping_method: str,
+        promo_code: Optional[str] = None,
+        now: Optional[datetime.datetime] = None
+    ) -> PriceQuote:
+        """The quote for this cart, from the cache or computed (and cached)."""
+        now = now or datetime.datetime.now()
+        cart: CartKey = self.cart_key(lines)
+        key: QuoteKey = (
+            cart, customer.customer_id, customer.tier, self.tax_service.region_for_address(customer.address),
+            promo_code, shipping_method
+        )
+        with self._lock:
+            entry: Optional[_Entry] = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at is None or now < entry.expires_at:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry.quote
+                self._drop(key)
+                self._invalidations += 1
+            self._misses += 1
+            changes: int = self._changes
+
+        quote: PriceQuote = self.compute(lines, customer, shipping_method, promo_code, now)
+
+        promo: Optional[Promotion] = self.data_store.promotions.get(promo_code) if promo_code else None
+        entry = _Entry(
+            quote, frozenset(product_id for product_id, _, _ in cart), customer.customer_id, promo_code,
+            promo.valid_until if promo is not None and now < promo.valid_until else None
+        )
+        with self._lock:
+            # A write while this quote was computed may or may not be in
+            # it; it is returned but not kept
+            if self._changes == changes:
+                self._store(key, entry)
+        return quote
+
+    def stats(self) -> QuoteCacheStats:
+        with self._lock:
+            return QuoteCacheStats(self._hits, self._misses, self._evictions, self._invalidations, len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._changes += 1
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+            self._by_product.clear()
+            self._by_customer.clear()
+            self._by_promo_code.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # --- Invalidation ---
+
+    def invalidate_product(self, product_id: str) -> int:
+        return self._invalidate(self._by_product, product_id)
+
+    def invalidate_customer(self, customer_id: str) -> int:
+        return self._invalidate(self._by_customer, customer_id)
+
+    def invalidate_promotion(self, code: str) -> int:
+        return self._invalidate(self._by_promo_code, code)
+
+    def _on_change(self, change: RecordChange) -> None:
+        if change.fields is not None and change.fields <= _UNPRICED_FIELDS.get(change.table, frozenset()):
+            return
+        if change.table == 'products':
+            self.invalidate_product(change.key)
+        elif change.table == 'customers':
+            self.invalidate_customer(change.key)
+        elif change.table == 'promotions':
+            self.invalidate_promotion(change.key)
+
+    def _invalidate(self, index: MutableMapping[Any, Set[QuoteKey]], dependency: Hashable) -> int:
+        """Drops every quote computed from `dependency`; returns how many."""
+        with self._lock:
+            self._changes += 1
+            keys: List[QuoteKey] = list(index.get(dependency, ()))
+            for key in keys:
+                self._drop(key)
+            self._invalidations += len(keys)
+            return len(keys)
+
+    # --- Private helpers (called with the lock held) ---
+
+    def _store(self, key: QuoteKey, entry: _Entry) -> None:
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = entry
+        for product_id in entry.product_ids:
+            self._by_product.setdefault(product_id, set()).add(key)
+        self._by_customer.setdefault(entry.customer_id, set()).add(key)
+        self._by_promo_code.setdefault(entry.promo_code, set()).add(key)
+        while len(self._entries) > self.capacity:
+            self._drop(next(iter(self._entries)))
+            self._evictions += 1
+
+    def _drop(self, key: QuoteKey) -> None:
+        entry: _Entry = self._entries.pop(key)
+        for product_id in entry.product_ids:
+            self._unlink(self._by_product, product_id, key)
+        self._unlink(self._by_customer, entry.customer_id, key)
+        self._unlink(self._by_promo_code, entry.promo_code, key)
+
+    @staticmethod
+    def _unlink(index: MutableMapping[Any, Set[QuoteKey]], dependency: Hashable, key: QuoteKey) -> None:
+        keys: Set[QuoteKey] = index[dependency]
+        keys.discard(key)
+        if not keys:
+            del index[dependency]
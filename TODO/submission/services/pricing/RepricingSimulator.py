@@ -0,0 +1,363 @@
+import dataclasses
+import os
+from array import array
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import repeat
+from operator import add, mul, sub, truediv
+from typing import Dict, Iterator, List, Mapping, Optional, Set, Tuple
+
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface
+from submission.domain.models.Customer import Customer
+from submission.domain.models.Order import Order
+from submission.domain.models.Product import Product
+from submission.domain.enums.membership_tier import MembershipTierEnum
+from submission.domain.enums.order_status import OrderStatus
+from submission.domain.enums.shipping_method import ShippingMethod
+from submission.domain.enums.tax_strategy import TaxRegion
+from submission.domain.values.Money import Money, MoneyArray
+from submission.services.pricing.BatchPricingService import bulk_discount_column
+from submission.services.pricing.PricingService import DISCOUNT_ROUNDING
+from submission.services.pricing.strategies.bulk_discount_table import (
+    BulkConfig,
+    BulkDiscountTable,
+    CompiledBulkDiscounts
+)
+from submission.services.pricing.strategies.strategy_registry import (
+    BULK_DISCOUNTS,
+    MEMBERSHIP_TIERS,
+    SHIPPING_STRATEGIES,
+    TAX_STRATEGIES
+)
+from submission.services.shipping_strategy import ShippingStrategy
+from submission.services.tax_service import TAX_ROUNDING, TaxService
+
+DEFAULT_SHARD_SIZE = 50_000
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """
+    The pricing rules an order is replayed under: membership discount
+    rates by tier, the bulk discount tiers, tax rates by region and the
+    shipping formula of each method. Plain values and strategy objects,
+    so a rule set can be sent to a worker process.
+    """
+    membership_rates: Dict[MembershipTierEnum, float]
+    bulk_discounts: CompiledBulkDiscounts
+    tax_rates: Dict[TaxRegion, float]
+    shipping: Dict[str, ShippingStrategy]
+
+    @classmethod
+    def current(cls) -> "RuleSet":
+        """The rules checkout uses today, from the strategy registry."""
+        return cls(
+            membership_rates={tier: strategy.get_discount() for tier, strategy in MEMBERSHIP_TIERS.items()},
+            bulk_discounts=BulkDiscountTable(list(BULK_DISCOUNTS.values())).current(),
+            tax_rates={region: strategy.get_rate() for region, strategy in TAX_STRATEGIES.items()},
+            shipping={method.value: SHIPPING_STRATEGIES[method] for method in ShippingMethod}
+        )
+
+    def with_changes(
+        self,
+        membership_rates: Optional[Mapping[MembershipTierEnum, float]] = None,
+        bulk_discounts: Optional[BulkConfig] = None,
+        tax_rates: Optional[Mapping[TaxRegion, float]] = None,
+        shipping: Optional[Mapping[str, ShippingStrategy]] = None
+    ) -> "RuleSet":
+        """
+        These rules with some changed: the rates and shipping methods
+        given replace those entries only; bulk tiers, if given, replace
+        the whole bulk configuration.
+        """
+        return dataclasses.replace(
+            self,
+            membership_rates={**self.membership_rates, **(membership_rates or {})},
+            bulk_discounts=self.bulk_discounts if bulk_discounts is None
+            else BulkDiscountTable(bulk_discounts).current(),
+            tax_rates={**self.tax_rates, **(tax_rates or {})},
+            shipping={**self.shipping, **(shipping or {})}
+        )
+
+
+class OrderShard:
+    """
+    The orders with ids in [first_id, last_id], as columns: what
+    replaying them needs and nothing else, so a shard is cheap to send
+    to a worker. Line i of order j is in slices()[j].
+    """
+    __slots__ = (
+        'first_id', 'last_id', 'skipped', 'order_ids', 'ends', 'line_categories', 'quantities',
+        'unit_cents', 'line_weights', 'customers', 'regions', 'shipping_cents'
+    )
+
+    def __init__(self, first_id: int, last_id: int) -> None:
+        self.first_id: int = first_id
+        self.last_id: int = last_id
+        # Orders in the range that are not replayed (cancelled, or their customer is gone)
+        self.skipped: int = 0
+        self.order_ids: "array[int]" = array('q')
+        self.ends: "array[int]" = array('q')
+        self.line_categories: List[Optional[str]] = []
+        self.quantities: "array[int]" = array('q')
+        self.unit_cents: "array[int]" = array('q')
+        self.line_weights: "array[float]" = array('d')
+        self.customers: List[Customer] = []
+        self.regions: List[TaxRegion] = []
+        # What each order was charged for shipping
+        self.shipping_cents: "array[int]" = array('q')
+
+    def __len__(self) -> int:
+        return len(self.order_ids)
+
+    def slices(self) -> List[slice]:
+        return list(map(slice, [0, *self.ends[:-1]], self.ends))
+
+
+@dataclass(frozen=True)
+class ShardResult:
+    first_id: int
+    last_id: int
+    orders: int
+    skipped: int
+    changed: int
+    baseline_cents: int
+    candidate_cents: int
+    path: str
+
+
+@dataclass(frozen=True)
+class RepricingReport:
+    """What the candidate rules would have done to the orders replayed."""
+    orders: int
+    skipped: int
+    changed: int
+    baseline: Money
+    candidate: Money
+    # One CSV per shard, by order id range: order_id, baseline_cents, candidate_cents, delta_cents
+    paths: Tuple[str, ...]
+
+    @property
+    def revenue_change(self) -> Money:
+        return self.candidate - self.baseline
+
+    @property
+    def change_ratio(self) -> float:
+        """The revenue change as a fraction of the baseline revenue."""
+        return self.revenue_change.cents / self.baseline.cents if self.baseline else 0.0
+
+
+# --- Replaying one shard (runs in a worker process) ---
+
+def _shipping_cents(
+    strategy: ShippingStrategy,
+    weights: List[float],
+    customers: List[Customer],
+    subtotals: List[float]
+) -> List[int]:
+    return list(map(round, map(mul, strategy.cal_shipping_costs(weights, customers, subtotals), repeat(100))))
+
+
+class _ShardPricer:
+    """A shard's per-order sums, worked out once and priced under any number of rule sets."""
+    __slots__ = ('shard', 'slices', 'line_cents', 'subtotal', 'item_counts', 'tiers', 'weights')
+
+    def __init__(self, shard: OrderShard) -> None:
+        self.shard: OrderShard = shard
+        self.slices: List[slice] = shard.slices()
+        self.line_cents: "array[int]" = array('q', map(mul, shard.quantities, shard.unit_cents))
+        self.subtotal: MoneyArray = MoneyArray(array('q', map(sum, map(self.line_cents.__getitem__, self.slices))))
+        self.item_counts: List[int] = list(map(sum, map(shard.quantities.__getitem__, self.slices)))
+        self.tiers: List[MembershipTierEnum] = [customer.tier for customer in shard.customers]
+        self.weights: List[float] = list(map(sum, map(shard.line_weights.__getitem__, self.slices)))
+
+    def total(self, rules: RuleSet, methods: Optional[List[str]] = None) -> Tuple[MoneyArray, List[str]]:
+        """
+        Each order's total under `rules`, and its shipping method. Without
+        `methods` (orders do not record one), an order's method is the one
+        whose cost under `rules` is nearest what it was charged, the
+        first listed on a tie.
+        """
+        shard: OrderShard = self.shard
+        discounted: MoneyArray = self.subtotal - bulk_discount_column(
+            rules.bulk_discounts, self.slices, shard.line_categories, shard.quantities, self.line_cents,
+            self.item_counts, self.tiers, self.subtotal
+        )
+        discounted = discounted - discounted.scale_each(
+            map(rules.membership_rates.__getitem__, self.tiers), DISCOUNT_ROUNDING
+        )
+        tax: MoneyArray = discounted.scale_each(map(rules.tax_rates.__getitem__, shard.regions), TAX_ROUNDING)
+        subtotals: List[float] = list(map(truediv, discounted.cents, repeat(100)))
+
+        shipping: "array[int]"
+        if methods is None:
+            names: List[str] = list(rules.shipping)
+            costs: List[List[int]] = [
+                _shipping_cents(rules.shipping[method], self.weights, shard.customers, subtotals) for method in names
+            ]
+            # distance x methods + method index: the smallest is the nearest method, first on a tie
+            ranked = [
+                list(map(add, map(mul, map(abs, map(sub, method_costs, shard.shipping_cents)), repeat(len(names))),
+                         repeat(index)))
+                for index, method_costs in enumerate(costs)
+            ]
+            chosen: List[int] = [rank % len(names) for rank in map(min, zip(*ranked))]
+            methods = list(map(names.__getitem__, chosen))
+            shipping = array('q', map(lambda index, i: costs[index][i], chosen, range(len(shard))))
+        else:
+            shipping = array('q', repeat(0, len(shard)))
+            for method in set(methods):
+                orders: List[int] = [i for i, order_method in enumerate(methods) if order_method == method]
+                for i, cents in zip(orders, _shipping_cents(
+                    rules.shipping[method], [self.weights[i] for i in orders], [shard.customers[i] for i in orders],
+                    [subtotals[i] for i in orders]
+                )):
+                    shipping[i] = cents
+        return discounted + tax + MoneyArray(shipping), methods
+
+
+def _replay_shard(shard: OrderShard, baseline: RuleSet, candidate: RuleSet, path: str) -> ShardResult:
+    """Prices the shard under both rule sets and writes each order's delta to `path`."""
+    pricer = _ShardPricer(shard)
+    before, methods = pricer.total(baseline)
+    after, _ = pricer.total(candidate, methods)
+
+    changed: int = 0
+    with open(path, 'w', encoding='utf-8') as out:
+        out.write("order_id,baseline_cents,candidate_cents,delta_cents\n")
+        rows: List[str] = []
+        for order_id, old, new in zip(shard.order_ids, before.cents, after.cents):
+            if old != new:
+                changed += 1
+            rows.append(f"{order_id},{old},{new},{new - old}\n")
+        out.writelines(rows)
+    return ShardResult(
+        shard.first_id, shard.last_id, len(shard), shard.skipped, changed,
+        sum(before.cents), sum(after.cents), path
+    )
+
+
+class RepricingSimulator:
+    """
+    Replays every stored order through a candidate rule set, to see what
+    a change to membership rates, bulk tiers, tax rates or shipping
+    formulas would have done to revenue before making it.
+
+    Each order is priced twice from its recorded lines (quantities and
+    the unit prices it was sold at) and its customer's tier and address:
+    under the baseline rules (today's, by default) and under the
+    candidate. Orders do not record promo codes, loyalty points spent or
+    a shipping method, so neither price has a promotion or loyalty
+    discount, and an order ships by the method whose baseline cost is
+    nearest what it was charged. Cancelled orders are skipped. A store
+    with an archive replays its archived orders too, read back from
+    their segments through the block cache rather than made resident.
+
+    The history is cut into shards by order id range. Shards are
+    replayed in a process pool, a few at a time so memory stays flat,
+    and each one writes its per-order deltas to its own CSV as it
+    finishes; only the totals come back to this process.
+    """
+
+    def __init__(
+        self,
+        data_store: DataStoreInterface,
+        tax_service: Optional[TaxService] = None,
+        baseline: Optional[RuleSet] = None
+    ) -> None:
+        self.data_store: DataStoreInterface = data_store
+        self.tax_service: TaxService = tax_service or TaxService()
+        self.baseline: RuleSet = baseline or RuleSet.current()
+
+    def run(
+        self,
+        candidate: RuleSet,
+        out_dir: str,
+        workers: Optional[int] = None,
+        shard_size: int = DEFAULT_SHARD_SIZE
+    ) -> RepricingReport:
+        """
+        Replays the history under `candidate` with `workers` processes
+        (one per CPU by default; 0 replays in this process) and writes
+        the shard files to `out_dir`.
+        """
+        if shard_size < 1:
+            raise ValueError("shard_size must be at least 1")
+        os.makedirs(out_dir, exist_ok=True)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        jobs: Iterator[Tuple[OrderShard, str]] = (
+            (shard, os.path.join(out_dir, f"reprice-{shard.first_id:012d}-{shard.last_id:012d}.csv"))
+            for shard in self.shards(shard_size)
+        )
+
+        results: List[ShardResult] = []
+        if workers == 0:
+            results = [_replay_shard(shard, self.baseline, candidate, path) for shard, path in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending: Set["Future[ShardResult]"] = set()
+                for shard, path in jobs:
+                    if len(pending) >= 2 * workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        results.extend(future.result() for future in done)
+                    pending.add(pool.submit(_replay_shard, shard, self.baseline, candidate, path))
+                results.extend(future.result() for future in wait(pending).done)
+
+        results.sort(key=lambda result: result.first_id)
+        return RepricingReport(
+            orders=sum(result.orders for result in results),
+            skipped=sum(result.skipped for result in results),
+            changed=sum(result.changed for result in results),
+            baseline=Money(sum(result.baseline_cents for result in results)),
+            candidate=Money(sum(result.candidate_cents for result in results)),
+            paths=tuple(result.path for result in results)
+        )
+
+    def shards(self, shard_size: int = DEFAULT_SHARD_SIZE) -> Iterator[OrderShard]:
+        """The stored orders, archived ones included, `shard_size` ids at a time in id order."""
+        order_ids: List[int] = sorted(self.data_store.orders)
+        products: Dict[str, Tuple[Optional[str], float]] = {}
+        regions: Dict[str, TaxRegion] = {}
+        for start in range(0, len(order_ids), shard_size):
+            chunk: List[int] = order_ids[start:start + shard_size]
+            shard = OrderShard(chunk[0], chunk[-1])
+            for order_id in chunk:
+                self._add_order(shard, self.data_store.orders[order_id], products, regions)
+            yield shard
+
+    def _add_order(
+        self,
+        shard: OrderShard,
+        order: Order,
+        products: Dict[str, Tuple[Optional[str], float]],
+        regions: Dict[str, TaxRegion]
+    ) -> None:
+        customer: Optional[Customer] = self.data_store.get_customer(order.customer_id)
+        if order.status is OrderStatus.CANCELLED or customer is None:
+            shard.skipped += 1
+            return
+        lines = order.items
+        for product_id in lines.product_ids:
+            known: Optional[Tuple[Optional[str], float]] = products.get(product_id)
+            if known is None:
+                # A product since removed from the catalog still counts, in no category
+                product: Optional[Product] = self.data_store.get_product(product_id)
+                known = products[product_id] = (product.category, product.weight) if product else (None, 0.0)
+            shard.line_categories.append(known[0])
+            shard.line_weights.append(known[1])
+        quantities: "array[int]" = lines.quantities
+        start: int = len(shard.quantities)
+        shard.quantities.extend(quantities)
+        shard.unit_cents.extend(lines.unit_cents)
+        for i, quantity in enumerate(quantities, start):
+            shard.line_weights[i] *= quantity
+        shard.ends.append(len(shard.quantities))
+
+        shard.order_ids.append(order.order_id)
+        shard.customers.append(customer)
+        region: Optional[TaxRegion] = regions.get(customer.address)
+        if region is None:
+            region = regions[customer.address] = self.tax_service.region_for_address(customer.address)
+        shard.regions.append(region)
+        shard.shipping_cents.append(Money.from_float(order.shipping_cost).cents)
@@ -1,8 +1,19 @@
 from abc import ABC, abstractmethod
 class BulkDiscount(ABC):
+    # Shared instances (see strategy_registry), so the fields are read-only
+    __slots__ = ('_min_quantity', '_discount')
+
     def __init__(self, min_quantity: int, discount: float) -> None:
-        self.min_quantity = min_quantity
-        self.discount = discount
+        self._min_quantity = min_quantity
+        self._discount = discount
+
+    @property
+    def min_quantity(self) -> int:
+        return self._min_quantity
+
+    @property
+    def discount(self) -> float:
+        return self._discount
     
     @abstractmethod
     def get_discount(self) -> float:
@@ -13,6 +24,8 @@ class BulkDiscount(ABC):
         pass # pragma: no cover
 
 class NoBulkDiscount(BulkDiscount):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(0, 0.0)
 
@@ -23,6 +36,8 @@ class NoBulkDiscount(BulkDiscount):
         return self.min_quantity
 
 class TenItemsDiscount(BulkDiscount):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(10, 0.05)
 
@@ -33,6 +48,8 @@ class TenItemsDiscount(BulkDiscount):
         return self.min_quantity
     
 class FiveItemsDiscount(BulkDiscount):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(5, 0.02)
 
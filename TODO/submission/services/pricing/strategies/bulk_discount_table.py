@@ -0,0 +1,157 @@
+from bisect import bisect_right
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional, Sequence, Tuple, Union
+
+from submission.domain.enums.membership_tier import MembershipTierEnum
+from submission.domain.enums.rounding_mode import RoundingMode
+from submission.domain.values.Money import Money
+from submission.services.pricing.strategies.bulk_discount import BulkDiscount
+
+# (product category, membership tier); None in either place means "any"
+ScheduleKey = Tuple[Optional[str], Optional[MembershipTierEnum]]
+
+# One list of strategies for everything, or lists by ScheduleKey
+BulkConfig = Union[Iterable[BulkDiscount], Mapping[ScheduleKey, Iterable[BulkDiscount]]]
+
+
+class BulkSchedule:
+    """
+    One list of bulk discount strategies, compiled: the tier minimums in
+    ascending order and the strategy each one reaches, so the best tier
+    for a quantity is one bisect. Below the lowest tier there is no
+    discount, whether or not a NoBulkDiscount was configured.
+    """
+    __slots__ = ('minimums', 'strategies', 'rates')
+
+    def __init__(self, strategies: Iterable[BulkDiscount] = ()) -> None:
+        # The first strategy listed wins a tie, as the sort in
+        # PricingService.apply_bulk_discount() used to pick it
+        tiers: Dict[int, BulkDiscount] = {}
+        for strategy in sorted(strategies, key=lambda d: d.get_min_quantity(), reverse=True):
+            tiers.setdefault(strategy.get_min_quantity(), strategy)
+        self.minimums: Tuple[int, ...] = tuple(sorted(tiers))
+        self.strategies: Tuple[Optional[BulkDiscount], ...] = (None, *map(tiers.__getitem__, self.minimums))
+        self.rates: Tuple[float, ...] = (0.0, *(tiers[minimum].get_discount() for minimum in self.minimums))
+
+    def best(self, quantity: int) -> Optional[BulkDiscount]:
+        """The highest tier `quantity` reaches, or None."""
+        return self.strategies[bisect_right(self.minimums, quantity)]
+
+    def rate(self, quantity: int) -> float:
+        return self.rates[bisect_right(self.minimums, quantity)]
+
+    def __len__(self) -> int:
+        return len(self.minimums)
+
+    def __bool__(self) -> bool:
+        return True
+
+
+_EMPTY = BulkSchedule()
+
+
+class CompiledBulkDiscounts:
+    """
+    A bulk discount configuration, compiled and never changed afterwards.
+    Every (category, tier) pair is resolved when it is built, most
+    specific first: (category, tier), (category, None), (None, tier),
+    then (None, None); so a lookup is two dict reads and a bisect.
+    """
+    __slots__ = ('categories', '_schedules')
+
+    def __init__(self, config: Mapping[ScheduleKey, Iterable[BulkDiscount]]) -> None:
+        compiled: Dict[ScheduleKey, BulkSchedule] = {
+            key: BulkSchedule(strategies) for key, strategies in config.items()
+        }
+        # Categories with a schedule of their own
+        self.categories: FrozenSet[str] = frozenset(
+            category for category, _ in compiled if category is not None
+        )
+        self._schedules: Dict[Optional[str], Dict[Optional[MembershipTierEnum], BulkSchedule]] = {
+            category: {
+                tier: (compiled.get((category, tier)) or compiled.get((category, None))
+                       or compiled.get((None, tier)) or compiled.get((None, None)) or _EMPTY)
+                for tier in (None, *MembershipTierEnum)
+            }
+            for category in (None, *self.categories)
+        }
+
+    def schedule(self, category: Optional[str] = None, tier: Optional[MembershipTierEnum] = None) -> BulkSchedule:
+        by_tier = self._schedules.get(category) or self._schedules[None]
+        return by_tier.get(tier) or by_tier[None]
+
+    def rate(self, quantity: int, category: Optional[str] = None, tier: Optional[MembershipTierEnum] = None) -> float:
+        return self.schedule(category, tier).rate(quantity)
+
+    def grouped_discount(
+        self,
+        line_categories: Iterable[Optional[str]],
+        quantities: Iterable[int],
+        line_cents: Iterable[int],
+        tier: Optional[MembershipTierEnum],
+        rounding: RoundingMode
+    ) -> Optional[Money]:
+        """
+        The bulk discount of an order whose lines fall under category
+        schedules: the lines of each such category are discounted by its
+        schedule on their own quantity, the other lines by the default
+        schedule on theirs. None if no line has a category schedule, and
+        the default schedule applies to the whole order.
+        """
+        if not self.categories:
+            return None
+        totals: Dict[Optional[str], Tuple[int, int]] = {}
+        for category, quantity, cents in zip(line_categories, quantities, line_cents):
+            group: Optional[str] = category if category in self.categories else None
+            group_quantity, group_cents = totals.get(group, (0, 0))
+            totals[group] = (group_quantity + quantity, group_cents + cents)
+        if not totals.keys() - {None}:
+            return None
+        return Money.sum(
+            Money(cents).scale(self.rate(quantity, group, tier), rounding)
+            for group, (quantity, cents) in totals.items()
+        )
+
+
+def _as_config(config: BulkConfig) -> Mapping[ScheduleKey, Iterable[BulkDiscount]]:
+    if isinstance(config, Mapping):
+        return config
+    return {(None, None): list(config)}
+
+
+
+class BulkDiscountTable:
+    """
+    The bulk discount tiers, compiled once from the configured strategies
+    instead of filtered and sorted for every order. Schedules can be set
+    per product category and per membership tier; the best tier for an
+    order is a bisect over that schedule's minimums, O(log tiers), and
+    allocates nothing.
+
+    configure() compiles a new configuration off to the side and swaps it
+    in with one assignment, so a reader that takes current() once sees
+    the old configuration or the new one, never part of each.
+    """
+
+    def __init__(self, config: BulkConfig = ()) -> None:
+        self._compiled: CompiledBulkDiscounts = CompiledBulkDiscounts(_as_config(config))
+
+    @classmethod
+    def of(cls, discounts: Union["BulkDiscountTable", Sequence[BulkDiscount]]) -> "BulkDiscountTable":
+        """
+        `discounts` if it is a table; otherwise a new table compiled from
+        that list of strategies. Compiling sorts the tiers, so callers on
+        a hot path build the table once, where the strategies are
+        configured, and pass it in.
+        """
+        if isinstance(discounts, BulkDiscountTable):
+            return discounts
+        return cls(discounts)
+
+    def configure(self, config: BulkConfig) -> None:
+        self._compiled = CompiledBulkDiscounts(_as_config(config))
+
+    def current(self) -> CompiledBulkDiscounts:
+        return self._compiled
+
+    def rate(self, quantity: int, category: Optional[str] = None, tier: Optional[MembershipTierEnum] = None) -> float:
+        return self._compiled.schedule(category, tier).rate(quantity)
@@ -1,9 +1,21 @@
 from abc import ABC, abstractmethod
 from submission.domain.enums.membership_tier import MembershipTierEnum
 class MembershipTier(ABC):
+    # Instances are shared by every customer in the tier (see
+    # strategy_registry), so their fields are read-only
+    __slots__ = ('_membership_tier', '_discount')
+
     def __init__(self, membership_tier: MembershipTierEnum , discount: float) -> None:
-        self.membership_tier = membership_tier
-        self.discount = discount
+        self._membership_tier = membership_tier
+        self._discount = discount
+
+    @property
+    def membership_tier(self) -> MembershipTierEnum:
+        return self._membership_tier
+
+    @property
+    def discount(self) -> float:
+        return self._discount
     
     @abstractmethod
     def get_name(self) -> str:
@@ -18,6 +30,8 @@ class MembershipTier(ABC):
         pass  # pragma: no cover
 
 class SuspendedMembership(MembershipTier):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(MembershipTierEnum.SUSPENDED, 0.0)
 
@@ -31,6 +45,8 @@ class SuspendedMembership(MembershipTier):
         return self.discount
     
 class BronzeMembership(MembershipTier):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(MembershipTierEnum.BRONZE, 0.03)
 
@@ -44,6 +60,8 @@ class BronzeMembership(MembershipTier):
         return self.discount
 
 class SilverMembership(MembershipTier):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(MembershipTierEnum.SILVER, 0.07)
 
@@ -57,6 +75,8 @@ class SilverMembership(MembershipTier):
         return self.discount
 
 class GoldMembership(MembershipTier):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(MembershipTierEnum.GOLD, 0.15)
 
@@ -0,0 +1,105 @@
+from types import MappingProxyType
+from typing import Iterator, Mapping, TypeVar
+
+from submission.domain.enums.bulk_discount_tier import BulkDiscountTier
+from submission.domain.enums.membership_tier import MembershipTierEnum
+from submission.domain.enums.payment_method import PaymentMethod
+from submission.domain.enums.shipping_method import ShippingMethod
+from submission.domain.enums.tax_strategy import TaxRegion
+from submission.services.pricing.strategies.bulk_discount import (
+    BulkDiscount,
+    NoBulkDiscount,
+    FiveItemsDiscount,
+    TenItemsDiscount
+)
+from submission.services.pricing.strategies.membership_discount import (
+    MembershipTier,
+    SuspendedMembership,
+    BronzeMembership,
+    SilverMembership,
+    GoldMembership
+)
+from submission.services.pricing.strategies.payment_strategy import (
+    PaymentStrategy,
+    CreditCardStrategy,
+    PayPalStrategy,
+    UnknownPaymentStrategy
+)
+from submission.services.pricing.strategies.tax_strategy import (
+    TaxStrategy,
+    DefaultTaxStrategy,
+    CaliforniaTaxStrategy,
+    NewYorkTaxStrategy,
+    TexasTaxStrategy
+)
+from submission.services.shipping_strategy import (
+    ShippingStrategy,
+    StandardShipping,
+    ExpressShipping,
+    OvernightShipping
+)
+
+K = TypeVar('K')
+S = TypeVar('S')
+
+
+class StrategyRegistry(Mapping[K, S]):
+    """
+    One shared instance per strategy, by enum key. Strategies carry no
+    per-customer or per-order state, so every customer and service can
+    use the same object: a million gold customers hold no strategy
+    objects of their own, and two strategies are the same tier (or
+    region, method, ...) exactly when they are the same object.
+    The table cannot be changed after it is built.
+    """
+
+    def __init__(self, strategies: Mapping[K, S]) -> None:
+        self._strategies: Mapping[K, S] = MappingProxyType(dict(strategies))
+
+    def __getitem__(self, key: K) -> S:
+        return self._strategies[key]
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._strategies)
+
+    def __len__(self) -> int:
+        return len(self._strategies)
+
+    def __repr__(self) -> str:
+        return f"StrategyRegistry({dict(self._strategies)!r})"
+
+
+# --- Shared instances ---
+
+MEMBERSHIP_TIERS: StrategyRegistry[MembershipTierEnum, MembershipTier] = StrategyRegistry({
+    MembershipTierEnum.SUSPENDED: SuspendedMembership(),
+    MembershipTierEnum.BRONZE: BronzeMembership(),
+    MembershipTierEnum.SILVER: SilverMembership(),
+    MembershipTierEnum.GOLD: GoldMembership(),
+})
+
+TAX_STRATEGIES: StrategyRegistry[TaxRegion, TaxStrategy] = StrategyRegistry({
+    TaxRegion.CALIFORNIA: CaliforniaTaxStrategy(),
+    TaxRegion.NEW_YORK: NewYorkTaxStrategy(),
+    TaxRegion.TEXAS: TexasTaxStrategy(),
+    TaxRegion.DEFAULT: DefaultTaxStrategy(),
+})
+
+PAYMENT_STRATEGIES: StrategyRegistry[PaymentMethod, PaymentStrategy] = StrategyRegistry({
+    PaymentMethod.CREDIT_CARD: CreditCardStrategy(),
+    PaymentMethod.PAYPAL: PayPalStrategy(),
+})
+# For payment types that are not a PaymentMethod
+UNKNOWN_PAYMENT: PaymentStrategy = UnknownPaymentStrategy()
+
+SHIPPING_STRATEGIES: StrategyRegistry[ShippingMethod, ShippingStrategy] = StrategyRegistry({
+    ShippingMethod.STANDARD: StandardShipping(),
+    ShippingMethod.EXPRESS: ExpressShipping(),
+    ShippingMethod.OVERNIGHT: OvernightShipping(),
+})
+
+BULK_DISCOUNTS: StrategyRegistry[BulkDiscountTier, BulkDiscount] = StrategyRegistry({
+    BulkDiscountTier.NONE: NoBulkDiscount(),
+    BulkDiscountTier.FIVE_ITEMS: FiveItemsDiscount(),
+    BulkDiscountTier.TEN_ITEMS: TenItemsDiscount(),
+})
@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 from typing import Optional
 
 # --- Import Dependencies ---
-from submission.repositories.in_memory.DataStore import DataStore
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface
 from submission.domain.models.Product import Product
 
 class ProductInterface(ABC):
@@ -15,8 +15,8 @@ class ProductInterface(ABC):
         pass  # pragma: no cover
 
 class ProductService(ProductInterface):
-    def __init__(self, data_store: DataStore) -> None:
-        self.data_store: DataStore = data_store
+    def __init__(self, data_store: DataStoreInterface) -> None:
+        self.data_store: DataStoreInterface = data_store
 
     def update_product_price(self, product_id: str, new_price: float) -> bool:
         """
@@ -31,7 +31,7 @@ class ProductService(ProductInterface):
             return False
             
         old_price: float = product.price
-        product.price = new_price
+        self.data_store.update_product(product, price=new_price)
         
         print(f"Updated {product.name} price from ${old_price:.2f} to ${new_price:.2f}")
         return True
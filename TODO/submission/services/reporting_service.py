@@ -3,11 +3,12 @@ import datetime
 from typing import Dict, List, Any, Tuple, Optional
 
 # --- Import Dependencies ---
-from submission.repositories.in_memory.DataStore import DataStore
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface
 from submission.services.customer_service import CustomerInterface
 from submission.domain.models.Order import Order
 from submission.domain.models.Product import Product
 from submission.domain.enums.order_status import OrderStatus
+from submission.domain.values.Money import Money, MoneyArray
 
 # --- Type Alias for the Report Structure ---
 ReportDict = Dict[str, Any]
@@ -27,8 +28,8 @@ class ReportingInterface(ABC):
         pass  # pragma: no cover
 
 class ReportingService(ReportingInterface):
-    def __init__(self, data_store: DataStore, customer_service: CustomerInterface) -> None:
-        self.data_store: DataStore = data_store
+    def __init__(self, data_store: DataStoreInterface, customer_service: CustomerInterface) -> None:
+        self.data_store: DataStoreInterface = data_store
         self.customer_service: CustomerInterface = customer_service
 
     def generate_sales_report(
@@ -49,34 +50,48 @@ class ReportingService(ReportingInterface):
             'top_customers': []
         }
 
-        # Iterate through orders in the DataStore
-        for order in self.data_store.orders.values():
-            if start_date <= order.created_at <= end_date:
+        # Money is summed in whole cents, so totals are exact; they are
+        # turned back into floats for the report at the end
+        sales: MoneyArray = MoneyArray()
+        revenue_cents: Dict[str, int] = {}
+
+        # One point-in-time view for the whole report: checkout keeps
+        # writing, and every total below comes from the same snapshot
+        with self.data_store.read_view() as view:
+            # Only orders inside the window are touched (sorted created_at index)
+            for order in view.get_orders_created_between(start_date, end_date):
                 if order.status != OrderStatus.CANCELLED:
-                    report['total_sales'] += order.total_price
+                    sales.append(Money.from_float(order.total_price))
                     report['total_orders'] += 1
 
-                    for item in order.items:
-                        product: Optional[Product] = self.data_store.get_product(item.product_id)
+                    # Straight off the order's line columns, no OrderItem per line
+                    lines = order.items
+                    for product_id, quantity, line_cents in zip(lines.product_ids, lines.quantities, lines.line_cents()):
+                        product: Optional[Product] = view.get_product(product_id)
                         if product:
                             # Tally products sold
                             if product.product_id not in report['products_sold']:
                                 report['products_sold'][product.product_id] = 0
-                            report['products_sold'][product.product_id] += item.quantity
+                            report['products_sold'][product.product_id] += quantity
 
                             # Tally revenue by category
-                            if product.category not in report['revenue_by_category']:
-                                report['revenue_by_category'][product.category] = 0.0
-                            report['revenue_by_category'][product.category] += item.quantity * item.unit_price
+                            if product.category not in revenue_cents:
+                                revenue_cents[product.category] = 0
+                            revenue_cents[product.category] += line_cents
                 else:
                     report['cancelled_orders'] += 1
 
-        # Find top customers
-        customer_spending: Dict[str, float] = {}
-        customer_id: str
-        for customer_id in self.data_store.customers.keys():
-            ltv: float = self.customer_service.get_customer_lifetime_value(customer_id)
-            customer_spending[customer_id] = ltv
+            # Find top customers
+            customer_spending: Dict[str, float] = {}
+            customer_id: str
+            for customer_id in view.customers.keys():
+                ltv: float = self.customer_service.get_customer_lifetime_value(customer_id, view)
+                customer_spending[customer_id] = ltv
+
+        report['total_sales'] = sales.total().to_float()
+        report['revenue_by_category'] = {
+            category: Money(cents).to_float() for category, cents in revenue_cents.items()
+        }
 
         # A List of Tuples, e.g., [('c1', 500.0), ('c2', 300.0)]
         sorted_customers: List[Tuple[str, float]] = sorted(
@@ -1,20 +1,25 @@
 from abc import ABC, abstractmethod
 import datetime
 import random
-from typing import Dict
+from typing import Dict, Iterable, List, Tuple
 
 # --- Import domain models ---
 from submission.domain.models.Order import Order
 from submission.domain.models.Customer import Customer
-from submission.repositories.in_memory.DataStore import DataStore
+from submission.domain.models.Shipment import Shipment
+from submission.domain.enums.shipment_status import ShipmentStatus
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface
+from submission.repositories.bulk.BulkRows import Row
 
 # --- Import the strategies from their new file ---
+from submission.domain.enums.shipping_method import ShippingMethod
 from submission.services.shipping_strategy import (
     ShippingStrategy,
     StandardShipping,
     ExpressShipping,
     OvernightShipping
 )
+from submission.services.pricing.strategies.strategy_registry import SHIPPING_STRATEGIES
 
 # --- Service Interface ---
 class ShippingServiceInterface(ABC):
@@ -32,16 +37,23 @@ class ShippingServiceInterface(ABC):
     def create_shipment_for_order(self, order: Order) -> str:
         pass # pragma: no cover
 
+    @abstractmethod
+    def apply_carrier_scans(self, rows: Iterable[Row]) -> int:
+        """
+        Applies a carrier scan file: rows with a tracking_number and a
+        status value (e.g. from BulkRows.read_csv). Returns how many
+        shipments were matched.
+        """
+        pass # pragma: no cover
+
 # --- Concrete Service ---
 class ShippingService(ShippingServiceInterface):
     
-    def __init__(self, data_store: DataStore):
+    def __init__(self, data_store: DataStoreInterface):
         self.data_store = data_store
-        # The strategies are now imported
+        # The shared strategies, by method name
         self.strategies: Dict[str, ShippingStrategy] = {
-            'standard': StandardShipping(),
-            'express': ExpressShipping(),
-            'overnight': OvernightShipping()
+            method.value: SHIPPING_STRATEGIES[method] for method in ShippingMethod
         }
     
     def shipping_cost(
@@ -62,17 +74,32 @@ class ShippingService(ShippingServiceInterface):
     def create_shipment_for_order(self, order: Order) -> str:
         tracking_number = f"TRACK{order.order_id}{random.randint(1000, 9999)}"
         
-        shipment_id = self.data_store.next_shipment_id
-        self.data_store.next_shipment_id += 1
+        shipment_id = self.data_store.allocate_shipment_id()
         
-        shipment_data = {
-            'shipment_id': shipment_id,
-            'order_id': order.order_id,
-            'tracking_number': tracking_number,
-            'created_at': datetime.datetime.now(),
-            'status': 'in_transit'
-        }
+        shipment = Shipment(
+            shipment_id,
+            order.order_id,
+            tracking_number,
+            datetime.datetime.now(),
+            ShipmentStatus.IN_TRANSIT
+        )
         
-        self.data_store.shipments[shipment_id] = shipment_data
+        self.data_store.add_shipment(shipment)
         
         return tracking_number
+
+    def apply_carrier_scans(self, rows: Iterable[Row]) -> int:
+        # Parse the whole file first, so a bad status rejects it before
+        # anything is written
+        updates: List[Tuple[str, ShipmentStatus]] = []
+        for row_number, row in enumerate(rows, start=1):
+            if 'tracking_number' not in row or 'status' not in row:
+                raise ValueError(f"row {row_number}: tracking_number and status are required")
+            try:
+                status = ShipmentStatus(row['status'])
+            except ValueError:
+                raise ValueError(f"row {row_number}: status={row['status']!r} is not valid") from None
+            updates.append((str(row['tracking_number']), status))
+        applied: int = self.data_store.update_shipment_statuses(updates)
+        self.data_store.sync()
+        return applied
@@ -1,5 +1,10 @@
 from abc import ABC, abstractmethod
-from submission.domain.models.Customer import Customer
+from typing import TYPE_CHECKING, List, Sequence
+from submission.domain.enums.membership_tier import MembershipTierEnum
+
+if TYPE_CHECKING:
+    # Customer resolves its tier through strategy_registry, which imports this module
+    from submission.domain.models.Customer import Customer
 
 # --- Strategy Interface ---
 class ShippingStrategy(ABC):
@@ -7,29 +12,50 @@ class ShippingStrategy(ABC):
     def cal_shipping_cost(
         self, 
         total_weight: float, 
-        customer: Customer, 
+        customer: "Customer", 
         subtotal: float
     ) -> float:
         pass # pragma: no cover
 
+    def cal_shipping_costs(
+        self,
+        total_weights: Sequence[float],
+        customers: Sequence["Customer"],
+        subtotals: Sequence[float]
+    ) -> List[float]:
+        """cal_shipping_cost() for many orders at once; element i is order i."""
+        return list(map(self.cal_shipping_cost, total_weights, customers, subtotals))
+
 # --- Concrete Strategies ---
 class ExpressShipping(ShippingStrategy):
     def cal_shipping_cost(
         self, 
         total_weight: float, 
-        customer: Customer, 
+        customer: "Customer", 
         subtotal: float
     ) -> float:
         shipping_cost: float = 25.0 + (total_weight * 0.5)
-        if customer.membership_tier.get_name() == "gold":
+        if customer.tier is MembershipTierEnum.GOLD:
             shipping_cost *= 0.5
         return shipping_cost
 
+    def cal_shipping_costs(
+        self,
+        total_weights: Sequence[float],
+        customers: Sequence["Customer"],
+        subtotals: Sequence[float]
+    ) -> List[float]:
+        gold = MembershipTierEnum.GOLD
+        return [
+            (25.0 + (weight * 0.5)) * 0.5 if customer.tier is gold else 25.0 + (weight * 0.5)
+            for weight, customer in zip(total_weights, customers)
+        ]
+
 class StandardShipping(ShippingStrategy):
     def cal_shipping_cost(
         self, 
         total_weight: float, 
-        customer: Customer,
+        customer: "Customer",
         subtotal: float
     ) -> float:
         if subtotal < 50:
@@ -38,12 +64,31 @@ class StandardShipping(ShippingStrategy):
             shipping_cost = 0.0 # Free shipping
         return shipping_cost
 
+    def cal_shipping_costs(
+        self,
+        total_weights: Sequence[float],
+        customers: Sequence["Customer"],
+        subtotals: Sequence[float]
+    ) -> List[float]:
+        return [
+            5.0 + (weight * 0.2) if subtotal < 50 else 0.0
+            for weight, subtotal in zip(total_weights, subtotals)
+        ]
+
 class OvernightShipping(ShippingStrategy):
     def cal_shipping_cost(
         self, 
         total_weight: float, 
-        customer: Customer,
+        customer: "Customer",
         subtotal: float
     ) -> float:
         shipping_cost: float = 50.0 + (total_weight * 1.0)
         return shipping_cost
+
+    def cal_shipping_costs(
+        self,
+        total_weights: Sequence[float],
+        customers: Sequence["Customer"],
+        subtotals: Sequence[float]
+    ) -> List[float]:
+        return [50.0 + (weight * 1.0) for weight in total_weights]
@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 from typing import Optional
 
 # Import the dependencies
-from submission.repositories.in_memory.DataStore import DataStore
+from submission.repositories.interfaces.DataStoreInterface import DataStoreInterface
 from submission.domain.models.Product import Product
 from submission.domain.models.Supplier import Supplier
 
@@ -21,8 +21,8 @@ class SupplierService(SupplierInterface):
     """
     Implements the logic for handling supplier communications.
     """
-    def __init__(self, data_store: DataStore) -> None:
-        self.data_store: DataStore = data_store
+    def __init__(self, data_store: DataStoreInterface) -> None:
+        self.data_store: DataStoreInterface = data_store
 
     def notify_supplier_reorder(self, product: Product) -> None:
         """
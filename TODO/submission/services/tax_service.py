@@ -1,12 +1,13 @@
 from typing import Dict, Optional
 from submission.domain.models.Customer import Customer
-from submission.services.pricing.strategies.tax_strategy import (
-    TaxStrategy,
-    DefaultTaxStrategy,
-    CaliforniaTaxStrategy,
-    NewYorkTaxStrategy,
-    TexasTaxStrategy
-)
+from submission.domain.enums.tax_strategy import TaxRegion
+from submission.domain.enums.rounding_mode import RoundingMode
+from submission.domain.values.Money import Money
+from submission.services.pricing.strategies.tax_strategy import TaxStrategy
+from submission.services.pricing.strategies.strategy_registry import TAX_STRATEGIES
+
+# Tax is rounded to the nearest cent, ties up
+TAX_ROUNDING = RoundingMode.HALF_UP
 
 class TaxService:
     """
@@ -14,36 +15,42 @@ class TaxService:
     and calculates the tax.
     """
     def __init__(self) -> None:
-        # We can pre-load our strategies
+        # The shared strategies, by region code
         self.strategies: Dict[str, TaxStrategy] = {
-            'CA': CaliforniaTaxStrategy(),
-            'NY': NewYorkTaxStrategy(),
-            'TX': TexasTaxStrategy()
+            region.value: TAX_STRATEGIES[region]
+            for region in (TaxRegion.CALIFORNIA, TaxRegion.NEW_YORK, TaxRegion.TEXAS)
         }
-        self.default_strategy: TaxStrategy = DefaultTaxStrategy()
+        self.default_strategy: TaxStrategy = TAX_STRATEGIES[TaxRegion.DEFAULT]
 
     def _get_strategy(self, address: Optional[str]) -> TaxStrategy:
         """
         This is the logic from your 'if/elif' block,
         refactored to return a strategy object.
         """
-        if not address:
-            return self.default_strategy
-            
-        if 'CA' in address:
-            return self.strategies['CA']
-        elif 'NY' in address:
-            return self.strategies['NY']
-        elif 'TX' in address:
-            return self.strategies['TX']
-        else:
-            return self.default_strategy
+        return self.strategies.get(self.region_for_address(address).value, self.default_strategy)
+
+    def region_for_address(self, address: Optional[str]) -> TaxRegion:
+        """The tax region of `address`: the first of CA, NY and TX it mentions, else DEFAULT."""
+        if address:
+            for region in (TaxRegion.CALIFORNIA, TaxRegion.NEW_YORK, TaxRegion.TEXAS):
+                if region.value in address:
+                    return region
+        return TaxRegion.DEFAULT
 
+    def rate_for_address(self, address: Optional[str]) -> float:
+        """The tax rate charged at `address`."""
+        return self._get_strategy(address).get_rate()
 
     def calculate_tax(self, subtotal: float, customer: Customer) -> float:
         """
         The main public method to calculate tax.
         """
+        return self.calculate_tax_money(Money.from_float(subtotal), customer).to_float()
+
+    def calculate_tax_money(self, subtotal: Money, customer: Customer) -> Money:
+        """
+        calculate_tax() in Money: the tax on `subtotal`, rounded to a cent.
+        """
         # 1. Get the correct strategy
         strategy: TaxStrategy = self._get_strategy(customer.address)
         
@@ -51,5 +58,4 @@ class TaxService:
         tax_rate: float = strategy.get_rate()
         
         # 3. Calculate the tax
-        tax: float = subtotal * tax_rate
-        return tax
+        return subtotal.scale(tax_rate, TAX_ROUNDING)
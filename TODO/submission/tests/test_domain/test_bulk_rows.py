@@ -0,0 +1,83 @@
+import unittest
+import datetime
+import io
+
+from submission.repositories.bulk.BulkRows import (
+    CUSTOMER_FIELDS,
+    PRODUCT_FIELDS,
+    PROMOTION_FIELDS,
+    read_csv,
+    read_ndjson,
+    validated_batches
+)
+
+class TestBulkRows(unittest.TestCase):
+
+    def test_read_csv_streams_rows_by_header(self):
+        source = io.StringIO(
+            "product_id,name,price,quantity,category,weight,supplier_id\n"
+            "P1,Laptop,999.99,10,Elec,2.5,S1\n"
+            "P2,\"Mouse, wireless\",19.99,5,Elec,0.2,S1\n"
+        )
+
+        rows = list(read_csv(source))
+
+        self.assertEqual([row['product_id'] for row in rows], ["P1", "P2"])
+        self.assertEqual(rows[1]['name'], "Mouse, wireless")
+
+    def test_read_ndjson_skips_blank_lines_and_names_bad_ones(self):
+        rows = list(read_ndjson(io.StringIO('{"a": 1}\n\n{"a": 2}\n')))
+        self.assertEqual(rows, [{"a": 1}, {"a": 2}])
+
+        with self.assertRaisesRegex(ValueError, "line 2"):
+            list(read_ndjson(io.StringIO('{"a": 1}\n{"a": \n')))
+
+        # Parsed in chunks; line numbers still count across them
+        lines = '{"a": 1}\n' * 5 + '[1]\n'
+        with self.assertRaisesRegex(ValueError, "line 6: expected a JSON object"):
+            list(read_ndjson(io.StringIO(lines), chunk_lines=2))
+
+    def test_batches_convert_strings_and_typed_values(self):
+        rows = [
+            {"product_id": "P1", "name": "Laptop", "price": "999.99", "quantity": "10",
+             "category": "Elec", "weight": "2.5", "supplier_id": "S1"},
+            {"product_id": "P2", "name": "Mouse", "price": 20, "quantity": 5,
+             "category": "Elec", "weight": 0.2, "supplier_id": "S1"},
+        ]
+
+        batches = list(validated_batches(rows, PRODUCT_FIELDS, batch_size=1))
+
+        self.assertEqual(batches, [
+            [("P1", "Laptop", 999.99, 10, "Elec", 2.5, "S1")],
+            [("P2", "Mouse", 20.0, 5, "Elec", 0.2, "S1")],
+        ])
+
+    def test_optional_fields_default_and_timestamps_parse(self):
+        customers = [{"customer_id": "C1", "name": "Alice", "email": "a@x.com", "tier": "gold",
+                      "loyalty_points": ""}]
+        promotions = [{"promo_id": "PR1", "code": "SAVE10", "discount_percent": "10",
+                       "min_purchase": "50", "valid_until": "2024-12-31T23:59:00", "category": "all"}]
+
+        [customer_batch] = validated_batches(customers, CUSTOMER_FIELDS)
+        [promotion_batch] = validated_batches(promotions, PROMOTION_FIELDS)
+
+        self.assertEqual(customer_batch, [("C1", "Alice", "a@x.com", "gold", "", "", 0)])
+        self.assertEqual(promotion_batch[0][4], datetime.datetime(2024, 12, 31, 23, 59))
+
+    def test_bad_rows_are_named_per_batch(self):
+        good = {"product_id": "P1", "name": "Laptop", "price": "1", "quantity": "1",
+                "category": "Elec", "weight": "1", "supplier_id": "S1"}
+        rows = [good, good, dict(good, quantity="-3"), dict(good, price="abc", name="")]
+
+        batches = validated_batches(rows, PRODUCT_FIELDS, batch_size=2)
+        self.assertEqual(len(next(batches)), 2)
+        with self.assertRaises(ValueError) as raised:
+            next(batches)
+
+        message = str(raised.exception)
+        self.assertIn("row 3: quantity='-3' is below 0", message)
+        self.assertIn("row 4: name is missing", message)
+        self.assertIn("row 4: price='abc' is not valid", message)
+
+# if __name__ == "__main__":
+#     unittest.main(argv=['first-arg-is-ignored'], exit=False)
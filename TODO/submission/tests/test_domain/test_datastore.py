@@ -1,8 +1,15 @@
 import unittest
 import datetime
+import threading
 from submission.repositories.in_memory.DataStore import DataStore
+from submission.repositories.changes.RecordChanges import RecordChange
 from submission.domain.models.Product import Product
 from submission.domain.models.Customer import Customer
+from submission.domain.models.Order import Order
+from submission.domain.models.OrderItem import OrderItem
+from submission.domain.models.Shipment import Shipment
+from submission.domain.enums.order_status import OrderStatus
+from submission.domain.enums.shipment_status import ShipmentStatus
 
 class TestDataStore(unittest.TestCase):
     
@@ -72,5 +79,393 @@ class TestDataStore(unittest.TestCase):
         self.assertIsNotNone(promo)
         self.assertEqual(promo.discount_percent, 10.0)
 
+    def test_category_and_supplier_indexes(self):
+        self.store.add_product("p1", "Laptop", 999.99, 10, "Elec", 2.5, "s1")
+        self.store.add_product("p2", "Mouse", 19.99, 10, "Elec", 0.2, "s2")
+        self.store.add_product("p3", "Novel", 9.99, 10, "Books", 0.5, "s1")
+
+        self.assertEqual(self.store.get_product_ids_by_category("Elec"), {"p1", "p2"})
+        self.assertEqual(
+            {p.product_id for p in self.store.get_products_by_supplier("s1")}, {"p1", "p3"}
+        )
+        self.assertEqual(self.store.get_products_by_category("Toys"), [])
+
+    def test_re_adding_product_moves_it_between_indexes(self):
+        self.store.add_product("p1", "Laptop", 999.99, 10, "Elec", 2.5, "s1")
+        self.store.add_product("p1", "Laptop", 999.99, 10, "Computers", 2.5, "s2")
+
+        self.assertEqual(self.store.get_product_ids_by_category("Elec"), set())
+        self.assertEqual(self.store.get_product_ids_by_category("Computers"), {"p1"})
+        self.assertEqual(self.store.get_products_by_supplier("s1"), [])
+        self.assertEqual(len(self.store.get_products_by_supplier("s2")), 1)
+
+    def test_orders_by_customer_index(self):
+        now = datetime.datetime.now()
+        order1 = Order(1, "c1", [], OrderStatus.PENDING, now, 10.0, 0.0)
+        order2 = Order(2, "c2", [], OrderStatus.PENDING, now, 20.0, 0.0)
+        order3 = Order(3, "c1", [], OrderStatus.PENDING, now, 30.0, 0.0)
+        for order in (order1, order2, order3):
+            self.store.add_order(order)
+
+        self.assertEqual(self.store.get_orders_by_customer("c1"), [order1, order3])
+        self.assertEqual(self.store.get_orders_by_customer("c3"), [])
+        self.assertIs(self.store.get_order(2), order2)
+
+        # Replacing an order under a new customer re-indexes it
+        self.store.add_order(Order(3, "c2", [], OrderStatus.PENDING, now, 30.0, 0.0))
+        self.assertEqual(self.store.get_orders_by_customer("c1"), [order1])
+        self.assertEqual([o.order_id for o in self.store.get_orders_by_customer("c2")], [2, 3])
+
+    def test_orders_created_between_uses_time_window(self):
+        base = datetime.datetime(2024, 1, 1)
+        # Added out of time order on purpose
+        for order_id, day in [(1, 0), (2, 5), (3, 2), (4, 9), (5, 5)]:
+            self.store.add_order(Order(
+                order_id, "c1", [], OrderStatus.PENDING,
+                base + datetime.timedelta(days=day), 10.0, 0.0
+            ))
+
+        window = self.store.get_orders_created_between(
+            base + datetime.timedelta(days=2), base + datetime.timedelta(days=5)
+        )
+        self.assertEqual([o.order_id for o in window], [3, 2, 5])
+
+        after = self.store.get_orders_created_after(base + datetime.timedelta(days=5))
+        self.assertEqual([o.order_id for o in after], [4])
+
+    def test_replacing_order_moves_it_in_time_index(self):
+        base = datetime.datetime(2024, 1, 1)
+        self.store.add_order(Order(1, "c1", [], OrderStatus.PENDING, base, 10.0, 0.0))
+        self.store.add_order(Order(
+            1, "c1", [], OrderStatus.PENDING, base + datetime.timedelta(days=3), 10.0, 0.0
+        ))
+
+        self.assertEqual(self.store.get_orders_created_between(base, base), [])
+        self.assertEqual(len(self.store.get_orders_created_after(base)), 1)
+
+    def test_update_product_keeps_indexes_in_sync(self):
+        product = self.store.add_product("p1", "Laptop", 999.99, 10, "Elec", 2.5, "s1")
+        self.store.update_product(product, category="Computers", price=899.0)
+
+        self.assertEqual(product.price, 899.0)
+        self.assertEqual(self.store.get_products_by_category("Elec"), [])
+        self.assertEqual(self.store.get_products_by_category("Computers"), [product])
+
+    def test_update_order_moves_it_in_indexes(self):
+        base = datetime.datetime(2024, 1, 1)
+        order = self.store.add_order(Order(1, "c1", [], OrderStatus.PENDING, base, 10.0, 0.0))
+        self.store.update_order(order, customer_id="c2", created_at=base + datetime.timedelta(days=1))
+
+        self.assertEqual(self.store.get_orders_by_customer("c1"), [])
+        self.assertEqual(self.store.get_orders_by_customer("c2"), [order])
+        self.assertEqual(self.store.get_orders_created_after(base), [order])
+
+    def test_shipment_indexes_follow_scan_updates(self):
+        base = datetime.datetime(2024, 1, 1)
+        first = self.store.add_shipment(Shipment(1, 7, "T1", base))
+        second = self.store.add_shipment(Shipment(2, 7, "T2", base))
+        third = self.store.add_shipment(Shipment(3, 8, "T3", base))
+
+        applied = self.store.update_shipment_statuses([
+            ("T1", ShipmentStatus.OUT_FOR_DELIVERY), ("T404", ShipmentStatus.DELIVERED),
+            ("T1", ShipmentStatus.DELIVERED), ("T3", ShipmentStatus.DELIVERED)
+        ])
+
+        self.assertEqual(applied, 3)
+        self.assertIs(self.store.get_shipment_by_tracking_number("T1"), first)
+        self.assertIsNone(self.store.get_shipment_by_tracking_number("T404"))
+        self.assertEqual(self.store.get_shipments_by_order(7), [first, second])
+        self.assertEqual(self.store.get_shipments_by_status(ShipmentStatus.IN_TRANSIT), [second])
+        self.assertCountEqual(self.store.get_shipments_by_status(ShipmentStatus.DELIVERED), [first, third])
+        self.assertEqual(self.store.get_shipments_by_status(ShipmentStatus.OUT_FOR_DELIVERY), [])
+
+    def test_change_listeners_see_pricing_writes(self):
+        changes = []
+        self.store.add_change_listener(changes.append)
+
+        product = self.store.add_product("p1", "Laptop", 999.99, 10, "Elec", 2.5, "s1")
+        customer = self.store.add_customer("c1", "Alice", "a@x.com", "gold", "", "", 0)
+        self.store.add_promotion("PR1", "SAVE", 10.0, 0.0, datetime.datetime(2030, 1, 1), "all")
+        self.store.update_product(product, price=899.99)
+        self.store.update_customer(customer, loyalty_points=50)
+        self.store.add_supplier("s1", "Sup", "s@x.com", 1.0)
+        self.store.add_customers_bulk([{"customer_id": "c2", "name": "Bob", "email": "b@x.com", "tier": "silver"}])
+
+        self.assertEqual(changes, [
+            RecordChange('products', "p1"),
+            RecordChange('customers', "c1"),
+            RecordChange('promotions', "SAVE"),
+            RecordChange('products', "p1", frozenset({'price'})),
+            RecordChange('customers', "c1", frozenset({'loyalty_points'})),
+            RecordChange('customers', "c2"),
+        ])
+
+class TestBulkLoads(unittest.TestCase):
+
+    def setUp(self):
+        self.store = DataStore()
+
+    def product_rows(self, count, category="Elec"):
+        return [
+            {"product_id": f"p{i}", "name": f"Item {i}", "price": 10.0 + i, "quantity": i,
+             "category": category, "weight": 1.0, "supplier_id": "s1"}
+            for i in range(count)
+        ]
+
+    def test_products_bulk_matches_per_row_path(self):
+        per_row = DataStore()
+        for row in self.product_rows(5):
+            per_row.add_product(row["product_id"], row["name"], row["price"], row["quantity"],
+                                row["category"], row["weight"], row["supplier_id"])
+
+        loaded = self.store.add_products_bulk(self.product_rows(5), batch_size=2)
+
+        self.assertEqual(loaded, 5)
+        bulk, single = self.store.get_product("p3"), per_row.get_product("p3")
+        self.assertEqual([getattr(bulk, f) for f in Product.__slots__[:-1]],
+                         [getattr(single, f) for f in Product.__slots__[:-1]])
+        self.assertEqual(self.store.get_product_ids_by_category("Elec"), {f"p{i}" for i in range(5)})
+        self.assertEqual(len(self.store.get_products_by_supplier("s1")), 5)
+        self.assertEqual(
+            [(e['product_id'], e['quantity_change'], e['reason']) for e in self.store.inventory_logs],
+            [(e['product_id'], e['quantity_change'], e['reason']) for e in per_row.inventory_logs]
+        )
+
+    def test_reloading_products_moves_them_between_indexes(self):
+        self.store.add_products_bulk(self.product_rows(3))
+        self.store.add_products_bulk(self.product_rows(2, category="Books"))
+
+        self.assertEqual(self.store.get_product_ids_by_category("Elec"), {"p2"})
+        self.assertEqual(self.store.get_product_ids_by_category("Books"), {"p0", "p1"})
+
+    def test_customers_suppliers_and_promotions_bulk(self):
+        self.store.add_customers_bulk([
+            {"customer_id": "c1", "name": "Alice", "email": "a@x.com", "tier": "gold"},
+            {"customer_id": "c2", "name": "Bob", "email": "b@x.com", "tier": "silver",
+             "phone": "555", "address": "1 Main St", "loyalty_points": 40},
+        ])
+        self.store.add_suppliers_bulk([
+            {"supplier_id": "s1", "name": "Sup", "email": "s@sup.com", "reliability": "0.9"}
+        ])
+        self.store.add_promotions_bulk([
+            {"promo_id": "pr1", "code": "SAVE10", "discount_percent": 10, "min_purchase": 50,
+             "valid_until": "2024-12-31T00:00:00", "category": "all"}
+        ])
+
+        self.assertEqual(self.store.get_customer("c1").membership_tier.get_name(), "gold")
+        self.assertEqual(self.store.get_customer("c2").loyalty_points, 40)
+        self.assertEqual(self.store.get_supplier("s1").reliability_score, 0.9)
+        self.assertEqual(self.store.promotions["SAVE10"].valid_until, datetime.datetime(2024, 12, 31))
+
+    def test_bad_batch_is_not_stored(self):
+        rows = self.product_rows(4)
+        rows[3]["price"] = -1
+
+        with self.assertRaisesRegex(ValueError, "row 4: price"):
+            self.store.add_products_bulk(rows, batch_size=2)
+
+        # The first batch went in, the failing one did not
+        self.assertEqual(sorted(self.store.products), ["p0", "p1"])
+        self.assertEqual(len(self.store.inventory_logs), 2)
+
+    def test_open_read_view_does_not_see_bulk_rows(self):
+        self.store.add_products_bulk(self.product_rows(2))
+        with self.store.read_view() as view:
+            self.store.add_products_bulk(self.product_rows(3, category="Books"))
+
+            self.assertEqual(view.get_product("p0").category, "Elec")
+            self.assertIsNone(view.get_product("p2"))
+            self.assertEqual(view.get_product_ids_by_category("Books"), set())
+
+class TestThreadSafeDataStore(unittest.TestCase):
+
+    def setUp(self):
+        """A store in thread-safe mode with one product in stock."""
+        self.store = DataStore(thread_safe=True)
+        self.product = self.store.add_product("p1", "Laptop", 999.99, 500, "Elec", 2.5, "s1")
+
+    def run_threads(self, target, count=8):
+        threads = [threading.Thread(target=target) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_allocated_ids_are_unique(self):
+        ids = []
+        self.run_threads(lambda: ids.extend(self.store.allocate_order_id() for _ in range(1000)))
+
+        self.assertEqual(len(set(ids)), 8000)
+        self.assertEqual(self.store.next_order_id, 8001)
+
+    def test_concurrent_deductions_never_oversell(self):
+        taken = []
+        item = OrderItem("p1", 1, 999.99)
+
+        def buy():
+            for _ in range(100):
+                if self.store.deduct_stock([item], "order_1"):
+                    taken.append(1)
+
+        self.run_threads(buy)  # 800 attempts for 500 units
+
+        self.assertEqual(len(taken), 500)
+        self.assertEqual(self.product.quantity_available, 0)
+        self.assertEqual(self.store.inventory_logs.net_change("p1"), 0)
+
+    def test_deduct_stock_is_all_or_nothing(self):
+        self.store.add_product("p2", "Mouse", 19.99, 1, "Elec", 0.2, "s1")
+        items = [OrderItem("p1", 5, 999.99), OrderItem("p2", 2, 19.99)]
+
+        self.assertFalse(self.store.deduct_stock(items, "order_1"))
+        self.assertEqual(self.product.quantity_available, 500)
+        self.assertEqual(len(self.store.inventory_logs), 2)  # initial stock only
+
+    def test_adjust_stock(self):
+        self.assertIs(self.store.adjust_stock("p1", 20, "restock"), self.product)
+        self.assertEqual(self.product.quantity_available, 520)
+        self.assertIsNone(self.store.adjust_stock("missing", 1, "restock"))
+
+    def test_stock_update_waits_for_the_stripe_lock(self):
+        writer = threading.Thread(target=lambda: self.store.update_product(self.product, quantity_available=7))
+
+        with self.store._stock_guard(["p1"]):
+            writer.start()
+            writer.join(0.2)
+            # Blocked behind the lock a deduction would hold
+            self.assertTrue(writer.is_alive())
+            self.assertEqual(self.product.quantity_available, 500)
+        writer.join()
+
+        self.assertEqual(self.product.quantity_available, 7)
+
+class TestReadView(unittest.TestCase):
+
+    def setUp(self):
+        """A thread-safe store with a product, a customer and two orders."""
+        self.base = datetime.datetime(2024, 1, 1)
+        self.store = DataStore(thread_safe=True)
+        self.product = self.store.add_product("p1", "Laptop", 999.99, 10, "Elec", 2.5, "s1")
+        self.customer = self.store.add_customer("c1", "Alice", "a@x.com", "gold", "", "", 0)
+        for order_id, day in [(1, 0), (2, 2)]:
+            self.store.add_order(Order(
+                order_id, "c1", [], OrderStatus.PENDING,
+                self.base + datetime.timedelta(days=day), 10.0 * order_id, 0.0
+            ))
+
+    def test_view_does_not_see_later_inserts(self):
+        with self.store.read_view() as view:
+            self.store.add_product("p2", "Mouse", 19.99, 5, "Elec", 0.2, "s1")
+            self.store.add_order(Order(3, "c1", [], OrderStatus.PENDING, self.base, 30.0, 0.0))
+
+            self.assertIsNone(view.get_product("p2"))
+            self.assertNotIn(3, view.orders)
+            self.assertEqual(sorted(view.orders.keys()), [1, 2])
+            self.assertEqual(view.get_product_ids_by_category("Elec"), {"p1"})
+            self.assertEqual([o.order_id for o in view.get_orders_by_customer("c1")], [1, 2])
+
+        self.assertIsNotNone(self.store.get_product("p2"))
+
+    def test_view_keeps_values_from_before_updates(self):
+        with self.store.read_view() as view:
+            self.store.update_product(self.product, price=899.0)
+            self.store.deduct_stock([OrderItem("p1", 4, 899.0)], "order_3")
+            self.store.append_order_history(self.customer, 3)
+
+            self.assertEqual(view.get_product("p1").price, 999.99)
+            self.assertEqual(view.products["p1"].quantity_available, 10)
+            self.assertEqual(view.get_customer("c1").order_history.tolist(), [])
+
+        # Live records were changed in place, as callers expect
+        self.assertEqual((self.product.price, self.product.quantity_available), (899.0, 6))
+        self.assertEqual(self.customer.order_history.tolist(), [3])
+
+    def test_view_index_lookups_follow_moved_orders(self):
+        order = self.store.get_order(1)
+        with self.store.read_view() as view:
+            self.store.update_order(
+                order, customer_id="c2", created_at=self.base + datetime.timedelta(days=5)
+            )
+
+            self.assertEqual([o.order_id for o in view.get_orders_by_customer("c1")], [1, 2])
+            self.assertEqual(view.get_orders_by_customer("c2"), [])
+            window = view.get_orders_created_between(self.base, self.base + datetime.timedelta(days=2))
+            self.assertEqual([o.order_id for o in window], [1, 2])
+            self.assertEqual(view.get_orders_created_after(self.base + datetime.timedelta(days=3)), [])
+
+        self.assertEqual(self.store.get_orders_by_customer("c2"), [order])
+
+    def test_view_shipment_lookups_keep_their_status(self):
+        self.store.add_shipment(Shipment(1, 1, "T1", self.base))
+        with self.store.read_view() as view:
+            self.store.update_shipment_statuses([("T1", ShipmentStatus.DELIVERED)])
+            self.store.add_shipment(Shipment(2, 1, "T2", self.base))
+
+            self.assertEqual([s.shipment_id for s in view.get_shipments_by_status(ShipmentStatus.IN_TRANSIT)], [1])
+            self.assertEqual(view.get_shipments_by_status(ShipmentStatus.DELIVERED), [])
+            self.assertEqual(view.get_shipment_by_tracking_number("T1").status, ShipmentStatus.IN_TRANSIT)
+            self.assertIsNone(view.get_shipment_by_tracking_number("T2"))
+            self.assertEqual(len(view.get_shipments_by_order(1)), 1)
+
+        self.assertEqual(self.store.get_shipment(1).status, ShipmentStatus.DELIVERED)
+
+    def test_history_is_dropped_when_views_close(self):
+        seen = []
+
+        def read_in_newer_view():
+            # A view on another thread, opened after the first write
+            with self.store.read_view() as newer:
+                self.store.update_product(self.product, price=2.0)
+                seen.append(newer.get_product("p1").price)
+
+        with self.store.read_view() as older:
+            self.store.update_product(self.product, price=1.0)
+            reader = threading.Thread(target=read_in_newer_view)
+            reader.start()
+            reader.join()
+            self.assertEqual(seen, [1.0])
+            self.assertEqual(older.get_product("p1").price, 999.99)
+
+        # On one thread, a nested view is the outer one
+        with self.store.read_view() as outer:
+            with self.store.read_view() as inner:
+                self.assertIs(inner, outer)
+
+        self.assertTrue(all(not chains for chains in self.store._history.values()))
+        self.store.update_product(self.product, price=3.0)  # no view open: nothing kept
+        self.assertTrue(all(not chains for chains in self.store._history.values()))
+
+    def test_reports_stay_consistent_alongside_writers(self):
+        done = threading.Event()
+        errors = []
+
+        def write():
+            # Each write sets total and shipping together; a torn read would split them
+            for order_id in range(3, 1003):
+                self.store.add_order(Order(order_id, "c1", [], OrderStatus.PENDING, self.base, 0.0, 0.0))
+                self.store.update_order(self.store.get_order(order_id), total_price=5.0, shipping_cost=5.0)
+            done.set()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        while not done.is_set():
+            with self.store.read_view() as view:
+                try:
+                    first = view.orders.values()
+                    second = view.orders.values()
+                except RuntimeError as error:  # "dictionary changed size during iteration"
+                    errors.append(error)
+                    continue
+                if len(first) != len(second):
+                    errors.append((len(first), len(second)))
+                errors.extend(
+                    order.order_id for order in first
+                    if order.order_id > 2 and order.total_price != order.shipping_cost
+                )
+        writer.join()
+
+        self.assertEqual(errors, [])
+        self.assertTrue(all(not chains for chains in self.store._history.values()))
+
 # if __name__ == "__main__":
 #     unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,76 @@
+import unittest
+
+from submission.repositories.ids.IdRegistry import IdRegistry, KeySet
+from submission.repositories.in_memory.DataStore import DataStore
+
+
+class TestIdRegistry(unittest.TestCase):
+
+    def test_keys_are_dense_and_stable(self):
+        registry = IdRegistry(["P1"])
+        self.assertEqual(registry.intern("P2"), 1)
+        self.assertEqual(registry.intern("P1"), 0)
+        self.assertEqual(registry.intern_many(["P3", "P2", "P3", "P4"]), [2, 1, 2, 3])
+
+        self.assertEqual(len(registry), 4)
+        self.assertEqual(registry.ids, ["P1", "P2", "P3", "P4"])
+        self.assertEqual(registry.id_of(2), "P3")
+        self.assertIsNone(registry.key_of("P9"))
+        self.assertNotIn("P9", registry)
+
+    def test_canonical_hands_out_the_first_string_seen(self):
+        registry = IdRegistry()
+        first = "".join(["Elec", "tronics"])
+        second = "".join(["Electr", "onics"])
+        self.assertIsNot(first, second)
+
+        self.assertIs(registry.canonical(first), first)
+        self.assertIs(registry.canonical(second), first)
+
+    def test_key_set_is_a_live_read_only_view(self):
+        registry = IdRegistry(["P1", "P2", "P3"])
+        keys = {0, 2}
+        view = KeySet(registry, keys)
+
+        self.assertEqual(view, {"P1", "P3"})
+        self.assertIn("P1", view)
+        self.assertNotIn("P2", view)
+        self.assertNotIn("P9", view)
+        keys.add(1)
+        self.assertEqual(len(view), 3)
+        self.assertEqual(view & {"P2", "P9"}, {"P2"})
+
+
+class TestCatalogKeys(unittest.TestCase):
+
+    def test_products_share_category_and_supplier_strings(self):
+        store = DataStore()
+        store.add_products_bulk(
+            {"product_id": f"P{i}", "name": "Item", "price": 1.0, "quantity": 1,
+             "category": "".join(["Ele", "c"]), "weight": 1.0, "supplier_id": "".join(["S", "1"])}
+            for i in range(3)
+        )
+        store.add_product("P3", "Item", 1.0, 1, "".join(["El", "ec"]), 1.0, "".join(["S", "1"]))
+        products = [store.products[f"P{i}"] for i in range(4)]
+
+        self.assertEqual(len({id(p.category) for p in products}), 1)
+        self.assertEqual(len({id(p.supplier_id) for p in products}), 1)
+        self.assertEqual(store.get_product_ids_by_category("Elec"), {"P0", "P1", "P2", "P3"})
+
+    def test_updates_keep_the_key_and_move_the_indexes(self):
+        store = DataStore()
+        store.add_product("P1", "Laptop", 999.99, 10, "Elec", 2.5, "S1")
+        store.add_product("P2", "Mouse", 19.99, 10, "Elec", 0.2, "S1")
+        key = store._product_keys.key_of("P1")
+
+        store.update_product(store.products["P1"], category="Computers", supplier_id="S2")
+        store.add_product("P1", "Laptop", 899.99, 10, "Computers", 2.5, "S2")
+
+        self.assertEqual(store._product_keys.key_of("P1"), key)
+        self.assertEqual(len(store._product_keys), 2)
+        self.assertEqual(store.get_product_ids_by_category("Elec"), {"P2"})
+        self.assertEqual([p.price for p in store.get_products_by_category("Computers")], [899.99])
+        self.assertEqual([p.product_id for p in store.get_products_by_supplier("S2")], ["P1"])
+
+# if __name__ == "__main__":
+#     unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,145 @@
+import unittest
+import mmap
+import os
+import tempfile
+
+from submission.repositories.journal.InventoryJournal import InventoryJournal, RECORD_SIZE, HEADER_SIZE
+from submission.repositories.in_memory.DataStore import DataStore
+
+class TestInventoryJournal(unittest.TestCase):
+
+    def setUp(self):
+        """Each test gets its own journal directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, "journal")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_replay_sums_changes_per_product(self):
+        journal = InventoryJournal(self.directory)
+        journal.append("P1", 10, "initial_stock")
+        journal.append("P1", -3, "order_1")
+        journal.append("P2", 5, "initial_stock")
+        journal.append("P1", 3, "cancel_order_1")
+        journal.append("P2", -1, "manual count")
+
+        self.assertEqual(journal.replay(), {"P1": 10, "P2": 4})
+        journal.close()
+
+    def test_records_survive_reopen(self):
+        journal = InventoryJournal(self.directory)
+        journal.append("P1", 10, "initial_stock", timestamp=1.0)
+        journal.append("P1", -2, "damaged in transit", timestamp=2.0)
+        journal.close()
+
+        reopened = InventoryJournal(self.directory)
+        reopened.append("P1", 4, "restock", timestamp=3.0)
+        self.assertEqual(list(reopened.records()), [
+            ("P1", 10, "initial_stock", 1.0),
+            ("P1", -2, "damaged in transit", 2.0),
+            ("P1", 4, "restock", 3.0),
+        ])
+        reopened.close()
+
+    def test_segments_rotate_at_size_limit(self):
+        # Room for exactly 4 records per segment
+        journal = InventoryJournal(self.directory, segment_size=HEADER_SIZE + 4 * RECORD_SIZE)
+        for i in range(10):
+            journal.append(f"P{i % 3}", 1, "restock")
+
+        self.assertEqual(len(journal.segment_paths), 3)
+        self.assertEqual(journal.replay(), {"P0": 4, "P1": 3, "P2": 3})
+        journal.close()
+
+    def test_extend_writes_a_block_across_segments(self):
+        journal = InventoryJournal(self.directory, segment_size=HEADER_SIZE + 4 * RECORD_SIZE)
+        journal.append("P0", 1, "restock")
+        journal.extend([f"P{i % 3}" for i in range(9)], [2] * 9, "initial_stock", timestamp=5.0)
+        journal.close()
+
+        reopened = InventoryJournal(self.directory)
+        self.assertEqual(len(reopened.segment_paths), 3)
+        self.assertEqual(reopened.replay(), {"P0": 7, "P1": 6, "P2": 6})
+        self.assertEqual(list(reopened.records())[-1], ("P2", 2, "initial_stock", 5.0))
+        reopened.close()
+
+    def test_compact_drops_old_segments(self):
+        journal = InventoryJournal(self.directory, segment_size=HEADER_SIZE + 4 * RECORD_SIZE)
+        for _ in range(10):
+            journal.append("P1", 1, "restock")
+        journal.compact({"P1": 10})
+        journal.append("P1", -4, "order_7")
+
+        self.assertEqual(len(journal.segment_paths), 1)
+        self.assertEqual(journal.replay(), {"P1": 6})
+        journal.close()
+
+    def test_crash_during_compact_keeps_the_old_segments(self):
+        class CrashingStock(dict):
+            """Stock levels whose iteration dies after the first product."""
+            def items(self):
+                yield "P1", 10
+                raise KeyboardInterrupt("power cut")
+
+        journal = InventoryJournal(self.directory, segment_size=HEADER_SIZE + 4 * RECORD_SIZE)
+        for i in range(6):
+            journal.append(f"P{i % 2}", 2, "restock")
+
+        with self.assertRaises(KeyboardInterrupt):
+            journal.compact(CrashingStock(P1=10, P2=0))
+        journal.close()
+
+        # The half-written checkpoint is not a segment, so replay is unchanged
+        reopened = InventoryJournal(self.directory)
+        self.assertEqual(len(reopened.segment_paths), 2)
+        self.assertEqual(reopened.replay(), {"P0": 6, "P1": 6})
+        reopened.compact({"P0": 6, "P1": 6})
+        self.assertEqual(reopened.replay(), {"P0": 6, "P1": 6})
+        self.assertEqual(len(reopened.segment_paths), 1)
+        reopened.close()
+
+    def test_scan_is_zero_copy(self):
+        journal = InventoryJournal(self.directory)
+        journal.append("P1", 1, "restock")
+        for view in journal.scan():
+            # The view points straight into the mapped segment
+            self.assertIsInstance(view.obj, mmap.mmap)
+            self.assertEqual(view.nbytes, RECORD_SIZE)
+        journal.close()
+
+    def test_datastore_restores_stock_from_journal(self):
+        store = DataStore(journal=InventoryJournal(self.directory))
+        store.add_product("P1", "Laptop", 999.99, 10, "Elec", 2.5, "S1")
+        store.log_inventory_change("P1", -3, "order_1")
+        store.products["P1"].quantity_available -= 3
+        store.journal.close()
+
+        # "Restart": the catalog is loaded again with its original quantity
+        restarted = DataStore(journal=InventoryJournal(self.directory))
+        product = restarted.add_product("P1", "Laptop", 999.99, 10, "Elec", 2.5, "S1")
+        new_product = restarted.add_product("P2", "Mouse", 19.99, 5, "Elec", 0.2, "S1")
+
+        self.assertEqual(product.quantity_available, 7)
+        self.assertEqual(new_product.quantity_available, 5)
+        # The restored product is not journaled a second time
+        self.assertEqual(restarted.journal.replay(), {"P1": 7, "P2": 5})
+        restarted.journal.close()
+
+    def test_bulk_load_restores_stock_from_journal(self):
+        journal = InventoryJournal(self.directory)
+        journal.append("P1", 7, "initial_stock")
+        store = DataStore(journal=journal)
+        rows = [
+            {"product_id": pid, "name": pid, "price": 1.0, "quantity": 10,
+             "category": "Elec", "weight": 1.0, "supplier_id": "S1"}
+            for pid in ("P1", "P2")
+        ]
+
+        store.add_products_bulk(rows)
+
+        self.assertEqual(store.get_product("P1").quantity_available, 7)
+        self.assertEqual(store.get_product("P2").quantity_available, 10)
+        self.assertEqual(journal.replay(), {"P1": 7, "P2": 10})
+        self.assertEqual(store.inventory_logs.net_change("P1"), 7)
+        journal.close()
@@ -0,0 +1,74 @@
+import unittest
+import datetime
+
+from submission.repositories.in_memory.InventoryLog import InventoryLog
+
+class TestInventoryLog(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a fresh log before each test."""
+        self.log = InventoryLog()
+
+    def test_entries_keep_the_dict_shape(self):
+        self.log.append("P1", 10, "initial_stock")
+        self.log.append("P1", -2, "order_42")
+        self.log.append("P1", 2, "cancel_order_42")
+        self.log.append("P2", 5, "restock")
+
+        self.assertEqual(len(self.log), 4)
+        self.assertEqual(
+            [(e['product_id'], e['quantity_change'], e['reason']) for e in self.log],
+            [
+                ("P1", 10, "initial_stock"),
+                ("P1", -2, "order_42"),
+                ("P1", 2, "cancel_order_42"),
+                ("P2", 5, "restock"),
+            ]
+        )
+        self.assertIsInstance(self.log[0]['timestamp'], datetime.datetime)
+        self.assertEqual(self.log[-1]['product_id'], "P2")
+
+    def test_free_form_reasons_round_trip(self):
+        # Non-numeric and non-canonical references fall back to the side table
+        for reason in ["order_O500", "order_007", "manual adjustment", "order_"]:
+            self.log.append("P1", 1, reason)
+        self.assertEqual([e['reason'] for e in self.log],
+                         ["order_O500", "order_007", "manual adjustment", "order_"])
+
+    def test_index_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.log[0]
+
+    def test_query_by_product_and_time_range(self):
+        base = datetime.datetime(2024, 1, 1)
+        for day in range(10):
+            when = (base + datetime.timedelta(days=day)).timestamp()
+            self.log.append("P1", day, "restock", timestamp=when)
+            self.log.append("P2", -day, "restock", timestamp=when)
+
+        window = list(self.log.query(
+            "P1", base + datetime.timedelta(days=3), base + datetime.timedelta(days=5)
+        ))
+        self.assertEqual([e['quantity_change'] for e in window], [3, 4, 5])
+        self.assertTrue(all(e['product_id'] == "P1" for e in window))
+
+        self.assertEqual(len(list(self.log.query("P2"))), 10)
+        self.assertEqual(list(self.log.query("UNKNOWN")), [])
+
+    def test_net_change(self):
+        self.log.append("P1", 10, "initial_stock")
+        self.log.append("P1", -3, "order_1")
+        self.log.append("P2", 7, "initial_stock")
+        self.assertEqual(self.log.net_change("P1"), 7)
+        self.assertEqual(self.log.net_change("P3"), 0)
+
+    def test_extend_appends_a_block(self):
+        self.log.append("P1", 1, "restock")
+        self.log.extend(["P2", "P1", "P3"], [5, 6, 7], "initial_stock", timestamp=100.0)
+
+        self.assertEqual(len(self.log), 4)
+        self.assertEqual(self.log[2]['quantity_change'], 6)
+        self.assertEqual(self.log[3]['reason'], "initial_stock")
+        self.assertEqual(self.log[3]['timestamp'], datetime.datetime.fromtimestamp(100.0))
+        self.assertEqual(self.log.net_change("P1"), 7)
+        self.assertEqual([e['quantity_change'] for e in self.log.query("P2")], [5])
@@ -0,0 +1,42 @@
+import unittest
+import weakref
+from array import array
+
+from submission.benchmarks.bench_model_memory import BUDGETS, bytes_per_entity
+from submission.domain.models.Customer import Customer
+from submission.domain.models.Product import Product
+from submission.domain.models.OrderItem import OrderItem
+from submission.repositories.in_memory.ReadView import copy_record
+
+
+class TestModelMemory(unittest.TestCase):
+
+    def test_models_stay_within_their_memory_budgets(self):
+        measured = bytes_per_entity(2000)
+
+        for name, budget in BUDGETS.items():
+            with self.subTest(model=name):
+                self.assertLessEqual(measured[name], budget)
+
+    def test_models_are_slotted_and_weakly_referenceable(self):
+        product = Product("P1", "Laptop", 999.99, 10, "Elec", 2.5, "S1")
+
+        self.assertFalse(hasattr(product, '__dict__'))
+        with self.assertRaises(AttributeError):
+            product.colour = "red"
+        self.assertIs(weakref.ref(product)(), product)
+        self.assertFalse(hasattr(OrderItem("P1", 1, 9.99), '__weakref__'))
+
+    def test_order_history_is_a_compact_array_copied_with_the_record(self):
+        customer = Customer("C1", "Alice", "a@b.com", "gold", "555", "1 St", 10)
+        customer.order_history.append(2**40)
+
+        copied = copy_record(customer)
+        customer.order_history.append(7)
+
+        self.assertEqual(customer.order_history, array('q', [2**40, 7]))
+        self.assertEqual(copied.order_history.tolist(), [2**40])
+        self.assertEqual((copied.name, copied.membership_tier), (customer.name, customer.membership_tier))
+
+# if __name__ == "__main__":
+#     unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -1,4 +1,5 @@
 import unittest
+from array import array
 import datetime
 from submission.domain.models.Customer import Customer
 from submission.domain.models.Order import Order
@@ -31,7 +32,7 @@ class TestCustomerModel(unittest.TestCase):
         self.assertEqual(customer.address, "123 St")
         self.assertEqual(customer.loyalty_points, 100)
         self.assertIsInstance(customer.membership_tier, GoldMembership)
-        self.assertEqual(customer.order_history, [])
+        self.assertEqual(customer.order_history, array('q'))
     
     def test_customer_Silver_creation(self):
         customer = Customer("c1", "Alice", "a@b.com", "silver", "555", "123 St", 100)
@@ -42,7 +43,7 @@ class TestCustomerModel(unittest.TestCase):
         self.assertEqual(customer.address, "123 St")
         self.assertEqual(customer.loyalty_points, 100)
         self.assertIsInstance(customer.membership_tier, SilverMembership)
-        self.assertEqual(customer.order_history, [])
+        self.assertEqual(customer.order_history, array('q'))
     
     def test_customer_Bronze_creation(self):
         customer = Customer("c1", "Alice", "a@b.com", "bronze", "555", "123 St", 100)
@@ -53,7 +54,7 @@ class TestCustomerModel(unittest.TestCase):
         self.assertEqual(customer.address, "123 St")
         self.assertEqual(customer.loyalty_points, 100)
         self.assertIsInstance(customer.membership_tier, BronzeMembership)
-        self.assertEqual(customer.order_history, [])
+        self.assertEqual(customer.order_history, array('q'))
         
     def test_customer_Suspended_creation(self):
         customer = Customer("c1", "Alice", "a@b.com", "suspended", "555", "123 St", 100)
@@ -64,7 +65,7 @@ class TestCustomerModel(unittest.TestCase):
         self.assertEqual(customer.address, "123 St")
         self.assertEqual(customer.loyalty_points, 100)
         self.assertIsInstance(customer.membership_tier, SuspendedMembership)
-        self.assertEqual(customer.order_history, [])
+        self.assertEqual(customer.order_history, array('q'))
 
 class TestOrderItemModel(unittest.TestCase):
     def test_order_item_creation(self):
@@ -0,0 +1,82 @@
+import pickle
+import unittest
+from decimal import Decimal
+from fractions import Fraction
+
+from submission.domain.enums.rounding_mode import RoundingMode
+from submission.domain.values.Money import Money, MoneyArray, ZERO
+
+
+class TestMoney(unittest.TestCase):
+
+    def test_conversions_and_display(self):
+        self.assertEqual(Money.from_float(19.99).cents, 1999)
+        self.assertEqual(Money.from_float(0.1 + 0.2), Money(30))
+        self.assertEqual(Money.parse("1234.565").cents, 123456)
+        self.assertEqual(Money(-5).to_float(), -0.05)
+        self.assertEqual((str(Money(123456)), str(Money(-7))), ("1234.56", "-0.07"))
+        self.assertEqual(repr(Money(1050)), "Money('10.50')")
+
+    def test_arithmetic_is_exact(self):
+        total = Money.sum(Money.from_float(0.1) for _ in range(1000))
+
+        self.assertEqual(total, Money(10000))
+        self.assertEqual(Money(250) * 3 - Money(50), Money(700))
+        self.assertEqual(3 * Money(250), Money(750))
+        self.assertEqual(min(Money(5), Money(-5)), Money(-5))
+        self.assertFalse(ZERO)
+
+    def test_scale_rounds_with_the_given_mode(self):
+        cases = [
+            # cents, rate, mode, expected
+            (1, 0.5, RoundingMode.HALF_UP, 1),
+            (1, 0.5, RoundingMode.HALF_EVEN, 0),
+            (3, 0.5, RoundingMode.HALF_EVEN, 2),
+            (-1, 0.5, RoundingMode.HALF_UP, -1),
+            (-3, 0.5, RoundingMode.HALF_EVEN, -2),
+            (199, 0.1, RoundingMode.DOWN, 19),
+            (-199, 0.1, RoundingMode.DOWN, -19),
+            (191, 0.1, RoundingMode.UP, 20),
+            (84900, 0.0725, RoundingMode.HALF_UP, 6155),
+            (100, Fraction(1, 3), RoundingMode.HALF_EVEN, 33),
+            (100, Decimal("0.125"), RoundingMode.HALF_EVEN, 12),
+        ]
+        for cents, rate, mode, expected in cases:
+            with self.subTest(cents=cents, rate=rate, mode=mode):
+                self.assertEqual(Money(cents).scale(rate, mode), Money(expected))
+
+    def test_money_is_immutable_and_picklable(self):
+        amount = Money(500)
+
+        with self.assertRaises(AttributeError):
+            amount.cents = 1
+        self.assertEqual(pickle.loads(pickle.dumps(amount)), amount)
+        self.assertEqual(len({Money(1), Money(1), Money(2)}), 2)
+
+
+class TestMoneyArray(unittest.TestCase):
+
+    def test_batch_operations_match_the_scalar_ones(self):
+        prices = [19.99, 0.05, 1234.5, 7.0]
+        quantities = [3, 7, 1, 2]
+        lines = MoneyArray.from_floats(prices).times(quantities)
+        discounts = lines.scale(0.15, RoundingMode.HALF_EVEN)
+
+        expected = [Money.from_float(p) * q for p, q in zip(prices, quantities)]
+        self.assertEqual(list(lines), expected)
+        self.assertEqual(list(discounts), [m.scale(0.15, RoundingMode.HALF_EVEN) for m in expected])
+        self.assertEqual((lines - discounts).total(), Money.sum(expected) - Money.sum(discounts))
+        self.assertEqual(lines.cents.typecode, 'q')
+        self.assertEqual(lines.to_floats().tolist(), [59.97, 0.35, 1234.5, 14.0])
+
+    def test_scale_each_uses_each_elements_rate(self):
+        amounts = MoneyArray([1, 3, -1, 84900, 1999])
+        rates = [0.5, 0.5, 0.5, 0.0725, 0]
+
+        for mode in RoundingMode:
+            with self.subTest(mode=mode):
+                self.assertEqual(list(amounts.scale_each(rates, mode)),
+                                 [m.scale(rate, mode) for m, rate in zip(amounts, rates)])
+
+# if __name__ == "__main__":
+#     unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,117 @@
+import unittest
+import datetime
+import os
+import tempfile
+
+from submission.repositories.archive.OrderArchive import OrderArchive
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.domain.models.Order import Order
+from submission.domain.models.OrderItem import OrderItem
+from submission.domain.enums.order_status import OrderStatus
+
+class TestOrderArchive(unittest.TestCase):
+
+    def setUp(self):
+        """40 orders, one a day from 2024-01-01, for two customers; every fifth is still pending."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, "archive")
+        self.start = datetime.datetime(2024, 1, 1)
+        self.now = self.start + datetime.timedelta(days=40)
+        self.store = DataStore(archive=self.archive())
+        for order_id in range(1, 41):
+            status = OrderStatus.PENDING if order_id % 5 == 0 else OrderStatus.DELIVERED
+            self.store.add_order(Order(
+                order_id, f"C{order_id % 2}", [OrderItem("P1", 1, 10.0)], status,
+                self.start + datetime.timedelta(days=order_id - 1), 10.0 + order_id, 5.0
+            ))
+
+    def tearDown(self):
+        if self.store.archive:
+            self.store.archive.close()
+        self.tmp.cleanup()
+
+    def archive(self):
+        return OrderArchive(self.directory, max_age=datetime.timedelta(days=10), block_size=4, cache_blocks=2)
+
+    def test_old_finished_orders_leave_memory_but_stay_visible(self):
+        moved = self.store.archive_orders(now=self.now)
+
+        # Orders 1..30 are older than 10 days; 5, 10, ... 30 are pending
+        self.assertEqual(moved, 24)
+        self.assertFalse(dict.__contains__(self.store.orders, 1))
+        self.assertTrue(dict.__contains__(self.store.orders, 5))
+        self.assertEqual(self.store.get_order(1).total_price, 11.0)
+        self.assertEqual(self.store.orders[2].status, OrderStatus.DELIVERED)
+        self.assertIsNone(self.store.get_order(99))
+        self.assertNotIn(99, self.store.orders)
+
+        by_customer = self.store.get_orders_by_customer("C1")
+        self.assertEqual([order.order_id for order in by_customer], list(range(1, 41, 2)))
+        between = self.store.get_orders_created_between(self.start, self.start + datetime.timedelta(days=5))
+        self.assertEqual([order.order_id for order in between], [1, 2, 3, 4, 5, 6])
+        after = self.store.get_orders_created_after(self.start + datetime.timedelta(days=35))
+        self.assertEqual([order.order_id for order in after], [37, 38, 39, 40])
+        self.assertLessEqual(len(self.store.archive._cache), 2)
+
+    def test_an_updated_archived_order_is_resident_again(self):
+        self.store.archive_orders(now=self.now)
+
+        order = self.store.get_order(3)
+        self.store.update_order(order, status=OrderStatus.CANCELLED)
+        self.assertTrue(dict.__contains__(self.store.orders, 3))
+        self.assertEqual(self.store.archive_orders(now=self.now), 1)
+
+        between = self.store.get_orders_created_between(self.start, self.start + datetime.timedelta(days=3))
+        self.assertEqual([(o.order_id, o.status) for o in between], [
+            (1, OrderStatus.DELIVERED), (2, OrderStatus.DELIVERED),
+            (3, OrderStatus.CANCELLED), (4, OrderStatus.DELIVERED)
+        ])
+
+        # The newer copy also wins once the segments are read back from disk
+        self.store.archive.close()
+        reopened = self.archive()
+        self.assertEqual(reopened.get_order(3).status, OrderStatus.CANCELLED)
+        self.assertEqual(len(reopened.get_orders_created_between(self.start, self.now)), 24)
+        reopened.close()
+
+    def test_len_and_iteration_cover_both_tiers(self):
+        # Act: archive, bring one archived order back, archive it again
+        self.store.archive_orders(now=self.now)
+        self.assertEqual(len(self.store.orders), 40)
+        self.store.update_order(self.store.get_order(3), status=OrderStatus.CANCELLED)
+        counts = [len(self.store.orders)]
+        self.store.archive_orders(now=self.now)
+        counts.append(len(self.store.orders))
+
+        # Assert
+        self.assertEqual(counts, [40, 40])
+        self.assertEqual(sorted(self.store.orders), list(range(1, 41)))
+        self.assertEqual(len(self.store.orders.values()), 40)
+        self.assertEqual(dict(self.store.orders.items())[3].status, OrderStatus.CANCELLED)
+
+    def test_snapshot_restore_with_the_archive_keeps_every_order(self):
+        self.store.archive_orders(now=self.now)
+        path = os.path.join(self.tmp.name, "store.snapshot")
+        self.store.snapshot(path)
+        self.store.archive.close()
+
+        self.store = DataStore.restore(path, archive=self.archive())
+
+        self.assertEqual(dict.__len__(self.store.orders), 16)
+        self.assertEqual(len(self.store.orders), 40)
+        self.assertEqual(len(self.store.get_orders_by_customer("C0")), 20)
+        self.assertEqual(self.store.get_order(1).created_at, self.start)
+
+    def test_a_read_view_is_unaffected_by_an_archive_pass(self):
+        with self.store.read_view() as view:
+            self.store.archive_orders(now=self.now)
+
+            self.assertEqual(view.get_order(1).total_price, 11.0)
+            self.assertEqual(len(view.get_orders_by_customer("C1")), 20)
+            self.assertEqual(len(view.get_orders_created_after(self.start)), 39)
+
+        with self.store.read_view() as view:
+            self.assertEqual(len(view.get_orders_created_between(self.start, self.now)), 40)
+
+# if __name__ == "__main__":
+#     unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,66 @@
+import datetime
+import unittest
+from array import array
+
+from submission.domain.enums.order_status import OrderStatus
+from submission.domain.models.Order import Order
+from submission.domain.models.OrderItem import OrderItem
+from submission.domain.models.OrderLines import OrderLines
+from submission.domain.values.Money import Money
+
+
+class TestOrderLines(unittest.TestCase):
+
+    def setUp(self):
+        """Three lines, the second with a discount; one added after construction."""
+        mouse = OrderItem("P2", 3, 19.99)
+        mouse.discount_applied = 1.5
+        self.lines = OrderLines([OrderItem("P1", 1, 999.99), mouse])
+        self.lines.add("P3", 2, 0.1)
+
+    def test_columns_and_totals(self):
+        weights = {"P1": 2.5, "P2": 0.2, "P3": 0.1}
+
+        self.assertEqual(self.lines.product_ids, ["P1", "P2", "P3"])
+        self.assertEqual(self.lines.quantities, array('q', [1, 3, 2]))
+        self.assertEqual(self.lines.unit_cents, array('q', [99999, 1999, 10]))
+        self.assertEqual(self.lines.line_cents(), array('q', [99999, 5997, 20]))
+        self.assertEqual(self.lines.subtotal(), Money(106016))
+        self.assertEqual(self.lines.subtotal([True, False, True]), Money(100019))
+        self.assertEqual(self.lines.discount_total(), Money(150))
+        self.assertEqual(self.lines.item_count(), 6)
+        self.assertAlmostEqual(self.lines.total_weight(weights.__getitem__), 3.3)
+
+    def test_items_read_and_write_the_lines(self):
+        mouse = self.lines[1]
+        mouse.quantity = 100
+        self.lines[-1].discount_applied = 0.05
+
+        self.assertEqual(len(self.lines), 3)
+        self.assertEqual((mouse.product_id, mouse.unit_price, mouse.discount_applied), ("P2", 19.99, 1.5))
+        self.assertEqual(self.lines.quantities[1], 100)
+        self.assertEqual(self.lines.discount_cents[2], 5)
+        self.assertEqual([item.product_id for item in self.lines[1:]], ["P2", "P3"])
+        with self.assertRaises(IndexError):
+            self.lines[3]
+        with self.assertRaises(IndexError):
+            self.lines.set_discount(3, 1.0)
+
+    def test_order_items_keep_identity_semantics(self):
+        a, b = OrderItem("P1", 1, 9.99), OrderItem("P1", 1, 9.99)
+
+        self.assertNotEqual(a, b)
+        self.assertEqual(len({a, b}), 2)
+        self.assertEqual(OrderLines([a])[0], b)
+        self.assertEqual(b, OrderLines([a])[0])
+
+    def test_order_stores_a_list_of_items_as_lines(self):
+        items = [OrderItem("P1", 1, 999.99), OrderItem("P2", 3, 19.99)]
+        order = Order(1, "C1", items, OrderStatus.PENDING, datetime.datetime(2024, 1, 1), 1059.96, 0.0)
+
+        self.assertIsInstance(order.items, OrderLines)
+        self.assertEqual(order.items, items)
+        self.assertEqual(OrderLines.from_columns(["P1", "P2"], [1, 3], [999.99, 19.99], [0.0, 0.0]), order.items)
+
+# if __name__ == "__main__":
+#     unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,318 @@
+import unittest
+import datetime
+import io
+import os
+import tempfile
+import threading
+from unittest.mock import patch
+
+from submission.repositories.sqlite.SqliteDataStore import SqliteDataStore
+from submission.repositories.bulk.BulkRows import read_csv
+from submission.repositories.stock.StockLevels import LowStockEvent
+from submission.repositories.changes.RecordChanges import RecordChange
+from submission.domain.models.Order import Order
+from submission.domain.models.OrderItem import OrderItem
+from submission.domain.models.Shipment import Shipment
+from submission.domain.enums.order_status import OrderStatus
+from submission.domain.enums.shipment_status import ShipmentStatus
+from submission.services.pricing.strategies.membership_discount import GoldMembership
+from submission.application.main import ServiceContainer, place_order_facade
+
+class TestSqliteDataStore(unittest.TestCase):
+
+    def setUp(self):
+        """Each test gets its own database file."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "store.sqlite")
+        self.store = SqliteDataStore(self.path)
+        self.base = datetime.datetime(2024, 1, 1)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def reopen(self):
+        self.store.close()
+        self.store = SqliteDataStore(self.path)
+        return self.store
+
+    def make_order(self, order_id, customer_id, day, status=OrderStatus.PENDING):
+        items = [OrderItem("P1", 2, 10.0), OrderItem("P2", 1, 5.5)]
+        items[1].discount_applied = 0.5
+        return Order(
+            order_id, customer_id, items, status,
+            self.base + datetime.timedelta(days=day), 25.5, 4.0
+        )
+
+    def test_rows_survive_reopen(self):
+        # Arrange
+        self.store.add_supplier("S1", "Sup", "s@sup.com", 0.9)
+        self.store.add_product("P1", "Laptop", 999.99, 10, "Elec", 2.5, "S1")
+        self.store.add_customer("C1", "Alice", "a@x.com", "gold", "555", "CA", 50)
+        self.store.add_promotion("PR1", "SAVE10", 10.0, 50.0, self.base, "all")
+        order = self.make_order(1, "C1", 0)
+        order.payment_method = "paypal"
+        self.store.add_order(order)
+        self.store.add_shipment(Shipment(1, 1, "T1", self.base))
+
+        # Act
+        store = self.reopen()
+
+        # Assert
+        self.assertEqual(store.get_supplier("S1").reliability_score, 0.9)
+        self.assertEqual(store.get_product("P1").quantity_available, 10)
+        self.assertEqual(store.get_customer("C1").membership_tier.get_name(), "gold")
+        self.assertEqual(store.promotions["SAVE10"].valid_until, self.base)
+
+        loaded = store.get_order(1)
+        self.assertEqual(loaded.status, OrderStatus.PENDING)
+        self.assertEqual(loaded.created_at, self.base)
+        self.assertEqual(loaded.payment_method, "paypal")
+        self.assertEqual([(i.product_id, i.quantity, i.unit_price, i.discount_applied) for i in loaded.items],
+                         [("P1", 2, 10.0, 0.0), ("P2", 1, 5.5, 0.5)])
+        self.assertEqual(store.shipments[1].tracking_number, "T1")
+        self.assertEqual(store.get_shipment_by_tracking_number("T1").status, ShipmentStatus.IN_TRANSIT)
+        self.assertIsNone(store.get_order(2))
+
+    def test_updates_are_persisted(self):
+        product = self.store.add_product("P1", "Laptop", 999.99, 10, "Elec", 2.5, "S1")
+        customer = self.store.add_customer("C1", "Alice", "a@x.com", "bronze", "555", "CA", 50)
+        order = self.store.add_order(self.make_order(1, "C1", 0))
+
+        self.store.update_product(product, quantity_available=7, price=899.0)
+        self.store.update_customer(customer, loyalty_points=80, membership_tier=GoldMembership())
+        self.store.append_order_history(customer, 1)
+        self.store.update_order(order, status=OrderStatus.SHIPPED, tracking_number="T1")
+
+        # The caller's objects change in place...
+        self.assertEqual(product.quantity_available, 7)
+        self.assertEqual(order.status, OrderStatus.SHIPPED)
+
+        # ...and the rows too
+        store = self.reopen()
+        self.assertEqual(store.get_product("P1").price, 899.0)
+        reloaded = store.get_customer("C1")
+        self.assertEqual((reloaded.loyalty_points, reloaded.membership_tier.get_name()), (80, "gold"))
+        self.assertEqual(reloaded.order_history.tolist(), [1])
+        self.assertEqual(store.get_order(1).tracking_number, "T1")
+
+    def test_update_rejects_unknown_fields(self):
+        product = self.store.add_product("P1", "Laptop", 999.99, 10, "Elec", 2.5, "S1")
+        with self.assertRaises(ValueError):
+            self.store.update_product(product, colour="red")
+
+    def test_identity_map_returns_the_same_object(self):
+        product = self.store.add_product("P1", "Laptop", 999.99, 10, "Elec", 2.5, "S1")
+        self.assertIs(self.store.get_product("P1"), product)
+        self.assertIs(self.store.products["P1"], product)
+
+    def test_index_lookups(self):
+        self.store.add_product("P1", "Laptop", 999.99, 10, "Elec", 2.5, "S1")
+        self.store.add_product("P2", "Book", 20.0, 10, "Books", 0.5, "S2")
+        for order_id, customer_id, day in [(1, "C1", 0), (2, "C2", 1), (3, "C1", 2), (4, "C1", 5)]:
+            self.store.add_order(self.make_order(order_id, customer_id, day))
+
+        by_customer = self.store.get_orders_by_customer("C1")
+        between = self.store.get_orders_created_between(self.base, self.base + datetime.timedelta(days=2))
+        after = self.store.get_orders_created_after(self.base + datetime.timedelta(days=2))
+
+        self.assertEqual([o.order_id for o in by_customer], [1, 3, 4])
+        self.assertEqual([o.order_id for o in between], [1, 2, 3])  # inclusive
+        self.assertEqual([o.order_id for o in after], [4])          # strict
+        self.assertEqual(self.store.get_product_ids_by_category("Books"), {"P2"})
+        self.assertEqual([p.product_id for p in self.store.get_products_by_supplier("S1")], ["P1"])
+
+    def test_counters_survive_reopen(self):
+        self.store.next_order_id += 5
+        self.store.next_shipment_id += 1
+        store = self.reopen()
+        self.assertEqual((store.next_order_id, store.next_shipment_id), (6, 2))
+
+    def test_deduct_stock_is_atomic(self):
+        product = self.store.add_product("P1", "Laptop", 999.99, 3, "Elec", 2.5, "S1")
+        self.store.add_product("P2", "Mouse", 19.99, 1, "Elec", 0.2, "S1")
+
+        short = [OrderItem("P1", 2, 999.99), OrderItem("P2", 2, 19.99)]
+        self.assertFalse(self.store.deduct_stock(short, "order_1"))
+        self.assertTrue(self.store.deduct_stock([OrderItem("P1", 2, 999.99)], "order_2"))
+        self.assertEqual(self.store.adjust_stock("P1", 5, "restock").quantity_available, 6)
+
+        self.assertEqual(product.quantity_available, 6)
+        self.assertEqual(self.reopen().get_product("P1").quantity_available, 6)
+
+    def test_allocated_ids_are_unique_across_threads(self):
+        ids = []
+        threads = [threading.Thread(target=lambda: ids.extend(
+            self.store.allocate_order_id() for _ in range(50)
+        )) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(ids), list(range(1, 201)))
+        self.assertEqual(self.reopen().next_order_id, 201)
+
+    def test_inventory_logs_are_batched(self):
+        self.store.log_batch_size = 3
+        for _ in range(5):
+            self.store.log_inventory_change("P1", -1, "order_1")
+
+        # Three rows were written as one batch, two are still buffered
+        with self.store._reader() as connection:
+            written = connection.execute("SELECT COUNT(*) FROM inventory_logs").fetchone()[0]
+        self.assertEqual(written, 3)
+
+        # Reading the log writes the rest first
+        self.assertEqual(len(self.store.inventory_logs), 5)
+        self.assertEqual(self.store.inventory_logs.net_change("P1"), -5)
+        self.assertEqual(self.store.inventory_logs[-1]['reason'], "order_1")
+
+    def test_transaction_rolls_back_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.store.transaction():
+                self.store.add_order(self.make_order(1, "C1", 0))
+                # Visible inside the transaction
+                self.assertEqual(len(self.store.get_orders_by_customer("C1")), 1)
+                raise RuntimeError("abort")
+
+        self.assertIsNone(self.store.get_order(1))
+
+    def test_concurrent_readers(self):
+        self.store.add_product("P1", "Laptop", 999.99, 10, "Elec", 2.5, "S1")
+        for order_id in range(1, 51):
+            self.store.add_order(self.make_order(order_id, "C1", order_id % 7))
+        errors = []
+
+        def read():
+            try:
+                for _ in range(20):
+                    self.assertEqual(len(self.store.get_orders_by_customer("C1")), 50)
+            except Exception as error:  # surfaced below
+                errors.append(error)
+
+        threads = [threading.Thread(target=read) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+
+    def test_read_view_is_a_fixed_snapshot(self):
+        product = self.store.add_product("P1", "Laptop", 999.99, 10, "Elec", 2.5, "S1")
+        self.store.add_order(self.make_order(1, "C1", 0))
+
+        def write():
+            self.store.add_order(self.make_order(2, "C1", 1))
+            self.store.update_product(product, price=899.0)
+
+        with self.store.read_view() as view:
+            self.assertEqual(len(view.get_orders_by_customer("C1")), 1)
+            writer = threading.Thread(target=write)
+            writer.start()
+            writer.join()
+
+            # Built from the snapshot, not the identity map
+            self.assertEqual(view.get_product("P1").price, 999.99)
+            self.assertIsNot(view.get_product("P1"), product)
+            self.assertEqual([o.order_id for o in view.get_orders_by_customer("C1")], [1])
+
+        self.assertIs(self.store.get_product("P1"), product)
+        self.assertEqual(len(self.store.get_orders_by_customer("C1")), 2)
+
+    def test_bulk_loads_are_persisted(self):
+        stale = self.store.add_product("P1", "Old", 1.0, 1, "Old", 1.0, "S0")
+        source = io.StringIO(
+            "product_id,name,price,quantity,category,weight,supplier_id\n"
+            "P1,Laptop,999.99,10,Elec,2.5,S1\n"
+            "P2,Mouse,19.99,5,Elec,0.2,S1\n"
+        )
+
+        self.assertEqual(self.store.add_products_bulk(read_csv(source)), 2)
+        self.store.add_customers_bulk([
+            {"customer_id": "C1", "name": "Alice", "email": "a@x.com", "tier": "gold", "loyalty_points": 7}
+        ])
+        self.store.add_suppliers_bulk([{"supplier_id": "S1", "name": "Sup", "email": "s@x.com", "reliability": 1}])
+        self.store.add_promotions_bulk([
+            {"promo_id": "PR1", "code": "SAVE10", "discount_percent": 10, "min_purchase": 0,
+             "valid_until": self.base, "category": "all"}
+        ])
+
+        # The replaced row is read afresh, not served from the identity map
+        self.assertIsNot(self.store.get_product("P1"), stale)
+        store = self.reopen()
+        self.assertEqual(store.get_product("P1").name, "Laptop")
+        self.assertEqual(store.get_product_ids_by_category("Elec"), {"P1", "P2"})
+        self.assertEqual(store.get_customer("C1").loyalty_points, 7)
+        self.assertEqual(store.get_supplier("S1").reliability_score, 1.0)
+        self.assertEqual(store.promotions["SAVE10"].valid_until, self.base)
+        self.assertEqual(store.inventory_logs.net_change("P2"), 5)
+
+    def test_shipment_lookups_and_scan_updates(self):
+        for shipment_id in range(1, 5):
+            self.store.add_shipment(Shipment(shipment_id, 10 + shipment_id % 2, f"T{shipment_id}", self.base))
+
+        applied = self.store.update_shipment_statuses([
+            ("T1", ShipmentStatus.DELIVERED), ("T3", ShipmentStatus.EXCEPTION), ("T9", ShipmentStatus.DELIVERED)
+        ])
+
+        self.assertEqual(applied, 2)
+        self.assertEqual([s.shipment_id for s in self.store.get_shipments_by_order(11)], [1, 3])
+        self.assertEqual(
+            sorted(s.shipment_id for s in self.store.get_shipments_by_status(ShipmentStatus.IN_TRANSIT)), [2, 4]
+        )
+        self.assertEqual(self.reopen().get_shipment_by_tracking_number("T3").status, ShipmentStatus.EXCEPTION)
+
+    def test_low_stock_range_query_and_events(self):
+        self.store.add_product("P1", "Laptop", 1000.0, 10, "Elec", 2.5, "S1")
+        self.store.add_product("P2", "Mouse", 20.0, 6, "Elec", 0.2, "S1")
+        events = []
+        self.store.add_low_stock_listener(events.append, below=5)
+
+        self.store.deduct_stock([OrderItem("P2", 3, 1.0)], "order_1")
+        self.assertEqual([p.product_id for p in self.store.get_products_at_or_below(6)], ["P2"])
+        self.store.adjust_stock("P2", 2, "restock")
+        self.assertEqual([p.product_id for p in self.store.get_products_at_or_below(10)], ["P2", "P1"])
+        self.store.add_product("P1", "Laptop", 900.0, 4, "Elec", 2.5, "S1")   # replaced: 10 -> 4
+        self.store.add_products_bulk([{"product_id": "P2", "name": "Mouse", "price": 20, "quantity": 1,
+                                       "category": "Elec", "weight": 0.2, "supplier_id": "S1"}])
+
+        self.assertEqual(events, [
+            LowStockEvent("P2", 3, entered=True), LowStockEvent("P2", 5, entered=False),
+            LowStockEvent("P1", 4, entered=True), LowStockEvent("P2", 1, entered=True),
+        ])
+
+    def test_change_listeners_see_pricing_writes(self):
+        changes = []
+        self.store.add_change_listener(changes.append)
+
+        product = self.store.add_product("P1", "Laptop", 1000.0, 10, "Elec", 2.5, "S1")
+        self.store.update_product(product, price=900.0)
+        self.store.add_promotions_bulk([{"promo_id": "PR1", "code": "SAVE", "discount_percent": 10.0,
+                                         "min_purchase": 0.0, "valid_until": self.base, "category": "all"}])
+
+        self.assertEqual(changes, [
+            RecordChange('products', "P1"),
+            RecordChange('products', "P1", frozenset({'price'})),
+            RecordChange('promotions', "SAVE"),
+        ])
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_services_place_an_order(self, mock_stdout):
+        # Arrange
+        services = ServiceContainer.initialize(self.store)
+        self.store.add_supplier("S1", "TestSup", "test@sup.com", 1.0)
+        self.store.add_product("P1", "Test Laptop", 1000.00, 10, "electronics", 2.0, "S1")
+        self.store.add_customer("C1", "Test Alice", "alice@test.com", "gold", "555-1111", "123 Main St, CA", 100)
+        payment = {"type": "credit_card", "card_number": "1234567812345678", "amount": 1500.0, "valid": True}
+
+        # Act
+        order = place_order_facade(services, "C1", [{"product_id": "P1", "quantity": 1}], "standard", payment)
+
+        # Assert (same figures as the in-memory integration test)
+        self.assertAlmostEqual(order.total_price, 910.55, 2)
+        store = self.reopen()
+        self.assertEqual(store.get_product("P1").quantity_available, 9)
+        self.assertEqual(store.get_customer("C1").order_history.tolist(), [order.order_id])
+        self.assertEqual(store.next_order_id, 2)
@@ -0,0 +1,85 @@
+import unittest
+
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.repositories.stock.StockLevels import LowStockEvent, StockLevelIndex
+from submission.domain.models.OrderItem import OrderItem
+
+class TestStockLevelIndex(unittest.TestCase):
+
+    def test_at_or_below_walks_buckets_in_order(self):
+        index = StockLevelIndex()
+        index.add_many([(1, 7), (2, 0), (3, 3), (4, 3), (5, 20)])
+        index.move(5, 20, 2)
+        index.remove(1, 7)
+
+        self.assertEqual(index.at_or_below(-1), [])
+        self.assertEqual(index.at_or_below(2), [2, 5])
+        self.assertEqual(sorted(index.at_or_below(3)[2:]), [3, 4])
+        self.assertEqual(len(index.at_or_below(100)), 4)
+        self.assertEqual(index._quantities, [0, 2, 3])
+
+
+class TestLowStockTracking(unittest.TestCase):
+
+    def setUp(self):
+        """Three products at 10, 6 and 2 units; a listener for the band below 5."""
+        self.store = DataStore()
+        self.store.add_product("P1", "Laptop", 1000.0, 10, "Elec", 2.5, "S1")
+        self.store.add_product("P2", "Mouse", 20.0, 6, "Elec", 0.2, "S1")
+        self.store.add_product("P3", "Cable", 5.0, 2, "Elec", 0.1, "S1")
+        self.events = []
+        self.store.add_low_stock_listener(self.events.append, below=5)
+
+    def low_ids(self, quantity):
+        return [product.product_id for product in self.store.get_products_at_or_below(quantity)]
+
+    def test_every_stock_path_keeps_the_index_current(self):
+        self.assertEqual(self.low_ids(6), ["P3", "P2"])
+
+        self.store.deduct_stock([OrderItem("P1", 9, 1.0)], "order_1")
+        self.assertEqual(self.low_ids(1), ["P1"])
+
+        self.store.adjust_stock("P1", 20, "restock")
+        self.store.update_product(self.store.products["P2"], quantity_available=0)
+        self.assertEqual(self.low_ids(2), ["P2", "P3"])
+
+        self.store.add_products_bulk([
+            {"product_id": "P3", "name": "Cable", "price": 5, "quantity": 50,
+             "category": "Elec", "weight": 0.1, "supplier_id": "S1"},
+            {"product_id": "P4", "name": "Plug", "price": 3, "quantity": 1,
+             "category": "Elec", "weight": 0.1, "supplier_id": "S1"},
+        ])
+        self.assertEqual(self.low_ids(10), ["P2", "P4"])
+        self.assertEqual(self.low_ids(100), ["P2", "P4", "P1", "P3"])
+
+    def test_crossings_emit_events_once_per_entry_and_exit(self):
+        self.store.deduct_stock([OrderItem("P2", 1, 1.0)], "order_1")   # 6 -> 5, still outside
+        self.store.deduct_stock([OrderItem("P2", 1, 1.0)], "order_2")   # 5 -> 4, enters
+        self.store.deduct_stock([OrderItem("P2", 1, 1.0)], "order_3")   # 4 -> 3, stays low
+        self.store.deduct_stock([OrderItem("P1", 99, 1.0)], "order_4")  # short, nothing moves
+        self.store.adjust_stock("P3", 10, "restock")                     # 2 -> 12, leaves
+        self.store.add_product("P5", "Fan", 15.0, 0, "Elec", 1.0, "S1")  # new: no crossing
+        self.store.add_product("P1", "Laptop", 900.0, 3, "Elec", 2.5, "S1")  # replaced: 10 -> 3, enters
+        self.store.add_products_bulk([
+            {"product_id": "P3", "name": "Cable", "price": 5, "quantity": 1,
+             "category": "Elec", "weight": 0.1, "supplier_id": "S1"},   # replaced: 12 -> 1, enters
+            {"product_id": "P2", "name": "Mouse", "price": 20, "quantity": 2,
+             "category": "Elec", "weight": 0.2, "supplier_id": "S1"},   # replaced: 3 -> 2, stays low
+        ])
+
+        self.assertEqual(self.events, [
+            LowStockEvent("P2", 4, entered=True),
+            LowStockEvent("P3", 12, entered=False),
+            LowStockEvent("P1", 3, entered=True),
+            LowStockEvent("P3", 1, entered=True),
+        ])
+
+    def test_read_view_answers_from_its_own_point_in_time(self):
+        with self.store.read_view() as view:
+            self.store.adjust_stock("P1", -9, "sale")
+
+            self.assertEqual([p.product_id for p in view.get_products_at_or_below(6)], ["P3", "P2"])
+        self.assertEqual(self.low_ids(1), ["P1"])
+
+# if __name__ == "__main__":
+#     unittest.main(argv=['first-arg-is-ignored'], exit=False)
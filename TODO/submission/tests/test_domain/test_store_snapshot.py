@@ -0,0 +1,131 @@
+import unittest
+import datetime
+import os
+import tempfile
+
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.repositories.journal.InventoryJournal import InventoryJournal
+from submission.repositories.snapshot.StoreSnapshot import HEADER, VERSION
+from submission.domain.models.Order import Order
+from submission.domain.models.OrderItem import OrderItem
+from submission.domain.models.Shipment import Shipment
+from submission.domain.enums.order_status import OrderStatus
+from submission.domain.enums.shipment_status import ShipmentStatus
+
+class TestStoreSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        """A small store touching every table."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "store.snapshot")
+        self.base = datetime.datetime(2024, 1, 1, 9, 30, 0, 123456)
+
+        store = DataStore()
+        store.add_supplier("S1", "Sup", "s@sup.com", 0.9)
+        store.add_product("P1", "Laptop", 999.99, 10, "Elec", 2.5, "S1")
+        mouse = store.add_product("P2", "Mouse – wireless", 19.99, 5, "Elec", 0.2, "S1")
+        mouse.discount_eligible = False
+        customer = store.add_customer("C1", "Alice", "a@x.com", "gold", "555", "CA", 50)
+        store.add_customer("C2", "Bob", "b@x.com", "unknown", "", "", 0)
+        promo = store.add_promotion("PR1", "SAVE10", 10.0, 50.0, self.base, "all")
+        promo.used_count = 3
+
+        items = [OrderItem("P1", 1, 999.99), OrderItem("P2", 2, 19.99)]
+        items[1].discount_applied = 1.5
+        late = Order(2, "C1", items, OrderStatus.SHIPPED, self.base + datetime.timedelta(days=2), 1040.0, 5.0)
+        late.tracking_number = "T2"
+        late.payment_method = "paypal"
+        store.add_order(late)
+        store.add_order(Order(1, "C1", [], OrderStatus.PENDING, self.base, 0.0, 0.0))
+        customer.order_history.extend([1, 2])
+        store.add_shipment(Shipment(1, 2, "T2", self.base, ShipmentStatus.OUT_FOR_DELIVERY))
+        store.log_inventory_change("P1", -1, "order_2")
+        store.log_inventory_change("P2", 4, "manual count")
+        store.next_order_id, store.next_shipment_id = 3, 2
+        self.store = store
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_restore_round_trips_every_table(self):
+        # Act
+        self.store.snapshot(self.path)
+        restored = DataStore.restore(self.path)
+
+        # Assert
+        self.assertEqual(restored.get_supplier("S1").reliability_score, 0.9)
+        mouse = restored.get_product("P2")
+        self.assertEqual((mouse.name, mouse.quantity_available, mouse.discount_eligible),
+                         ("Mouse – wireless", 5, False))
+        self.assertTrue(restored.get_product("P1").discount_eligible)
+
+        alice = restored.get_customer("C1")
+        self.assertEqual((alice.membership_tier.get_name(), alice.loyalty_points, alice.order_history.tolist()),
+                         ("gold", 50, [1, 2]))
+        self.assertEqual(restored.get_customer("C2").membership_tier.get_name(), "suspended")
+        self.assertEqual(restored.promotions["SAVE10"].valid_until, self.base)
+        self.assertEqual(restored.promotions["SAVE10"].used_count, 3)
+
+        order = restored.get_order(2)
+        self.assertEqual((order.status, order.tracking_number, order.payment_method),
+                         (OrderStatus.SHIPPED, "T2", "paypal"))
+        self.assertEqual(order.created_at, self.base + datetime.timedelta(days=2))
+        self.assertEqual([(i.product_id, i.quantity, i.discount_applied) for i in order.items],
+                         [("P1", 1, 0.0), ("P2", 2, 1.5)])
+        self.assertIsNone(restored.get_order(1).tracking_number)
+        shipment = restored.shipments[1]
+        self.assertEqual((shipment.order_id, shipment.tracking_number, shipment.created_at, shipment.status),
+                         (2, "T2", self.base, ShipmentStatus.OUT_FOR_DELIVERY))
+        self.assertIs(restored.get_shipment_by_tracking_number("T2"), shipment)
+
+        self.assertEqual(list(restored.inventory_logs), list(self.store.inventory_logs))
+        self.assertEqual((restored.next_order_id, restored.next_shipment_id), (3, 2))
+
+    def test_restore_rebuilds_indexes(self):
+        self.store.snapshot(self.path)
+        restored = DataStore.restore(self.path)
+
+        self.assertEqual([o.order_id for o in restored.get_orders_by_customer("C1")], [2, 1])
+        self.assertEqual([o.order_id for o in restored.get_orders_created_after(self.base)], [2])
+        self.assertEqual(restored.get_product_ids_by_category("Elec"), {"P1", "P2"})
+        self.assertEqual(len(restored.get_products_by_supplier("S1")), 2)
+        self.assertEqual(restored.inventory_logs.net_change("P2"), 9)
+
+        # The restored store keeps working as usual
+        self.assertEqual(restored.allocate_order_id(), 3)
+        self.assertTrue(restored.deduct_stock([OrderItem("P1", 2, 999.99)], "order_3"))
+
+    def test_journal_stock_wins_over_snapshot(self):
+        self.store.snapshot(self.path)
+        journal = InventoryJournal(os.path.join(self.tmp.name, "journal"))
+        journal.append("P1", 7, "initial_stock")
+
+        restored = DataStore.restore(self.path, journal=journal)
+        journal.close()
+
+        self.assertEqual(restored.get_product("P1").quantity_available, 7)
+        self.assertEqual(restored.get_product("P2").quantity_available, 5)
+
+    def test_rejects_foreign_or_newer_files(self):
+        with open(self.path, 'wb') as handle:
+            handle.write(b"{}")
+        with self.assertRaises(ValueError):
+            DataStore.restore(self.path)
+
+        self.store.snapshot(self.path)
+        with open(self.path, 'r+b') as handle:
+            magic, _, byte_order, count = HEADER.unpack(handle.read(HEADER.size))
+            handle.seek(0)
+            handle.write(HEADER.pack(magic, VERSION + 1, byte_order, count))
+        with self.assertRaisesRegex(ValueError, "version"):
+            DataStore.restore(self.path)
+
+    def test_truncated_file_is_rejected(self):
+        self.store.snapshot(self.path)
+        with open(self.path, 'r+b') as handle:
+            handle.truncate(os.path.getsize(self.path) - 10)
+        with self.assertRaisesRegex(ValueError, "truncated"):
+            DataStore.restore(self.path)
+
+# if __name__ == "__main__":
+#     unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,189 @@
+import unittest
+import datetime
+import os
+import tempfile
+import threading
+import time
+
+from submission.application.main import ServiceContainer, place_order_facade
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.repositories.journal.InventoryJournal import InventoryJournal
+from submission.repositories.wal.WriteAheadLog import WriteAheadLog
+from submission.domain.models.Order import Order
+from submission.domain.models.OrderItem import OrderItem
+from submission.domain.enums.order_status import OrderStatus
+from submission.domain.enums.shipment_status import ShipmentStatus
+
+class TestWriteAheadLog(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "store.wal")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_records_round_trip_with_tagged_values(self):
+        when = datetime.datetime(2024, 5, 1, 12, 0, 0, 250)
+        wal = WriteAheadLog(self.path, commit_window_ms=0)
+        wal.append(("promotion", "PR1", "SAVE10", 10.0, 50.0, when, "all"))
+        wal.append(("update", "orders", 7, {"status": OrderStatus.SHIPPED}))
+        wal.wait()
+        wal.close()
+
+        records = list(WriteAheadLog(self.path).records())
+
+        self.assertEqual(records[0], ["promotion", "PR1", "SAVE10", 10.0, 50.0, when, "all"])
+        self.assertEqual(records[1][3], {"status": OrderStatus.SHIPPED})
+
+    def test_torn_tail_is_cut_off_on_open(self):
+        wal = WriteAheadLog(self.path, commit_window_ms=0)
+        wal.append(("log", "P1", 5, "restock"))
+        wal.append(("log", "P1", -1, "sale"))
+        wal.wait()
+        wal.close()
+        with open(self.path, 'r+b') as handle:
+            handle.truncate(os.path.getsize(self.path) - 3)
+
+        reopened = WriteAheadLog(self.path, commit_window_ms=0)
+        self.assertEqual(reopened.durable_lsn, 1)
+        reopened.append(("log", "P1", 2, "restock"))
+        reopened.wait()
+        reopened.close()
+
+        self.assertEqual(
+            [record[2] for record in WriteAheadLog(self.path).records()], [5, 2]
+        )
+
+    def test_concurrent_writers_share_a_commit(self):
+        wal = WriteAheadLog(self.path, commit_window_ms=20)
+        flushes = []
+        original_write = wal._file.write
+        wal._file.write = lambda data: flushes.append(data) or original_write(data)
+        start = threading.Barrier(8)
+
+        def writer(index):
+            start.wait()
+            wal.append(("log", f"P{index}", 1, "restock"))
+            wal.wait()
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wal.close()
+
+        self.assertEqual(wal.durable_lsn, 8)
+        self.assertLess(len(flushes), 8)
+
+    def test_wal_and_journal_are_exclusive(self):
+        wal = WriteAheadLog(self.path)
+        journal = InventoryJournal(os.path.join(self.tmp.name, "inventory.journal"))
+        with self.assertRaises(ValueError):
+            DataStore(journal=journal, wal=wal)
+        wal.close()
+        journal.close()
+
+
+class TestDataStoreRecovery(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "store.wal")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def reopen(self, store):
+        store.wal.close()
+        return DataStore(wal=WriteAheadLog(self.path))
+
+    def test_placed_orders_are_recovered_by_replay(self):
+        store = DataStore(thread_safe=True, wal=WriteAheadLog(self.path, commit_window_ms=0))
+        store.add_supplier("S1", "Sup", "s@sup.com", 0.9)
+        store.add_product("P1", "Laptop", 1000.0, 10, "Elec", 2.5, "S1")
+        store.add_customer("C1", "Alice", "a@x.com", "silver", "555", "CA", 0)
+        services = ServiceContainer.initialize(store)
+        payment = {"type": "credit_card", "card_number": "1234567812345678", "valid": True, "amount": 1e6}
+
+        order = place_order_facade(services, "C1", [{"product_id": "P1", "quantity": 2}], "standard", payment)
+        services.order.update_order_status(order.order_id, OrderStatus.SHIPPED)
+        store.adjust_stock("P1", 4, "restock")
+        services.shipping.apply_carrier_scans([{"tracking_number": order.tracking_number, "status": "delivered"}])
+
+        recovered = self.reopen(store)
+
+        # Replay is not written to the log again
+        self.assertEqual(recovered.wal.durable_lsn, store.wal.durable_lsn)
+        self.assertEqual(recovered.products["P1"].quantity_available, 12)
+        self.assertEqual(recovered.customers["C1"].order_history.tolist(), [order.order_id])
+        self.assertEqual(recovered.customers["C1"].loyalty_points, store.customers["C1"].loyalty_points)
+        copy = recovered.orders[order.order_id]
+        self.assertEqual(copy.status, OrderStatus.SHIPPED)
+        self.assertEqual(copy.tracking_number, order.tracking_number)
+        self.assertEqual(copy.total_price, order.total_price)
+        self.assertEqual(recovered.next_order_id, order.order_id + 1)
+        self.assertEqual(recovered.next_shipment_id, store.next_shipment_id)
+        self.assertEqual(
+            [s.tracking_number for s in recovered.get_shipments_by_status(ShipmentStatus.DELIVERED)],
+            [order.tracking_number]
+        )
+        self.assertEqual(
+            [(log['quantity_change'], log['reason']) for log in recovered.inventory_logs.query("P1")],
+            [(log['quantity_change'], log['reason']) for log in store.inventory_logs.query("P1")]
+        )
+        recovered.wal.close()
+
+    def test_bulk_loads_and_membership_changes_are_replayed(self):
+        store = DataStore(wal=WriteAheadLog(self.path, commit_window_ms=0))
+        store.add_customers_bulk([
+            {"customer_id": "C1", "name": "Alice", "email": "a@x.com", "tier": "bronze"},
+            {"customer_id": "C2", "name": "Bob", "email": "b@x.com", "tier": "gold"},
+        ])
+        store.add_products_bulk([
+            {"product_id": "P1", "name": "Mouse", "price": 20, "quantity": 5,
+             "category": "Elec", "weight": 0.2, "supplier_id": "S1"},
+        ])
+        store.update_customer(store.customers["C1"], membership_tier=store.customers["C2"].membership_tier)
+        store.add_order(Order(41, "C2", [OrderItem("P1", 1, 20.0)], OrderStatus.PENDING,
+                              datetime.datetime(2024, 1, 1), 20.0, 5.0))
+        store.sync()
+
+        recovered = self.reopen(store)
+
+        self.assertEqual(recovered.customers["C1"].membership_tier.get_name(), "gold")
+        self.assertEqual(recovered.get_product_ids_by_category("Elec"), {"P1"})
+        self.assertEqual([o.order_id for o in recovered.get_orders_by_customer("C2")], [41])
+        self.assertEqual(recovered.next_order_id, 42)
+        recovered.wal.close()
+
+    def test_inventory_log_times_survive_replay(self):
+        # Arrange: every kind of logged stock write, all before `written`
+        store = DataStore(wal=WriteAheadLog(self.path, commit_window_ms=0))
+        store.add_product("P1", "Laptop", 1000.0, 10, "Elec", 2.5, "S1")
+        store.add_products_bulk([
+            {"product_id": "P2", "name": "Mouse", "price": 20, "quantity": 5,
+             "category": "Elec", "weight": 0.2, "supplier_id": "S1"},
+        ])
+        store.deduct_stock([OrderItem("P1", 2, 1000.0), OrderItem("P2", 1, 20.0)], "order_1")
+        store.adjust_stock("P1", 4, "restock")
+        store.log_inventory_change("P2", 0, "audit")
+        store.sync()
+        written = datetime.datetime.now()
+        time.sleep(0.01)
+
+        # Act
+        recovered = self.reopen(store)
+
+        # Assert: the same times, so a range query ending before the crash finds every entry
+        self.assertEqual(
+            [log['timestamp'] for log in recovered.inventory_logs],
+            [log['timestamp'] for log in store.inventory_logs]
+        )
+        self.assertEqual(len(list(recovered.inventory_logs.query("P1", end=written))), 3)
+        self.assertEqual(len(list(recovered.inventory_logs.query("P2", end=written))), 3)
+        recovered.wal.close()
+
+# if __name__ == "__main__":
+#     unittest.main(argv=['first-arg-is-ignored'], exit=False)
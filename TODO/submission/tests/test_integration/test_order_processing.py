@@ -1,5 +1,7 @@
 import unittest
 import datetime
+import io
+from unittest.mock import patch
 
 # Import the container from main.py that holds all services
 from submission.application.main import ServiceContainer, setup_data
@@ -86,3 +88,84 @@ class TestOrderProcessingIntegration(unittest.TestCase):
         self.assertEqual(product.quantity_available, 10) # Stock is unchanged
         self.assertEqual(len(self.services.db.orders), 0) # No order in DB
         self.assertEqual(len(customer.order_history), 0) # No order in history
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_place_order_cancels_when_stock_is_taken_first(self, mock_stdout):
+        """
+        Another thread may take the stock between the availability check
+        and the deduction; the order is then cancelled, not oversold.
+        """
+        # Arrange
+        items = [{"product_id": "P1", "quantity": 1}]
+        payment = {"type": "credit_card", "amount": 1500.0, "valid": True, "card_number": "1234567812345678"}
+        product = self.services.db.get_product("P1")
+
+        def taken_by_another_order(order_items):
+            self.services.db.update_product(product, quantity_available=0)
+            return True
+
+        # Act
+        from submission.application.main import place_order_facade
+        with patch.object(self.services.inventory, 'check_stock_availability', side_effect=taken_by_another_order):
+            order = place_order_facade(self.services, "C1", items, "standard", payment)
+
+        # Assert
+        self.assertIsNone(order)
+        self.assertEqual(product.quantity_available, 0)
+        cancelled = self.services.db.get_order(1)
+        self.assertEqual(cancelled.status.value, "cancelled")
+        self.assertIn("ran out", mock_stdout.getvalue())
+        # The loyalty points spent on it are given back
+        self.assertEqual(self.services.db.get_customer("C1").loyalty_points, 100)
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_low_stock_email_follows_orders_not_catalog_setup(self, mock_stdout):
+        # Arrange: a product loaded already low sends nothing
+        self.services.db.add_product("P2", "Test Cable", 5.00, 2, "electronics", 0.1, "S1")
+        self.assertNotIn("Low stock alert", mock_stdout.getvalue())
+        items = [{"product_id": "P1", "quantity": 6}]
+        payment = {"type": "credit_card", "amount": 10_000.0, "valid": True, "card_number": "1234567812345678"}
+
+        # Act
+        from submission.application.main import place_order_facade
+        order = place_order_facade(self.services, "C1", items, "standard", payment)
+
+        # Assert: 10 -> 4 is below the threshold of 5
+        self.assertIsNotNone(order)
+        self.assertEqual(mock_stdout.getvalue().count("Low stock alert for Test Laptop"), 1)
+        self.assertNotIn("Low stock alert for Test Cable", mock_stdout.getvalue())
+
+        # A second order while the product stays low sends no second email
+        place_order_facade(self.services, "C1", [{"product_id": "P1", "quantity": 1}], "standard", payment)
+        self.assertEqual(mock_stdout.getvalue().count("Low stock alert for Test Laptop"), 1)
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_points_are_given_back_when_a_step_after_commit_fails(self, mock_stdout):
+        # Arrange
+        items = [{"product_id": "P1", "quantity": 1}]
+        payment = {"type": "credit_card", "amount": 1500.0, "valid": True, "card_number": "1234567812345678"}
+
+        # Act
+        from submission.application.main import place_order_facade
+        with patch.object(self.services.order, 'create_order', side_effect=RuntimeError("disk full")):
+            order = place_order_facade(self.services, "C1", items, "standard", payment)
+
+        # Assert
+        self.assertIsNone(order)
+        self.assertIn("disk full", mock_stdout.getvalue())
+        self.assertEqual(self.services.db.get_customer("C1").loyalty_points, 100)
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_place_order_spends_no_points_when_payment_fails(self, mock_stdout):
+        # Arrange
+        items = [{"product_id": "P1", "quantity": 1}]
+        payment = {"type": "credit_card", "amount": 1500.0, "valid": False, "card_number": "1234567812345678"}
+
+        # Act
+        from submission.application.main import place_order_facade
+        order = place_order_facade(self.services, "C1", items, "standard", payment)
+
+        # Assert
+        self.assertIsNone(order)
+        self.assertEqual(self.services.db.get_customer("C1").loyalty_points, 100)
+        self.assertIn("Applied loyalty discount", mock_stdout.getvalue())
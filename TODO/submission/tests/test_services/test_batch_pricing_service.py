@@ -0,0 +1,98 @@
+import contextlib
+import io
+import unittest
+
+from submission.benchmarks.bench_batch_pricing import (
+    QuoteStore,
+    batch_service,
+    breakdowns,
+    build_services,
+    make_carts,
+    price_scalar
+)
+from submission.domain.models.CartBatch import CartBatch
+from submission.domain.models.OrderLines import OrderLines
+from submission.domain.enums.membership_tier import MembershipTierEnum
+from submission.services.pricing.BatchPricingService import BatchPricingService
+from submission.services.pricing.strategies.bulk_discount import BulkDiscount
+
+
+class _Tier(BulkDiscount):
+    __slots__ = ()
+
+    def get_discount(self) -> float:
+        return self.discount
+
+    def get_min_quantity(self) -> int:
+        return self.min_quantity
+
+
+FIVE_PERCENT_FROM_3 = _Tier(3, 0.05)
+TEN_PERCENT_FROM_2 = _Tier(2, 0.10)
+
+
+class TestBatchPricingService(unittest.TestCase):
+
+    def setUp(self):
+        """The benchmark's catalog, customers and promotions, on a small scale."""
+        self.services = build_services(customer_count=40)
+        self.batch_pricing = batch_service(self.services)
+
+    def test_batch_matches_the_scalar_path_for_every_cart(self):
+        # Arrange
+        carts, customers, methods, codes = make_carts(600, self.services)
+        quote_store = QuoteStore(self.services.db)
+        points = [customer.loyalty_points for customer in customers]
+
+        # Act
+        prices = self.batch_pricing.price(CartBatch(carts), customers, methods, codes)
+        with contextlib.redirect_stdout(io.StringIO()):
+            scalar = [price_scalar(self.services, quote_store, *cart)
+                      for cart in zip(carts, customers, methods, codes)]
+
+        # Assert
+        self.assertEqual(breakdowns(prices), scalar)
+        # Every stage did something somewhere, so the comparison covers it
+        for column in (prices.bulk_discount, prices.membership_discount, prices.promotion_discount,
+                       prices.loyalty_discount, prices.tax, prices.shipping):
+            self.assertTrue(any(column.cents))
+        # Quotes spend no points
+        self.assertEqual([customer.loyalty_points for customer in customers], points)
+
+    def test_batch_matches_the_scalar_path_with_category_and_tier_schedules(self):
+        # Arrange
+        default = self.services.bulk_discount_strategies
+        self.services.bulk_discounts.configure({
+            (None, None): default,
+            (None, MembershipTierEnum.GOLD): default + [FIVE_PERCENT_FROM_3],
+            ("category-3", None): [TEN_PERCENT_FROM_2],
+        })
+        carts, customers, methods, codes = make_carts(300, self.services)
+        quote_store = QuoteStore(self.services.db)
+
+        # Act
+        prices = self.batch_pricing.price(CartBatch(carts), customers, methods, codes)
+        with contextlib.redirect_stdout(io.StringIO()):
+            scalar = [price_scalar(self.services, quote_store, *cart)
+                      for cart in zip(carts, customers, methods, codes)]
+
+        # Assert
+        self.assertEqual(breakdowns(prices), scalar)
+        # ...and the schedules changed some discounts
+        default_only = BatchPricingService(self.services.db, self.services.tax, self.services.shipping, default)
+        self.assertNotEqual(prices.bulk_discount.cents,
+                            default_only.price(CartBatch(carts), customers, methods, codes).bulk_discount.cents)
+
+    def test_inputs_must_line_up_and_methods_must_exist(self):
+        customer = self.services.db.get_customer("C0")
+        cart = OrderLines()
+        cart.add("P1", 1, 10.0)
+
+        with self.assertRaises(ValueError):
+            self.batch_pricing.price([cart, cart], [customer], ["standard", "standard"])
+        with self.assertRaises(ValueError):
+            self.batch_pricing.price([cart], [customer], ["teleport"])
+        self.assertEqual(len(self.batch_pricing.price([], [], [])), 0)
+
+# if __name__ == "__main__":
+#     unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,106 @@
+import unittest
+
+from submission.domain.enums.membership_tier import MembershipTierEnum
+from submission.domain.enums.rounding_mode import RoundingMode
+from submission.domain.values.Money import Money
+from submission.services.pricing.strategies.bulk_discount import (
+    BulkDiscount,
+    NoBulkDiscount,
+    FiveItemsDiscount,
+    TenItemsDiscount
+)
+from submission.services.pricing.strategies.bulk_discount_table import BulkDiscountTable, BulkSchedule
+
+
+class Tier(BulkDiscount):
+    __slots__ = ()
+
+    def get_discount(self) -> float:
+        return self.discount
+
+    def get_min_quantity(self) -> int:
+        return self.min_quantity
+
+
+class TestBulkSchedule(unittest.TestCase):
+
+    def test_best_tier_for_each_quantity(self):
+        none, five, ten = NoBulkDiscount(), FiveItemsDiscount(), TenItemsDiscount()
+        schedule = BulkSchedule([ten, none, five])
+
+        self.assertIs(schedule.best(0), none)
+        self.assertIs(schedule.best(4), none)
+        self.assertIs(schedule.best(5), five)
+        self.assertIs(schedule.best(9), five)
+        self.assertIs(schedule.best(10), ten)
+        self.assertIs(schedule.best(10_000), ten)
+        self.assertEqual(schedule.rate(7), 0.02)
+
+    def test_below_every_tier_is_no_discount(self):
+        schedule = BulkSchedule([FiveItemsDiscount()])
+        self.assertIsNone(schedule.best(4))
+        self.assertEqual(schedule.rate(4), 0.0)
+        self.assertEqual(BulkSchedule().rate(100), 0.0)
+
+    def test_first_listed_wins_a_tie(self):
+        first, second = Tier(5, 0.03), Tier(5, 0.04)
+        self.assertIs(BulkSchedule([first, second]).best(5), first)
+
+    def test_dozens_of_tiers(self):
+        schedule = BulkSchedule(Tier(minimum, minimum / 1000) for minimum in range(48, 0, -1))
+        self.assertEqual(len(schedule), 48)
+        self.assertEqual([schedule.rate(q) for q in (0, 1, 17, 48, 99)], [0.0, 0.001, 0.017, 0.048, 0.048])
+
+
+class TestBulkDiscountTable(unittest.TestCase):
+
+    def setUp(self):
+        self.default = [NoBulkDiscount(), FiveItemsDiscount(), TenItemsDiscount()]
+        self.table = BulkDiscountTable({
+            (None, None): self.default,
+            (None, MembershipTierEnum.GOLD): [Tier(2, 0.10)],
+            ("books", None): [Tier(3, 0.15)],
+            ("books", MembershipTierEnum.GOLD): [Tier(1, 0.25)],
+        })
+
+    def test_most_specific_schedule_wins(self):
+        gold = MembershipTierEnum.GOLD
+        self.assertEqual(self.table.rate(3, "books", gold), 0.25)
+        self.assertEqual(self.table.rate(3, "books", MembershipTierEnum.SILVER), 0.15)
+        self.assertEqual(self.table.rate(3, "toys", gold), 0.10)
+        self.assertEqual(self.table.rate(3, "toys"), 0.0)
+        self.assertEqual(self.table.rate(5), 0.02)
+
+    def test_a_list_is_the_default_schedule(self):
+        table = BulkDiscountTable(self.default)
+        self.assertEqual(table.current().categories, frozenset())
+        self.assertEqual(table.rate(12, "books", MembershipTierEnum.GOLD), 0.05)
+
+    def test_of_passes_a_table_through_and_compiles_a_list(self):
+        self.assertIs(BulkDiscountTable.of(self.table), self.table)
+        self.assertEqual(BulkDiscountTable.of(self.default).rate(12), BulkDiscountTable(self.default).rate(12))
+
+    def test_configure_swaps_the_whole_table(self):
+        before = self.table.current()
+
+        self.table.configure([Tier(1, 0.5)])
+
+        self.assertEqual(self.table.rate(1), 0.5)
+        self.assertEqual(self.table.rate(1, "books", MembershipTierEnum.GOLD), 0.5)
+        # A reader holding the old configuration still sees all of it
+        self.assertEqual(before.rate(3, "books", MembershipTierEnum.GOLD), 0.25)
+        self.assertEqual(before.categories, frozenset({"books"}))
+
+    def test_grouped_discount(self):
+        compiled = self.table.current()
+        # 3 books at 10.00 (15%) and 6 toys at 5.00 (default, 2%)
+        discount = compiled.grouped_discount(
+            ["books", "toys", "toys"], [3, 2, 4], [3000, 1000, 2000], None, RoundingMode.HALF_EVEN
+        )
+        self.assertEqual(discount, Money(450 + 60))
+
+        # No line under a category schedule: the caller applies the default
+        self.assertIsNone(compiled.grouped_discount(["toys"], [9], [900], None, RoundingMode.HALF_EVEN))
+
+# if __name__ == "__main__":
+#     unittest.main(argv=['first-arg-is-ignored'], exit=False)
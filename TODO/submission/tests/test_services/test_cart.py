@@ -0,0 +1,113 @@
+import random
+import unittest
+
+from submission.benchmarks.bench_batch_pricing import build_services
+from submission.domain.enums.membership_tier import MembershipTierEnum
+from submission.domain.values.Money import Money
+from submission.services.pricing.Cart import Cart
+from submission.services.pricing.PricingService import PricingService
+from submission.tests.test_services.test_batch_pricing_service import FIVE_PERCENT_FROM_3, TEN_PERCENT_FROM_2
+
+
+class TestCart(unittest.TestCase):
+
+    def setUp(self):
+        """The batch benchmark's catalog and promotions, and an empty cart for a gold customer with points."""
+        self.services = build_services(customer_count=4)
+        self.customer = self.services.db.get_customer("C0")
+        self.customer.loyalty_points = 5000
+        self.cart = Cart(self.services.db, self.customer, self.services.bulk_discounts, "ALL10")
+
+    def reference(self):
+        return PricingService.quote(self.cart.lines(), self.services.db, self.customer,
+                                    self.cart.promotion_code, self.services.bulk_discounts)
+
+    def test_running_totals_follow_every_change(self):
+        # Arrange
+        p1 = self.services.db.get_product("P1")
+        p11 = self.services.db.get_product("P11")   # same category as P1
+
+        # Act
+        self.cart.add("P1", 2)
+        self.cart.add("P11", 1)
+        self.cart.add("P1", 3)
+        self.cart.update("P11", 4)
+        self.cart.add("P2")
+        self.cart.remove("P2")
+
+        # Assert
+        self.assertEqual(self.cart.quantity("P1"), 5)
+        self.assertEqual(self.cart.item_count, 9)
+        expected = Money.from_float(p1.price) * 5 + Money.from_float(p11.price) * 4
+        self.assertEqual(self.cart.subtotal, expected)
+        self.assertEqual(self.cart.category_total(p1.category), (9, expected))
+        self.assertEqual(self.cart.category_total("category-2"), (0, Money(0)))
+        self.assertAlmostEqual(self.cart.weight, p1.weight * 5 + p11.weight * 4)
+        self.assertEqual(list(self.cart), ["P1", "P11"])
+
+    def test_price_matches_pricing_service_after_every_change(self):
+        # Arrange
+        default = self.services.bulk_discount_strategies
+        self.services.bulk_discounts.configure({
+            (None, None): default,
+            (None, MembershipTierEnum.GOLD): default + [FIVE_PERCENT_FROM_3],
+            ("category-3", None): [TEN_PERCENT_FROM_2],
+        })
+        rng = random.Random(3)
+        codes = [None, "ALL10", "CAT20", "EXPIRED", "BIG5"]
+
+        for step in range(400):
+            # Act
+            product_id = f"P{rng.randrange(40)}"
+            action = rng.random()
+            if product_id in self.cart and action < 0.3:
+                self.cart.remove(product_id)
+            elif product_id in self.cart and action < 0.6:
+                self.cart.update(product_id, rng.randrange(0, 8))
+            else:
+                self.cart.add(product_id, rng.randrange(1, 5))
+            if step % 25 == 0:
+                self.cart.promotion_code = rng.choice(codes)
+
+            # Assert
+            with self.subTest(step=step):
+                self.assertEqual(self.cart.price(), self.reference())
+
+    def test_only_stages_with_changed_inputs_run_again(self):
+        # Arrange
+        self.cart.add("P1", 6)
+        self.cart.price()
+        runs = dict(self.cart.stage_runs)
+
+        # Act / Assert: nothing changed
+        self.cart.price()
+        self.assertEqual(self.cart.stage_runs, runs)
+
+        # Only the loyalty stage reads the points
+        self.customer.loyalty_points = 4000
+        self.cart.price()
+        self.assertEqual(self.cart.stage_runs["loyalty"], runs["loyalty"] + 1)
+        self.assertEqual(self.cart.stage_runs["promotion"], runs["promotion"])
+
+        # A new code runs the promotion stage and what follows it
+        self.cart.promotion_code = None
+        quote = self.cart.price()
+        self.assertEqual(quote.promotion_code, None)
+        self.assertEqual(self.cart.stage_runs["bulk"], runs["bulk"])
+        self.assertEqual(self.cart.stage_runs["membership"], runs["membership"])
+        self.assertEqual(self.cart.stage_runs["promotion"], runs["promotion"] + 1)
+        self.assertEqual(quote, self.reference())
+
+    def test_bad_lines_are_refused(self):
+        with self.assertRaises(ValueError):
+            self.cart.add("NOPE")
+        with self.assertRaises(ValueError):
+            self.cart.add("P1", 0)
+        with self.assertRaises(KeyError):
+            self.cart.update("P1", 2)
+        with self.assertRaises(KeyError):
+            self.cart.remove("P1")
+        self.assertEqual(len(self.cart), 0)
+
+# if __name__ == "__main__":
+#     unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -5,14 +5,15 @@ import datetime # Import the real datetime module
 
 # Import the class we are testing
 from submission.services.customer_service import CustomerService
+from submission.domain.enums.order_status import OrderStatus
 
 # Import the membership classes to check types during upgrades
+from submission.domain.enums.membership_tier import MembershipTierEnum
 from submission.services.pricing.strategies.membership_discount import (
-    BronzeMembership,
     SilverMembership,
-    GoldMembership,
-    SuspendedMembership
+    GoldMembership
 )
+from submission.services.pricing.strategies.strategy_registry import MEMBERSHIP_TIERS
 
 class TestCustomerService(unittest.TestCase):
 
@@ -22,6 +23,12 @@ class TestCustomerService(unittest.TestCase):
         """
         self.mock_data_store = MagicMock()
         self.customer_service = CustomerService(data_store=self.mock_data_store)
+        # Segment scans read through a read view; here it is the store mock itself
+        self.mock_data_store.read_view.return_value.__enter__.return_value = self.mock_data_store
+
+    def serve_live(self, customers):
+        """Makes get_customer return the given customers by id."""
+        self.mock_data_store.get_customer.side_effect = {c.customer_id: c for c in customers}.get
 
     def test_finalize_customer_order_updates(self):
         """
@@ -40,8 +47,8 @@ class TestCustomerService(unittest.TestCase):
         )
 
         # 3. Assert
-        self.assertEqual(mock_customer.order_history, [9001])
-        self.assertEqual(mock_customer.loyalty_points, 220)
+        self.mock_data_store.append_order_history.assert_called_once_with(mock_customer, 9001)
+        self.mock_data_store.update_customer.assert_called_once_with(mock_customer, loyalty_points=220)
 
     @patch('sys.stdout', new_callable=io.StringIO)
     def test_refund_loyalty_points_for_order(self, mock_stdout):
@@ -106,6 +113,21 @@ class TestCustomerService(unittest.TestCase):
         self.mock_data_store.get_customer.assert_called_once_with("C1")
         self.mock_data_store.orders.get.assert_has_calls([call(1), call(2), call(3)])
 
+    def test_get_customer_lifetime_value_skips_cancelled_status(self):
+        # Arrange: statuses as the services store them, OrderStatus members
+        orders = {
+            1: MagicMock(total_price=100.0, status=OrderStatus.DELIVERED),
+            2: MagicMock(total_price=50.0, status=OrderStatus.CANCELLED),
+        }
+        self.mock_data_store.get_customer.return_value = MagicMock(order_history=[1, 2])
+        self.mock_data_store.orders.get.side_effect = orders.get
+
+        # Act
+        ltv = self.customer_service.get_customer_lifetime_value("C1")
+
+        # Assert
+        self.assertEqual(ltv, 100.0)
+
     def test_get_customer_lifetime_value_with_missing_order(self):
         """
         Tests LTV calculation when an order in history is not found.
@@ -153,7 +175,7 @@ class TestCustomerService(unittest.TestCase):
         """
         # 1. Arrange
         mock_customer = MagicMock(customer_id="C_SUSPENDED")
-        mock_customer.membership_tier = SuspendedMembership()
+        mock_customer.tier = MembershipTierEnum.SUSPENDED
         
         self.mock_data_store.get_customer.return_value = mock_customer
         
@@ -163,7 +185,8 @@ class TestCustomerService(unittest.TestCase):
         # 3. Assert
         self.assertFalse(result)
         # We should not even bother calculating LTV
-        self.assertEqual(mock_customer.membership_tier.get_name(), 'suspended')
+        self.assertIs(mock_customer.tier, MembershipTierEnum.SUSPENDED)
+        self.mock_data_store.update_customer.assert_not_called()
 
 
     def test_check_and_upgrade_membership_to_silver(self):
@@ -172,7 +195,7 @@ class TestCustomerService(unittest.TestCase):
         """
         # 1. Arrange
         mock_customer = MagicMock(customer_id="C1")
-        mock_customer.membership_tier = BronzeMembership()
+        mock_customer.tier = MembershipTierEnum.BRONZE
         
         self.mock_data_store.get_customer.return_value = mock_customer
         
@@ -183,7 +206,9 @@ class TestCustomerService(unittest.TestCase):
         # 3. Assert
         self.assertTrue(result)
         mock_get_ltv.assert_called_once_with("C1")
-        self.assertIsInstance(mock_customer.membership_tier, SilverMembership)
+        new_tier = self.mock_data_store.update_customer.call_args.kwargs['membership_tier']
+        self.assertIsInstance(new_tier, SilverMembership)
+        self.assertIs(new_tier, MEMBERSHIP_TIERS[MembershipTierEnum.SILVER])
 
     def test_check_and_upgrade_membership_to_gold(self):
         """
@@ -191,7 +216,7 @@ class TestCustomerService(unittest.TestCase):
         """
         # 1. Arrange
         mock_customer = MagicMock(customer_id="C2")
-        mock_customer.membership_tier = BronzeMembership()
+        mock_customer.tier = MembershipTierEnum.BRONZE
         
         self.mock_data_store.get_customer.return_value = mock_customer
         
@@ -202,7 +227,8 @@ class TestCustomerService(unittest.TestCase):
         # 3. Assert
         self.assertTrue(result)
         mock_get_ltv.assert_called_once_with("C2")
-        self.assertIsInstance(mock_customer.membership_tier, GoldMembership)
+        new_tier = self.mock_data_store.update_customer.call_args.kwargs['membership_tier']
+        self.assertIsInstance(new_tier, GoldMembership)
 
     def test_check_and_upgrade_membership_no_upgrade(self):
         """
@@ -210,7 +236,7 @@ class TestCustomerService(unittest.TestCase):
         """
         # 1. Arrange
         mock_customer = MagicMock(customer_id="C3")
-        mock_customer.membership_tier = BronzeMembership()
+        mock_customer.tier = MembershipTierEnum.BRONZE
         
         self.mock_data_store.get_customer.return_value = mock_customer
         
@@ -221,7 +247,7 @@ class TestCustomerService(unittest.TestCase):
         # 3. Assert
         self.assertFalse(result)
         mock_get_ltv.assert_called_once_with("C3")
-        self.assertIsInstance(mock_customer.membership_tier, BronzeMembership)
+        self.mock_data_store.update_customer.assert_not_called()
 
     # --- THE FIX IS HERE ---
     # 1. We patch the *module* 'datetime' as it's seen by the customer_service file.
@@ -244,27 +270,29 @@ class TestCustomerService(unittest.TestCase):
         mock_datetime_module.timedelta = datetime.timedelta
         
         # --- Create mock customers ---
-        cust_active = MagicMock(order_history=[1])
-        cust_inactive = MagicMock(order_history=[2])
-        cust_no_orders = MagicMock(order_history=[])
+        cust_active = MagicMock(customer_id="C1", order_history=[1])
+        cust_inactive = MagicMock(customer_id="C2", order_history=[2])
+        cust_no_orders = MagicMock(customer_id="C3", order_history=[])
         
         # --- Create mock orders with real dates ---
-        order_recent = MagicMock(created_at = real_now - datetime.timedelta(days=30))
-        order_old = MagicMock(created_at = real_now - datetime.timedelta(days=100))
+        order_recent = MagicMock(order_id=1, customer_id="C1", created_at = real_now - datetime.timedelta(days=30))
+        # A recent order that failed at checkout is not in C2's history
+        order_failed = MagicMock(order_id=3, customer_id="C2", created_at = real_now - datetime.timedelta(days=10))
         
         # --- Configure DataStore mocks ---
         self.mock_data_store.customers.values.return_value = [cust_active, cust_inactive, cust_no_orders]
+        self.serve_live([cust_active, cust_inactive, cust_no_orders])
         
-        def get_order_side_effect(order_id):
-            if order_id == 1: return order_recent
-            if order_id == 2: return order_old
-            return None
-        self.mock_data_store.orders.get.side_effect = get_order_side_effect
+        # The created_at index only returns orders after the 90-day cutoff
+        self.mock_data_store.get_orders_created_after.return_value = [order_recent, order_failed]
 
         # 2. Act
         inactive_list = self.customer_service.get_customers_for_segment('inactive')
         
         # 3. Assert
+        self.mock_data_store.get_orders_created_after.assert_called_once_with(
+            real_now - datetime.timedelta(days=90)
+        )
         self.assertEqual(len(inactive_list), 2)
         self.assertIn(cust_inactive, inactive_list)
         self.assertIn(cust_no_orders, inactive_list)
@@ -277,12 +305,13 @@ class TestCustomerService(unittest.TestCase):
         """
         # 1. Arrange
         cust_gold = MagicMock()
-        cust_gold.membership_tier.get_name.return_value = 'gold'
+        cust_gold.tier = MembershipTierEnum.GOLD
         
         cust_silver = MagicMock()
-        cust_silver.membership_tier.get_name.return_value = 'silver'
+        cust_silver.tier = MembershipTierEnum.SILVER
         
         self.mock_data_store.customers.values.return_value = [cust_gold, cust_silver]
+        self.serve_live([cust_gold, cust_silver])
         
         # 2. Act
         gold_list = self.customer_service.get_customers_for_segment('gold')
@@ -301,9 +330,11 @@ class TestCustomerService(unittest.TestCase):
         all_custs = [cust1, cust2]
         
         self.mock_data_store.customers.values.return_value = all_custs
+        self.serve_live(all_custs)
         
         # 2. Act
         all_list = self.customer_service.get_customers_for_segment('all')
         
         # 3. Assert
         self.assertEqual(all_list, all_custs)
+        self.mock_data_store.read_view.assert_called_once()
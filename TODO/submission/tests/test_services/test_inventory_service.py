@@ -3,6 +3,9 @@ from unittest.mock import MagicMock, patch, call
 import io # Used to capture stdout
 
 from submission.services.inventory_service import InventoryService
+from submission.domain.models.OrderItem import OrderItem
+from submission.domain.models.OrderLines import OrderLines
+from submission.repositories.stock.StockLevels import LowStockEvent
 
 
 class TestInventoryService(unittest.TestCase):
@@ -22,13 +25,9 @@ class TestInventoryService(unittest.TestCase):
 
     def test_deduct_stock_and_log(self):
         """
-        Tests that stock is correctly deducted and the change is logged.
+        Tests that stock is deducted through the store's atomic operation.
         """
         # 1. Arrange
-        # Create mock domain models
-        mock_product = MagicMock()
-        mock_product.quantity_available = 20
-        
         mock_item = MagicMock()
         mock_item.product_id = "P100"
         mock_item.quantity = 2
@@ -36,23 +35,30 @@ class TestInventoryService(unittest.TestCase):
         mock_order = MagicMock()
         mock_order.order_id = "O500"
         
-        # Configure the DataStore mock to return the mock product
-        self.mock_data_store.get_product.return_value = mock_product
+        self.mock_data_store.deduct_stock.return_value = True
 
         # 2. Act
-        self.inventory_service.deduct_stock_and_log([mock_item], mock_order)
+        result = self.inventory_service.deduct_stock_and_log([mock_item], mock_order)
 
         # 3. Assert
-        # Check that we retrieved the product
-        self.mock_data_store.get_product.assert_called_once_with("P100")
-        
-        # Check that the product's quantity was reduced in-memory
-        self.assertEqual(mock_product.quantity_available, 18) # 20 - 2
-        
-        # Check that the change was logged with the correct details
-        self.mock_data_store.log_inventory_change.assert_called_once_with(
-            "P100", -2, "order_O500"
-        )
+        self.assertTrue(result)
+        # The store checks, deducts and logs every item in one step
+        self.mock_data_store.deduct_stock.assert_called_once_with([mock_item], "order_O500")
+
+    def test_deduct_stock_and_log_reports_shortage(self):
+        """
+        Tests that a failed (all-or-nothing) deduction is passed on.
+        """
+        # 1. Arrange
+        mock_order = MagicMock()
+        mock_order.order_id = "O500"
+        self.mock_data_store.deduct_stock.return_value = False
+
+        # 2. Act
+        result = self.inventory_service.deduct_stock_and_log([MagicMock()], mock_order)
+
+        # 3. Assert
+        self.assertFalse(result)
 
     def test_check_and_notify_low_stock_triggers_notification(self):
         """
@@ -102,36 +108,38 @@ class TestInventoryService(unittest.TestCase):
         # Check that the supplier service was *not* called
         self.mock_supplier_service.notify_supplier_reorder.assert_not_called()
 
+    def test_low_stock_event_notifies_supplier_on_entry_only(self):
+        """
+        Tests that a product entering the low band is reordered, and one leaving it is not.
+        """
+        # 1. Arrange
+        mock_product = MagicMock()
+        self.mock_data_store.get_product.return_value = mock_product
+
+        # 2. Act
+        self.inventory_service.handle_low_stock_event(LowStockEvent("P101", 3, entered=True))
+        self.inventory_service.handle_low_stock_event(LowStockEvent("P101", 8, entered=False))
+
+        # 3. Assert
+        self.mock_data_store.get_product.assert_called_once_with("P101")
+        self.mock_supplier_service.notify_supplier_reorder.assert_called_once_with(mock_product)
+
     def test_restore_stock(self):
         """
         Tests that stock is correctly restored (e.g., for a canceled order).
         """
         # 1. Arrange
-        mock_product = MagicMock()
-        mock_product.quantity_available = 15
-        
-        mock_item = MagicMock()
-        mock_item.product_id = "P100"
-        mock_item.quantity = 5
-        
-        # The mock order needs an 'items' attribute to be iterable
+        # The mock order needs real order lines: restore_stock reads their columns
         mock_order = MagicMock()
         mock_order.order_id = "O501"
-        mock_order.items = [mock_item] 
-        
-        self.mock_data_store.get_product.return_value = mock_product
+        mock_order.items = OrderLines([OrderItem("P100", 5, 10.0)])
 
         # 2. Act
         self.inventory_service.restore_stock(mock_order)
 
         # 3. Assert
-        self.mock_data_store.get_product.assert_called_once_with("P100")
-        
-        # Check that the product's quantity was increased
-        self.assertEqual(mock_product.quantity_available, 20) # 15 + 5
-        
-        # Check that the (positive) change was logged
-        self.mock_data_store.log_inventory_change.assert_called_once_with(
+        # Check that the (positive) change was applied and logged atomically
+        self.mock_data_store.adjust_stock.assert_called_once_with(
             "P100", 5, "cancel_order_O501"
         )
 
@@ -147,14 +155,14 @@ class TestInventoryService(unittest.TestCase):
         mock_product.name = "Test Widget"
         
         self.mock_data_store.get_product.return_value = mock_product
+        self.mock_data_store.adjust_stock.return_value = mock_product
         
         # 2. Act
         result = self.inventory_service.restock_product("P1", 40, "S1")
 
         # 3. Assert
         self.assertTrue(result)
-        self.assertEqual(mock_product.quantity_available, 50) # 10 + 40
-        self.mock_data_store.log_inventory_change.assert_called_once_with(
+        self.mock_data_store.adjust_stock.assert_called_once_with(
             "P1", 40, "restock"
         )
         self.assertIn("Restocked Test Widget by 40", mock_stdout.getvalue())
@@ -173,6 +181,7 @@ class TestInventoryService(unittest.TestCase):
         # 3. Assert
         self.assertFalse(result)
         # Check that no logging or stock changes occurred
+        self.mock_data_store.adjust_stock.assert_not_called()
         self.mock_data_store.log_inventory_change.assert_not_called()
         self.assertIn("Product not found", mock_stdout.getvalue())
 
@@ -215,15 +224,15 @@ class TestInventoryService(unittest.TestCase):
         prod_exact = MagicMock()
         prod_exact.quantity_available = 10 # Should be included (<=)
 
-        # Configure the mock DataStore to return these products
-        # when '.products.values()' is called
-        self.mock_data_store.products.values.return_value = [prod_low, prod_high, prod_exact]
+        # The store's stock index answers the range query
+        self.mock_data_store.get_products_at_or_below.return_value = [prod_low, prod_exact]
 
         # 2. Act
         # Use the default threshold of 10
         low_stock_list = self.inventory_service.get_low_stock_products() 
 
         # 3. Assert
+        self.mock_data_store.get_products_at_or_below.assert_called_once_with(10)
         self.assertEqual(len(low_stock_list), 2)
         self.assertIn(prod_low, low_stock_list)
         self.assertIn(prod_exact, low_stock_list)
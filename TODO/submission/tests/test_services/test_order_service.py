@@ -8,6 +8,7 @@ from submission.services.order_service import OrderService
 
 # Import the Enum for status checks
 from submission.domain.enums.order_status import OrderStatus
+from submission.domain.models.OrderItem import OrderItem
 
 # We will use MagicMock for all dependencies and models
 # (DataStore, Services, Customer, Order)
@@ -52,10 +53,11 @@ class TestOrderService(unittest.TestCase):
         mock_now = datetime.datetime(2023, 1, 1, 12, 0, 0)
         mock_datetime.datetime.now.return_value = mock_now
         
-        self.mock_data_store.next_order_id = 101
+        self.mock_data_store.allocate_order_id.return_value = 101
         self.mock_data_store.orders = {}
         
-        mock_items = [MagicMock()]
+        # Real items: the order stores them by column
+        mock_items = [OrderItem("P1", 2, 75.0)]
         
         # 2. Act
         new_order = self.order_service.create_order(
@@ -67,7 +69,7 @@ class TestOrderService(unittest.TestCase):
         )
         
         # 3. Assert
-        self.assertEqual(self.mock_data_store.next_order_id, 102)
+        self.mock_data_store.allocate_order_id.assert_called_once_with()
         self.assertEqual(new_order.order_id, 101)
         self.assertEqual(new_order.customer_id, "C1")
         self.assertEqual(new_order.items, mock_items)
@@ -76,7 +78,7 @@ class TestOrderService(unittest.TestCase):
         self.assertEqual(new_order.total_price, 150.0)
         self.assertEqual(new_order.shipping_cost, 10.0)
         self.assertEqual(new_order.payment_method, "credit_card")
-        self.assertEqual(self.mock_data_store.orders[101], new_order)
+        self.mock_data_store.add_order.assert_called_once_with(new_order)
 
     def test_get_order_found(self):
         """
@@ -121,12 +123,12 @@ class TestOrderService(unittest.TestCase):
         
         # 3. Assert
         self.assertEqual(updated_order, self.mock_order)
-        self.assertEqual(self.mock_order.status, OrderStatus.SHIPPED)
+        self.mock_data_store.update_order.assert_any_call(self.mock_order, status=OrderStatus.SHIPPED)
         self.mock_notification_service.send_status_update.assert_called_once_with(
             self.mock_customer, self.mock_order
         )
         self.mock_shipping_service.create_shipment_for_order.assert_called_once_with(self.mock_order)
-        self.assertEqual(self.mock_order.tracking_number, "123XYZ")
+        self.mock_data_store.update_order.assert_called_with(self.mock_order, tracking_number="123XYZ")
 
     @patch('sys.stdout', new_callable=io.StringIO)
     def test_update_order_status_shipping_failure(self, mock_stdout):
@@ -158,7 +160,9 @@ class TestOrderService(unittest.TestCase):
         
         # 3. Assert
         self.assertEqual(updated_order, self.mock_order)
-        self.assertEqual(self.mock_order.total_price, 90.0) # 100 * (1 - 0.10)
+        self.mock_data_store.update_order.assert_called_once_with(
+            self.mock_order, total_price=90.0 # 100 * (1 - 0.10)
+        )
         self.assertIn("Applied 10% discount", mock_stdout.getvalue())
         
     @patch('sys.stdout', new_callable=io.StringIO)
@@ -191,7 +195,9 @@ class TestOrderService(unittest.TestCase):
         # 3. Assert
         self.assertTrue(result)
         self.mock_inventory_service.restore_stock.assert_called_once_with(self.mock_order)
-        self.assertEqual(self.mock_order.status, OrderStatus.CANCELLED)
+        self.mock_data_store.update_order.assert_called_once_with(
+            self.mock_order, status=OrderStatus.CANCELLED
+        )
         self.mock_notification_service.send_cancellation_notice.assert_called_once_with(
             self.mock_customer, self.mock_order, "Changed mind"
         )
@@ -230,7 +236,9 @@ class TestOrderService(unittest.TestCase):
         # 3. Assert
         self.assertTrue(result)
         self.mock_inventory_service.restore_stock.assert_called_once_with(self.mock_order)
-        self.assertEqual(self.mock_order.status, OrderStatus.CANCELLED)
+        self.mock_data_store.update_order.assert_called_once_with(
+            self.mock_order, status=OrderStatus.CANCELLED
+        )
         self.mock_notification_service.send_cancellation_notice.assert_not_called()
         self.mock_customer_service.refund_loyalty_points_for_order.assert_not_called()
 
@@ -240,31 +248,25 @@ class TestOrderService(unittest.TestCase):
         """
         # 1. Arrange
         order1 = MagicMock(customer_id="C1")
-        order2 = MagicMock(customer_id="C2")
         order3 = MagicMock(customer_id="C1")
         
-        all_orders = [order1, order2, order3]
-        self.mock_data_store.orders.values.return_value = all_orders
+        self.mock_data_store.get_orders_by_customer.return_value = [order1, order3]
         
         # 2. Act
         customer_orders = self.order_service.get_customer_orders("C1")
         
         # 3. Assert
-        self.assertEqual(len(customer_orders), 2)
-        self.assertIn(order1, customer_orders)
-        self.assertIn(order3, customer_orders)
-        self.assertNotIn(order2, customer_orders)
+        self.assertEqual(customer_orders, [order1, order3])
+        self.mock_data_store.get_orders_by_customer.assert_called_once_with("C1")
+        # The index is used instead of scanning every order
+        self.mock_data_store.orders.values.assert_not_called()
 
     def test_get_customer_orders_no_orders(self):
         """
         Tests retrieving orders for a customer who has none.
         """
         # 1. Arrange
-        order1 = MagicMock(customer_id="C1")
-        order2 = MagicMock(customer_id="C2")
-        
-        all_orders = [order1, order2]
-        self.mock_data_store.orders.values.return_value = all_orders
+        self.mock_data_store.get_orders_by_customer.return_value = []
         
         # 2. Act
         customer_orders = self.order_service.get_customer_orders("C3") # No orders for C3
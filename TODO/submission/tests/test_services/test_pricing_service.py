@@ -8,12 +8,26 @@ from submission.services.pricing.PricingService import PricingService
 
 # --- Import dependencies needed for tests ---
 from submission.domain.models.OrderItem import OrderItem
+from submission.domain.values.Money import Money
 from submission.services.pricing.strategies.bulk_discount import (
     BulkDiscount,
     NoBulkDiscount,
     FiveItemsDiscount,
     TenItemsDiscount
 )
+from submission.services.pricing.strategies.bulk_discount_table import BulkDiscountTable
+from submission.services.pricing.PromotionEngine import PromotionEngine
+from submission.domain.enums.membership_tier import MembershipTierEnum
+
+
+class BulkStub(BulkDiscount):
+    __slots__ = ()
+
+    def get_discount(self) -> float:
+        return self.discount
+
+    def get_min_quantity(self) -> int:
+        return self.min_quantity
 
 class TestPricingServiceWithMocks(unittest.TestCase):
     
@@ -39,6 +53,10 @@ class TestPricingServiceWithMocks(unittest.TestCase):
         product1 = Mock(product_id="p1", category="electronics", price=100.0)
         product2 = Mock(product_id="p2", category="books", price=50.0)
         self.store.get_product.side_effect = lambda pid: {"p1": product1, "p2": product2}.get(pid)
+        self.store.get_product_ids_by_category.side_effect = lambda category: {
+            "electronics": {"p1"},
+            "books": {"p2"}
+        }.get(category, set())
 
         valid_promo = Mock(
             code="VALID10", discount_percent=10, min_purchase=50, category="all",
@@ -61,6 +79,7 @@ class TestPricingServiceWithMocks(unittest.TestCase):
             used_count=0
         )
         
+        self.promotions = [valid_promo, expired_promo, min_promo, books_promo]
         self.store.promotions.get.side_effect = lambda code: {
             "VALID10": valid_promo,
             "EXPIRED": expired_promo,
@@ -83,7 +102,7 @@ class TestPricingServiceWithMocks(unittest.TestCase):
         service.apply_loyalty_discount(self.customer_loyal)
         self.assertAlmostEqual(service.discounted_price, 95.0)
         self.assertEqual(service.loyalty_discount_amount, 5.0)
-        self.assertEqual(self.customer_loyal.loyalty_points, 0)
+        self.store.update_customer.assert_called_once_with(self.customer_loyal, loyalty_points=0)
 
     @patch('sys.stdout', new_callable=io.StringIO)
     def test_apply_loyalty_fail_not_enough_points(self, mock_stdout):
@@ -121,6 +140,40 @@ class TestPricingServiceWithMocks(unittest.TestCase):
         self.assertAlmostEqual(service.discounted_price, 104.5)
         self.assertEqual(service.bulk_discount_amount, 5.5)
 
+    def test_apply_bulk_discount_uses_the_customers_tier_schedule(self):
+        table = BulkDiscountTable({
+            (None, None): self.bulk_strategies,
+            (None, MembershipTierEnum.GOLD): [BulkStub(2, 0.10)],
+        })
+        self.customer_gold.tier = MembershipTierEnum.GOLD
+        self.customer_normal.tier = MembershipTierEnum.BRONZE
+
+        gold = PricingService([OrderItem("p1", 3, 10.0)], self.store).apply_bulk_discount(table, self.customer_gold)
+        bronze = PricingService([OrderItem("p1", 3, 10.0)], self.store).apply_bulk_discount(table, self.customer_normal)
+
+        self.assertEqual(gold.bulk_discount_money, Money(300))
+        self.assertEqual(bronze.bulk_discount_money, Money(0))
+
+    def test_apply_bulk_discount_by_category_schedule(self):
+        """Books count toward the books schedule; everything else toward the default."""
+        table = BulkDiscountTable({
+            (None, None): self.bulk_strategies,
+            ("books", None): [BulkStub(3, 0.10)],
+        })
+        items = [OrderItem("p1", 4, 10.0), OrderItem("p2", 3, 50.0)]
+        service = PricingService(items, self.store)
+
+        service.apply_bulk_discount(table)
+
+        # 4 electronics reach no tier; 3 books take 10% of 150.00
+        self.assertEqual(service.bulk_discount_money, Money(1500))
+        self.assertEqual(service.get_final_discounted_money(), Money(17500))
+
+    def test_apply_bulk_discount_without_a_zero_tier(self):
+        service = PricingService([OrderItem("p1", 4, 10.0)], self.store)
+        service.apply_bulk_discount([FiveItemsDiscount(), TenItemsDiscount()])
+        self.assertEqual(service.bulk_discount_money, Money(0))
+
     def test_promotion_success_all_category(self):
         items = [OrderItem("p1", 1, 100.0)]
         service = PricingService(items, self.store)
@@ -154,6 +207,66 @@ class TestPricingServiceWithMocks(unittest.TestCase):
         service.apply_promotion_discount("FAKECODE")
         self.assertAlmostEqual(service.discounted_price, 100.0)
 
+    def test_apply_best_promotion_picks_the_highest_eligible(self):
+        engine = PromotionEngine(self.promotions)
+
+        books = PricingService([OrderItem("p2", 2, 50.0)], self.store)
+        with patch('sys.stdout', new_callable=io.StringIO):
+            books.apply_best_promotion(engine)
+        electronics = PricingService([OrderItem("p1", 1, 100.0)], self.store)
+        with patch('sys.stdout', new_callable=io.StringIO):
+            electronics.apply_best_promotion(engine)
+        small = PricingService([OrderItem("p1", 1, 10.0)], self.store).apply_best_promotion(engine)
+
+        # BOOKS_ONLY (20%) beats VALID10; MIN_PURCHASE and EXPIRED never qualify
+        self.assertEqual(books.promotion_discount_money, Money(2000))
+        self.assertEqual(electronics.promotion_discount_money, Money(1000))
+        self.assertEqual(small.promotion_discount_money, Money(0))
+        self.store.update_promotion.assert_called_with(self.promotions[0], used_count=1)
+
+    def test_quote_writes_nothing_and_says_what_it_uses(self):
+        items = [OrderItem("p1", 1, 100.0)]
+
+        with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+            quote = PricingService.quote(items, self.store, self.customer_loyal, "VALID10")
+
+        # 10% off 100.00, then 500 points for 5.00
+        self.assertEqual(quote.promotion_discount, Money(1000))
+        self.assertEqual(quote.loyalty_discount, Money(500))
+        self.assertEqual(quote.discounted, Money(8500))
+        self.assertEqual((quote.promotion_code, quote.loyalty_points), ("VALID10", 500))
+        self.store.update_customer.assert_not_called()
+        self.store.update_promotion.assert_not_called()
+        self.assertEqual(mock_stdout.getvalue(), "")
+
+    def test_commit_spends_the_quote_and_release_gives_it_back(self):
+        quote = PricingService.quote([OrderItem("p1", 1, 100.0)], self.store, self.customer_loyal, "VALID10")
+        promo = self.promotions[0]
+
+        self.assertTrue(PricingService.commit(self.store, quote, self.customer_loyal))
+        self.store.update_promotion.assert_called_once_with(promo, used_count=1)
+        self.store.update_customer.assert_called_once_with(self.customer_loyal, loyalty_points=0)
+
+        self.store.reset_mock()
+        promo.used_count = 1
+        PricingService.release(self.store, quote, self.customer_loyal)
+        self.store.update_promotion.assert_called_once_with(promo, used_count=0)
+        self.store.update_customer.assert_called_once_with(self.customer_loyal, loyalty_points=1000)
+
+    def test_commit_changes_nothing_when_the_quote_no_longer_holds(self):
+        quote = PricingService.quote([OrderItem("p1", 1, 100.0)], self.store, self.customer_loyal, "VALID10")
+
+        # The points were spent on another order in the meantime
+        self.customer_loyal.loyalty_points = 100
+        self.assertFalse(PricingService.commit(self.store, quote, self.customer_loyal))
+        # ...or the promotion expired
+        self.customer_loyal.loyalty_points = 500
+        later = datetime.datetime.now() + datetime.timedelta(days=31)
+        self.assertFalse(PricingService.commit(self.store, quote, self.customer_loyal, now=later))
+
+        self.store.update_customer.assert_not_called()
+        self.store.update_promotion.assert_not_called()
+
     # --- ADDED TEST ---
     def test_get_final_discounted_price(self):
         """Tests that the getter method returns the correct value."""
@@ -164,3 +277,17 @@ class TestPricingServiceWithMocks(unittest.TestCase):
         service.discounted_price = 77.77
         
         self.assertEqual(service.get_final_discounted_price(), 77.77)
+
+    def test_discounts_are_whole_cents(self):
+        """Tests that every stage takes a whole number of cents off."""
+        items = [OrderItem("p1", 3, 33.33)]
+        service = PricingService(items, self.store)
+
+        service.apply_bulk_discount(self.bulk_strategies)   # none at 3 items
+        service.apply_membership_discount(self.customer_gold)  # 20% of 99.99 = 19.998
+        service.apply_promotion_discount("VALID10")          # 10% of 79.99 = 7.999
+
+        self.assertEqual(service.membership_discount_money, Money(2000))
+        self.assertEqual(service.promotion_discount_money, Money(800))
+        self.assertEqual(service.get_final_discounted_money(), Money(7199))
+        self.assertEqual(service.discounted_price, 71.99)
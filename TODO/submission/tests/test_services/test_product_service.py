@@ -42,8 +42,8 @@ class TestProductService(unittest.TestCase):
         # Check that we tried to find the product
         self.mock_data_store.get_product.assert_called_once_with("P123")
         
-        # Check that the price on the mock object was updated
-        self.assertEqual(mock_product.price, 15.50)
+        # Check that the price was updated through the store
+        self.mock_data_store.update_product.assert_called_once_with(mock_product, price=15.50)
         
         # Check that the correct message was printed
         expected_output = "Updated Test Widget price from $10.00 to $15.50\n"
@@ -0,0 +1,98 @@
+import datetime
+import unittest
+
+from submission.domain.models.Promotion import Promotion
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.domain.values.Money import Money
+from submission.services.pricing.PromotionEngine import PromotionEngine
+
+NOW = datetime.datetime(2025, 6, 1, 12, 0)
+DAY = datetime.timedelta(days=1)
+
+
+def promo(code, percent, min_purchase=0.0, category="all", valid_until=NOW + DAY):
+    return Promotion(code, code, percent, min_purchase, valid_until, category)
+
+
+class TestPromotionEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.all10 = promo("ALL10", 10)
+        self.big15 = promo("BIG15", 15, min_purchase=200.0)
+        self.books20 = promo("BOOKS20", 20, category="books")
+        self.toys30 = promo("TOYS30", 30, min_purchase=500.0, category="toys")
+        self.engine = PromotionEngine([self.all10, self.big15, self.books20, self.toys30])
+
+    def test_best_is_the_highest_eligible_discount(self):
+        self.assertIs(self.engine.best(["games"], Money(5000), NOW), self.all10)
+        self.assertIs(self.engine.best(["games"], Money(20000), NOW), self.big15)
+        self.assertIs(self.engine.best(["games", "books"], Money(20000), NOW), self.books20)
+        # TOYS30 needs 500.00
+        self.assertIs(self.engine.best(["toys"], Money(49999), NOW), self.big15)
+        self.assertIs(self.engine.best(["toys"], Money(50000), NOW), self.toys30)
+
+    def test_nothing_eligible(self):
+        engine = PromotionEngine([self.big15, self.books20])
+        self.assertIsNone(engine.best(["games"], Money(100), NOW))
+        self.assertIsNone(PromotionEngine().best(["books"], Money(100), NOW))
+
+    def test_expired_promotions_are_dropped(self):
+        later = NOW + DAY
+        self.engine.add(promo("LONG5", 5, valid_until=NOW + 3 * DAY))
+
+        # Everything but LONG5 ends at `later`
+        self.assertEqual(self.engine.best(["books"], Money(100), later).code, "LONG5")
+        self.assertEqual(len(self.engine), 1)
+        self.assertEqual(self.engine.expire(NOW + 3 * DAY)[0].code, "LONG5")
+        self.assertEqual(len(self.engine), 0)
+
+    def test_add_replaces_and_remove_forgets(self):
+        self.engine.add(promo("ALL10", 40))
+        self.assertEqual(self.engine.best(["games"], Money(100), NOW).discount_percent, 40)
+
+        self.assertIs(self.engine.remove("BOOKS20"), self.books20)
+        self.assertIsNone(self.engine.remove("BOOKS20"))
+        self.assertNotIn("BOOKS20", self.engine)
+        self.assertEqual(self.engine.best(["books"], Money(100), NOW).code, "ALL10")
+
+    def test_re_added_with_a_later_expiry_stays(self):
+        self.all10.valid_until = NOW + 5 * DAY
+        self.engine.add(self.all10)
+
+        self.assertIs(self.engine.best([], Money(100), NOW + 2 * DAY), self.all10)
+
+    def test_changed_category_is_reindexed(self):
+        self.books20.category = "games"
+        self.engine.add(self.books20)
+
+        self.assertIs(self.engine.best(["games"], Money(100), NOW), self.books20)
+        self.assertIs(self.engine.best(["books"], Money(100), NOW), self.all10)
+
+    def test_valid_until_changed_in_place_is_honoured(self):
+        # Brought forward without add(): dropped once it passes
+        self.all10.valid_until = NOW + DAY / 4
+        self.assertIsNone(self.engine.best([], Money(100), NOW + DAY / 2))
+        self.assertNotIn("ALL10", self.engine)
+
+        # Pushed back without add(): kept past its first date, then expired
+        self.books20.valid_until = NOW + 5 * DAY
+        self.assertIs(self.engine.best(["books"], Money(100), NOW + 2 * DAY), self.books20)
+        self.assertEqual(self.engine.expire(NOW + 5 * DAY), [self.books20])
+
+    def test_engine_from_store_follows_promotion_updates(self):
+        # Arrange
+        store = DataStore()
+        all10 = store.add_promotion("PR1", "ALL10", 10, 0.0, NOW + DAY, "all")
+        store.add_promotion("PR2", "ALL5", 5, 0.0, NOW + 3 * DAY, "all")
+        engine = PromotionEngine.from_store(store)
+
+        # Act / Assert
+        store.update_promotion(all10, min_purchase=50.0)
+        self.assertEqual(engine.best([], Money(100), NOW).code, "ALL5")
+        store.update_promotion(all10, min_purchase=0.0, valid_until=NOW + 5 * DAY)
+        self.assertIs(engine.best([], Money(100), NOW + 2 * DAY), all10)
+        store.add_promotion("PR3", "ALL20", 20, 0.0, NOW + DAY, "all")
+        self.assertEqual(engine.best([], Money(100), NOW).code, "ALL20")
+
+# if __name__ == "__main__":
+#     unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,126 @@
+import contextlib
+import datetime
+import io
+import unittest
+from unittest.mock import MagicMock
+
+from submission.application.main import ServiceContainer, quote_order_facade
+from submission.domain.models.OrderLines import OrderLines
+from submission.domain.values.Money import Money
+from submission.domain.values.PriceQuote import PriceQuote
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.services.pricing.QuoteCache import QuoteCache
+from submission.services.tax_service import TaxService
+
+NOW = datetime.datetime(2025, 6, 1)
+
+
+class TestQuoteCache(unittest.TestCase):
+
+    def setUp(self):
+        """A store with two products and two customers, and a cache over a counting quote function."""
+        self.store = DataStore()
+        self.laptop = self.store.add_product("P1", "Laptop", 1000.0, 10, "electronics", 2.0, "S1")
+        self.book = self.store.add_product("P2", "Book", 20.0, 50, "books", 0.5, "S1")
+        self.alice = self.store.add_customer("C1", "Alice", "a@x.com", "gold", "", "1 Main St, CA", 500)
+        self.bob = self.store.add_customer("C2", "Bob", "b@x.com", "silver", "", "2 Elm St, TX", 0)
+
+        # Each computed quote is different, so a hit is easy to tell apart
+        self.compute = MagicMock(side_effect=lambda *args: PriceQuote(*[Money(self.compute.call_count)] * 9))
+        self.cache = QuoteCache(self.store, TaxService(), self.compute, capacity=3)
+
+    def cart(self, *lines):
+        cart = OrderLines()
+        for product, quantity in lines:
+            cart.add(product.product_id, quantity, product.price)
+        return cart
+
+    def test_same_cart_in_any_order_is_a_hit(self):
+        first = self.cache.quote(self.cart((self.laptop, 1), (self.book, 2)), self.alice, "standard", now=NOW)
+        again = self.cache.quote(self.cart((self.book, 1), (self.laptop, 1), (self.book, 1)), self.alice,
+                                 "standard", now=NOW)
+        other_method = self.cache.quote(self.cart((self.laptop, 1), (self.book, 2)), self.alice, "express", now=NOW)
+
+        self.assertIs(again, first)
+        self.assertIsNot(other_method, first)
+        stats = self.cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.size), (1, 2, 2))
+        self.assertAlmostEqual(stats.hit_ratio, 1 / 3)
+
+    def test_price_change_drops_only_carts_with_the_product(self):
+        laptop_cart, book_cart = self.cart((self.laptop, 1)), self.cart((self.book, 1))
+        self.cache.quote(laptop_cart, self.alice, "standard", now=NOW)
+        self.cache.quote(book_cart, self.alice, "standard", now=NOW)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            ServiceContainer.initialize(self.store).product.update_product_price("P2", 25.0)
+        self.store.update_product(self.laptop, quantity_available=3)   # stock: no price depends on it
+
+        self.assertEqual(len(self.cache), 1)
+        self.cache.quote(laptop_cart, self.alice, "standard", now=NOW)
+        self.assertEqual(self.compute.call_count, 2)
+        self.assertEqual(self.cache.stats().invalidations, 1)
+
+    def test_customer_changes_drop_that_customers_quotes(self):
+        cart = self.cart((self.book, 1))
+        self.cache.quote(cart, self.alice, "standard", now=NOW)
+        self.cache.quote(cart, self.bob, "standard", now=NOW)
+
+        self.store.update_customer(self.alice, loyalty_points=100)
+        self.store.update_customer(self.bob, phone="555")
+
+        self.assertEqual(self.cache.invalidate_customer("C2"), 1)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_promotions_added_or_expired(self):
+        cart = self.cart((self.book, 1))
+        self.cache.quote(cart, self.alice, "standard", "SAVE", now=NOW)
+        self.cache.quote(cart, self.alice, "standard", now=NOW)
+
+        self.store.add_promotion("PR1", "SAVE", 10.0, 0.0, NOW + datetime.timedelta(days=1), "all")
+        self.assertEqual(len(self.cache), 1)
+
+        quote = self.cache.quote(cart, self.alice, "standard", "SAVE", now=NOW)
+        self.assertIs(self.cache.quote(cart, self.alice, "standard", "SAVE", now=NOW), quote)
+        # Used counts don't matter; expiry does
+        self.store.update_promotion(self.store.promotions["SAVE"], used_count=5)
+        self.assertIs(self.cache.quote(cart, self.alice, "standard", "SAVE", now=NOW), quote)
+        self.assertIsNot(self.cache.quote(cart, self.alice, "standard", "SAVE", now=NOW + datetime.timedelta(days=2)),
+                         quote)
+
+    def test_least_recently_used_is_evicted(self):
+        carts = [self.cart((self.book, quantity)) for quantity in range(1, 5)]
+        for cart in carts[:3]:
+            self.cache.quote(cart, self.alice, "standard", now=NOW)
+        self.cache.quote(carts[0], self.alice, "standard", now=NOW)   # now the most recent
+
+        self.cache.quote(carts[3], self.alice, "standard", now=NOW)
+
+        self.assertEqual(self.cache.stats().evictions, 1)
+        self.cache.quote(carts[0], self.alice, "standard", now=NOW)
+        self.cache.quote(carts[1], self.alice, "standard", now=NOW)
+        self.assertEqual(self.compute.call_count, 5)
+
+
+class TestQuoteOrderFacade(unittest.TestCase):
+
+    def test_quotes_without_placing_and_repeats_from_the_cache(self):
+        store = DataStore()
+        with contextlib.redirect_stdout(io.StringIO()):
+            services = ServiceContainer.initialize(store)
+        store.add_product("P1", "Laptop", 1000.0, 10, "electronics", 2.0, "S1")
+        store.add_customer("C1", "Alice", "a@x.com", "gold", "", "1 Main St, CA", 500)
+        items = [{"product_id": "P1", "quantity": 1}]
+
+        quote = quote_order_facade(services, "C1", items, "standard")
+
+        # 15% gold, then 500 points of loyalty at one cent each
+        self.assertEqual(quote.discounted, Money(85000 - 500))
+        self.assertEqual(quote.total, quote.discounted + quote.tax + quote.shipping)
+        self.assertIs(quote_order_facade(services, "C1", items, "standard"), quote)
+        self.assertEqual(store.get_customer("C1").loyalty_points, 500)
+        self.assertIsNone(quote_order_facade(services, "C404", items, "standard"))
+        self.assertIsNone(quote_order_facade(services, "C1", [{"product_id": "P404", "quantity": 1}], "standard"))
+
+# if __name__ == "__main__":
+#     unittest.main(argv=['first-arg-is-ignored'], exit=False)
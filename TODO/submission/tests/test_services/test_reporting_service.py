@@ -7,6 +7,8 @@ from submission.services.reporting_service import ReportingService
 
 # Import the Enum for status checks
 from submission.domain.enums.order_status import OrderStatus
+from submission.domain.models.OrderItem import OrderItem
+from submission.domain.models.OrderLines import OrderLines
 
 # We will use MagicMock for all dependencies and models
 
@@ -18,6 +20,8 @@ class TestReportingService(unittest.TestCase):
         """
         self.mock_data_store = MagicMock()
         self.mock_customer_service = MagicMock()
+        # Reports read through a read view; here it is the store mock itself
+        self.mock_data_store.read_view.return_value.__enter__.return_value = self.mock_data_store
         
         self.reporting_service = ReportingService(
             data_store=self.mock_data_store,
@@ -40,42 +44,35 @@ class TestReportingService(unittest.TestCase):
         prod_B = MagicMock(product_id="P2", category="Books")
         
         # --- Mock Order Items ---
-        item_A1 = MagicMock(product_id="P1", quantity=2, unit_price=100.0) # 200.0
-        item_B1 = MagicMock(product_id="P2", quantity=1, unit_price=20.0)  # 20.0
-        item_B2 = MagicMock(product_id="P2", quantity=3, unit_price=20.0)  # 60.0
+        item_A1 = OrderItem(product_id="P1", quantity=2, unit_price=100.0) # 200.0
+        item_B1 = OrderItem(product_id="P2", quantity=1, unit_price=20.0)  # 20.0
+        item_B2 = OrderItem(product_id="P2", quantity=3, unit_price=20.0)  # 60.0
 
         # --- Mock Orders ---
         order_1_in_range = MagicMock(
             created_at=datetime.datetime(2023, 1, 5),
             status=OrderStatus.SHIPPED,  # <-- FIX: Was COMPLETED
             total_price=220.0,
-            items=[item_A1, item_B1]
+            items=OrderLines([item_A1, item_B1])
         )
         order_2_in_range = MagicMock(
             created_at=datetime.datetime(2023, 1, 10),
             status=OrderStatus.SHIPPED,
             total_price=60.0,
-            items=[item_B2]
+            items=OrderLines([item_B2])
         )
         order_3_cancelled = MagicMock(
             created_at=datetime.datetime(2023, 1, 15),
             status=OrderStatus.CANCELLED,
             total_price=100.0,
-            items=[]
+            items=OrderLines()
         )
-        order_4_out_of_range = MagicMock(
-            created_at=datetime.datetime(2023, 2, 1),
-            status=OrderStatus.DELIVERED, # <-- Also valid
-            total_price=50.0,
-            items=[]
-        )
-        
         # --- Mock DataStore (Orders) ---
-        self.mock_data_store.orders.values.return_value = [
+        # The created_at index only returns orders inside the window
+        self.mock_data_store.get_orders_created_between.return_value = [
             order_1_in_range, 
             order_2_in_range, 
-            order_3_cancelled, 
-            order_4_out_of_range
+            order_3_cancelled
         ]
         
         # --- Mock DataStore (Products) ---
@@ -87,7 +84,7 @@ class TestReportingService(unittest.TestCase):
         
         # --- Mock CustomerService (LTV) ---
         self.mock_data_store.customers.keys.return_value = ["C1", "C2", "C3"]
-        def get_ltv_side_effect(customer_id):
+        def get_ltv_side_effect(customer_id, store=None):
             if customer_id == "C1": return 500.0
             if customer_id == "C2": return 1000.0
             if customer_id == "C3": return 200.0
@@ -99,6 +96,16 @@ class TestReportingService(unittest.TestCase):
 
         # 3. Assert
         
+        # The window is delegated to the index, no full scan of orders
+        self.mock_data_store.get_orders_created_between.assert_called_once_with(
+            self.start_date, self.end_date
+        )
+        self.mock_data_store.orders.values.assert_not_called()
+        self.mock_data_store.read_view.assert_called_once()
+
+        # LTVs are computed on the same view as the totals
+        self.mock_customer_service.get_customer_lifetime_value.assert_any_call("C2", self.mock_data_store)
+
         # Check sales and order counts
         self.assertEqual(report['total_sales'], 280.0) # 220.0 (Order 1) + 60.0 (Order 2)
         self.assertEqual(report['total_orders'], 2)
@@ -119,7 +126,7 @@ class TestReportingService(unittest.TestCase):
         Tests that a default (zeroed-out) report is returned if no data exists.
         """
         # 1. Arrange
-        self.mock_data_store.orders.values.return_value = []
+        self.mock_data_store.get_orders_created_between.return_value = []
         self.mock_data_store.customers.keys.return_value = []
         
         # 2. Act
@@ -141,19 +148,19 @@ class TestReportingService(unittest.TestCase):
         # 1. Arrange
         
         # --- Mock Order Items ---
-        item_A = MagicMock(product_id="P1", quantity=2, unit_price=100.0)
-        item_BAD = MagicMock(product_id="P_BAD", quantity=5, unit_price=10.0)
+        item_A = OrderItem(product_id="P1", quantity=2, unit_price=100.0)
+        item_BAD = OrderItem(product_id="P_BAD", quantity=5, unit_price=10.0)
 
         # --- Mock Orders ---
         order_1 = MagicMock(
             created_at=datetime.datetime(2023, 1, 5),
             status=OrderStatus.SHIPPED,  # <-- FIX: Was COMPLETED
             total_price=250.0, # 200 + 50
-            items=[item_A, item_BAD]
+            items=OrderLines([item_A, item_BAD])
         )
         
         # --- Mock DataStore (Orders) ---
-        self.mock_data_store.orders.values.return_value = [order_1]
+        self.mock_data_store.get_orders_created_between.return_value = [order_1]
         
         # --- Mock DataStore (Products) ---
         prod_A = MagicMock(product_id="P1", category="Electronics")
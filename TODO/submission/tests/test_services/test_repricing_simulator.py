@@ -0,0 +1,160 @@
+import contextlib
+import copy
+import csv
+import datetime
+import io
+import os
+import tempfile
+import unittest
+
+from submission.application.main import ServiceContainer, place_order_facade
+from submission.domain.enums.membership_tier import MembershipTierEnum
+from submission.domain.enums.order_status import OrderStatus
+from submission.domain.enums.tax_strategy import TaxRegion
+from submission.domain.values.Money import Money
+from submission.repositories.archive.OrderArchive import OrderArchive
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.services.pricing.RepricingSimulator import RepricingSimulator, RuleSet
+from submission.services.shipping_strategy import StandardShipping
+
+PAYMENT = {"type": "credit_card", "amount": 100_000.0, "valid": True, "card_number": "1234567812345678"}
+
+
+class FlatStandardShipping(StandardShipping):
+    """A candidate formula: $4.00 whatever the weight or subtotal."""
+
+    def cal_shipping_cost(self, total_weight, customer, subtotal):
+        return 4.0
+
+
+class TestRepricingSimulator(unittest.TestCase):
+
+    def setUp(self):
+        """Orders placed through checkout, without promo codes or loyalty points, and one cancelled."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.services = ServiceContainer.initialize()
+            db = self.services.db
+            db.add_supplier("S1", "Supplier", "s@x.com", 1.0)
+            db.add_product("P1", "Laptop", 999.99, 100, "electronics", 2.0, "S1")
+            db.add_product("P2", "Cable", 12.49, 1000, "electronics", 0.1, "S1")
+            db.add_product("P3", "Book", 18.00, 1000, "books", 0.5, "S1")
+            customers = [
+                ("C1", "gold", "1 Main St, CA"), ("C2", "silver", "2 Broadway, NY"), ("C3", "bronze", "3 Elm St, TX"),
+                ("C4", "gold", "4 Oak Ave, WA"), ("C5", "silver", "2 Broadway, NY"),
+            ]
+            for customer_id, tier, address in customers:
+                db.add_customer(customer_id, customer_id, "c@x.com", tier, "", address, 0)
+            orders = [
+                ("C1", [("P1", 1), ("P2", 3)], "express"),
+                ("C2", [("P3", 12)], "standard"),
+                ("C3", [("P2", 2)], "standard"),
+                ("C4", [("P3", 6), ("P2", 1)], "overnight"),
+                ("C5", [("P1", 2)], "express"),
+            ]
+            for customer_id, lines, method in orders:
+                items = [{"product_id": product_id, "quantity": quantity} for product_id, quantity in lines]
+                place_order_facade(self.services, customer_id, items, method, PAYMENT)
+            self.services.order.cancel_order(5, "test")
+        # Orders record no tier: put back the tiers they were placed at
+        for customer_id, tier, _ in customers:
+            db.update_customer(db.get_customer(customer_id), tier=MembershipTierEnum(tier))
+        self.out_dir = tempfile.TemporaryDirectory()
+        self.simulator = RepricingSimulator(self.services.db)
+
+    def tearDown(self):
+        self.out_dir.cleanup()
+
+    def rows(self, report):
+        rows = []
+        for path in report.paths:
+            with open(path, newline='') as f:
+                rows.extend(csv.DictReader(f))
+        return rows
+
+    def test_todays_rules_reproduce_what_checkout_charged(self):
+        # Act
+        report = self.simulator.run(RuleSet.current(), self.out_dir.name, workers=0, shard_size=2)
+
+        # Assert
+        charged = sum(Money.from_float(self.services.db.get_order(i).total_price).cents for i in range(1, 5))
+        self.assertEqual((report.orders, report.skipped, report.changed), (4, 1, 0))
+        self.assertEqual(report.baseline, Money(charged))
+        self.assertEqual(report.revenue_change, Money(0))
+        self.assertEqual([os.path.basename(path) for path in report.paths], [
+            "reprice-000000000001-000000000002.csv",
+            "reprice-000000000003-000000000004.csv",
+            "reprice-000000000005-000000000005.csv",
+        ])
+
+    def test_candidate_rules_change_the_orders_they_touch(self):
+        # Arrange: gold 20% instead of 15%, and Texas tax at 7%
+        candidate = RuleSet.current().with_changes(
+            membership_rates={MembershipTierEnum.GOLD: 0.20},
+            tax_rates={TaxRegion.TEXAS: 0.07}
+        )
+
+        # Act
+        report = self.simulator.run(candidate, self.out_dir.name, workers=0)
+        rows = {int(row["order_id"]): row for row in self.rows(report)}
+
+        # Assert: orders 1 and 4 (gold) and 3 (Texas) change; order 2 does not
+        self.assertEqual(sorted(order_id for order_id, row in rows.items() if row["delta_cents"] != "0"), [1, 3, 4])
+        # Order 3: 2 x 12.49 = 24.98 less 3% bronze = 24.23; tax 1.51 becomes 1.70
+        self.assertEqual(int(rows[3]["delta_cents"]), 19)
+        self.assertLess(int(rows[1]["delta_cents"]), 0)
+        self.assertEqual(report.revenue_change, Money(sum(int(row["delta_cents"]) for row in rows.values())))
+        self.assertEqual(report.changed, 3)
+
+    def test_worker_processes_give_the_same_report(self):
+        # Arrange
+        candidate = RuleSet.current().with_changes(
+            bulk_discounts=[],
+            shipping={"standard": FlatStandardShipping()}
+        )
+        inline_dir = os.path.join(self.out_dir.name, "inline")
+        pool_dir = os.path.join(self.out_dir.name, "pool")
+
+        # Act
+        inline = self.simulator.run(candidate, inline_dir, workers=0, shard_size=1)
+        pooled = self.simulator.run(candidate, pool_dir, workers=2, shard_size=1)
+
+        # Assert
+        self.assertEqual(
+            (pooled.orders, pooled.changed, pooled.baseline, pooled.candidate),
+            (inline.orders, inline.changed, inline.baseline, inline.candidate)
+        )
+        self.assertEqual(self.rows(pooled), self.rows(inline))
+        self.assertTrue(inline.revenue_change)
+
+    def test_archived_orders_are_replayed(self):
+        # Arrange: the same history in a store that has archived every order
+        db = self.services.db
+        archived = DataStore(archive=OrderArchive(
+            os.path.join(self.out_dir.name, "archive"), max_age=datetime.timedelta(0), block_size=2
+        ))
+        self.addCleanup(archived.archive.close)
+        for p in db.products.values():
+            archived.add_product(p.product_id, p.name, p.price, p.quantity_available, p.category, p.weight,
+                                 p.supplier_id)
+        for c in db.customers.values():
+            archived.add_customer(c.customer_id, c.name, c.email, c.tier.value, c.phone, c.address, c.loyalty_points)
+        for order_id in range(1, 6):
+            order = copy.copy(db.get_order(order_id))
+            if order.status is not OrderStatus.CANCELLED:
+                order.status = OrderStatus.DELIVERED
+            archived.add_order(order)
+        archived.archive_orders(now=datetime.datetime.now() + datetime.timedelta(days=1))
+        candidate = RuleSet.current().with_changes(membership_rates={MembershipTierEnum.GOLD: 0.20})
+
+        # Act
+        expected = self.simulator.run(candidate, os.path.join(self.out_dir.name, "resident"), workers=0)
+        report = RepricingSimulator(archived).run(candidate, os.path.join(self.out_dir.name, "archived"), workers=0)
+
+        # Assert
+        self.assertEqual(dict.__len__(archived.orders), 0)
+        self.assertEqual((report.orders, report.skipped), (4, 1))
+        self.assertEqual((report.baseline, report.candidate), (expected.baseline, expected.candidate))
+        self.assertEqual(self.rows(report), self.rows(expected))
+
+# if __name__ == "__main__":
+#     unittest.main(argv=['first-arg-is-ignored'], exit=False)
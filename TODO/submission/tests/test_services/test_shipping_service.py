@@ -3,7 +3,9 @@ from unittest.mock import MagicMock, patch, Mock
 import datetime
 
 # --- Import the class to be tested ---
+from submission.domain.enums.membership_tier import MembershipTierEnum
 from submission.services.shipping_service import ShippingService
+from submission.domain.enums.shipment_status import ShipmentStatus
 
 # --- Import dependencies needed for mocks ---
 # (We don't need to import the real classes if we remove the 'spec')
@@ -42,7 +44,7 @@ class TestShippingService(unittest.TestCase):
         """
         # --- FIX: Remove spec=Customer ---
         mock_customer = MagicMock()
-        mock_customer.membership_tier.get_name.return_value = "gold"
+        mock_customer.tier = MembershipTierEnum.GOLD
         total_weight = 10.0
         subtotal = 100.0
         
@@ -73,7 +75,7 @@ class TestShippingService(unittest.TestCase):
         """
         # --- FIX: Remove spec=Order ---
         mock_order = Mock(order_id=123) 
-        self.mock_datastore.next_shipment_id = 1
+        self.mock_datastore.allocate_shipment_id.return_value = 1
         
         # We patch 'random.randint' in the *shipping_service* module
         with patch('submission.services.shipping_service.random.randint', return_value=9999):
@@ -82,17 +84,48 @@ class TestShippingService(unittest.TestCase):
         # 1. Check the returned tracking number
         self.assertEqual(tracking_number, "TRACK1239999")
         
-        # 2. Check that the datastore's ID was incremented
-        self.assertEqual(self.mock_datastore.next_shipment_id, 2)
+        # 2. Check that the shipment ID came from the datastore's counter
+        self.mock_datastore.allocate_shipment_id.assert_called_once_with()
         
-        # 3. Check that the shipment was saved to the datastore's dictionary
-        self.mock_datastore.shipments.__setitem__.assert_called_once()
+        # 3. Check that the shipment was saved to the datastore
+        self.mock_datastore.add_shipment.assert_called_once()
         
-        call_args = self.mock_datastore.shipments.__setitem__.call_args[0]
-        saved_shipment_id = call_args[0]
-        saved_shipment_data = call_args[1]
+        saved_shipment = self.mock_datastore.add_shipment.call_args[0][0]
         
-        self.assertEqual(saved_shipment_id, 1)
-        self.assertEqual(saved_shipment_data['shipment_id'], 1)
-        self.assertEqual(saved_shipment_data['order_id'], 123)
-        self.assertEqual(saved_shipment_data['tracking_number'], "TRACK1239999")
+        self.assertEqual(saved_shipment.shipment_id, 1)
+        self.assertEqual(saved_shipment.order_id, 123)
+        self.assertEqual(saved_shipment.tracking_number, "TRACK1239999")
+        self.assertEqual(saved_shipment.status, ShipmentStatus.IN_TRANSIT)
+
+    def test_apply_carrier_scans(self):
+        """
+        Tests that scan rows are parsed and handed to the store as one update.
+        """
+        # 1. Arrange
+        self.mock_datastore.update_shipment_statuses.return_value = 2
+        rows = [
+            {"tracking_number": "T1", "status": "delivered"},
+            {"tracking_number": "T2", "status": "out_for_delivery"},
+        ]
+
+        # 2. Act
+        applied = self.shipping_service.apply_carrier_scans(rows)
+
+        # 3. Assert
+        self.assertEqual(applied, 2)
+        self.mock_datastore.update_shipment_statuses.assert_called_once_with([
+            ("T1", ShipmentStatus.DELIVERED), ("T2", ShipmentStatus.OUT_FOR_DELIVERY)
+        ])
+        self.mock_datastore.sync.assert_called_once_with()
+
+    def test_apply_carrier_scans_rejects_unknown_status(self):
+        """
+        Tests that a bad status rejects the whole file before anything is written.
+        """
+        rows = [{"tracking_number": "T1", "status": "delivered"}, {"tracking_number": "T2", "status": "lost"}]
+
+        with self.assertRaises(ValueError) as context:
+            self.shipping_service.apply_carrier_scans(rows)
+
+        self.assertIn("row 2", str(context.exception))
+        self.mock_datastore.update_shipment_statuses.assert_not_called()
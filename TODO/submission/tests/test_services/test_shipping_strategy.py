@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import Mock, MagicMock  # <-- Import MagicMock
 
 # Import the classes to be tested
+from submission.domain.enums.membership_tier import MembershipTierEnum
 from submission.services.shipping_service import (
     ShippingStrategy,
     ExpressShipping,
@@ -38,7 +39,7 @@ class TestExpressShipping(unittest.TestCase):
     def test_cost_non_gold_member(self):
         """Test cost for a non-gold member."""
         mock_customer = MagicMock() # <-- Use MagicMock
-        mock_customer.membership_tier.get_name.return_value = "silver"
+        mock_customer.tier = MembershipTierEnum.SILVER
         
         cost = self.strategy.cal_shipping_cost(self.weight, mock_customer, self.subtotal)
         self.assertEqual(cost, 30.0)
@@ -46,7 +47,7 @@ class TestExpressShipping(unittest.TestCase):
     def test_cost_gold_member(self):
         """Test 50% discount for a gold member."""
         mock_customer = MagicMock() # <-- Use MagicMock
-        mock_customer.membership_tier.get_name.return_value = "gold"
+        mock_customer.tier = MembershipTierEnum.GOLD
         
         cost = self.strategy.cal_shipping_cost(self.weight, mock_customer, self.subtotal)
         self.assertEqual(cost, 15.0)
@@ -0,0 +1,71 @@
+import pickle
+import unittest
+
+from submission.domain.enums.bulk_discount_tier import BulkDiscountTier
+from submission.domain.enums.membership_tier import MembershipTierEnum
+from submission.domain.enums.shipping_method import ShippingMethod
+from submission.domain.enums.tax_strategy import TaxRegion
+from submission.domain.models.Customer import Customer
+from submission.repositories.in_memory.DataStore import DataStore
+from submission.services.pricing.strategies.membership_discount import GoldMembership
+from submission.services.pricing.strategies.strategy_registry import (
+    BULK_DISCOUNTS,
+    MEMBERSHIP_TIERS,
+    SHIPPING_STRATEGIES,
+    TAX_STRATEGIES
+)
+from submission.services.shipping_service import ShippingService
+from submission.services.tax_service import TaxService
+
+
+class TestStrategyRegistry(unittest.TestCase):
+
+    def test_every_key_has_one_shared_instance(self):
+        self.assertEqual(set(MEMBERSHIP_TIERS), set(MembershipTierEnum))
+        self.assertEqual(set(BULK_DISCOUNTS), set(BulkDiscountTier))
+        for tier, strategy in MEMBERSHIP_TIERS.items():
+            self.assertIs(strategy.get_tier(), tier)
+
+        # Services hand out the registry's objects, not their own
+        self.assertIs(TaxService().strategies['CA'], TAX_STRATEGIES[TaxRegion.CALIFORNIA])
+        self.assertIs(ShippingService(None).strategies['express'], SHIPPING_STRATEGIES[ShippingMethod.EXPRESS])
+
+    def test_shared_strategies_are_read_only(self):
+        gold = MEMBERSHIP_TIERS[MembershipTierEnum.GOLD]
+
+        with self.assertRaises(AttributeError):
+            gold.discount = 0.5
+        with self.assertRaises(AttributeError):
+            BULK_DISCOUNTS[BulkDiscountTier.TEN_ITEMS].min_quantity = 1
+        with self.assertRaises(TypeError):
+            MEMBERSHIP_TIERS[MembershipTierEnum.GOLD] = GoldMembership()
+        self.assertEqual(gold.get_discount(), 0.15)
+
+    def test_strategies_survive_pickling(self):
+        copied = pickle.loads(pickle.dumps(BULK_DISCOUNTS[BulkDiscountTier.FIVE_ITEMS]))
+
+        self.assertEqual((copied.get_min_quantity(), copied.get_discount()), (5, 0.02))
+
+
+class TestCustomerTier(unittest.TestCase):
+
+    def test_customers_hold_the_tier_and_share_its_strategy(self):
+        alice = Customer("C1", "Alice", "a@b.com", "gold", "555", "1 St", 0)
+        bob = Customer("C2", "Bob", "b@b.com", "gold", "555", "2 St", 0)
+        carol = Customer("C3", "Carol", "c@b.com", "standard", "555", "3 St", 0)
+
+        self.assertIs(alice.tier, MembershipTierEnum.GOLD)
+        self.assertIs(alice.membership_tier, bob.membership_tier)
+        self.assertIs(carol.tier, MembershipTierEnum.SUSPENDED)
+
+    def test_assigning_a_strategy_through_the_store_records_its_tier(self):
+        store = DataStore()
+        customer = store.add_customer("C1", "Alice", "a@b.com", "bronze", "555", "1 St", 0)
+
+        store.update_customer(customer, membership_tier=GoldMembership())
+
+        self.assertIs(customer.tier, MembershipTierEnum.GOLD)
+        self.assertIs(customer.membership_tier, MEMBERSHIP_TIERS[MembershipTierEnum.GOLD])
+
+# if __name__ == "__main__":
+#     unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -3,6 +3,7 @@ from unittest.mock import MagicMock
 
 # --- Import classes to be tested ---
 from submission.services.tax_service import TaxService
+from submission.domain.values.Money import Money
 from submission.services.pricing.strategies.tax_strategy import (
     TaxStrategy,
     DefaultTaxStrategy,
@@ -69,3 +70,9 @@ class TestTaxService(unittest.TestCase):
         """Test that a customer with no address falls back to default (8%)."""
         tax = self.tax_service.calculate_tax(self.subtotal, self.customer_no_address)
         self.assertEqual(tax, 8.0) # 100.0 * 0.08
+
+    def test_tax_is_rounded_to_the_cent_half_up(self):
+        """Test that tax is whole cents: 849.00 * 7.25% = 61.5525 -> 61.55, 0.10 * 7.25% -> 0.01."""
+        tax = self.tax_service.calculate_tax_money(Money(84900), self.customer_ca)
+        self.assertEqual(tax, Money(6155))
+        self.assertEqual(self.tax_service.calculate_tax(0.10, self.customer_ca), 0.01)